@@ -0,0 +1,13 @@
+"""Offline performance benchmarks for the SRE four-agent pattern."""
+
+import os
+import tempfile
+
+
+def keep_logs_out_of_tree() -> None:
+    """Send observability logs to the temp directory unless SRE_POC_LOG_DIR is set.
+
+    Importing the pipeline or the agents opens ``logs/`` under the working
+    directory by default; benchmarks call this before those imports.
+    """
+    os.environ.setdefault("SRE_POC_LOG_DIR", tempfile.gettempdir())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Analyst calls and detection delay of fixed versus adaptive window scheduling.
+
+Replays a generated log dataset with embedded incidents (the one the WebSocket
+load test uses) through ``AdaptiveWindowScheduler`` the way a streaming
+session does, in two modes:
+
+- ``fixed``: the base stride with every non-empty window analysed, as
+  streaming sessions did before adaptive scheduling
+- ``adaptive``: strides and window sizes follow the window statistics and
+  stable windows skip the analyst
+
+The analyst is a rule (a window with at least three ERROR entries is an
+anomaly), so the run needs no model and measures only the scheduling. Since
+the incident onsets are known, detection delay is measured directly: from the
+onset to the end of the first analysed window that reported the incident.
+
+Reports, per mode: analyst calls, calls saved against the fixed schedule,
+per-incident detection delay and missed incidents, and the scheduler's own
+report (strides used, longest unanalysed stretch). It also checks that the
+fixed schedule over a streaming session's span (``max_windows`` windows at
+the base stride) visits exactly ``max_windows`` windows.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.adaptive_windows
+
+    # Longer replay, more aggressive widening
+    python -m benchmarks.adaptive_windows --hours 5 --window-minutes 20 --max-stride 20 --max-skipped 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from benchmarks.websocket_load import _ANOMALY_ERROR_COUNT, _INCIDENT_WINDOWS, write_dataset  # noqa: E402
+from src.data_pipeline.adaptive_schedule import (  # noqa: E402
+    AdaptiveScheduleConfig,
+    AdaptiveWindowScheduler,
+    WindowStats,
+)
+from src.data_pipeline.pipeline_orchestrator import LogDataPipeline  # noqa: E402
+
+MODES = ("fixed", "adaptive")
+# Session lengths to check, including spans that are whole hours at a 5-minute stride
+SESSION_WINDOWS = (1, 12, 13, 20, 24, 25, 49)
+
+
+def run_mode(pipeline: LogDataPipeline, mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Replay the dataset under one schedule and measure calls and detection delay."""
+    config = AdaptiveScheduleConfig(
+        enabled=mode == "adaptive",
+        base_stride_minutes=args.base_stride,
+        min_stride_minutes=args.min_stride,
+        max_stride_minutes=args.max_stride,
+        max_skipped_windows=args.max_skipped,
+    )
+    start = pipeline.dataset_start_time
+    end = start + timedelta(hours=args.hours) - timedelta(minutes=args.window_minutes)
+    scheduler = AdaptiveWindowScheduler(start, end, window_minutes=args.window_minutes, config=config)
+
+    onsets = [start + timedelta(minutes=lo) for lo, _ in _INCIDENT_WINDOWS]
+    ends = [start + timedelta(minutes=hi) for _, hi in _INCIDENT_WINDOWS]
+    detected_at: List[Optional[Any]] = [None] * len(onsets)
+
+    while (window := scheduler.next_window()) is not None:
+        logs = pipeline.get_window_logs(window.start, window.minutes)
+        decision = scheduler.observe(window, WindowStats.from_logs(logs, window.minutes))
+        if not decision.analyze:
+            continue
+        anomalous = sum(1 for log in logs if log.level == "ERROR") >= _ANOMALY_ERROR_COUNT
+        scheduler.record_analysis(window, anomalous)
+        if not anomalous:
+            continue
+        for i, (onset, incident_end) in enumerate(zip(onsets, ends)):
+            if detected_at[i] is None and window.start < incident_end and window.end > onset:
+                detected_at[i] = window.end
+
+    delays = [
+        (detected - onset).total_seconds() / 60
+        for onset, detected in zip(onsets, detected_at)
+        if detected is not None
+    ]
+    return {
+        "llm_calls": scheduler.llm_calls,
+        "incidents": [
+            {
+                "onset": onset.isoformat(),
+                "detected_at": detected.isoformat() if detected is not None else None,
+                "delay_minutes": round((detected - onset).total_seconds() / 60, 1) if detected else None,
+            }
+            for onset, detected in zip(onsets, detected_at)
+        ],
+        "missed": sum(1 for detected in detected_at if detected is None),
+        "delay_minutes": {
+            "mean": round(statistics.fmean(delays), 2) if delays else None,
+            "max": round(max(delays), 2) if delays else None,
+        },
+        "schedule": scheduler.report(),
+    }
+
+
+def check_fixed_sessions(pipeline: LogDataPipeline, args: argparse.Namespace) -> Dict[str, Any]:
+    """Windows the fixed schedule visits over the span of a session of ``max_windows`` windows."""
+    config = AdaptiveScheduleConfig(
+        enabled=False,
+        base_stride_minutes=args.base_stride,
+        min_stride_minutes=args.min_stride,
+        max_stride_minutes=args.max_stride,
+    )
+    start = pipeline.dataset_start_time
+    visited = {}
+    for max_windows in SESSION_WINDOWS:
+        # The span demo_app gives a streaming session
+        end = start + timedelta(minutes=args.base_stride * (max_windows - 1))
+        scheduler = AdaptiveWindowScheduler(start, end, window_minutes=args.window_minutes, config=config)
+        while (window := scheduler.next_window()) is not None:
+            scheduler.observe(window, WindowStats.from_logs([], window.minutes))
+        visited[str(max_windows)] = scheduler.windows
+    return {
+        "visited": visited,
+        "mismatches": [int(expected) for expected, windows in visited.items() if windows != int(expected)],
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    stdout = contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext()
+    with tempfile.TemporaryDirectory() as tmp, stdout:
+        dataset = Path(tmp) / "streaming_logs.jsonl"
+        entries = write_dataset(dataset, hours=args.hours, seed=args.seed)
+        pipeline = LogDataPipeline(log_file_path=dataset, window_minutes=args.window_minutes)
+        pipeline.load_logs()
+        modes = {mode: run_mode(pipeline, mode, args) for mode in args.modes}
+        fixed_sessions = check_fixed_sessions(pipeline, args)
+
+    report: Dict[str, Any] = {
+        "config": {
+            "hours": args.hours,
+            "log_entries": entries,
+            "window_minutes": args.window_minutes,
+            "base_stride": args.base_stride,
+            "min_stride": args.min_stride,
+            "max_stride": args.max_stride,
+            "max_skipped": args.max_skipped,
+        },
+        "modes": modes,
+        "fixed_sessions": fixed_sessions,
+    }
+    if "fixed" in modes and "adaptive" in modes:
+        fixed, adaptive = modes["fixed"], modes["adaptive"]
+        fixed_delay = fixed["delay_minutes"]["mean"]
+        adaptive_delay = adaptive["delay_minutes"]["mean"]
+        report["comparison"] = {
+            "llm_calls_saved": fixed["llm_calls"] - adaptive["llm_calls"],
+            "llm_calls_saved_pct": round(
+                (fixed["llm_calls"] - adaptive["llm_calls"]) / fixed["llm_calls"] * 100, 1
+            ) if fixed["llm_calls"] else 0.0,
+            "mean_delay_change_minutes": round(adaptive_delay - fixed_delay, 2)
+            if fixed_delay is not None and adaptive_delay is not None else None,
+            "extra_missed": adaptive["missed"] - fixed["missed"],
+        }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare analyst calls and detection delay of fixed and adaptive window schedules"
+    )
+    parser.add_argument("--hours", type=int, default=4, help="Hours of generated logs (incidents sit in the first 4)")
+    parser.add_argument("--window-minutes", type=int, default=15, help="Window size at the base stride")
+    parser.add_argument("--base-stride", type=int, default=5, help="Fixed-schedule stride in minutes")
+    parser.add_argument("--min-stride", type=int, default=1, help="Stride after a sharp change")
+    parser.add_argument("--max-stride", type=int, default=10, help="Widest stride in quiet periods")
+    parser.add_argument("--max-skipped", type=int, default=3, help="Skipped windows before a heartbeat analysis")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Modes to run")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the generated dataset")
+    parser.add_argument("--verbose", action="store_true", help="Show data pipeline prints")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    failed = report.get("comparison", {}).get("extra_missed", 0) > 0 or report["fixed_sessions"]["mismatches"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
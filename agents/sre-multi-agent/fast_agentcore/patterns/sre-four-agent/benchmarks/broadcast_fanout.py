@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for WebSocket broadcast fan-out.
+
+Compares the legacy broadcast loop, which encodes the message with ``json``
+and awaits each client in turn, against ``PipelineStateManager.broadcast_update``,
+which encodes once (orjson when installed) and hands the same frame to every
+client's send queue. Clients are in-memory fakes, so the numbers are pure
+encoding and scheduling cost.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.broadcast_fanout
+    python -m benchmarks.broadcast_fanout --clients 1 10 100 1000 --messages 200 --payload-bytes 4096
+    python -m benchmarks.broadcast_fanout --encoder json --output fanout.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from src.orchestration.real_time import client_channel  # noqa: E402
+from src.orchestration.real_time.pipeline_state_manager import PipelineStateManager  # noqa: E402
+
+
+class _NullWebSocket:
+    """WebSocket stand-in that only counts what it is sent."""
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.bytes = 0
+
+    async def send_text(self, text: str) -> None:
+        self.frames += 1
+        self.bytes += len(text)
+
+    async def send_json(self, data: Any) -> None:
+        # Mirrors Starlette: send_json encodes with the standard library per call
+        await self.send_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+    async def close(self, code: int = 1000) -> None:
+        pass
+
+
+def _make_message(index: int, payload_bytes: int) -> Dict[str, Any]:
+    return {
+        "type": "agent_output_chunk",
+        "kind": "patch",
+        "pipeline_id": "bench-pipeline",
+        "version": index + 2,
+        "base_version": index + 1,
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "patch": [
+            {"op": "remove", "path": "/agents/1/output_chunks/0"},
+            {
+                "op": "add",
+                "path": "/agents/1/output_chunks/-",
+                "value": {
+                    "chunk_id": f"chunk-{index}",
+                    "chunk_content": "x" * payload_bytes,
+                    "chunk_type": "text",
+                    "chunk_index": index,
+                    "is_complete": False,
+                },
+            },
+            {"op": "replace", "path": "/agents/1/output_length", "value": (index + 1) * payload_bytes},
+        ],
+    }
+
+
+async def _bench_legacy(clients: int, messages: List[Dict[str, Any]]) -> Dict[str, float]:
+    sockets = [_NullWebSocket() for _ in range(clients)]
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for message in messages:
+        for websocket in sockets:
+            await websocket.send_json(message)
+    return {
+        "cpu_s": time.process_time() - cpu_started,
+        "wall_s": time.perf_counter() - wall_started,
+        "frames": sum(ws.frames for ws in sockets),
+    }
+
+
+async def _bench_serialize_once(clients: int, messages: List[Dict[str, Any]]) -> Dict[str, float]:
+    manager = PipelineStateManager(max_queue_size=len(messages) + 1, queue_policy="drop_oldest")
+    sockets = [_NullWebSocket() for _ in range(clients)]
+    for websocket in sockets:
+        await manager.add_websocket_connection(websocket)
+    await asyncio.sleep(0)
+
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for message in messages:
+            await manager.broadcast_update(message)
+    # Wait for every writer task to drain its queue
+    while any(client.depth for client in manager.websocket_connections.values()):
+        await asyncio.sleep(0)
+    result = {
+        "cpu_s": time.process_time() - cpu_started,
+        "wall_s": time.perf_counter() - wall_started,
+        "frames": sum(ws.frames for ws in sockets),
+    }
+
+    for websocket in sockets:
+        await manager.remove_websocket_connection(websocket)
+    return result
+
+
+def _per_message(result: Dict[str, float], count: int) -> Dict[str, float]:
+    return {
+        "cpu_us_per_message": round(result["cpu_s"] / count * 1e6, 1),
+        "wall_us_per_message": round(result["wall_s"] / count * 1e6, 1),
+        "frames": result["frames"],
+    }
+
+
+async def run_benchmark(client_counts: List[int], message_count: int, payload_bytes: int) -> Dict[str, Any]:
+    """Run both broadcast paths for each client count."""
+    messages = [_make_message(i, payload_bytes) for i in range(message_count)]
+    results = []
+    for clients in client_counts:
+        legacy = _per_message(await _bench_legacy(clients, messages), message_count)
+        once = _per_message(await _bench_serialize_once(clients, messages), message_count)
+        results.append({
+            "clients": clients,
+            "legacy": legacy,
+            "serialize_once": once,
+            "cpu_speedup": round(
+                legacy["cpu_us_per_message"] / once["cpu_us_per_message"], 2
+            ) if once["cpu_us_per_message"] else None,
+        })
+    return {
+        "encoder": "orjson" if client_channel.ORJSON_AVAILABLE else "json",
+        "messages": message_count,
+        "payload_bytes": payload_bytes,
+        "frame_bytes": len(client_channel.encode_frame(messages[0])),
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket broadcast fan-out")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100, 1000], help="Client counts to test")
+    parser.add_argument("--messages", type=int, default=100, help="Messages broadcast per run")
+    parser.add_argument("--payload-bytes", type=int, default=2048, help="Chunk content size per message")
+    parser.add_argument("--encoder", choices=["auto", "json"], default="auto", help="Force the stdlib encoder")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if args.encoder == "json":
+        client_channel.ORJSON_AVAILABLE = False
+
+    report = asyncio.run(run_benchmark(args.clients, args.messages, args.payload_bytes))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Similar-incident search during a Bedrock brownout: zero vectors versus the
+embedding fallback chain.
+
+When Titan could not embed a query, ``BedrockEmbeddings.embed_query`` used to
+return a zero vector, so every search ranked chunks by their norm alone. The
+vector RAG reader now falls back through a chain of embedding backends, each
+behind a circuit breaker (see ``src.orchestration.four_agent.embedding_backends``).
+
+The indexes are built while a bedrock-runtime stand-in (hashed word and
+trigram counts, as in ``benchmarks.hybrid_retrieval``) answers normally;
+then a share of its requests (``--throttle-rate``) fail with
+ThrottlingException and the labelled queries of the hybrid retrieval
+benchmark are asked through ``get_similar_incidents``. Scenarios:
+
+- ``healthy``: no throttling
+- ``zero_vector``: throttled, with the previous zero-vector fallback
+- ``fallback``: throttled, with the hashing backend as fallback
+
+Reports recall@1/5 and MRR of the expected incident, per-query latency
+percentiles, Bedrock requests per query and, for the chain, the backend
+states at the end. A last check edits a policy document while every request
+is throttled and no fallback is configured: BM25 then holds chunks the vector
+stores do not, and lexical and hybrid searches must still answer; the exit
+status is 1 if any raised. Run in "vector" mode by default, where the fallback is
+all there is; in "hybrid" mode BM25 hides part of the damage. The stand-in
+is itself a hashing model, so here the fallback ranks nearly as well as the
+healthy primary; against Titan a local sentence-transformers model narrows
+that gap.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.embedding_fallback
+
+    # Half of the requests throttled, hybrid retrieval
+    python -m benchmarks.embedding_fallback --throttle-rate 0.5 --mode hybrid
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from botocore.exceptions import ClientError  # noqa: E402
+
+from benchmarks.hybrid_retrieval import POLICIES_DIR, QUERIES, HashedTermRuntime  # noqa: E402
+from src.orchestration.four_agent.embedding_backends import EmbeddingError, HashingEmbeddings  # noqa: E402
+from src.orchestration.four_agent.query_cache import QueryResultCache  # noqa: E402
+from src.orchestration.four_agent.vector_rag_reader import (  # noqa: E402
+    BedrockEmbeddings,
+    VectorRAGKnowledgeReader,
+)
+
+SCENARIOS = ("healthy", "zero_vector", "fallback")
+DOCUMENTS = ("troubleshooting-runbooks.md", "known-failure-patterns.md")
+RECALL_AT = (1, 5)
+
+
+class BrownoutRuntime(HashedTermRuntime):
+    """Hashed-term stand-in for bedrock-runtime that throttles a share of requests."""
+
+    def __init__(self, dimension: int, latency_ms: float, seed: int):
+        super().__init__(dimension)
+        self.latency_ms = latency_ms
+        self.throttle_rate = 0.0
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def invoke_model(self, modelId: str, body: str) -> Dict[str, Any]:
+        self.calls += 1
+        time.sleep(self.latency_ms / 1000)
+        if self._rng.random() < self.throttle_rate:
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, "InvokeModel")
+        return super().invoke_model(modelId, body)
+
+
+class ZeroVectorEmbeddings(BedrockEmbeddings):
+    """The previous behaviour: a zero vector for a query that could not be embedded."""
+
+    def embed_query(self, text: str) -> List[float]:
+        try:
+            return super().embed_query(text)
+        except EmbeddingError:
+            return [0.0] * (self.dimension or 1536)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_scenario(scenario: str, args: argparse.Namespace, cache_dir: Path) -> Dict[str, Any]:
+    runtime = BrownoutRuntime(args.dimension, args.latency_ms, args.seed)
+    embedding_class = ZeroVectorEmbeddings if scenario == "zero_vector" else BedrockEmbeddings
+    embeddings = embedding_class(client=runtime, max_retries=args.retries)
+    reader = VectorRAGKnowledgeReader(
+        runbooks_path=POLICIES_DIR / "troubleshooting-runbooks.md",
+        patterns_path=POLICIES_DIR / "known-failure-patterns.md",
+        cache_dir=cache_dir,
+        embeddings=embeddings,
+        retrieval_mode=args.mode,
+        query_cache=QueryResultCache(ttl_seconds=0),
+        fallbacks=[HashingEmbeddings(args.dimension)] if scenario == "fallback" else [],
+    )
+    if scenario != "healthy":
+        runtime.throttle_rate = args.throttle_rate
+    built_calls = runtime.calls
+
+    ranks: List[Optional[int]] = []
+    latencies: List[float] = []
+    for _ in range(args.repeats):
+        for _, query, expected, filters in QUERIES:
+            started = time.perf_counter()
+            incidents = reader.get_similar_incidents([query], filters=filters, limit=max(RECALL_AT))
+            latencies.append((time.perf_counter() - started) * 1000)
+            ranked = [incident["incident_id"] for incident in incidents]
+            ranks.append(ranked.index(expected) + 1 if expected in ranked else None)
+
+    result: Dict[str, Any] = {
+        **{f"recall@{k}": round(sum(1 for rank in ranks if rank and rank <= k) / len(ranks), 3) for k in RECALL_AT},
+        "mrr": round(statistics.fmean(1.0 / rank if rank else 0.0 for rank in ranks), 3),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+        },
+        "bedrock_requests_per_query": round((runtime.calls - built_calls) / len(ranks), 2),
+    }
+    if scenario == "fallback":
+        result["embedding_backends"] = reader.embedding_status()
+    return result
+
+
+def check_edit_during_outage(args: argparse.Namespace, tmp: Path) -> Dict[str, Any]:
+    """Search after a policy edit that no embedding backend could index."""
+    results: Dict[str, Any] = {}
+    for mode in ("lexical", "hybrid"):
+        corpus = tmp / mode
+        corpus.mkdir()
+        for name in DOCUMENTS:
+            shutil.copy(POLICIES_DIR / name, corpus / name)
+        runtime = BrownoutRuntime(args.dimension, 0.0, args.seed)
+        reader = VectorRAGKnowledgeReader(
+            runbooks_path=corpus / DOCUMENTS[0],
+            patterns_path=corpus / DOCUMENTS[1],
+            cache_dir=corpus / "index",
+            embeddings=BedrockEmbeddings(client=runtime, max_retries=args.retries),
+            retrieval_mode=mode,
+            query_cache=QueryResultCache(ttl_seconds=0),
+            fallbacks=[],
+        )
+        runtime.throttle_rate = 1.0
+        # Every failure-pattern chunk that names an incident changes
+        patterns = corpus / DOCUMENTS[1]
+        patterns.write_text(re.sub(r"(INC-\d{4}-\d{2}-\d{2})", r"\1 (reviewed)", patterns.read_text()))
+        reader.refresh()
+
+        answered = 0
+        errors: List[str] = []
+        for _, query, _, filters in QUERIES:
+            try:
+                answered += bool(reader.get_similar_incidents([query], filters=filters))
+            except Exception as e:
+                errors.append(f"{query}: {type(e).__name__}: {e}")
+        results[mode] = {"queries": len(QUERIES), "answered": answered, "errors": errors}
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare zero-vector and fallback embeddings during a brownout")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Scenarios")
+    parser.add_argument("--mode", choices=("vector", "hybrid"), default="vector", help="Retrieval mode")
+    parser.add_argument("--throttle-rate", type=float, default=1.0, help="Share of Bedrock requests throttled")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Latency of each Bedrock request")
+    parser.add_argument("--retries", type=int, default=1, help="Bedrock retries per request")
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the labelled queries")
+    parser.add_argument("--dimension", type=int, default=512, help="Dimension of the stand-in embeddings")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for throttling")
+    parser.add_argument("--verbose", action="store_true", help="Show fallback and breaker logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.ERROR)
+    if not args.verbose:
+        # Every query logs its fallback during a brownout
+        logging.getLogger("src.orchestration.four_agent").setLevel(logging.CRITICAL)
+
+    report: Dict[str, Any] = {
+        "config": {
+            "mode": args.mode,
+            "throttle_rate": args.throttle_rate,
+            "latency_ms": args.latency_ms,
+            "retries": args.retries,
+            "queries": len(QUERIES) * args.repeats,
+        },
+        "scenarios": {},
+    }
+    for scenario in args.scenarios:
+        with tempfile.TemporaryDirectory() as tmp:
+            report["scenarios"][scenario] = run_scenario(scenario, args, Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        report["edit_during_outage"] = check_edit_during_outage(args, Path(tmp))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 1 if any(result["errors"] for result in report["edit_during_outage"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Vector index build time with serial, concurrent and cached embeddings.
+
+Builds ``VectorRAGKnowledgeReader`` indexes over the policy documents
+(replicated ``--copies`` times with a per-copy marker on every paragraph so
+no two chunks are equal) against a fake bedrock-runtime client that sleeps for the injected
+request latency and throttles a fraction of requests. Modes:
+
+- ``serial``: one request per chunk in a plain loop with no cache, as the
+  reader embedded before
+- ``concurrent``: bounded concurrency with retry, cold embedding cache
+- ``cached``: a rebuild after the corpus hash changed with nothing edited,
+  served entirely from the embedding cache
+- ``edited``: a rebuild after one section of the runbooks was edited
+
+Reports, per mode: build seconds, embedding requests, retries, cache hit rate
+and requests per second.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.embedding_throughput
+
+    # Larger corpus, slower model, more throttling
+    python -m benchmarks.embedding_throughput --copies 8 --latency-ms 120 --throttle-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from botocore.exceptions import ClientError  # noqa: E402
+
+from src.orchestration.four_agent.embedding_cache import EmbeddingCache  # noqa: E402
+from src.orchestration.four_agent.vector_rag_reader import (  # noqa: E402
+    BedrockEmbeddings,
+    VectorRAGKnowledgeReader,
+)
+
+MODES = ("serial", "concurrent", "cached", "edited")
+
+POLICIES_DIR = PROJECT_ROOT.parents[2] / "docs" / "policies"
+
+
+class FakeBedrockRuntime:
+    """bedrock-runtime stand-in with request latency and random throttling."""
+
+    def __init__(self, latency_ms: float, throttle_rate: float, dimension: int, seed: int):
+        self.latency_s = latency_ms / 1000.0
+        self.throttle_rate = throttle_rate
+        self.dimension = dimension
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def invoke_model(self, modelId: str, body: str) -> Dict[str, Any]:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            throttled = self._rng.random() < self.throttle_rate
+        try:
+            time.sleep(self.latency_s)
+            if throttled:
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                    "InvokeModel",
+                )
+            text = json.loads(body)["inputText"]
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+            rng = random.Random(seed)
+            vector = [rng.uniform(-1.0, 1.0) for _ in range(self.dimension)]
+            return {"body": io.BytesIO(json.dumps({"embedding": vector}).encode("utf-8"))}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class SerialEmbeddings(BedrockEmbeddings):
+    """The reader's previous embedding loop: one request per text, in order."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        started = time.perf_counter()
+        vectors = [self._embed_with_retry(text) for text in texts]
+        self.texts_requested += len(texts)
+        self.api_seconds += time.perf_counter() - started
+        return vectors
+
+
+def write_corpus(directory: Path, copies: int) -> Dict[str, Path]:
+    """Replicate the runbooks and failure patterns with a marker per copy and paragraph."""
+    paths = {}
+    for name in ("troubleshooting-runbooks.md", "known-failure-patterns.md"):
+        source = (POLICIES_DIR / name).read_text()
+        parts = []
+        for copy in range(copies):
+            parts.append(source.replace("\n\n", f"\n\n[region-{copy}]\n"))
+        path = directory / name
+        path.write_text("\n\n".join(parts))
+        paths[name] = path
+    return paths
+
+
+def edit_one_section(path: Path) -> None:
+    """Append a line to the first second-level section of a document."""
+    content = path.read_text()
+    marker = content.index("\n## ")
+    line_end = content.index("\n", marker + 1)
+    path.write_text(
+        content[: line_end + 1]
+        + "Edited: confirm the rollback completed before closing the incident.\n"
+        + content[line_end + 1:]
+    )
+
+
+def build(corpus: Dict[str, Path], index_dir: Path, embeddings: BedrockEmbeddings) -> Dict[str, Any]:
+    """Build a reader's indexes from scratch and time it."""
+    shutil.rmtree(index_dir, ignore_errors=True)
+    started = time.perf_counter()
+    reader = VectorRAGKnowledgeReader(
+        runbooks_path=corpus["troubleshooting-runbooks.md"],
+        patterns_path=corpus["known-failure-patterns.md"],
+        cache_dir=index_dir,
+        embeddings=embeddings,
+    )
+    seconds = time.perf_counter() - started
+    chunks = len(reader.runbooks_store.index_to_docstore_id) + len(reader.patterns_store.index_to_docstore_id)
+    return {"build_seconds": round(seconds, 3), "chunks": chunks, "embeddings": embeddings.stats()}
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    modes: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        corpus = write_corpus(root, args.copies)
+        shared_cache = root / "embeddings"
+
+        def embeddings(concurrency: int, cache: Optional[EmbeddingCache]) -> BedrockEmbeddings:
+            client = FakeBedrockRuntime(args.latency_ms, args.throttle_rate, args.dimension, args.seed)
+            cls = SerialEmbeddings if concurrency == 0 else BedrockEmbeddings
+            return cls(max_concurrency=max(concurrency, 1), cache=cache, client=client)
+
+        for mode in args.modes:
+            if mode == "serial":
+                emb = embeddings(0, None)
+            else:
+                if mode == "concurrent":
+                    shutil.rmtree(shared_cache, ignore_errors=True)
+                elif mode == "edited":
+                    edit_one_section(corpus["troubleshooting-runbooks.md"])
+                # A new cache object each time, so hits come from disk as after a restart
+                emb = embeddings(args.concurrency, EmbeddingCache(shared_cache))
+            result = build(corpus, root / f"index-{mode}", emb)
+            result["peak_in_flight"] = emb.client.peak_in_flight
+            modes[mode] = result
+
+    report: Dict[str, Any] = {
+        "config": {
+            "copies": args.copies,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "throttle_rate": args.throttle_rate,
+            "dimension": args.dimension,
+        },
+        "modes": modes,
+    }
+    if "serial" in modes and "concurrent" in modes:
+        report["concurrent_speedup"] = round(
+            modes["serial"]["build_seconds"] / max(modes["concurrent"]["build_seconds"], 1e-9), 1
+        )
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare vector index build time with serial, concurrent and cached embeddings"
+    )
+    parser.add_argument("--copies", type=int, default=4, help="Copies of the policy documents in the corpus")
+    parser.add_argument("--concurrency", type=int, default=8, help="Embedding requests in flight")
+    parser.add_argument("--latency-ms", type=float, default=60.0, help="Latency per embedding request")
+    parser.add_argument("--throttle-rate", type=float, default=0.05, help="Fraction of requests throttled")
+    parser.add_argument("--dimension", type=int, default=1536, help="Embedding dimension")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Modes to run")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for throttling")
+    parser.add_argument("--verbose", action="store_true", help="Show reader logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    report = run_benchmark(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
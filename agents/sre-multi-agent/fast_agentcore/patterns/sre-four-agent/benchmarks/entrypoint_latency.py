@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Request latency of the AgentCore entrypoint with and without the agent pool.
+
+Sends incident-analysis prompts through ``sre_agent.agent_stream`` in two
+modes:
+
+- ``fresh``: a new, cold ``AgentPool`` per request, which reproduces building
+  the agents, Bedrock KB readers, boto3 clients and LLM runners on every call
+- ``pooled``: one pool warmed up front, as the app's lifespan does at startup
+
+LLM calls are answered by the latency-injecting fake runner and Bedrock KB
+retrievals by canned results, but the readers' boto3 clients are real, so the
+construction cost being measured is the production one. Short queries are the
+default (no injected LLM latency), which is where per-request setup dominates.
+
+Reports, per mode: time to the first streamed chunk and to the end of the
+response (p50/p99), and for the pooled mode the warmup time and pool health.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.entrypoint_latency --requests 30
+
+    # With model latency and concurrent requests sharing the pool
+    python -m benchmarks.entrypoint_latency --requests 40 --concurrency 4 --llm-latency-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+# Readers build real boto3 clients; retrievals are faked below
+os.environ.setdefault("BEDROCK_KB_ID", "BENCHKB001")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-2")
+os.environ["SRE_AGENT_POOL_WARMUP"] = "lazy"
+os.environ.pop("MEMORY_ID", None)
+
+from benchmarks.orchestrator_throughput import (  # noqa: E402
+    _RESPONSE_BUILDERS,
+    LatencyInjectingLLMRunner,
+    _summarise,
+)
+
+MODES = ("fresh", "pooled")
+
+_PROMPT = "Analyze the payment-processor errors from the last 15 minutes"
+
+
+def _install_fakes(sre_agent: Any, args: argparse.Namespace) -> None:
+    """Answer LLM calls and KB retrievals locally, in the modules sre_agent uses."""
+    llm = sys.modules["orchestration.four_agent.llm"]
+    kb = sys.modules["orchestration.four_agent.bedrock_kb_reader"]
+    rng = random.Random(args.seed)
+    builders = {role.lower(): builder for role, builder in _RESPONSE_BUILDERS.items()}
+
+    def ensure_runner(self):
+        if self._llm_runner is None:
+            role = str(getattr(self._role, "value", self._role)).lower()
+            builder = next(
+                (candidate for stage, candidate in builders.items() if stage in role),
+                _RESPONSE_BUILDERS["analyst"],
+            )
+            self._llm_runner = LatencyInjectingLLMRunner(
+                builder, latency_ms=args.llm_latency_ms, jitter=0.2, rng=rng
+            )
+        return self._llm_runner
+
+    def retrieve(self, query: str, **_: Any) -> Dict[str, Any]:
+        if args.kb_latency_ms:
+            time.sleep(args.kb_latency_ms / 1000.0)
+        return {
+            "retrievalResults": [
+                {
+                    "content": {"text": f"Runbook guidance for: {query}"},
+                    "score": 0.8,
+                    "location": {"s3Location": {"uri": "s3://bench/policies/troubleshooting-runbooks.md"}},
+                }
+            ]
+        }
+
+    llm.BaseLLMAgent._ensure_runner = ensure_runner
+    kb.BedrockKnowledgeBaseReader._retrieve_from_kb = retrieve
+
+
+async def _request(sre_agent: Any) -> Dict[str, float]:
+    """Run one prompt through the entrypoint and time its stream."""
+    payload = {"prompt": _PROMPT, "runtimeSessionId": uuid.uuid4().hex}
+    context = SimpleNamespace(identity=None)
+    started = time.perf_counter()
+    first_chunk_ms: Optional[float] = None
+    error: Optional[str] = None
+    async for chunk in sre_agent.agent_stream(payload, context):
+        if first_chunk_ms is None:
+            first_chunk_ms = (time.perf_counter() - started) * 1000.0
+        if chunk.get("response_metadata", {}).get("stop_reason") == "error":
+            error = chunk["content"][0]["text"]
+    return {
+        "first_chunk_ms": first_chunk_ms or 0.0,
+        "total_ms": (time.perf_counter() - started) * 1000.0,
+        "error": error,
+    }
+
+
+async def run_mode(sre_agent: Any, mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every request in one mode and summarise the timings."""
+    pool_cls = type(sre_agent.agent_pool)
+    warmup_ms = None
+    if mode == "pooled":
+        sre_agent.agent_pool = pool_cls()
+        started = time.perf_counter()
+        await sre_agent.agent_pool.start_warmup()
+        warmup_ms = round((time.perf_counter() - started) * 1000.0, 3)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    results: List[Dict[str, Any]] = []
+
+    async def one() -> None:
+        async with semaphore:
+            if mode == "fresh":
+                # Cold pool per request: every component is built for this call
+                sre_agent.agent_pool = pool_cls()
+            results.append(await _request(sre_agent))
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    wall_s = time.perf_counter() - wall_started
+
+    errors = [result["error"] for result in results if result["error"]]
+    report: Dict[str, Any] = {
+        "requests": len(results),
+        "failed": len(errors),
+        "errors": errors[:3],
+        "wall_seconds": round(wall_s, 3),
+        "first_chunk_ms": _summarise([result["first_chunk_ms"] for result in results]),
+        "total_ms": _summarise([result["total_ms"] for result in results]),
+    }
+    if mode == "pooled":
+        report["warmup_ms"] = warmup_ms
+        report["pool"] = sre_agent.agent_pool.health()
+    return report
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    sink = io.StringIO()
+    stdout = contextlib.redirect_stdout(sink) if not args.verbose else contextlib.nullcontext()
+    if not args.verbose:
+        # Each cold KB reader logs its configuration defaults
+        logging.getLogger("orchestration.four_agent.bedrock_kb_reader").setLevel(logging.ERROR)
+    with stdout:
+        import sre_agent
+
+        _install_fakes(sre_agent, args)
+        modes = {mode: await run_mode(sre_agent, mode, args) for mode in args.modes}
+
+    report: Dict[str, Any] = {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "llm_latency_ms": args.llm_latency_ms,
+            "kb_latency_ms": args.kb_latency_ms,
+        },
+        "modes": modes,
+    }
+    if "fresh" in modes and "pooled" in modes:
+        fresh, pooled = modes["fresh"], modes["pooled"]
+        report["improvement"] = {
+            metric: {
+                "p50_saved_ms": round(fresh[metric]["p50"] - pooled[metric]["p50"], 3),
+                "p50_speedup": round(fresh[metric]["p50"] / pooled[metric]["p50"], 2)
+                if pooled[metric]["p50"] else None,
+            }
+            for metric in ("first_chunk_ms", "total_ms")
+        }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare entrypoint latency with per-request agents and the warm agent pool"
+    )
+    parser.add_argument("--requests", type=int, default=20, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight at once")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Mean injected latency per LLM call")
+    parser.add_argument("--kb-latency-ms", type=float, default=0.0, help="Blocking latency per KB retrieval")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Modes to run")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for latency jitter")
+    parser.add_argument("--verbose", action="store_true", help="Show agent and entrypoint prints")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if args.requests < 1 or args.concurrency < 1:
+        parser.error("--requests and --concurrency must be at least 1")
+
+    report = asyncio.run(run_benchmark(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    failed = sum(mode["failed"] for mode in report["modes"].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Recall and latency of similar-incident search: vector, BM25 and hybrid.
+
+Builds ``VectorRAGKnowledgeReader`` over the bundled runbooks and failure
+patterns, then asks ``get_similar_incidents`` for each incident with a set
+of labelled queries:
+
+- ``paraphrase``: the incident described in other words
+- ``identifier``: exact identifiers (incident ids, error codes, regions)
+- ``filtered``: an ambiguous query narrowed by a metadata pre-filter
+  (service, date range)
+
+in each retrieval mode:
+
+- ``baseline``: the previous search, runbooks-only vector top 10 with
+  incidents taken in chunk order and filters ignored
+- ``vector``: FAISS nearest neighbours only
+- ``lexical``: BM25 only
+- ``hybrid``: both rankings fused with reciprocal-rank fusion
+
+Without ``--bedrock`` the embeddings come from a local stand-in for Titan
+(hashed word and character-trigram counts), so the run needs no AWS
+access; absolute vector-mode numbers are then pessimistic, but the effect
+of fusing in BM25 on identifier queries is the same.
+
+Reports, per mode and query kind: recall@1/3/5 (expected incident within the
+first k returned) and MRR; per mode: per-query latency percentiles and the
+chunk context (tokens estimated at 4 characters each) a prompt needs to
+include the expected incident when chunks are added in ranked order.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.hybrid_retrieval
+
+    # Real Titan embeddings (needs AWS credentials with Bedrock access)
+    python -m benchmarks.hybrid_retrieval --bedrock
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import math
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from src.orchestration.four_agent.vector_rag_reader import (  # noqa: E402
+    BedrockEmbeddings,
+    VectorRAGKnowledgeReader,
+)
+
+MODES = ("baseline", "vector", "lexical", "hybrid")
+RECALL_AT = (1, 3, 5)
+
+POLICIES_DIR = PROJECT_ROOT.parents[2] / "docs" / "policies"
+
+# (kind, query, expected incident, filters)
+QUERIES: List[tuple] = [
+    ("paraphrase", "connections leaking after we upgraded SQLAlchemy to 2.0", "INC-2024-01-15", None),
+    ("paraphrase", "ORM library upgrade broke connection handling", "INC-2024-01-15", None),
+    ("paraphrase", "RDS failover followed by a storm of client reconnect attempts", "INC-2024-02-03", None),
+    ("paraphrase", "terraform change deleted the database security group rule", "INC-2024-03-12", None),
+    ("paraphrase", "payment provider degraded in one region, requests routed to europe", "INC-2024-04-08", None),
+    ("paraphrase", "marketing campaign traffic spike exceeded payment API rate limits", "INC-2024-05-20", None),
+    ("paraphrase", "redis client opened a new connection for every request", "INC-2024-06-15", None),
+    ("paraphrase", "in-process cache with no max size grew to 8GB over three days", "INC-2024-07-22", None),
+    ("paraphrase", "payment service slowly stopped releasing pooled connections", "INC-2024-08-15", None),
+    ("identifier", "INC-2024-06-15", "INC-2024-06-15", None),
+    ("identifier", "INC-2024-03-12 follow-up", "INC-2024-03-12", None),
+    ("identifier", "504 from stripe us-east-1", "INC-2024-04-08", None),
+    ("identifier", "HTTP 429 payment rate limit", "INC-2024-05-20", None),
+    ("identifier", "maxsize=10000 eviction policy", "INC-2024-07-22", None),
+    ("identifier", "SQLAlchemy 2.0", "INC-2024-01-15", None),
+    ("filtered", "connection leak", "INC-2024-06-15", {"service": "memory"}),
+    ("filtered", "connection leak", "INC-2024-08-15", {"since": "2024-08-01"}),
+    ("filtered", "connection storm", "INC-2024-02-03", {"service": "database"}),
+    ("filtered", "traffic spike backoff", "INC-2024-05-20", {"since": "2024-05-01", "until": "2024-05-31"}),
+]
+
+
+class HashedTermRuntime:
+    """bedrock-runtime stand-in returning hashed word and trigram counts."""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def _bucket(self, feature: str) -> int:
+        return int.from_bytes(hashlib.md5(feature.encode("utf-8")).digest()[:4], "big") % self.dimension
+
+    def invoke_model(self, modelId: str, body: str) -> Dict[str, Any]:
+        text = json.loads(body)["inputText"].lower()
+        vector = [0.0] * self.dimension
+        for word in re.findall(r"[a-z0-9]+", text):
+            vector[self._bucket(word)] += 1.0
+            padded = f" {word} "
+            for i in range(len(padded) - 2):
+                vector[self._bucket(padded[i:i + 3])] += 0.5
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        embedding = [value / norm for value in vector]
+        return {"body": io.BytesIO(json.dumps({"embedding": embedding}).encode("utf-8"))}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def baseline_chunks(reader: VectorRAGKnowledgeReader, query: str) -> list:
+    return [doc for doc, _ in reader.runbooks_store.similarity_search_with_score(query, k=10)]
+
+
+def incident_ranking(reader: VectorRAGKnowledgeReader, mode: str, query: str, filters: Optional[dict]) -> List[str]:
+    """Incident ids returned for one query, best first."""
+    if mode == "baseline":
+        # The previous get_similar_incidents: incidents in chunk order
+        ranked: List[str] = []
+        for doc in baseline_chunks(reader, query):
+            for incident_id in re.findall(r"INC-\d{4}-\d{2}-\d{2}", doc.page_content):
+                if incident_id not in ranked:
+                    ranked.append(incident_id)
+        return ranked[:max(RECALL_AT)]
+    incidents = reader.get_similar_incidents([query], filters=filters, limit=max(RECALL_AT))
+    return [incident["incident_id"] for incident in incidents]
+
+
+def chunk_ranking(reader: VectorRAGKnowledgeReader, mode: str, query: str, filters: Optional[dict]) -> list:
+    """Chunks the incident search ranked, best first."""
+    if mode == "baseline":
+        return baseline_chunks(reader, query)
+    return [doc for doc, _ in reader.hybrid_search(query, k=10, filters=dict(filters or {}, incidents_only=True))]
+
+
+def evaluate(reader: VectorRAGKnowledgeReader, mode: str, repeats: int) -> Dict[str, Any]:
+    """Run every labelled query and score the incident rankings."""
+    per_kind: Dict[str, Dict[str, List[float]]] = {}
+    latencies = []
+    context_tokens = []
+    misses = []
+    for kind, query, expected, filters in QUERIES:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            ranked = incident_ranking(reader, mode, query, filters)
+            latencies.append((time.perf_counter() - started) * 1000)
+        docs = chunk_ranking(reader, mode, query, filters)
+        hit = next((i for i, doc in enumerate(docs) if expected in doc.page_content), None)
+        if hit is not None:
+            context_tokens.append(sum(len(doc.page_content) for doc in docs[:hit + 1]) / 4)
+        rank = ranked.index(expected) + 1 if expected in ranked else None
+        scores = per_kind.setdefault(kind, {"rr": [], **{f"recall@{k}": [] for k in RECALL_AT}})
+        scores["rr"].append(1.0 / rank if rank else 0.0)
+        for k in RECALL_AT:
+            scores[f"recall@{k}"].append(1.0 if rank and rank <= k else 0.0)
+        if rank != 1:
+            misses.append({"query": query, "expected": expected, "rank": rank, "got": ranked[:3]})
+
+    def summarise(scores: Dict[str, List[float]]) -> Dict[str, float]:
+        summary = {name: round(statistics.fmean(values), 3) for name, values in scores.items() if name != "rr"}
+        summary["mrr"] = round(statistics.fmean(scores["rr"]), 3)
+        return summary
+
+    overall: Dict[str, List[float]] = {}
+    for scores in per_kind.values():
+        for name, values in scores.items():
+            overall.setdefault(name, []).extend(values)
+    return {
+        "overall": summarise(overall),
+        "by_kind": {kind: summarise(scores) for kind, scores in per_kind.items()},
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+        },
+        "context_tokens_to_hit": {
+            "mean": round(statistics.fmean(context_tokens), 1) if context_tokens else None,
+            "queries_without_hit": len(QUERIES) - len(context_tokens),
+        },
+        "not_first": misses,
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.bedrock:
+        embeddings = BedrockEmbeddings()
+    else:
+        embeddings = BedrockEmbeddings(client=HashedTermRuntime(args.dimension))
+
+    modes: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            # Same cache directory: later modes load the index built by the first
+            reader = VectorRAGKnowledgeReader(
+                runbooks_path=POLICIES_DIR / "troubleshooting-runbooks.md",
+                patterns_path=POLICIES_DIR / "known-failure-patterns.md",
+                cache_dir=tmp,
+                embeddings=embeddings,
+                retrieval_mode="vector" if mode == "baseline" else mode,
+            )
+            modes[mode] = evaluate(reader, mode, args.repeats)
+
+    return {
+        "config": {
+            "embeddings": embeddings.model_id if args.bedrock else f"hashed-terms-{args.dimension}",
+            "queries": len(QUERIES),
+            "repeats": args.repeats,
+        },
+        "modes": modes,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare recall and latency of vector, BM25 and hybrid similar-incident search"
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Modes to run")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--dimension", type=int, default=512, help="Dimension of the local stand-in embeddings")
+    parser.add_argument("--bedrock", action="store_true", help="Use Titan embeddings through Bedrock")
+    parser.add_argument("--verbose", action="store_true", help="Show reader logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    report = run_benchmark(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of the vector index cache: pickle versus mapped files.
+
+The vector stores used to be persisted with LangChain's ``FAISS.save_local``
+and loaded with ``load_local(allow_dangerous_deserialization=True)``, which
+unpickles every chunk's document before the first search. They are now
+written with ``faiss.write_index`` next to a JSON lines docstore, and loaded
+by mapping both files (see ``src.orchestration.four_agent.chunk_docstore``).
+
+For each corpus size this benchmark builds the same synthetic chunks (with
+hash-seeded fake embeddings, so no model is called) in both formats and
+reports:
+
+- ``load_ms``: opening the cache (``load_local`` versus
+  ``IncrementalVectorIndex.load``, which also checks the manifest and the
+  metadata sidecar)
+- ``first_query_ms`` / ``query_ms``: the first search after loading, and the
+  median of the following ones, each returning ``k`` documents
+- ``files_mb``: size of the cache on disk
+
+The files are in the page cache when they are loaded, so the numbers show
+the CPU cost of each format rather than disk reads.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.index_persistence
+
+    # Bigger corpus
+    python -m benchmarks.index_persistence --sizes 10000 100000 300000
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+import faiss  # noqa: E402
+from langchain_community.docstore.in_memory import InMemoryDocstore  # noqa: E402
+from langchain_community.vectorstores import FAISS  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+from src.orchestration.four_agent.vector_index import IncrementalVectorIndex, IndexConfig, chunk_ids  # noqa: E402
+
+POLICIES_DIR = PROJECT_ROOT.parents[2] / "docs" / "policies"
+
+
+class HashEmbeddings(Embeddings):
+    """Deterministic pseudo-random unit vectors seeded by the text's hash."""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def _embed(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def synthetic_chunks(n_chunks: int) -> List[str]:
+    """Runbook paragraphs, numbered so every chunk is distinct."""
+    paragraphs = [
+        paragraph.strip()
+        for paragraph in (POLICIES_DIR / "troubleshooting-runbooks.md").read_text().split("\n\n")
+        if len(paragraph.strip()) > 200
+    ]
+    return [f"[{i}] {paragraphs[i % len(paragraphs)]}" for i in range(n_chunks)]
+
+
+def _files_mb(directory: Path) -> float:
+    return round(sum(path.stat().st_size for path in directory.iterdir() if path.is_file()) / 2**20, 2)
+
+
+def _query_timings(search, queries: List[str]) -> Dict[str, float]:
+    started = time.perf_counter()
+    search(queries[0])
+    first_ms = (time.perf_counter() - started) * 1000
+    timings = []
+    for query in queries[1:]:
+        started = time.perf_counter()
+        search(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"first_query_ms": round(first_ms, 3), "query_ms": round(statistics.median(timings), 3)}
+
+
+def measure_pickle(chunks: List[str], embeddings: HashEmbeddings, queries: List[str], k: int, root: Path) -> Dict[str, Any]:
+    """The previous format: a LangChain FAISS store with an in-memory docstore, pickled."""
+    directory = root / "pickle"
+    ids = chunk_ids("runbooks.md", chunks)
+    index = faiss.IndexIDMap2(faiss.IndexFlatL2(embeddings.dimension))
+    index.add_with_ids(np.asarray(embeddings.embed_documents(chunks), dtype=np.float32), np.arange(len(chunks)))
+    store = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore({
+            chunk_id: Document(
+                page_content=text,
+                metadata={"source": "runbooks.md", "chunk_id": chunk_id, "position": position},
+            )
+            for position, (chunk_id, text) in enumerate(zip(ids, chunks))
+        }),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+    store.save_local(str(directory), index_name="runbooks")
+    del store, index
+
+    started = time.perf_counter()
+    loaded = FAISS.load_local(
+        str(directory), embeddings, index_name="runbooks", allow_dangerous_deserialization=True
+    )
+    load_ms = (time.perf_counter() - started) * 1000
+    return {
+        "load_ms": round(load_ms, 2),
+        **_query_timings(lambda query: loaded.similarity_search_with_score(query, k=k), queries),
+        "files_mb": _files_mb(directory),
+    }
+
+
+def measure_mapped(chunks: List[str], embeddings: HashEmbeddings, queries: List[str], k: int, root: Path) -> Dict[str, Any]:
+    """The current format: mapped FAISS index, JSON lines docstore, manifest and sidecar."""
+    directory = root / "mapped"
+    config = IndexConfig(kind="flat")
+    builder = IncrementalVectorIndex("runbooks", directory, embeddings, config=config)
+    builder.sync("runbooks.md", chunks, source_hash="synthetic")
+    builder.metadata.close()
+    del builder
+
+    index = IncrementalVectorIndex("runbooks", directory, embeddings, config=config)
+    started = time.perf_counter()
+    loaded = index.load()
+    load_ms = (time.perf_counter() - started) * 1000
+    if not loaded:
+        raise RuntimeError("Persisted index did not load")
+    return {
+        "load_ms": round(load_ms, 2),
+        **_query_timings(lambda query: index.similarity_search_with_score(query, k=k), queries),
+        "files_mb": _files_mb(directory),
+        "mapped": index.stats()["mapped"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare pickled and mapped vector index caches")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Chunks per corpus")
+    parser.add_argument("--dimension", type=int, default=256, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=50, help="Searches after loading")
+    parser.add_argument("--k", type=int, default=5, help="Documents per search")
+    parser.add_argument("--verbose", action="store_true", help="Show index logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    embeddings = HashEmbeddings(args.dimension)
+    queries = [f"incident query {i}" for i in range(args.queries + 1)]
+    report: Dict[str, Any] = {"config": {"dimension": args.dimension, "k": args.k}, "sizes": {}}
+    for n_chunks in args.sizes:
+        chunks = synthetic_chunks(n_chunks)
+        with tempfile.TemporaryDirectory() as tmp:
+            pickled = measure_pickle(chunks, embeddings, queries, args.k, Path(tmp))
+            mapped = measure_mapped(chunks, embeddings, queries, args.k, Path(tmp))
+        report["sizes"][str(n_chunks)] = {
+            "pickle": pickled,
+            "mapped": mapped,
+            "load_speedup": round(pickled["load_ms"] / max(mapped["load_ms"], 1e-6), 1),
+        }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Cost of knowledge-base updates with incremental index maintenance.
+
+Builds a ``VectorRAGKnowledgeReader`` over the replicated policy documents
+(see ``benchmarks.embedding_throughput``) against the fake bedrock-runtime
+client, then applies a series of edits to the runbooks and calls
+``refresh()`` after each:
+
+- ``noop``: nothing changed
+- ``edit``: one line appended to one section
+- ``insert``: a paragraph inserted at the top, shifting every chunk below it
+- ``delete``: one section removed
+- ``append``: a new section added at the end
+
+Each refresh is compared with what an edit used to cost: discarding the index
+and embedding every chunk again (``full_rebuild``). After the last edit the
+incrementally maintained index is checked against an index built from
+scratch: both must return the same chunks for a set of queries.
+
+Reports, per edit: refresh seconds, chunks added/removed/moved and embedding
+requests, against the time of one full serial rebuild of the final corpus.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.index_refresh
+
+    # Bigger corpus, slower embeddings
+    python -m benchmarks.index_refresh --copies 8 --latency-ms 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from benchmarks.embedding_throughput import (  # noqa: E402
+    POLICIES_DIR,
+    FakeBedrockRuntime,
+    SerialEmbeddings,
+    edit_one_section,
+    write_corpus,
+)
+from src.orchestration.four_agent.embedding_cache import EmbeddingCache  # noqa: E402
+from src.orchestration.four_agent.vector_rag_reader import (  # noqa: E402
+    BedrockEmbeddings,
+    VectorRAGKnowledgeReader,
+)
+
+_QUERIES = (
+    "database connection pool exhausted",
+    "payment gateway timeout",
+    "rollback a failed deployment",
+    "high memory usage on pods",
+    "HTTP 503 upstream overloaded",
+)
+
+
+def insert_paragraph(path: Path) -> None:
+    path.write_text(
+        "Read the escalation matrix before paging a second on-call engineer.\n\n" + path.read_text()
+    )
+
+
+def delete_section(path: Path) -> None:
+    content = path.read_text()
+    first = content.index("\n## ")
+    second = content.index("\n## ", first + 1)
+    path.write_text(content[:first] + content[second:])
+
+
+def append_section(path: Path) -> None:
+    path.write_text(
+        path.read_text()
+        + "\n\n## Cache stampede\n\nSymptoms: sudden spike of identical cache misses after a"
+        " deploy or TTL expiry.\n\nMitigation: enable request coalescing and stagger TTLs.\n"
+    )
+
+
+EDITS: Dict[str, Callable[[Path], None]] = {
+    "noop": lambda path: None,
+    "edit": edit_one_section,
+    "insert": insert_paragraph,
+    "delete": delete_section,
+    "append": append_section,
+}
+
+
+def _reader(corpus: Dict[str, Path], index_dir: Path, embeddings: BedrockEmbeddings) -> VectorRAGKnowledgeReader:
+    return VectorRAGKnowledgeReader(
+        runbooks_path=corpus["troubleshooting-runbooks.md"],
+        patterns_path=corpus["known-failure-patterns.md"],
+        cache_dir=index_dir,
+        embeddings=embeddings,
+    )
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        corpus = write_corpus(root, args.copies)
+        runbooks = corpus["troubleshooting-runbooks.md"]
+
+        def client() -> FakeBedrockRuntime:
+            return FakeBedrockRuntime(args.latency_ms, 0.0, args.dimension, args.seed)
+
+        embeddings = BedrockEmbeddings(
+            max_concurrency=args.concurrency, cache=EmbeddingCache(root / "embeddings"), client=client()
+        )
+        started = time.perf_counter()
+        reader = _reader(corpus, root / "index", embeddings)
+        initial_build_s = time.perf_counter() - started
+
+        edits: Dict[str, Any] = {}
+        for name in args.edits:
+            EDITS[name](runbooks)
+            before = embeddings.stats()["api_requests"]
+            started = time.perf_counter()
+            reports = reader.refresh()
+            refresh_s = time.perf_counter() - started
+            report = reports.get(runbooks.name)
+            edits[name] = {
+                "refresh_seconds": round(refresh_s, 4),
+                "added": report.added if report else 0,
+                "removed": report.removed if report else 0,
+                "moved": report.moved if report else 0,
+                "unchanged": report.unchanged if report else None,
+                "compacted": report.compacted if report else False,
+                "embedding_requests": embeddings.stats()["api_requests"] - before,
+            }
+
+        # What any edit used to cost: the whole index rebuilt, every chunk embedded
+        full = SerialEmbeddings(cache=None, client=client())
+        started = time.perf_counter()
+        _reader(corpus, root / "full", full)
+        full_s = time.perf_counter() - started
+        for result in edits.values():
+            result["speedup_vs_full_rebuild"] = round(full_s / max(result["refresh_seconds"], 1e-6), 1)
+
+        # The incrementally maintained index must answer like a fresh one
+        fresh = _reader(corpus, root / "fresh", BedrockEmbeddings(
+            max_concurrency=args.concurrency, cache=EmbeddingCache(root / "embeddings"), client=client()
+        ))
+        mismatches = []
+        for query in _QUERIES:
+            for store_name in ("runbooks_store", "patterns_store"):
+                got = [doc.page_content for doc, _ in getattr(reader, store_name).similarity_search_with_score(query, k=5)]
+                want = [doc.page_content for doc, _ in getattr(fresh, store_name).similarity_search_with_score(query, k=5)]
+                if got != want:
+                    mismatches.append({"query": query, "store": store_name})
+
+        reader.compact()
+        compacted_ok = all(
+            [doc.page_content for doc, _ in reader.runbooks_store.similarity_search_with_score(query, k=5)]
+            == [doc.page_content for doc, _ in fresh.runbooks_store.similarity_search_with_score(query, k=5)]
+            for query in _QUERIES
+        )
+
+        return {
+            "config": {
+                "copies": args.copies,
+                "concurrency": args.concurrency,
+                "latency_ms": args.latency_ms,
+                "dimension": args.dimension,
+            },
+            "initial_build_seconds": round(initial_build_s, 3),
+            "full_rebuild": {"seconds": round(full_s, 3), "embedding_requests": full.stats()["api_requests"]},
+            "runbooks_index": {
+                key: value for key, value in reader.runbooks_index.stats().items() if key != "sources"
+            },
+            "edits": edits,
+            "search_mismatches": mismatches,
+            "search_matches_after_compaction": compacted_ok,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure incremental vector index refreshes after KB edits")
+    parser.add_argument("--copies", type=int, default=4, help="Copies of the policy documents in the corpus")
+    parser.add_argument("--concurrency", type=int, default=8, help="Embedding requests in flight")
+    parser.add_argument("--latency-ms", type=float, default=60.0, help="Latency per embedding request")
+    parser.add_argument("--dimension", type=int, default=1536, help="Embedding dimension")
+    parser.add_argument("--edits", nargs="+", choices=list(EDITS), default=list(EDITS), help="Edits to apply, in order")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the fake client")
+    parser.add_argument("--verbose", action="store_true", help="Show reader logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    report = run_benchmark(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    ok = not report["search_mismatches"] and report["search_matches_after_compaction"]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
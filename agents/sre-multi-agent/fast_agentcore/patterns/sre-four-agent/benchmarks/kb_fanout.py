@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Prompt-preparation latency of the RCA, impact and mitigation agents with
+concurrent knowledge-base lookups.
+
+Each agent needs several KB lookups before it can prompt the LLM (RCA four
+reader calls, impact and mitigation three semantic queries). This benchmark
+builds each agent's user prompt for one incident against a
+``BedrockKnowledgeBaseReader`` whose retrieve API is a local stand-in with
+request latency (see ``benchmarks.query_cache``), with the query cache
+disabled so every lookup pays the round-trip, in two ways:
+
+- ``sequential``: ``_build_user_prompt`` looks everything up itself, one
+  query after another, on the event loop (the previous behaviour)
+- ``fanout``: ``_retrieve_knowledge`` runs the lookups concurrently in
+  worker threads (``retrieve_many`` / ``gather_lookups``), then the prompt
+  is built from the result
+
+Reports, per agent and mode: wall time to a finished prompt, the longest
+event-loop stall while it ran, retrieve calls, and the prompt size in tokens
+(estimated at 4 characters each; merged results list each chunk once).
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.kb_fanout
+
+    # Slower KB
+    python -m benchmarks.kb_fanout --latency-ms 400 --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from benchmarks.query_cache import DOCUMENTS, POLICIES_DIR, FakeAgentRuntime  # noqa: E402
+from src.orchestration.four_agent.bedrock_kb_reader import (  # noqa: E402
+    BedrockKnowledgeBaseReader,
+    clear_kb_retrievals,
+)
+from src.orchestration.four_agent.impact_agent import ImpactAgent  # noqa: E402
+from src.orchestration.four_agent.mitigation_agent import MitigationCommsAgent  # noqa: E402
+from src.orchestration.four_agent.query_cache import QueryResultCache  # noqa: E402
+from src.orchestration.four_agent.rca_agent import RCAAgent  # noqa: E402
+from src.orchestration.four_agent.schema import (  # noqa: E402
+    AgentMessage,
+    AgentRole,
+    MessageType,
+    PayloadModel,
+    Severity,
+)
+from src.orchestration.four_agent.state import IncidentState  # noqa: E402
+
+AGENTS = ("rca", "impact", "mitigation")
+MODES = ("sequential", "fanout")
+AGENT_ROLES = {"rca": "RCA", "impact": "Impact", "mitigation": "Mitigation"}
+
+_SIGNALS = {
+    "anomalies": [{"pattern": "SQLSTATE[08006] connection failure in payment-service"}],
+    "error_patterns": ["database connection pool exhausted", "HTTP 503 upstream overloaded"],
+}
+
+
+def _incoming(agent: str) -> AgentMessage:
+    details: Dict[str, Any] = {
+        "signals": _SIGNALS,
+        "monitoring": {"metrics": {"tps": 45.0, "error_rate": 0.12}},
+        "rca": {"top_hypothesis": "Connection pool exhaustion"},
+        "intent": "plan",
+    }
+    return AgentMessage(
+        incident_id="INC-BENCH-0001",
+        **{"from": AgentRole.ORCHESTRATOR, "to": AgentRole(AGENT_ROLES[agent])},
+        type=MessageType.REQUEST,
+        severity=Severity.SEV_1,
+        payload=PayloadModel(details=details),
+    )
+
+
+async def _max_loop_stall(task: "asyncio.Future[Any]", interval_s: float = 0.005) -> float:
+    """Longest delay, in ms, with which the loop woke a ticker while *task* ran."""
+    loop = asyncio.get_running_loop()
+    worst = 0.0
+    while not task.done():
+        expected = loop.time() + interval_s
+        await asyncio.sleep(interval_s)
+        worst = max(worst, loop.time() - expected)
+    return worst * 1000.0
+
+
+async def _prepare(agent: Any, mode: str, incoming: AgentMessage, state: IncidentState) -> str:
+    if mode == "sequential":
+        return agent._build_user_prompt(incoming, state)
+    knowledge = await agent._retrieve_knowledge(incoming, state)
+    return agent._build_user_prompt(incoming, state, knowledge)
+
+
+async def measure(agent: Any, runtime: FakeAgentRuntime, agent_name: str, mode: str, repeats: int) -> Dict[str, Any]:
+    state = IncidentState(incident_id="INC-BENCH-0001", severity=Severity.SEV_1)
+    incoming = _incoming(agent_name)
+    wall_ms, stalls, calls = [], [], []
+    prompt = ""
+    for _ in range(repeats):
+        before = runtime.calls
+        started = time.perf_counter()
+        task = asyncio.ensure_future(_prepare(agent, mode, incoming, state))
+        stall = await _max_loop_stall(task)
+        prompt = await task
+        wall_ms.append((time.perf_counter() - started) * 1000)
+        stalls.append(stall)
+        calls.append(runtime.calls - before)
+    return {
+        "wall_ms": round(statistics.median(wall_ms), 1),
+        "max_loop_stall_ms": round(max(stalls), 1),
+        "retrieve_calls": calls[-1],
+        "prompt_tokens": len(prompt) // 4,
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for name in DOCUMENTS:
+            shutil.copy(POLICIES_DIR / name, root / name)
+        reader = BedrockKnowledgeBaseReader(
+            knowledge_base_id="BENCHMARK", region_name="us-west-2", cache=QueryResultCache(ttl_seconds=0)
+        )
+        runtime = FakeAgentRuntime(root, args.latency_ms)
+        reader.client = runtime
+        agents = {
+            "rca": RCAAgent(kb_reader=reader),
+            "impact": ImpactAgent(kb_reader=reader),
+            "mitigation": MitigationCommsAgent(kb_reader=reader),
+        }
+        clear_kb_retrievals()
+        for agent_name in args.agents:
+            per_mode = {
+                mode: await measure(agents[agent_name], runtime, agent_name, mode, args.repeats)
+                for mode in MODES
+            }
+            per_mode["speedup"] = round(
+                per_mode["sequential"]["wall_ms"] / max(per_mode["fanout"]["wall_ms"], 1e-6), 1
+            )
+            results[agent_name] = per_mode
+    return {
+        "config": {"latency_ms": args.latency_ms, "repeats": args.repeats},
+        "agents": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure agent prompt preparation with concurrent KB lookups")
+    parser.add_argument("--agents", nargs="+", choices=AGENTS, default=list(AGENTS), help="Agents to run")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Latency per KB retrieve request")
+    parser.add_argument("--repeats", type=int, default=3, help="Prompts built per agent and mode")
+    parser.add_argument("--verbose", action="store_true", help="Show reader logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    report = asyncio.run(run_benchmark(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
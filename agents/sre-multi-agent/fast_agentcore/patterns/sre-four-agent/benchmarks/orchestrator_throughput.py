@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the PhaseTwoOrchestrator.
+
+Drives ``PhaseTwoOrchestrator.run`` for many incidents at a fixed concurrency
+with a latency-injecting fake LLM runner and in-memory knowledge readers, so
+that everything measured apart from the injected sleeps is orchestration
+overhead: LangGraph scheduling, pydantic (de)serialisation, transcript writes,
+``emit_event`` and state broadcasts.
+
+Reports:
+    - throughput (incidents/minute) and end-to-end latency p50/p99
+    - event-loop lag (p50/p99/max) sampled while incidents run
+    - CPU time per stage (analyst, rca, impact, mitigation, broadcast) and the
+      remaining orchestrator CPU per incident
+
+No AWS credentials or network access are needed, which makes the benchmark
+suitable for CI. Threshold flags turn it into a regression gate: the process
+exits with status 1 when a threshold is breached.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.orchestrator_throughput --incidents 50 --concurrency 10
+
+    # CI gate on orchestration overhead
+    python -m benchmarks.orchestrator_throughput --incidents 40 --concurrency 8 \\
+        --llm-latency-ms 50 --max-cpu-ms-per-incident 150 --max-loop-lag-p99-ms 50 \\
+        --output benchmark.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from src.orchestration.four_agent.analyst_agent import AnalystAgent  # noqa: E402
+from src.orchestration.four_agent.impact_agent import ImpactAgent  # noqa: E402
+from src.orchestration.four_agent.llm import LLMRequest, LLMResult  # noqa: E402
+from src.orchestration.four_agent.mitigation_agent import MitigationCommsAgent  # noqa: E402
+from src.orchestration.four_agent.orchestrator import PhaseTwoOrchestrator  # noqa: E402
+from src.orchestration.four_agent.rca_agent import RCAAgent  # noqa: E402
+from src.orchestration.four_agent.scenario_loader import ScenarioSnapshot  # noqa: E402
+from src.orchestration.four_agent.structured_output import validate_against_schema  # noqa: E402
+from src.orchestration.four_agent.summary import SummaryExporter  # noqa: E402
+from src.orchestration.four_agent.transcript import TranscriptLogger  # noqa: E402
+
+STAGES = ("analyst", "rca", "impact", "mitigation")
+
+
+# ----------------------------------------------------------------------
+# CPU accounting
+# ----------------------------------------------------------------------
+class _CpuSegment:
+    """Accumulates thread CPU time for one agent call, excluding awaits on the fake LLM."""
+
+    def __init__(self) -> None:
+        self.cpu_s = 0.0
+        self._mark: Optional[float] = time.thread_time()
+
+    def pause(self) -> None:
+        if self._mark is not None:
+            self.cpu_s += time.thread_time() - self._mark
+            self._mark = None
+
+    def resume(self) -> None:
+        self._mark = time.thread_time()
+
+
+# The segment of the agent call currently running in this task, if any
+_CURRENT_SEGMENT: ContextVar[Optional[_CpuSegment]] = ContextVar(
+    "_CURRENT_SEGMENT", default=None
+)
+
+
+@dataclass
+class _StageStats:
+    cpu_ms: Dict[str, List[float]] = field(
+        default_factory=lambda: {stage: [] for stage in (*STAGES, "broadcast")}
+    )
+    llm_wait_ms: List[float] = field(default_factory=list)
+
+
+class _TimedAgent:
+    """ConversationAgent wrapper that records per-stage CPU and simulates a broadcast."""
+
+    def __init__(
+        self,
+        stage: str,
+        agent: Any,
+        stats: _StageStats,
+        broadcast: Optional[Callable[[str], None]],
+    ) -> None:
+        self.name = getattr(agent, "name", stage)
+        self._stage = stage
+        self._agent = agent
+        self._stats = stats
+        self._broadcast = broadcast
+
+    async def handle(self, incoming, state):
+        segment = _CpuSegment()
+        token = _CURRENT_SEGMENT.set(segment)
+        try:
+            response = await self._agent.handle(incoming, state)
+        finally:
+            _CURRENT_SEGMENT.reset(token)
+            segment.pause()
+        self._stats.cpu_ms[self._stage].append(segment.cpu_s * 1000.0)
+
+        if response is not None and self._broadcast is not None:
+            started = time.thread_time()
+            # Mirror demo_app: each agent result is serialised once per client broadcast
+            self._broadcast(
+                json.dumps(
+                    {
+                        "type": "agent_completed",
+                        "agent": self._stage,
+                        "message": response.model_dump(mode="json", by_alias=True),
+                    }
+                )
+            )
+            self._stats.cpu_ms["broadcast"].append(
+                (time.thread_time() - started) * 1000.0
+            )
+        return response
+
+
+# ----------------------------------------------------------------------
+# Fakes
+# ----------------------------------------------------------------------
+def _analyst_response(request: LLMRequest) -> Dict[str, Any]:
+    return {
+        "summary": "HIGH severity: payment-processor error spike with DB connection timeouts",
+        "details": {
+            "severity_score": 0.82,
+            "anomaly_confidence": 0.9,
+            "detected_patterns": {
+                "error_spike": {"service": "payment-processor", "rate": 0.37},
+                "latency_regression": {"service": "db-proxy", "p99_ms": 4200},
+            },
+            "severity_indicators": ["DB_CONN_TIMEOUT", "HTTP_503"],
+            "initial_hypothesis": "Database connection pool exhaustion",
+            "recommended_action": "Escalate to RCA",
+        },
+    }
+
+
+def _rca_response(request: LLMRequest) -> Dict[str, Any]:
+    return {
+        "summary": "Connection pool exhaustion on payments-db after config rollout",
+        "details": {
+            "ranked_hypotheses": [
+                {
+                    "hypothesis": "payments-db connection pool exhausted",
+                    "confidence": 0.78,
+                    "evidence": ["DB_CONN_TIMEOUT x412", "pool_active=200/200"],
+                },
+                {
+                    "hypothesis": "Upstream issuer latency",
+                    "confidence": 0.15,
+                    "evidence": ["issuer p99 2.1s"],
+                },
+            ],
+            "affected_components": ["payment-processor", "payments-db"],
+        },
+    }
+
+
+def _impact_response(request: LLMRequest) -> Dict[str, Any]:
+    return {
+        "summary": "Approx. $4.2k/min revenue at risk; SLA breach in 12 minutes",
+        "details": {
+            "estimated_revenue_loss_per_min": 4200.0,
+            "affected_customers_pct": 18.5,
+            "approvals": {"baseline": 0.97, "current": 0.79, "delta": -0.18},
+            "sla_breach_eta_minutes": 12,
+        },
+        "evidence": [{"title": "Baseline approval rate", "summary": "97% over 7d"}],
+    }
+
+
+def _mitigation_response(request: LLMRequest) -> Dict[str, Any]:
+    return {
+        "message_type": "plan",
+        "summary": "Scale payments-db pool and roll back connection config",
+        "details": {
+            "plan_id": "PLAN-BENCH-primary",
+            "revision": 0,
+            "steps": [
+                {"action": "kubectl rollout undo deployment/payment-processor-api -n production"},
+                {"action": "Raise payments-db max_connections from 200 to 400"},
+                {"action": "Monitor TPS recovery to 95+ within 5 minutes"},
+            ],
+            "approvals_required": ["incident_commander"],
+            "communications": {
+                "internal": "Payments degraded; mitigation in progress.",
+                "external": "Some card payments may fail; we are working on a fix.",
+            },
+        },
+    }
+
+
+_RESPONSE_BUILDERS: Mapping[str, Callable[[LLMRequest], Dict[str, Any]]] = {
+    "analyst": _analyst_response,
+    "rca": _rca_response,
+    "impact": _impact_response,
+    "mitigation": _mitigation_response,
+}
+
+
+class LatencyInjectingLLMRunner:
+    """LLMRunner that answers with canned JSON after a simulated model latency.
+
+    Latency is split into time-to-first-token followed by evenly spaced stream
+    chunks, so streaming callbacks run with the same interleaving they see
+    against a real model. The sleeps never consume CPU, which is what lets the
+    benchmark attribute all measured CPU to orchestration.
+    """
+
+    def __init__(
+        self,
+        builder: Callable[[LLMRequest], Mapping[str, Any]],
+        *,
+        latency_ms: float,
+        jitter: float = 0.2,
+        chunk_chars: int = 64,
+        rng: Optional[random.Random] = None,
+        stats: Optional[_StageStats] = None,
+    ) -> None:
+        self._builder = builder
+        self._latency_ms = latency_ms
+        self._jitter = jitter
+        self._chunk_chars = max(1, chunk_chars)
+        self._rng = rng or random.Random()
+        self._stats = stats
+
+    async def _sleep(self, seconds: float) -> None:
+        segment = _CURRENT_SEGMENT.get()
+        if segment is not None:
+            segment.pause()
+        await asyncio.sleep(seconds)
+        if segment is not None:
+            segment.resume()
+
+    async def run(
+        self,
+        request: LLMRequest,
+        *,
+        stream: Optional[Callable[[str], None]] = None,
+    ) -> LLMResult:
+        data = self._builder(request)
+        if request.response_schema is not None:
+            validate_against_schema(data, request.response_schema)
+        text = json.dumps(data)
+
+        jitter = self._rng.uniform(-self._jitter, self._jitter)
+        total_s = max(self._latency_ms * (1.0 + jitter), 0.0) / 1000.0
+        if self._stats is not None:
+            self._stats.llm_wait_ms.append(total_s * 1000.0)
+
+        if request.stream and stream is not None:
+            chunks = [
+                text[i:i + self._chunk_chars]
+                for i in range(0, len(text), self._chunk_chars)
+            ]
+            first_token_s = total_s * 0.3
+            per_chunk_s = (total_s - first_token_s) / max(len(chunks), 1)
+            await self._sleep(first_token_s)
+            for chunk in chunks:
+                stream(chunk)
+                await self._sleep(per_chunk_s)
+        else:
+            await self._sleep(total_s)
+
+        return LLMResult(
+            text=text,
+            usage={"mode": "benchmark"},
+            structured=data if request.response_schema is not None else None,
+        )
+
+
+class FakeKnowledgeReader:
+    """In-memory stand-in for the RCA, business-metrics, policy and Bedrock KB readers.
+
+    Lookups are synchronous, like the real readers, and can block for
+    ``latency_ms`` to model retrieval cost paid on the event loop.
+    """
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self._latency_s = latency_ms / 1000.0
+
+    def _block(self) -> None:
+        if self._latency_s:
+            time.sleep(self._latency_s)
+
+    # RCAKnowledgeReader / BedrockKnowledgeBaseReader
+    def get_troubleshooting_steps(self, error_pattern: str) -> Dict[str, Any]:
+        self._block()
+        return {
+            "error_pattern": error_pattern,
+            "steps": ["Check pool saturation", "Inspect recent config changes"],
+        }
+
+    def get_failure_pattern(self, service_or_symptom: str) -> Dict[str, Any]:
+        self._block()
+        return {"service": service_or_symptom, "pattern": "Connection pool exhaustion"}
+
+    def get_similar_incidents(self, symptoms: List[str]) -> List[Dict[str, Any]]:
+        self._block()
+        return [{"incident_id": "INC-2024-0412", "root_cause": "Pool misconfiguration"}]
+
+    def get_error_code_guidance(self, error_code: str) -> Dict[str, Any]:
+        self._block()
+        return {"error_code": error_code, "guidance": "Scale the pool or shed load"}
+
+    # BusinessMetricsReader
+    def get_baseline_metrics(self, severity) -> Dict[str, float]:
+        self._block()
+        return {"tps": 100.0, "approval_rate": 0.97, "revenue_per_min": 23000.0}
+
+    def get_revenue_formulas(self) -> Dict[str, str]:
+        self._block()
+        return {"revenue_loss_per_min": "tps_drop * avg_ticket * 60"}
+
+    def get_sla_thresholds(self, severity) -> Dict[str, Any]:
+        self._block()
+        return {"availability": 0.999, "p99_latency_ms": 800}
+
+    # PolicyReader
+    def get_severity_procedures(self, severity) -> str:
+        self._block()
+        return "Page the incident commander and open a bridge within 5 minutes."
+
+    def get_approval_requirements(self, severity) -> str:
+        self._block()
+        return "Incident commander approval required for production changes."
+
+    # BedrockKnowledgeBaseReader semantic search
+    def search_by_semantic_query(self, query: str, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        self._block()
+        return [
+            {"content": f"Playbook excerpt for: {query}", "score": 0.81},
+            {"content": "Escalate per POL-SRE-004 section 3.", "score": 0.74},
+        ]
+
+
+# ----------------------------------------------------------------------
+# Benchmark driver
+# ----------------------------------------------------------------------
+@dataclass
+class BenchmarkConfig:
+    """Knobs for a benchmark run."""
+    incidents: int = 20
+    concurrency: int = 5
+    llm_latency_ms: float = 100.0
+    llm_jitter: float = 0.2
+    stream_chunk_chars: int = 64
+    kb_latency_ms: float = 0.0
+    transcripts: bool = True
+    broadcast_clients: int = 1
+    structured_output: bool = False
+    seed: int = 7
+    quiet: bool = True
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _summarise(values: List[float]) -> Dict[str, float]:
+    return {
+        "mean": round(statistics.fmean(values), 3) if values else 0.0,
+        "p50": round(_percentile(values, 50), 3),
+        "p99": round(_percentile(values, 99), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+async def _sample_loop_lag(interval_s: float, samples: List[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval_s
+        await asyncio.sleep(interval_s)
+        samples.append(max(loop.time() - expected, 0.0) * 1000.0)
+
+
+def _build_agents(config: BenchmarkConfig, stats: _StageStats) -> Dict[str, Any]:
+    """Create the four agents once and swap in the fake runner and readers."""
+    rng = random.Random(config.seed)
+    reader = FakeKnowledgeReader(latency_ms=config.kb_latency_ms)
+
+    agents = {
+        "analyst": AnalystAgent(),
+        "rca": RCAAgent(),
+        "impact": ImpactAgent(),
+        "mitigation": MitigationCommsAgent(),
+    }
+    agents["rca"]._rca_knowledge_reader = reader
+    agents["impact"]._business_metrics_reader = reader
+    agents["mitigation"]._kb_reader = reader
+    agents["mitigation"]._policy_reader = reader
+
+    for stage, agent in agents.items():
+        agent._structured_output = config.structured_output
+        agent.set_llm_runner(
+            LatencyInjectingLLMRunner(
+                _RESPONSE_BUILDERS[stage],
+                latency_ms=config.llm_latency_ms,
+                jitter=config.llm_jitter,
+                chunk_chars=config.stream_chunk_chars,
+                rng=rng,
+                stats=stats,
+            )
+        )
+    return agents
+
+
+async def run_benchmark(config: BenchmarkConfig) -> Dict[str, Any]:
+    """Run the benchmark and return the report as a dictionary."""
+    if config.incidents < 1 or config.concurrency < 1:
+        raise ValueError("incidents and concurrency must be at least 1")
+
+    stats = _StageStats()
+    sink = io.StringIO()
+    stdout = contextlib.redirect_stdout(sink) if config.quiet else contextlib.nullcontext()
+
+    with tempfile.TemporaryDirectory(prefix="sre-bench-") as workdir, stdout:
+        agents = _build_agents(config, stats)
+
+        def broadcast(text: str) -> None:
+            # One encode per connected client, as demo_app's broadcast loop does
+            for _ in range(config.broadcast_clients):
+                text.encode("utf-8")
+
+        timed = {
+            stage: _TimedAgent(
+                stage, agent, stats, broadcast if config.broadcast_clients > 0 else None
+            )
+            for stage, agent in agents.items()
+        }
+        transcript_logger = TranscriptLogger(Path(workdir) / "transcripts") if config.transcripts else None
+        summary_exporter = SummaryExporter(Path(workdir) / "summaries") if config.transcripts else None
+
+        latencies_ms: List[float] = []
+        failures: List[str] = []
+        semaphore = asyncio.Semaphore(config.concurrency)
+
+        async def run_incident(index: int) -> None:
+            async with semaphore:
+                snapshot = ScenarioSnapshot.create_basic_scenario(
+                    "sev2", {"benchmark_incident": index}
+                )
+                orchestrator = PhaseTwoOrchestrator(
+                    analyst_agent=timed["analyst"],
+                    rca_agent=timed["rca"],
+                    impact_agent=timed["impact"],
+                    mitigation_agent=timed["mitigation"],
+                    transcript_logger=transcript_logger,
+                    summary_exporter=summary_exporter,
+                    incident_id=snapshot.incident_id,
+                )
+                started = time.perf_counter()
+                try:
+                    await orchestrator.run(snapshot)
+                except Exception as exc:  # noqa: BLE001 - reported, not raised
+                    failures.append(f"{type(exc).__name__}: {exc}")
+                    return
+                latencies_ms.append((time.perf_counter() - started) * 1000.0)
+
+        lag_samples: List[float] = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_loop_lag(0.005, lag_samples, stop))
+
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        await asyncio.gather(*(run_incident(i) for i in range(config.incidents)))
+        wall_s = time.perf_counter() - wall_started
+        cpu_s = time.process_time() - cpu_started
+
+        stop.set()
+        await sampler
+
+    completed = len(latencies_ms)
+    stage_cpu = {
+        stage: _summarise(values) for stage, values in stats.cpu_ms.items()
+    }
+    accounted_ms = sum(sum(values) for values in stats.cpu_ms.values())
+    total_cpu_ms = cpu_s * 1000.0
+    injected_per_incident = (
+        sum(stats.llm_wait_ms) / completed if completed else 0.0
+    )
+
+    return {
+        "config": {
+            "incidents": config.incidents,
+            "concurrency": config.concurrency,
+            "llm_latency_ms": config.llm_latency_ms,
+            "llm_jitter": config.llm_jitter,
+            "stream_chunk_chars": config.stream_chunk_chars,
+            "kb_latency_ms": config.kb_latency_ms,
+            "transcripts": config.transcripts,
+            "broadcast_clients": config.broadcast_clients,
+            "structured_output": config.structured_output,
+        },
+        "completed": completed,
+        "failed": len(failures),
+        "errors": failures[:5],
+        "wall_seconds": round(wall_s, 3),
+        "throughput_per_minute": round(completed / wall_s * 60.0, 2) if wall_s else 0.0,
+        "latency_ms": _summarise(latencies_ms),
+        "injected_llm_ms_per_incident": round(injected_per_incident, 3),
+        "event_loop_lag_ms": _summarise(lag_samples),
+        "cpu_ms": {
+            "total": round(total_cpu_ms, 3),
+            "per_incident": round(total_cpu_ms / completed, 3) if completed else 0.0,
+            "stages": stage_cpu,
+            # LangGraph scheduling, request building, transcripts, emit_event, summaries
+            "orchestrator_per_incident": round(
+                max(total_cpu_ms - accounted_ms, 0.0) / completed, 3
+            ) if completed else 0.0,
+        },
+    }
+
+
+def _check_thresholds(report: Mapping[str, Any], args: argparse.Namespace) -> List[str]:
+    breaches = []
+    if report["failed"]:
+        breaches.append(f"{report['failed']} incident(s) failed: {report['errors']}")
+    if args.max_cpu_ms_per_incident is not None and report["cpu_ms"]["per_incident"] > args.max_cpu_ms_per_incident:
+        breaches.append(
+            f"CPU per incident {report['cpu_ms']['per_incident']}ms > {args.max_cpu_ms_per_incident}ms"
+        )
+    if args.max_loop_lag_p99_ms is not None and report["event_loop_lag_ms"]["p99"] > args.max_loop_lag_p99_ms:
+        breaches.append(
+            f"event-loop lag p99 {report['event_loop_lag_ms']['p99']}ms > {args.max_loop_lag_p99_ms}ms"
+        )
+    if args.min_throughput is not None and report["throughput_per_minute"] < args.min_throughput:
+        breaches.append(
+            f"throughput {report['throughput_per_minute']}/min < {args.min_throughput}/min"
+        )
+    return breaches
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark PhaseTwoOrchestrator throughput with a fake LLM"
+    )
+    parser.add_argument("--incidents", type=int, default=20, help="Total incidents to run")
+    parser.add_argument("--concurrency", type=int, default=5, help="Incidents in flight at once")
+    parser.add_argument("--llm-latency-ms", type=float, default=100.0, help="Mean injected latency per LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="Relative latency jitter (0.2 = +/-20%%)")
+    parser.add_argument("--stream-chunk-chars", type=int, default=64, help="Characters per streamed chunk")
+    parser.add_argument("--kb-latency-ms", type=float, default=0.0, help="Blocking latency per knowledge lookup")
+    parser.add_argument("--no-transcripts", action="store_true", help="Disable transcript and summary writes")
+    parser.add_argument("--broadcast-clients", type=int, default=1, help="Simulated WebSocket clients (0 disables)")
+    parser.add_argument("--structured-output", action="store_true", help="Request schema-validated responses")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for latency jitter")
+    parser.add_argument("--verbose", action="store_true", help="Show agent and orchestrator prints")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    parser.add_argument("--max-cpu-ms-per-incident", type=float, help="Fail if total CPU per incident exceeds this")
+    parser.add_argument("--max-loop-lag-p99-ms", type=float, help="Fail if event-loop lag p99 exceeds this")
+    parser.add_argument("--min-throughput", type=float, help="Fail if incidents/minute falls below this")
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(
+        incidents=args.incidents,
+        concurrency=args.concurrency,
+        llm_latency_ms=args.llm_latency_ms,
+        llm_jitter=args.llm_jitter,
+        stream_chunk_chars=args.stream_chunk_chars,
+        kb_latency_ms=args.kb_latency_ms,
+        transcripts=not args.no_transcripts,
+        broadcast_clients=args.broadcast_clients,
+        structured_output=args.structured_output,
+        seed=args.seed,
+        quiet=not args.verbose,
+    )
+    report = asyncio.run(run_benchmark(config))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+    breaches = _check_thresholds(report, args)
+    for breach in breaches:
+        print(f"❌ {breach}", file=sys.stderr)
+    return 1 if breaches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
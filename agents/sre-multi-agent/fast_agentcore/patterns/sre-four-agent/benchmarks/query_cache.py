@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Knowledge-base lookups saved by the query result cache during an incident.
+
+Replays the lookups the analysis agents make over the windows of one
+sustained incident: each window asks for troubleshooting steps, failure
+patterns, error-code guidance and similar incidents, mostly in the same or
+slightly reworded form as the windows before (reordered words, different
+case, a filler word), with a new symptom showing up now and then. Midway
+the knowledge base is synced, which must drop every cached result.
+
+Each workload runs twice against the same documents, with the cache
+disabled and with it enabled, for:
+
+- ``kb``: ``BedrockKnowledgeBaseReader`` against a local retrieve API
+  stand-in with request latency (term-overlap ranking over the policy
+  document sections) and an ingestion-job listing that changes on sync
+- ``vector``: ``VectorRAGKnowledgeReader`` against a local embedding
+  stand-in (hashed word and character-trigram counts) with latency; its
+  cache serves exact repeats only
+
+Reports, per reader: mean latency per window, backend calls (retrieve or
+embedding requests), exact and near-duplicate hit rates, how many cached
+answers differ from what the reader computes for that wording itself, and
+whether the first lookup after the sync was answered from fresh content.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.query_cache
+
+    # Longer incident, slower backend
+    python -m benchmarks.query_cache --windows 40 --latency-ms 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from benchmarks.hybrid_retrieval import POLICIES_DIR, HashedTermRuntime  # noqa: E402
+from src.orchestration.four_agent.bedrock_kb_reader import (  # noqa: E402
+    BedrockKnowledgeBaseReader,
+    clear_kb_retrievals,
+    get_kb_retrievals,
+)
+from src.orchestration.four_agent.embedding_cache import EmbeddingCache  # noqa: E402
+from src.orchestration.four_agent.query_cache import QueryResultCache  # noqa: E402
+from src.orchestration.four_agent.vector_rag_reader import (  # noqa: E402
+    BedrockEmbeddings,
+    VectorRAGKnowledgeReader,
+)
+
+READERS = ("kb", "vector")
+DOCUMENTS = ("troubleshooting-runbooks.md", "known-failure-patterns.md")
+
+# (reader method, query) asked in every window
+STANDING_QUERIES: List[tuple] = [
+    ("get_troubleshooting_steps", "database connection pool exhausted in payment-service"),
+    ("get_troubleshooting_steps", "p99 latency spike on checkout API"),
+    ("get_failure_pattern", "payment-service connection leak"),
+    ("get_error_code_guidance", "SQLSTATE[08006]"),
+    ("get_similar_incidents", ["connection pool exhausted", "latency spike"]),
+]
+# Symptoms that appear later in the incident, one at a time
+NEW_QUERIES: List[tuple] = [
+    ("get_troubleshooting_steps", "HTTP 503 upstream overloaded"),
+    ("get_failure_pattern", "redis connection storm"),
+    ("get_error_code_guidance", "HTTP 429"),
+    ("get_troubleshooting_steps", "pods restarting with OOMKilled"),
+]
+_FILLERS = ("investigate", "current", "ongoing")
+# Appended to the runbooks by the mid-incident sync
+SYNC_MARKER = "Drain the pgbouncer pool before restarting payment-service"
+
+
+def reword(query: str, rng: random.Random) -> str:
+    """Same question as another agent might phrase it."""
+    words = query.split()
+    choice = rng.random()
+    if choice < 0.35:
+        return query
+    if choice < 0.55:
+        return query.upper() if rng.random() < 0.2 else query.lower().capitalize()
+    if choice < 0.8 and len(words) > 2:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+        return " ".join(words)
+    return f"{rng.choice(_FILLERS)} {query}"
+
+
+def workload(windows: int, seed: int) -> List[List[tuple]]:
+    """Lookups per analysis window."""
+    rng = random.Random(seed)
+    asked: List[tuple] = list(STANDING_QUERIES)
+    schedule = []
+    for window in range(windows):
+        if window and window % max(1, windows // (len(NEW_QUERIES) + 1)) == 0 and len(asked) < len(
+            STANDING_QUERIES
+        ) + len(NEW_QUERIES):
+            asked.append(NEW_QUERIES[len(asked) - len(STANDING_QUERIES)])
+        lookups = []
+        for method, query in asked:
+            if isinstance(query, list):
+                query = [reword(symptom, rng) for symptom in query]
+            else:
+                query = reword(query, rng)
+            lookups.append((method, query))
+        schedule.append(lookups)
+    return schedule
+
+
+def _sections(root: Path) -> List[tuple]:
+    sections = []
+    for name in DOCUMENTS:
+        for section in re.split(r"\n(?=## )", (root / name).read_text()):
+            if section.strip():
+                sections.append((name, section))
+    return sections
+
+
+def _terms(text: str) -> set:
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+class FakeAgentRuntime:
+    """bedrock-agent-runtime stand-in ranking document sections by term overlap."""
+
+    def __init__(self, root: Path, latency_ms: float):
+        self.root = root
+        self.latency_s = latency_ms / 1000.0
+        self.calls = 0
+        self.reload()
+
+    def reload(self) -> None:
+        self.sections = [(name, section, _terms(section)) for name, section in _sections(self.root)]
+
+    def retrieve(self, knowledgeBaseId: str, retrievalQuery: dict, retrievalConfiguration: dict) -> Dict[str, Any]:
+        self.calls += 1
+        time.sleep(self.latency_s)
+        terms = _terms(retrievalQuery["text"])
+        top_k = retrievalConfiguration["vectorSearchConfiguration"]["numberOfResults"]
+        scored = sorted(
+            ((len(terms & section_terms) / (len(terms) or 1), name, section)
+             for name, section, section_terms in self.sections),
+            key=lambda item: item[0],
+            reverse=True,
+        )[:top_k]
+        return {
+            "retrievalResults": [
+                {
+                    "content": {"text": section},
+                    "score": round(score, 4),
+                    "location": {"s3Location": {"uri": f"s3://kb-bucket/policies/{name}"}},
+                }
+                for score, name, section in scored
+            ]
+        }
+
+
+class FakeBedrockAgent:
+    """bedrock-agent stand-in whose latest ingestion job changes on every sync."""
+
+    def __init__(self):
+        self.job = 1
+
+    def list_ingestion_jobs(self, **kwargs) -> Dict[str, Any]:
+        return {"ingestionJobSummaries": [{"ingestionJobId": f"job-{self.job}", "status": "COMPLETE"}]}
+
+
+class SlowHashedTermRuntime(HashedTermRuntime):
+    """HashedTermRuntime with request latency, counting requests."""
+
+    def __init__(self, dimension: int, latency_ms: float):
+        super().__init__(dimension)
+        self.latency_s = latency_ms / 1000.0
+        self.calls = 0
+
+    def invoke_model(self, modelId: str, body: str) -> Dict[str, Any]:
+        self.calls += 1
+        time.sleep(self.latency_s)
+        return super().invoke_model(modelId, body)
+
+
+def _kb_reader(root: Path, args: argparse.Namespace, cached: bool) -> tuple:
+    reader = BedrockKnowledgeBaseReader(
+        knowledge_base_id="BENCHMARK", region_name="us-west-2", cache=QueryResultCache(ttl_seconds=0)
+    )
+    runtime = FakeAgentRuntime(root, args.latency_ms)
+    embed_runtime = SlowHashedTermRuntime(args.dimension, args.embed_latency_ms)
+    agent = FakeBedrockAgent()
+    reader.client = runtime
+    reader._embed_client = embed_runtime
+    reader._agent_client = agent
+    reader.data_source_id = "BENCHMARK-DS"
+    if cached:
+        reader.cache = QueryResultCache(embed=reader._embed_query)
+
+    def sync() -> None:
+        with (root / DOCUMENTS[0]).open("a") as f:
+            f.write(f"\n\n## Connection pool exhausted (update)\n\n{SYNC_MARKER}.\n")
+        runtime.reload()
+        agent.job += 1
+        reader._sync_checked_at = 0.0  # as if the sync check interval had elapsed
+
+    return reader, sync, lambda: {"retrieve": runtime.calls, "embedding": embed_runtime.calls}
+
+
+def _vector_reader(root: Path, args: argparse.Namespace, cached: bool) -> tuple:
+    runtime = SlowHashedTermRuntime(args.dimension, args.embed_latency_ms)
+    embeddings = BedrockEmbeddings(cache=EmbeddingCache(root / "embeddings"), client=runtime)
+    reader = VectorRAGKnowledgeReader(
+        runbooks_path=root / DOCUMENTS[0],
+        patterns_path=root / DOCUMENTS[1],
+        cache_dir=root / "index",
+        embeddings=embeddings,
+        query_cache=None if cached else QueryResultCache(ttl_seconds=0),
+    )
+    built = runtime.calls
+
+    def sync() -> None:
+        with (root / DOCUMENTS[0]).open("a") as f:
+            f.write(f"\n\n## Connection pool exhausted (update)\n\n{SYNC_MARKER}.\n")
+        reader.refresh()
+
+    return reader, sync, lambda: {"retrieve": 0, "embedding": runtime.calls - built}
+
+
+def _comparable(result: Any) -> str:
+    """Result without the echoed query wording."""
+    if isinstance(result, dict):
+        result = {key: value for key, value in result.items() if key not in ("query", "error_code")}
+    return json.dumps(result, sort_keys=True, default=str)
+
+
+def _call(reader: Any, method: str, query: Any) -> Any:
+    return getattr(reader, method)(list(query) if isinstance(query, list) else query)
+
+
+def run_reader(
+    factory: Callable[[Path, argparse.Namespace, bool], tuple],
+    schedule: List[List[tuple]],
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    sync_window = len(schedule) // 2
+    results: Dict[str, Any] = {}
+    answers: Dict[bool, List[tuple]] = {}
+    for cached in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for name in DOCUMENTS:
+                shutil.copy(POLICIES_DIR / name, root / name)
+            reader, sync, backend_calls = factory(root, args, cached)
+            clear_kb_retrievals()
+            window_ms = []
+            answers[cached] = []
+            fresh_after_sync = None
+            for window, lookups in enumerate(schedule):
+                if window == sync_window:
+                    sync()
+                started = time.perf_counter()
+                for method, query in lookups:
+                    answers[cached].append((method, query, _comparable(_call(reader, method, query))))
+                window_ms.append((time.perf_counter() - started) * 1000)
+                if window == sync_window:
+                    fresh_after_sync = SYNC_MARKER in _comparable(_call(reader, *STANDING_QUERIES[0]))
+            outcomes = [retrieval["cache"] for retrieval in get_kb_retrievals()]
+            lookups_total = sum(len(lookups) for lookups in schedule)
+            results["cached" if cached else "uncached"] = {
+                "mean_window_ms": round(statistics.fmean(window_ms), 2),
+                "total_seconds": round(sum(window_ms) / 1000, 3),
+                "backend_calls": backend_calls(),
+                "exact_hit_rate": round(outcomes.count("exact") / lookups_total, 3),
+                "semantic_hit_rate": round(outcomes.count("semantic") / lookups_total, 3),
+                "fresh_after_sync": fresh_after_sync,
+            }
+    differing = [
+        {"method": method, "query": query}
+        for (method, query, plain), (_, _, cached) in zip(answers[False], answers[True])
+        if plain != cached
+    ]
+    results["cached_answers_differing"] = {"count": len(differing), "examples": differing[:3]}
+    results["backend_calls_saved"] = {
+        kind: calls - results["cached"]["backend_calls"][kind]
+        for kind, calls in results["uncached"]["backend_calls"].items()
+    }
+    results["speedup"] = round(
+        results["uncached"]["total_seconds"] / max(results["cached"]["total_seconds"], 1e-6), 1
+    )
+    return results
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    schedule = workload(args.windows, args.seed)
+    factories = {"kb": _kb_reader, "vector": _vector_reader}
+    return {
+        "config": {
+            "windows": args.windows,
+            "lookups": sum(len(lookups) for lookups in schedule),
+            "latency_ms": args.latency_ms,
+            "embed_latency_ms": args.embed_latency_ms,
+            "sync_before_window": args.windows // 2,
+        },
+        "readers": {name: run_reader(factories[name], schedule, args) for name in args.readers},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure KB lookups saved by the query result cache")
+    parser.add_argument("--readers", nargs="+", choices=READERS, default=list(READERS), help="Readers to run")
+    parser.add_argument("--windows", type=int, default=20, help="Analysis windows in the incident")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Latency per KB retrieve request")
+    parser.add_argument("--embed-latency-ms", type=float, default=30.0, help="Latency per embedding request")
+    parser.add_argument("--dimension", type=int, default=512, help="Dimension of the local stand-in embeddings")
+    parser.add_argument("--seed", type=int, default=11, help="Seed for the query rewording")
+    parser.add_argument("--verbose", action="store_true", help="Show reader logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    report = run_benchmark(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    ok = all(reader["cached"]["fresh_after_sync"] is not False for reader in report["readers"].values())
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
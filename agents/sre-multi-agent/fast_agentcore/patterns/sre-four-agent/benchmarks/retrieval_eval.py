@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Retrieval evaluation of the SRE knowledge layer: recall, MRR, latency,
+context size and build time per knowledge reader.
+
+Derives a labelled query set from the bundled runbooks and failure patterns,
+so it follows the documents as they change:
+
+- ``identifier``: an incident id on its own
+- ``root_cause`` / ``symptom``: the root cause or symptoms recorded for an
+  incident, without its id
+- ``error``: an error message or code listed under a runbook's Error Patterns
+- ``indicator``: an observable indicator from a failure pattern's Symptom
+  Pattern
+- ``paraphrase``: the hand-written paraphrases of ``benchmarks.hybrid_retrieval``
+
+Relevance is judged per chapter (``## N. Title``) of either document: a
+chapter is relevant to an incident query if it mentions the incident, and to
+an error or indicator query if it is the chapter the text came from or
+contains it verbatim. A returned passage counts for the chapter it lies in.
+
+Every query is asked of:
+
+- ``vector``: ``VectorRAGKnowledgeReader.search_by_semantic_query``
+- ``hybrid``: ``VectorRAGKnowledgeReader.hybrid_search`` (BM25 and vector
+  fused with RRF), on the same indexes
+- ``markdown``: ``RCAKnowledgeReader.search_sections``, keyword search over
+  the documents' heading tree
+- ``bedrock_kb``: ``BedrockKnowledgeBaseReader.search_by_semantic_query``
+  against a local stand-in for ``bedrock-agent-runtime.retrieve`` (fixed-size
+  300-token chunks with 20% overlap, like a KB's default chunking, ranked by
+  cosine similarity of hashing embeddings), or a real knowledge base with
+  ``--kb-id``
+
+Query caches are disabled. Reports per reader: recall@1/3/5 (share of the
+relevant chapters among the chapters of the first k passages) and MRR, overall
+and per query kind; per-query latency percentiles; tokens returned per query
+(4 characters each); and the time to build the reader's index from scratch.
+Without ``--bedrock`` the vector reader embeds with the hashed-term stand-in
+for Titan, so vector numbers are pessimistic and need no AWS access.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.retrieval_eval
+
+    # Track a chunking change over time
+    python -m benchmarks.retrieval_eval --chunk-size 800 --output eval-800.json
+
+    # Real Titan embeddings and a real knowledge base (needs AWS credentials)
+    python -m benchmarks.retrieval_eval --bedrock --kb-id KB123456
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import logging
+import re
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from benchmarks.hybrid_retrieval import POLICIES_DIR, QUERIES, HashedTermRuntime  # noqa: E402
+from src.orchestration.four_agent.bedrock_kb_reader import BedrockKnowledgeBaseReader  # noqa: E402
+from src.orchestration.four_agent.embedding_backends import HashingEmbeddings  # noqa: E402
+from src.orchestration.four_agent.query_cache import QueryResultCache  # noqa: E402
+from src.orchestration.four_agent.rca_knowledge_reader import RCAKnowledgeReader  # noqa: E402
+from src.orchestration.four_agent.section_index import SectionIndex, estimate_tokens  # noqa: E402
+from src.orchestration.four_agent.vector_rag_reader import (  # noqa: E402
+    BedrockEmbeddings,
+    VectorRAGKnowledgeReader,
+)
+
+RUNBOOKS = "troubleshooting-runbooks.md"
+PATTERNS = "known-failure-patterns.md"
+DOCUMENTS = (RUNBOOKS, PATTERNS)
+POLICY_IDS = {"POL-SRE-003": RUNBOOKS, "POL-SRE-004": PATTERNS}
+READERS = ("vector", "hybrid", "markdown", "bedrock_kb")
+RECALL_AT = (1, 3, 5)
+
+_INCIDENT_RE = re.compile(r"^\*\*(INC-\d{4}-\d{2}-\d{2}): [^*]+\*\*$")
+_FIELD_RE = re.compile(r"^- (?:\*\*)?(Symptoms|Root Cause):(?:\*\*)? +(.+)$")
+_CODE_RE = re.compile(r"`([^`]+)`")
+
+# (document, chapter number or title)
+Chapter = Tuple[str, str]
+
+
+@dataclass
+class LabelledQuery:
+    """A query and the chapters that answer it."""
+
+    kind: str
+    text: str
+    relevant: List[Chapter]
+    origin: str
+
+
+class ChapterMap:
+    """Chapters of the policy documents, and the chapter a passage lies in."""
+
+    def __init__(self, policies_dir: Path):
+        self.content: Dict[str, str] = {}
+        self.starts: Dict[str, List[int]] = {}
+        self.chapters: Dict[str, List[str]] = {}
+        self.sections: Dict[str, SectionIndex] = {}
+        for name in DOCUMENTS:
+            index = SectionIndex(policies_dir / name, name)
+            content = index.content
+            chapters = [section for section in index.sections() if section.level == 2]
+            self.sections[name] = index
+            self.content[name] = content
+            self.starts[name] = [content.find(section.text) for section in chapters]
+            self.chapters[name] = [section.number or section.title for section in chapters]
+
+    def chapter_at(self, document: str, offset: int) -> Optional[Chapter]:
+        position = bisect.bisect_right(self.starts[document], offset) - 1
+        return (document, self.chapters[document][position]) if position >= 0 else None
+
+    def locate(self, document: str, text: str) -> Optional[Chapter]:
+        """Chapter holding a passage of a document (its first line, if it spans several)."""
+        if document not in self.content:
+            return None
+        offset = self.content[document].find(text.strip()[:200])
+        return self.chapter_at(document, offset) if offset >= 0 else None
+
+    def mentioning(self, needle: str) -> List[Chapter]:
+        """Chapters whose text contains this string, case-insensitively."""
+        found = []
+        for document, content in self.content.items():
+            lowered = content.lower()
+            start = 0
+            while (offset := lowered.find(needle.lower(), start)) >= 0:
+                chapter = self.chapter_at(document, offset)
+                if chapter is not None and chapter not in found:
+                    found.append(chapter)
+                start = offset + 1
+        return found
+
+
+def labelled_queries(chapters: ChapterMap) -> List[LabelledQuery]:
+    """Queries derived from the documents, plus the hand-written paraphrases."""
+    queries: List[LabelledQuery] = []
+    seen = set()
+
+    def add(kind: str, text: str, relevant: List[Chapter], origin: str) -> None:
+        text = " ".join(text.split())
+        if text and relevant and (kind, text.lower()) not in seen:
+            seen.add((kind, text.lower()))
+            queries.append(LabelledQuery(kind, text, relevant, origin))
+
+    for document in DOCUMENTS:
+        for section in chapters.sections[document].sections():
+            lines = section.body.split("\n")
+            origin = f"{document} {section.number or section.title}"
+            title = section.title.lower()
+            if section.level == 3 and (title.startswith("error patterns") or title.startswith("symptom pattern")):
+                kind = "error" if title.startswith("error") else "indicator"
+                chapter = (document, section.number.split(".")[0])
+                for line in lines:
+                    if not line.startswith("- "):
+                        continue
+                    codes = _CODE_RE.findall(line) if kind == "error" else []
+                    for text in codes or [_CODE_RE.sub(r"\1", line[2:])]:
+                        relevant = [chapter] + [found for found in chapters.mentioning(text) if found != chapter]
+                        add(kind, text, relevant, origin)
+
+            incident = None
+            for line in lines:
+                match = _INCIDENT_RE.match(line.strip())
+                if match:
+                    incident = match.group(1)
+                    add("identifier", incident, chapters.mentioning(incident), origin)
+                    continue
+                field = _FIELD_RE.match(line.strip()) if incident else None
+                if field:
+                    kind = "symptom" if field.group(1) == "Symptoms" else "root_cause"
+                    add(kind, field.group(2), chapters.mentioning(incident), f"{origin} {incident}")
+
+    for kind, text, expected, filters in QUERIES:
+        if kind == "paraphrase" and filters is None:
+            add("paraphrase", text, chapters.mentioning(expected), f"benchmarks.hybrid_retrieval {expected}")
+    return queries
+
+
+class LocalKnowledgeBase:
+    """Stand-in for ``bedrock-agent-runtime.retrieve`` over the policy documents.
+
+    Documents are split like a knowledge base's default fixed-size chunking
+    (``chunk_tokens`` tokens with ``overlap`` of them shared with the next
+    chunk, counting words as tokens) and ranked by cosine similarity of
+    hashing embeddings.
+    """
+
+    def __init__(self, policies_dir: Path, dimension: int, chunk_tokens: int = 300, overlap: float = 0.2):
+        self.embeddings = HashingEmbeddings(dimension)
+        self.chunks: List[Tuple[str, str]] = []
+        step = max(1, int(chunk_tokens * (1 - overlap)))
+        for name in DOCUMENTS:
+            words = (policies_dir / name).read_text().split(" ")
+            for start in range(0, len(words), step):
+                self.chunks.append((name, " ".join(words[start:start + chunk_tokens])))
+                if start + chunk_tokens >= len(words):
+                    break
+        self.matrix = np.asarray(self.embeddings.embed_documents([text for _, text in self.chunks]), dtype=np.float32)
+
+    def retrieve(self, knowledgeBaseId: str, retrievalQuery: dict, retrievalConfiguration: dict) -> Dict[str, Any]:
+        top_k = retrievalConfiguration["vectorSearchConfiguration"]["numberOfResults"]
+        query = np.asarray(self.embeddings.embed_query(retrievalQuery["text"]), dtype=np.float32)
+        scores = self.matrix @ query
+        return {
+            "retrievalResults": [
+                {
+                    "content": {"text": self.chunks[i][1]},
+                    "score": round((float(scores[i]) + 1) / 2, 4),
+                    "location": {"s3Location": {"uri": f"s3://kb-bucket/policies/{self.chunks[i][0]}"}},
+                    "metadata": {"x-amz-bedrock-kb-chunk-id": str(i)},
+                }
+                for i in np.argsort(-scores)[:top_k].tolist()
+            ]
+        }
+
+
+# A reader under evaluation: query and depth to (document, passage text) pairs, best first
+Search = Callable[[str, int], List[Tuple[str, str]]]
+
+
+def build_readers(args: argparse.Namespace, cache_dir: Path) -> Dict[str, Tuple[Search, float, Dict[str, Any]]]:
+    """Build each reader's index from scratch; (search, build seconds, details) per reader."""
+    readers: Dict[str, Tuple[Search, float, Dict[str, Any]]] = {}
+    k = max(RECALL_AT)
+
+    if {"vector", "hybrid"} & set(args.readers):
+        client = None if args.bedrock else HashedTermRuntime(args.dimension)
+        started = time.perf_counter()
+        vector_reader = VectorRAGKnowledgeReader(
+            runbooks_path=POLICIES_DIR / RUNBOOKS,
+            patterns_path=POLICIES_DIR / PATTERNS,
+            cache_dir=cache_dir,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            top_k=k,
+            embeddings=BedrockEmbeddings(client=client),
+            query_cache=QueryResultCache(ttl_seconds=0),
+            fallbacks=[],
+        )
+        build_seconds = time.perf_counter() - started
+        details = {"chunks": len(vector_reader.runbooks_index) + len(vector_reader.patterns_index)}
+        readers["vector"] = (
+            lambda query, depth: [
+                (result["source"], result["content"])
+                # Ranked per document; merge by score
+                for result in sorted(
+                    vector_reader.search_by_semantic_query(query), key=lambda result: -result["relevance_score"]
+                )
+            ][:depth],
+            build_seconds,
+            details,
+        )
+        readers["hybrid"] = (
+            lambda query, depth: [
+                (doc.metadata["source"], doc.page_content) for doc, _ in vector_reader.hybrid_search(query, k=depth)
+            ],
+            build_seconds,
+            details,
+        )
+
+    if "markdown" in args.readers:
+        started = time.perf_counter()
+        markdown_reader = RCAKnowledgeReader(POLICIES_DIR / RUNBOOKS, POLICIES_DIR / PATTERNS)
+        markdown_reader.preload()
+        # The keyword index is built on the first search
+        markdown_reader.search_sections("warm up", limit=1)
+        build_seconds = time.perf_counter() - started
+
+        def markdown_search(query: str, depth: int) -> List[Tuple[str, str]]:
+            return [
+                (POLICY_IDS[result["policy_reference"].split()[0]], result["content"])
+                for result in markdown_reader.search_sections(query, limit=depth)
+            ]
+
+        readers["markdown"] = (markdown_search, build_seconds, {})
+
+    if "bedrock_kb" in args.readers:
+        kb_reader = BedrockKnowledgeBaseReader(
+            knowledge_base_id=args.kb_id or "EVALUATION", top_k=k, cache=QueryResultCache(ttl_seconds=0)
+        )
+        details: Dict[str, Any] = {"knowledge_base": args.kb_id or "local stand-in"}
+        build_seconds = 0.0
+        if not args.kb_id:
+            started = time.perf_counter()
+            knowledge_base = LocalKnowledgeBase(POLICIES_DIR, args.dimension)
+            build_seconds = time.perf_counter() - started
+            kb_reader.client = knowledge_base
+            details["chunks"] = len(knowledge_base.chunks)
+        readers["bedrock_kb"] = (
+            lambda query, depth: [
+                (result["source"], result["content"]) for result in kb_reader.search_by_semantic_query(query)
+            ][:depth],
+            build_seconds,
+            details,
+        )
+
+    return {name: readers[name] for name in args.readers}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def evaluate(search: Search, queries: List[LabelledQuery], chapters: ChapterMap, repeats: int) -> Dict[str, Any]:
+    """Run every labelled query through one reader and score the passages."""
+    depth = max(RECALL_AT)
+    per_kind: Dict[str, Dict[str, List[float]]] = {}
+    latencies: List[float] = []
+    tokens: List[int] = []
+    for query in queries:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            passages = search(query.text, depth)
+            latencies.append((time.perf_counter() - started) * 1000)
+        tokens.append(sum(estimate_tokens(text) for _, text in passages))
+
+        found = [chapters.locate(document, text) for document, text in passages]
+        relevant = set(query.relevant)
+        first = next((rank for rank, chapter in enumerate(found, 1) if chapter in relevant), None)
+        scores = per_kind.setdefault(query.kind, {"rr": [], **{f"recall@{k}": [] for k in RECALL_AT}})
+        scores["rr"].append(1.0 / first if first else 0.0)
+        for k in RECALL_AT:
+            scores[f"recall@{k}"].append(len(relevant.intersection(found[:k])) / len(relevant))
+
+    def summarise(scores: Dict[str, List[float]]) -> Dict[str, float]:
+        summary = {name: round(statistics.fmean(values), 3) for name, values in scores.items() if name != "rr"}
+        summary["mrr"] = round(statistics.fmean(scores["rr"]), 3)
+        return summary
+
+    overall: Dict[str, List[float]] = {}
+    for scores in per_kind.values():
+        for name, values in scores.items():
+            overall.setdefault(name, []).extend(values)
+    return {
+        "overall": summarise(overall),
+        "by_kind": {kind: summarise(scores) for kind, scores in per_kind.items()},
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 3),
+            "p99": round(_percentile(latencies, 99), 3),
+        },
+        "tokens_per_query": {
+            "mean": round(statistics.fmean(tokens), 1),
+            "max": max(tokens),
+        },
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    chapters = ChapterMap(POLICIES_DIR)
+    queries = labelled_queries(chapters)
+    if args.kinds:
+        queries = [query for query in queries if query.kind in args.kinds]
+    if args.dump_queries:
+        args.dump_queries.write_text(
+            json.dumps([{**vars(query), "relevant": [list(chapter) for chapter in query.relevant]} for query in queries], indent=2)
+            + "\n"
+        )
+
+    kinds: Dict[str, int] = {}
+    for query in queries:
+        kinds[query.kind] = kinds.get(query.kind, 0) + 1
+    report: Dict[str, Any] = {
+        "config": {
+            "embeddings": "bedrock" if args.bedrock else f"hashed-terms-{args.dimension}",
+            "chunk_size": args.chunk_size,
+            "chunk_overlap": args.chunk_overlap,
+            "k": max(RECALL_AT),
+            "repeats": args.repeats,
+            "queries": len(queries),
+            "query_kinds": kinds,
+        },
+        "readers": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (search, build_seconds, details) in build_readers(args, Path(tmp)).items():
+            results = evaluate(search, queries, chapters, args.repeats)
+            report["readers"][name] = {"build_seconds": round(build_seconds, 3), **details, **results}
+            logging.info(f"{name}: {results['overall']}")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate the knowledge readers on queries labelled from the policy documents")
+    parser.add_argument("--readers", nargs="+", choices=READERS, default=list(READERS), help="Readers to evaluate")
+    parser.add_argument("--kinds", nargs="+", help="Only these query kinds")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Vector reader chunk size in characters")
+    parser.add_argument("--chunk-overlap", type=int, default=50, help="Vector reader chunk overlap in characters")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per query")
+    parser.add_argument("--dimension", type=int, default=512, help="Dimension of the local stand-in embeddings")
+    parser.add_argument("--bedrock", action="store_true", help="Embed with Titan through Bedrock")
+    parser.add_argument("--kb-id", help="Evaluate this Bedrock knowledge base instead of the local stand-in")
+    parser.add_argument("--dump-queries", type=Path, help="Write the labelled query set to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show reader logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if not args.verbose:
+        # The KB reader logs every retrieval
+        logging.getLogger("src.orchestration.four_agent").setLevel(logging.ERROR)
+
+    text = json.dumps(run_benchmark(args), indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Section lookup latency and prompt size of the markdown knowledge readers.
+
+``PolicyReader``, ``BusinessMetricsReader`` and ``RCAKnowledgeReader`` used
+to find a numbered section by scanning every line of their document on each
+lookup. They now serve sections from a ``SectionIndex`` (a heading tree
+parsed once, and again only when the file changes). This benchmark reports:
+
+- ``extraction``: per section, the time to extract it with a line scan over
+  the cached document text (the previous approach) and with an index lookup,
+  including the stat that detects edits
+- ``readers``: per-call time of the reader methods the agents call for one
+  incident, with the index warm
+- ``reparse``: time to parse each document into its index, paid once per edit
+- ``prompt_tokens``: for each query, estimated tokens of the whole runbook
+  chapter an agent would otherwise include versus the best-matching
+  subsections under a token budget (``search_sections``)
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.section_index
+
+    # More iterations, tighter budget
+    python -m benchmarks.section_index --iterations 20000 --max-tokens 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from src.orchestration.four_agent.business_metrics_reader import BusinessMetricsReader  # noqa: E402
+from src.orchestration.four_agent.policy_reader import PolicyReader  # noqa: E402
+from src.orchestration.four_agent.rca_knowledge_reader import RCAKnowledgeReader  # noqa: E402
+from src.orchestration.four_agent.schema import Severity  # noqa: E402
+from src.orchestration.four_agent.section_index import SectionIndex, estimate_tokens  # noqa: E402
+
+POLICIES_DIR = PROJECT_ROOT.parents[2] / "docs" / "policies"
+
+# Sections the readers look up while handling an incident
+SECTIONS = {
+    "incident-response-procedures.md": ["3.1", "4", "5"],
+    "business-impact-baselines.md": ["3.2", "4.1"],
+    "troubleshooting-runbooks.md": ["1", "2", "3"],
+    "known-failure-patterns.md": ["2", "3"],
+}
+
+QUERIES = [
+    ("troubleshooting-runbooks.md", "1", "SQLSTATE[08006] connection pool exhausted"),
+    ("troubleshooting-runbooks.md", "2", "payment gateway 504 timeout stripe"),
+    ("troubleshooting-runbooks.md", "3", "OOMKilled heap growing redis client leak"),
+    ("known-failure-patterns.md", "3", "slow queries lock contention database"),
+]
+
+
+def line_scan_extract(content: str, section_num: str) -> str:
+    """The readers' previous extraction, matching "## 4." headings as well as "## 4 "."""
+    section_lines: List[str] = []
+    in_section = False
+    section_level = len(section_num.split("."))
+    prefixes = tuple(f"{'#' * level} {section_num}{sep}" for level in (2, 3) for sep in (" ", ". "))
+
+    for line in content.split("\n"):
+        if line.startswith(prefixes):
+            in_section = True
+            section_lines.append(line)
+            continue
+        if in_section and line.startswith("#"):
+            heading_level = len(line) - len(line.lstrip("#"))
+            if heading_level <= section_level + 1:
+                break
+        if in_section:
+            section_lines.append(line)
+    return "\n".join(section_lines) if section_lines else f"Section {section_num} not found"
+
+
+def _per_call_us(call: Callable[[], Any], iterations: int) -> float:
+    call()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return round((time.perf_counter() - started) / iterations * 1e6, 2)
+
+
+def measure_extraction(iterations: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name, numbers in SECTIONS.items():
+        path = POLICIES_DIR / name
+        content = path.read_text()
+        index = SectionIndex(path)
+        for number in numbers:
+            scan_us = _per_call_us(lambda: line_scan_extract(content, number), iterations)
+            index_us = _per_call_us(lambda: index.section_text(number), iterations)
+            results[f"{name}#{number}"] = {
+                "line_scan_us": scan_us,
+                "index_us": index_us,
+                "speedup": round(scan_us / max(index_us, 1e-6), 1),
+            }
+    return results
+
+
+def measure_readers(iterations: int) -> Dict[str, float]:
+    policy = PolicyReader(str(POLICIES_DIR / "incident-response-procedures.md"))
+    metrics = BusinessMetricsReader(str(POLICIES_DIR / "business-impact-baselines.md"))
+    rca = RCAKnowledgeReader(
+        str(POLICIES_DIR / "troubleshooting-runbooks.md"),
+        str(POLICIES_DIR / "known-failure-patterns.md"),
+    )
+    calls = {
+        "policy.get_severity_procedures": lambda: policy.get_severity_procedures(Severity.SEV_1),
+        "metrics.get_baseline_metrics": lambda: metrics.get_baseline_metrics(Severity.SEV_1),
+        "metrics.get_revenue_formulas": metrics.get_revenue_formulas,
+        "rca.get_troubleshooting_steps": lambda: rca.get_troubleshooting_steps("SQLSTATE[08006]"),
+        "rca.get_failure_pattern": lambda: rca.get_failure_pattern("payment-service"),
+        "rca.get_similar_incidents": lambda: rca.get_similar_incidents(["connection pool", "timeout"]),
+        "rca.search_sections": lambda: rca.search_sections("connection pool exhausted", max_tokens=400),
+    }
+    return {name: _per_call_us(call, iterations) for name, call in calls.items()}
+
+
+def measure_reparse(iterations: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name in SECTIONS:
+        content = (POLICIES_DIR / name).read_text()
+        results[name] = {
+            "parse_us": _per_call_us(lambda: SectionIndex._parse(content), max(1, iterations // 100)),
+            "sections": len(SectionIndex._parse(content)),
+            "document_tokens": estimate_tokens(content),
+        }
+    return results
+
+
+def measure_prompt_tokens(max_tokens: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name, chapter, query in QUERIES:
+        index = SectionIndex(POLICIES_DIR / name)
+        matches = index.search(query, limit=3, max_tokens=max_tokens)
+        results[query] = {
+            "chapter_tokens": index.section(chapter).tokens,
+            "search_tokens": sum(section.body_tokens for section in matches),
+            "sections": [section.number or section.title for section in matches],
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure indexed section lookups of the markdown knowledge readers")
+    parser.add_argument("--iterations", type=int, default=5000, help="Calls per measurement")
+    parser.add_argument("--max-tokens", type=int, default=400, help="Token budget for search_sections")
+    parser.add_argument("--verbose", action="store_true", help="Show reader logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if not POLICIES_DIR.is_dir():
+        parser.error(f"Policy documents not found in {POLICIES_DIR}")
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG)
+
+    report = {
+        "config": {"iterations": args.iterations, "max_tokens": args.max_tokens},
+        "extraction": measure_extraction(args.iterations),
+        "readers": measure_readers(args.iterations),
+        "reparse": measure_reparse(args.iterations),
+        "prompt_tokens": measure_prompt_tokens(args.max_tokens),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
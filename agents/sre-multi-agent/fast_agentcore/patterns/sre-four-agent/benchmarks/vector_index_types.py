@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Build time, query latency and recall of the FAISS index types for large
+incident corpora.
+
+The vector stores can be built as exact "flat" indexes, HNSW graphs or
+IVF-PQ (``SRE_VECTOR_INDEX_TYPE``). This benchmark builds each type over
+synthetic clustered embeddings (one cluster per "incident family", like
+post-mortems of recurring failures) through the same ``build_faiss_index``
+and ``search_faiss_index`` the vector stores use, and reports per corpus
+size and index type:
+
+- ``build_seconds``: training (IVF-PQ) plus adding every vector
+- ``query_ms``: p50/p95 latency of single-query searches, as agents issue them
+- ``recall@k``: overlap of the top k with the exact (flat) top k
+- ``filtered``: the same for searches restricted by a service and date
+  filter, resolved in a ``ChunkMetadataStore`` SQLite sidecar first
+  (``sidecar_ms`` is that lookup); recall is against the exact top k among
+  the chunks the filter allows
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.vector_index_types
+
+    # Quicker run, two sizes, HNSW with a wider search
+    SRE_VECTOR_HNSW_EF_SEARCH=128 python -m benchmarks.vector_index_types --sizes 10000 100000
+
+At 1M vectors the corpus and indexes need a few GB of memory, and building
+HNSW takes a while on few cores.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks import keep_logs_out_of_tree  # noqa: E402
+
+keep_logs_out_of_tree()
+
+from src.orchestration.four_agent.chunk_metadata import ChunkMetadataStore  # noqa: E402
+from src.orchestration.four_agent.hybrid_search import MetadataFilter  # noqa: E402
+from src.orchestration.four_agent.vector_index import (  # noqa: E402
+    INDEX_TYPES,
+    ChunkRecord,
+    IndexConfig,
+    build_faiss_index,
+    search_faiss_index,
+)
+
+SERVICES = (
+    "Payment Gateway Failures",
+    "Database Connection Issues",
+    "Application Memory Leaks",
+    "API Rate Limiting and Throttling",
+    "Service Deployment Failures",
+    "Cross-Service Communication Failures",
+    "CDN and Caching Issues",
+    "Authentication and Authorization Failures",
+)
+FIRST_DAY = date(2019, 1, 1)
+DAYS = 6 * 365
+# Spread of chunks around their family's centre, relative to the centre's norm
+NOISE = 0.5
+
+
+def synthetic_corpus(n_vectors: int, n_queries: int, dimension: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """Unit vectors scattered around one centre per incident family, and queries drawn alike."""
+    rng = np.random.default_rng(seed)
+    n_clusters = max(8, int(np.sqrt(n_vectors)))
+    centres = rng.standard_normal((n_clusters, dimension)).astype(np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+
+    def sample(count: int) -> np.ndarray:
+        vectors = np.empty((count, dimension), dtype=np.float32)
+        for start in range(0, count, 100_000):
+            stop = min(start + 100_000, count)
+            assignment = rng.integers(0, n_clusters, stop - start)
+            noise = rng.standard_normal((stop - start, dimension)).astype(np.float32)
+            vectors[start:stop] = centres[assignment] + NOISE / np.sqrt(dimension) * noise
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+    return sample(n_vectors), sample(n_queries)
+
+
+def synthetic_metadata(store: ChunkMetadataStore, n_vectors: int, seed: int) -> None:
+    """One incident per chunk, with a service section and a date over six years."""
+    rng = np.random.default_rng(seed)
+    services = rng.integers(0, len(SERVICES), n_vectors)
+    days = rng.integers(0, DAYS, n_vectors)
+    store.replace_source(
+        "postmortems",
+        (
+            (
+                f"postmortems:{vector_id}",
+                ChunkRecord(content_hash="", vector_id=vector_id, source="postmortems", position=vector_id),
+                {
+                    "section": SERVICES[services[vector_id]],
+                    "incident_ids": [f"INC-{vector_id}"],
+                    "incident_dates": [(FIRST_DAY + timedelta(days=int(days[vector_id]))).isoformat()],
+                },
+            )
+            for vector_id in range(n_vectors)
+        ),
+    )
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = [len(set(row[row >= 0]) & set(expected[expected >= 0])) for row, expected in zip(found, truth)]
+    wanted = sum(int((expected >= 0).sum()) for expected in truth)
+    return round(sum(hits) / wanted, 4) if wanted else 1.0
+
+
+def _latencies(index: Any, kind: str, config: IndexConfig, queries: np.ndarray, k: int, ids=None):
+    labels, timings = [], []
+    for query in queries:
+        started = time.perf_counter()
+        _, found = search_faiss_index(index, kind, config, query[None, :], k, ids=ids)
+        timings.append((time.perf_counter() - started) * 1000)
+        labels.append(found[0])
+    timings.sort()
+    percentiles = {
+        "p50": round(statistics.median(timings), 3),
+        "p95": round(timings[int(0.95 * (len(timings) - 1))], 3),
+    }
+    return np.vstack(labels), percentiles
+
+
+def measure_size(n_vectors: int, args: argparse.Namespace, sidecar_dir: Path) -> Dict[str, Any]:
+    vectors, queries = synthetic_corpus(n_vectors, args.queries, args.dimension, args.seed)
+    ids = np.arange(n_vectors, dtype=np.int64)
+
+    store = ChunkMetadataStore(sidecar_dir / f"postmortems-{n_vectors}.meta.sqlite")
+    started = time.perf_counter()
+    synthetic_metadata(store, n_vectors, args.seed)
+    sidecar_build = time.perf_counter() - started
+    filters = MetadataFilter(service="payment", since=date(2023, 1, 1), until=date(2023, 12, 31))
+    started = time.perf_counter()
+    allowed = store.vector_ids(filters)
+    sidecar_ms = (time.perf_counter() - started) * 1000
+    store.close()
+
+    exact = IndexConfig(kind="flat")
+    flat, _ = build_faiss_index(exact, vectors[:1])
+    flat.add_with_ids(vectors, ids)
+    _, truth = search_faiss_index(flat, "flat", exact, queries, args.k)
+    _, filtered_truth = search_faiss_index(flat, "flat", exact, queries, args.k, ids=allowed)
+    del flat
+    gc.collect()
+
+    results: Dict[str, Any] = {
+        "sidecar": {
+            "build_seconds": round(sidecar_build, 2),
+            "filter_ms": round(sidecar_ms, 2),
+            "allowed": len(allowed),
+        },
+        "types": {},
+    }
+    for kind in args.types:
+        config = IndexConfig(kind=kind)
+        started = time.perf_counter()
+        index, built = build_faiss_index(config, vectors)
+        index.add_with_ids(vectors, ids)
+        build_seconds = time.perf_counter() - started
+
+        found, latency = _latencies(index, built, config, queries, args.k)
+        filtered_found, filtered_latency = _latencies(index, built, config, queries, args.k, ids=allowed)
+        results["types"][kind] = {
+            "built_as": built,
+            "build_seconds": round(build_seconds, 2),
+            "query_ms": latency,
+            f"recall@{args.k}": _recall(found, truth),
+            "filtered": {
+                "query_ms": filtered_latency,
+                f"recall@{args.k}": _recall(filtered_found, filtered_truth),
+                "exact": built != "flat" and len(allowed) <= config.exact_filter_limit,
+            },
+        }
+        logging.info(f"{n_vectors} vectors, {kind}: {results['types'][kind]}")
+        del index
+        gc.collect()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare FAISS index types on synthetic incident embeddings")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Corpus sizes")
+    parser.add_argument("--types", nargs="+", choices=INDEX_TYPES, default=list(INDEX_TYPES), help="Index types")
+    parser.add_argument("--dimension", type=int, default=128, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per measurement")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--verbose", action="store_true", help="Log each measurement as it finishes")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+
+    defaults = IndexConfig()
+    report: Dict[str, Any] = {
+        "config": {
+            "dimension": args.dimension,
+            "queries": args.queries,
+            "k": args.k,
+            "hnsw": {"m": defaults.hnsw_m, "ef_construction": defaults.ef_construction, "ef_search": defaults.ef_search},
+            "ivfpq": {
+                "nlist": defaults.ivf_nlist or "sqrt(n)",
+                "nprobe": defaults.ivf_nprobe,
+                "pq_m": defaults.pq_subquantizers(args.dimension),
+                "pq_bits": defaults.pq_bits,
+            },
+            "exact_filter_limit": defaults.exact_filter_limit,
+        },
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_vectors in args.sizes:
+            report["sizes"][str(n_vectors)] = measure_size(n_vectors, args, Path(tmp))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
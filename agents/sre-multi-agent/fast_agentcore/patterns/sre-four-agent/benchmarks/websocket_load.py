@@ -0,0 +1,756 @@
+#!/usr/bin/env python3
+"""
+Load test for demo_app's WebSocket updates.
+
+Starts ``src.demo_app`` under uvicorn in a child process with every LLM call
+answered by a latency-injecting fake runner and every knowledge lookup served
+from memory, over a generated log dataset with three embedded incidents. It
+then opens N dashboard-like WebSocket clients and triggers M incident
+pipelines and S streaming sessions. Clients track pipeline state versions like
+the dashboard does and ask for a resync when they see a gap.
+
+Reports, per client count:
+    - delivery latency (message timestamp to client receipt) p50/p99/max
+    - messages and bytes per second received across all clients
+    - event-loop lag sampled inside the server, and in the client process so
+      a saturated load generator is visible
+    - server RSS at start, peak and end, and pipeline memory accounting
+    - dropped, coalesced and evicted messages on the server, version gaps and
+      resyncs seen by the clients
+
+Each client count gets a fresh server, so memory figures do not carry over.
+No AWS credentials or network access are needed; besides the app's own
+dependencies (fastapi, uvicorn) the clients need ``websockets`` and ``httpx``.
+
+Usage:
+    # From patterns/sre-four-agent
+    python -m benchmarks.websocket_load --clients 50 --pipelines 5 --sessions 2
+
+    # Sweep client counts and keep the report
+    python -m benchmarks.websocket_load --clients 10 100 500 --pipelines 10 --output load.json
+
+    # Compare against an earlier report; fail on latency or loop-lag regressions
+    python -m benchmarks.websocket_load --clients 10 100 500 --pipelines 10 \\
+        --baseline load.json --max-latency-p99-ms 250 --max-loop-lag-p99-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from array import array
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+# Allow running as a plain script as well as with ``python -m``
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+try:
+    import httpx
+
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import websockets
+
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+# Start times of the streaming sessions; each reaches one embedded incident
+SESSION_START_TIMES = ("09:30", "11:00", "12:30")
+
+# Scenarios run by directly triggered pipelines (see demo_app.REAL_INCIDENT_SCENARIOS)
+PIPELINE_SCENARIOS = ("payment_processing_failures", "database_connection_issues", "traffic_surge_overload")
+
+# Incident windows embedded in the generated dataset (minutes after 09:00)
+_INCIDENT_WINDOWS = ((45, 60), (135, 150), (225, 240))
+
+# ERROR entries in an analyst prompt that make the fake analyst report an anomaly
+_ANOMALY_ERROR_COUNT = 3
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _summarise(values) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 3) if values else 0.0,
+        "p50": round(_percentile(values, 50), 3),
+        "p99": round(_percentile(values, 99), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
+
+
+async def _sample_loop_lag(interval_s: float, samples: array, stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval_s
+        await asyncio.sleep(interval_s)
+        samples.append(max(loop.time() - expected, 0.0) * 1000.0)
+
+
+def _raise_fd_limit() -> None:
+    """Allow as many sockets as the hard limit permits (1024 is common on laptops)."""
+    try:
+        import resource
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard == resource.RLIM_INFINITY:
+            hard = 65536
+        if soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def write_dataset(path: Path, *, hours: int = 4, interval_s: int = 6, seed: int = 7) -> int:
+    """
+    Write a synthetic streaming-log dataset starting 2024-01-15 09:00 UTC.
+
+    Traffic is mostly INFO with the occasional WARN; inside each incident
+    window most entries are errors of the affected service.
+
+    Returns:
+        Number of log entries written
+    """
+    rng = random.Random(seed)
+    services = ("payment-processor", "payments-db", "api-gateway", "auth-service", "ledger")
+    incidents = (
+        ("payment-processor", "GATEWAY_TIMEOUT", "Payment gateway timeout after 30000ms"),
+        ("payments-db", "DB_CONN_TIMEOUT", "Connection pool exhausted: 200/200 active"),
+        ("api-gateway", "HTTP_503", "Upstream overloaded, shedding request"),
+    )
+    start = datetime(2024, 1, 15, 9, 0, tzinfo=timezone.utc)
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for offset in range(0, hours * 3600, interval_s):
+            timestamp = start + timedelta(seconds=offset)
+            minute = offset // 60
+            incident = next(
+                (incidents[i] for i, (lo, hi) in enumerate(_INCIDENT_WINDOWS) if lo <= minute < hi),
+                None,
+            )
+            entry: Dict[str, Any] = {
+                "timestamp": timestamp.isoformat().replace("+00:00", "Z"),
+                "host": f"ip-10-0-{rng.randint(0, 3)}-{rng.randint(2, 250)}",
+                "pod": f"pod-{rng.randint(1000, 9999)}",
+                "trace_id": uuid.UUID(int=rng.getrandbits(128)).hex,
+                "request_id": f"req-{offset}",
+                "response_time_ms": rng.randint(20, 180),
+            }
+            if incident is not None and rng.random() < 0.7:
+                service, error_code, message = incident
+                entry.update(
+                    service=service,
+                    level="ERROR",
+                    message=message,
+                    error_code=error_code,
+                    http_status=503,
+                    response_time_ms=rng.randint(2000, 30000),
+                )
+            else:
+                entry.update(
+                    service=rng.choice(services),
+                    level="WARN" if rng.random() < 0.05 else "INFO",
+                    message="Request completed",
+                    http_status=200,
+                )
+            f.write(json.dumps(entry) + "\n")
+            count += 1
+    return count
+
+
+# ----------------------------------------------------------------------
+# Server process
+# ----------------------------------------------------------------------
+class _RunTracker:
+    """Counts calls of the pipeline and streaming-session coroutines in flight."""
+
+    def __init__(self) -> None:
+        self.started: Dict[str, int] = {}
+        self.finished: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.in_flight: Dict[str, int] = {}
+
+    def wrap(self, kind: str, func):
+        for counter in (self.started, self.finished, self.failed, self.in_flight):
+            counter.setdefault(kind, 0)
+
+        @functools.wraps(func)
+        async def tracked(*args, **kwargs):
+            self.started[kind] += 1
+            self.in_flight[kind] += 1
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                self.failed[kind] += 1
+                raise
+            finally:
+                self.in_flight[kind] -= 1
+                self.finished[kind] += 1
+
+        return tracked
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started": dict(self.started),
+            "finished": dict(self.finished),
+            "failed": dict(self.failed),
+            "in_flight": dict(self.in_flight),
+        }
+
+
+def _install_fakes(args: argparse.Namespace) -> None:
+    """Route every LLM call and knowledge lookup of the app to local fakes."""
+    from benchmarks.orchestrator_throughput import (
+        _RESPONSE_BUILDERS,
+        FakeKnowledgeReader,
+        LatencyInjectingLLMRunner,
+    )
+    from src.orchestration.four_agent import impact_agent, llm, mitigation_agent, rca_agent
+    from src.orchestration.four_agent.schema import AgentRole
+
+    def analyst_response(request) -> Dict[str, Any]:
+        text = " ".join(str(message.get("content", "")) for message in request.messages)
+        if text.count("ERROR") >= _ANOMALY_ERROR_COUNT:
+            return _RESPONSE_BUILDERS["analyst"](request)
+        return {
+            "summary": "LOW severity: traffic and error rates within baseline",
+            "details": {
+                "severity_score": 0.1,
+                "anomaly_confidence": 0.2,
+                "detected_patterns": {},
+                "severity_indicators": [],
+                "initial_hypothesis": "No incident",
+                "recommended_action": "Continue monitoring",
+            },
+        }
+
+    builders = {
+        AgentRole.ANALYST.value: analyst_response,
+        AgentRole.RCA.value: _RESPONSE_BUILDERS["rca"],
+        AgentRole.IMPACT.value: _RESPONSE_BUILDERS["impact"],
+        AgentRole.MITIGATION.value: _RESPONSE_BUILDERS["mitigation"],
+    }
+    rng = random.Random(args.seed)
+
+    def ensure_runner(self):
+        if self._llm_runner is None:
+            role = getattr(self._role, "value", self._role)
+            self._llm_runner = LatencyInjectingLLMRunner(
+                builders.get(role, analyst_response),
+                latency_ms=args.llm_latency_ms,
+                jitter=args.llm_jitter,
+                chunk_chars=args.stream_chunk_chars,
+                rng=rng,
+            )
+        return self._llm_runner
+
+    llm.BaseLLMAgent._ensure_runner = ensure_runner
+
+    def reader(*_args, **_kwargs):
+        return FakeKnowledgeReader(latency_ms=args.kb_latency_ms)
+
+    for module in (rca_agent, impact_agent, mitigation_agent):
+        module.BEDROCK_KB_AVAILABLE = False
+    rca_agent.RCAKnowledgeReader = reader
+    impact_agent.BusinessMetricsReader = reader
+    mitigation_agent.PolicyReader = reader
+
+
+def _serve(args: argparse.Namespace) -> int:
+    """Run demo_app with the fakes plus the routes the load generator polls."""
+    import uvicorn
+
+    from src import demo_app as demo
+    from src.data_pipeline import analysis_cache
+    from src.data_pipeline.pipeline_orchestrator import LogDataPipeline
+    from src.orchestration.real_time.retention import process_rss_bytes
+
+    _raise_fd_limit()
+    _install_fakes(args)
+    demo.data_pipeline = LogDataPipeline(log_file_path=args.dataset)
+    analysis_cache._window_analysis_cache = analysis_cache.WindowAnalysisCache(persist=False)
+
+    tracker = _RunTracker()
+    demo.run_real_pipeline = tracker.wrap("pipelines", demo.run_real_pipeline)
+    demo.run_streaming_session = tracker.wrap("sessions", demo.run_streaming_session)
+
+    lag_samples = array("d")
+    rss_samples: List[int] = []
+    tasks = set()
+
+    def forget_task(task: asyncio.Task) -> None:
+        tasks.discard(task)
+        # Failures are printed by the app and counted by the tracker
+        if not task.cancelled():
+            task.exception()
+
+    @demo.app.post("/api/loadtest/pipeline")
+    async def start_load_pipeline(scenario: str = PIPELINE_SCENARIOS[0]):
+        pipeline_id = f"load-{uuid.uuid4().hex[:10]}"
+        task = asyncio.create_task(demo.run_real_pipeline(scenario, pipeline_id, f"INC-{pipeline_id}"))
+        tasks.add(task)
+        task.add_done_callback(forget_task)
+        return {"pipeline_id": pipeline_id}
+
+    @demo.app.get("/api/loadtest/stats")
+    async def get_load_stats(reset: bool = False):
+        stats = {
+            "runs": tracker.to_dict(),
+            "loop_lag_ms": _summarise(lag_samples),
+            "rss_bytes": process_rss_bytes(),
+            "rss_peak_bytes": max(rss_samples, default=None),
+        }
+        if reset:
+            del lag_samples[:]
+            rss_samples.clear()
+        return stats
+
+    async def sample_rss(stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            rss = process_rss_bytes()
+            if rss is not None:
+                rss_samples.append(rss)
+            await asyncio.sleep(0.25)
+
+    async def run() -> None:
+        stop = asyncio.Event()
+        samplers = [
+            asyncio.create_task(_sample_loop_lag(0.005, lag_samples, stop)),
+            asyncio.create_task(sample_rss(stop)),
+        ]
+        config = uvicorn.Config(demo.app, host="127.0.0.1", port=args.port, log_level="warning")
+        try:
+            await uvicorn.Server(config).serve()
+        finally:
+            stop.set()
+            await asyncio.gather(*samplers, return_exceptions=True)
+
+    asyncio.run(run())
+    return 0
+
+
+# ----------------------------------------------------------------------
+# Load generator
+# ----------------------------------------------------------------------
+class _DashboardClient:
+    """WebSocket client that tracks state versions and delivery latency."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.messages = 0
+        self.bytes = 0
+        self.latencies_ms = array("d")
+        self.gaps = 0
+        self.resyncs = 0
+        self.close_code: Optional[int] = None
+        self._versions: Dict[str, Any] = {}
+        self._awaiting_snapshot: set = set()
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self, timeout: float) -> None:
+        self._ws = await websockets.connect(self.url, max_size=None, ping_interval=None, open_timeout=timeout)
+        self._task = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        try:
+            async for frame in self._ws:
+                received_at = time.time()
+                self.messages += 1
+                self.bytes += len(frame)
+                try:
+                    message = json.loads(frame)
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                sent_at = message.get("timestamp")
+                if isinstance(sent_at, str):
+                    try:
+                        self.latencies_ms.append((received_at - datetime.fromisoformat(sent_at).timestamp()) * 1000.0)
+                    except ValueError:
+                        pass
+                await self._track_version(message)
+        except websockets.ConnectionClosed as e:
+            self.close_code = getattr(e, "code", None) or getattr(getattr(e, "rcvd", None), "code", None)
+
+    async def _track_version(self, message: Mapping[str, Any]) -> None:
+        pipeline_id, kind = message.get("pipeline_id"), message.get("kind")
+        if pipeline_id is None or kind is None:
+            return
+        if kind == "snapshot":
+            self._versions[pipeline_id] = message.get("version")
+            self._awaiting_snapshot.discard(pipeline_id)
+        elif kind == "patch":
+            if pipeline_id in self._awaiting_snapshot:
+                return
+            if self._versions.get(pipeline_id) != message.get("base_version"):
+                # What the dashboard does: drop the mirror and ask for a snapshot
+                self.gaps += 1
+                self._awaiting_snapshot.add(pipeline_id)
+                self._versions.pop(pipeline_id, None)
+                self.resyncs += 1
+                await self._ws.send(json.dumps({"type": "resync", "pipeline_id": pipeline_id}))
+            else:
+                self._versions[pipeline_id] = message.get("version")
+        elif kind == "evicted":
+            self._versions.pop(pipeline_id, None)
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_until_healthy(http: "httpx.AsyncClient", server: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode} during startup")
+        try:
+            if (await http.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError(f"Server not healthy after {timeout}s")
+
+
+def _start_server(args: argparse.Namespace, port: int, dataset: Path, log_path: Path) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "benchmarks.websocket_load", "--serve",
+        "--port", str(port),
+        "--dataset", str(dataset),
+        "--llm-latency-ms", str(args.llm_latency_ms),
+        "--llm-jitter", str(args.llm_jitter),
+        "--stream-chunk-chars", str(args.stream_chunk_chars),
+        "--kb-latency-ms", str(args.kb_latency_ms),
+        "--seed", str(args.seed),
+    ]
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    env.setdefault("SRE_POC_LOG_DIR", str(log_path.parent))
+    with open(log_path, "ab") as log:
+        return subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT, env=env)
+
+
+def _stop_server(server: subprocess.Popen) -> None:
+    if server.poll() is None:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+async def _run_step(args: argparse.Namespace, clients_count: int, workdir: Path) -> Dict[str, Any]:
+    """Run one load level against a fresh server."""
+    port = _free_port()
+    log_path = workdir / f"server-{clients_count}.log"
+    server = _start_server(args, port, workdir / "logs.jsonl", log_path)
+    base_url = f"http://127.0.0.1:{port}"
+    ws_url = f"ws://127.0.0.1:{port}{args.endpoint}" + (f"?{args.subscribe}" if args.subscribe else "")
+
+    clients: List[_DashboardClient] = []
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as http:
+            await _wait_until_healthy(http, server, args.startup_timeout)
+            idle = (await http.get("/api/loadtest/stats", params={"reset": True})).json()
+
+            # Connect in batches so the accept backlog is not the bottleneck
+            semaphore = asyncio.Semaphore(100)
+
+            async def connect(client: _DashboardClient) -> None:
+                async with semaphore:
+                    await client.connect(args.connect_timeout)
+
+            clients = [_DashboardClient(ws_url) for _ in range(clients_count)]
+            results = await asyncio.gather(*(connect(client) for client in clients), return_exceptions=True)
+            connect_errors = [repr(r) for r in results if isinstance(r, BaseException)]
+            clients = [client for client, result in zip(clients, results) if not isinstance(result, BaseException)]
+            received_before = sum(client.messages for client in clients)
+            bytes_before = sum(client.bytes for client in clients)
+            for client in clients:
+                # Connection snapshots are not load; count only what follows
+                client.latencies_ms = array("d")
+            await http.get("/api/loadtest/stats", params={"reset": True})
+
+            client_lag = array("d")
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(_sample_loop_lag(0.005, client_lag, stop))
+            started = time.perf_counter()
+
+            for index in range(args.pipelines):
+                await http.post(
+                    "/api/loadtest/pipeline",
+                    params={"scenario": PIPELINE_SCENARIOS[index % len(PIPELINE_SCENARIOS)]},
+                )
+            for index in range(args.sessions):
+                await http.post("/api/streaming/start", json={
+                    "start_time": SESSION_START_TIMES[index % len(SESSION_START_TIMES)],
+                    "window_size_minutes": 15,
+                    "max_windows": args.session_windows,
+                    "window_interval_seconds": args.window_interval_seconds,
+                })
+
+            # Wait for every pipeline and session to finish
+            timed_out = False
+            while True:
+                runs = (await http.get("/api/loadtest/stats")).json()["runs"]
+                started_runs = runs["started"]
+                if (
+                    started_runs.get("pipelines", 0) >= args.pipelines
+                    and started_runs.get("sessions", 0) >= args.sessions
+                    and not any(runs["in_flight"].values())
+                ):
+                    break
+                if time.perf_counter() - started > args.timeout:
+                    timed_out = True
+                    break
+                await asyncio.sleep(0.5)
+
+            # Let the send queues drain before reading the counters
+            drain_deadline = time.perf_counter() + args.drain_seconds
+            while time.perf_counter() < drain_deadline:
+                if not (await http.get("/api/websocket/metrics")).json()["queued"]:
+                    break
+                await asyncio.sleep(0.1)
+            duration_s = time.perf_counter() - started
+
+            stop.set()
+            await sampler
+            load = (await http.get("/api/loadtest/stats")).json()
+            broadcast = (await http.get("/api/websocket/metrics")).json()
+            memory = (await http.get("/api/memory")).json()
+    finally:
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+        _stop_server(server)
+
+    received = sum(client.messages for client in clients) - received_before
+    received_bytes = sum(client.bytes for client in clients) - bytes_before
+    latencies = array("d")
+    for client in clients:
+        latencies.extend(client.latencies_ms)
+    rss_start = idle["rss_bytes"] or 0
+    rss_end = load["rss_bytes"] or 0
+    rss_peak = max(load["rss_peak_bytes"] or 0, rss_end)
+
+    return {
+        "clients": clients_count,
+        "connected": len(clients),
+        "connect_errors": connect_errors[:5],
+        "runs": load["runs"],
+        "timed_out": timed_out,
+        "duration_seconds": round(duration_s, 3),
+        "messages_received": received,
+        "messages_per_second": round(received / duration_s, 1) if duration_s else 0.0,
+        "bytes_per_second": round(received_bytes / duration_s, 1) if duration_s else 0.0,
+        "messages_per_client": round(received / len(clients), 1) if clients else 0.0,
+        "latency_ms": _summarise(latencies),
+        "server_loop_lag_ms": load["loop_lag_ms"],
+        "client_loop_lag_ms": _summarise(client_lag),
+        "memory": {
+            "rss_start_mb": round(rss_start / 2**20, 1),
+            "rss_peak_mb": round(rss_peak / 2**20, 1),
+            "rss_end_mb": round(rss_end / 2**20, 1),
+            "rss_growth_mb": round((rss_end - rss_start) / 2**20, 1),
+            "live_pipelines": memory["pipelines"]["live"],
+            "pipeline_state_mb": round(memory["pipelines"]["approx_bytes"] / 2**20, 2),
+        },
+        "delivery": {
+            "server_sent": broadcast["sent"],
+            "server_dropped": broadcast["dropped"],
+            "server_coalesced": broadcast["coalesced"],
+            "server_evicted_clients": broadcast["evicted"],
+            "client_gaps": sum(client.gaps for client in clients),
+            "client_resyncs": sum(client.resyncs for client in clients),
+            "clients_closed_by_server": sum(1 for client in clients if client.close_code not in (None, 1000)),
+        },
+        "server_log": str(log_path) if args.keep_logs else None,
+    }
+
+
+# Metrics compared against a baseline report: (path, higher_is_better)
+_COMPARED = (
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p99"), False),
+    (("messages_per_second",), True),
+    (("server_loop_lag_ms", "p99"), False),
+    (("memory", "rss_growth_mb"), False),
+    (("memory", "rss_peak_mb"), False),
+    (("delivery", "server_dropped"), False),
+    (("delivery", "client_gaps"), False),
+)
+
+
+def _lookup(result: Mapping[str, Any], path) -> Optional[float]:
+    value: Any = result
+    for key in path:
+        if not isinstance(value, Mapping) or key not in value:
+            return None
+        value = value[key]
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare_reports(report: Mapping[str, Any], baseline: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Per-client-count deltas of the key metrics against a baseline report."""
+    previous = {result["clients"]: result for result in baseline.get("results", [])}
+    rows = []
+    for result in report["results"]:
+        before = previous.get(result["clients"])
+        if before is None:
+            continue
+        metrics = {}
+        for path, higher_is_better in _COMPARED:
+            old, new = _lookup(before, path), _lookup(result, path)
+            if old is None or new is None:
+                continue
+            change = round((new - old) / old * 100.0, 1) if old else None
+            metrics[".".join(path)] = {
+                "baseline": old,
+                "current": new,
+                "change_pct": change,
+                "better": (new >= old) if higher_is_better else (new <= old),
+            }
+        rows.append({"clients": result["clients"], "metrics": metrics})
+    return rows
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every requested load level and return the report."""
+    _raise_fd_limit()
+    with tempfile.TemporaryDirectory(prefix="sre-load-") as tmp:
+        workdir = Path(args.log_dir) if args.keep_logs else Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        entries = write_dataset(workdir / "logs.jsonl", seed=args.seed)
+        results = []
+        for clients_count in args.clients:
+            print(f"▶️  {clients_count} clients, {args.pipelines} pipelines, {args.sessions} sessions", file=sys.stderr)
+            results.append(await _run_step(args, clients_count, workdir))
+    return {
+        "config": {
+            "endpoint": args.endpoint,
+            "subscribe": args.subscribe,
+            "pipelines": args.pipelines,
+            "sessions": args.sessions,
+            "session_windows": args.session_windows,
+            "window_interval_seconds": args.window_interval_seconds,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_jitter": args.llm_jitter,
+            "stream_chunk_chars": args.stream_chunk_chars,
+            "kb_latency_ms": args.kb_latency_ms,
+            "dataset_entries": entries,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def _check_thresholds(report: Mapping[str, Any], args: argparse.Namespace) -> List[str]:
+    breaches = []
+    for result in report["results"]:
+        label = f"{result['clients']} clients"
+        if result["timed_out"]:
+            breaches.append(f"{label}: runs still in flight after {args.timeout}s")
+        if result["connect_errors"]:
+            breaches.append(f"{label}: {result['clients'] - result['connected']} client(s) failed to connect")
+        if args.max_latency_p99_ms is not None and result["latency_ms"]["p99"] > args.max_latency_p99_ms:
+            breaches.append(f"{label}: delivery latency p99 {result['latency_ms']['p99']}ms > {args.max_latency_p99_ms}ms")
+        if args.max_loop_lag_p99_ms is not None and result["server_loop_lag_ms"]["p99"] > args.max_loop_lag_p99_ms:
+            breaches.append(
+                f"{label}: server event-loop lag p99 {result['server_loop_lag_ms']['p99']}ms > {args.max_loop_lag_p99_ms}ms"
+            )
+    return breaches
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test demo_app WebSocket updates with a fake LLM")
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100], help="WebSocket client counts to test")
+    parser.add_argument("--pipelines", type=int, default=5, help="Incident pipelines triggered per run")
+    parser.add_argument("--sessions", type=int, default=1, help="Streaming sessions started per run")
+    parser.add_argument("--session-windows", type=int, default=6, help="Windows processed per streaming session")
+    parser.add_argument("--window-interval-seconds", type=float, default=0.2, help="Pause between session windows")
+    parser.add_argument("--endpoint", default="/ws/pipeline", choices=["/ws/pipeline", "/ws/demo"], help="WebSocket endpoint")
+    parser.add_argument("--subscribe", help="Subscription query string for every client, e.g. 'severity=SEV-1'")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="Mean injected latency per LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="Relative latency jitter (0.2 = +/-20%%)")
+    parser.add_argument("--stream-chunk-chars", type=int, default=32, help="Characters per streamed chunk")
+    parser.add_argument("--kb-latency-ms", type=float, default=0.0, help="Blocking latency per knowledge lookup")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the dataset and latency jitter")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds to wait for runs to finish")
+    parser.add_argument("--drain-seconds", type=float, default=5.0, help="Seconds to wait for send queues to empty")
+    parser.add_argument("--startup-timeout", type=float, default=60.0, help="Seconds to wait for the server to start")
+    parser.add_argument("--connect-timeout", type=float, default=30.0, help="Seconds per WebSocket handshake")
+    parser.add_argument("--keep-logs", action="store_true", help="Keep the dataset and server logs in --log-dir")
+    parser.add_argument("--log-dir", default="load-test-logs", help="Directory for --keep-logs")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file")
+    parser.add_argument("--baseline", type=Path, help="Earlier report to compare against")
+    parser.add_argument("--max-latency-p99-ms", type=float, help="Fail if delivery latency p99 exceeds this")
+    parser.add_argument("--max-loop-lag-p99-ms", type=float, help="Fail if server event-loop lag p99 exceeds this")
+    # Internal: run the server half in a child process
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--dataset", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return _serve(args)
+
+    missing = [name for name, available in (("httpx", HTTPX_AVAILABLE), ("websockets", WEBSOCKETS_AVAILABLE)) if not available]
+    if missing:
+        print(f"❌ The load generator needs: pip install {' '.join(missing)}", file=sys.stderr)
+        return 2
+
+    report = asyncio.run(run_load_test(args))
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("config") != report["config"]:
+            print("⚠️  Baseline was run with a different configuration; deltas mix load and code changes", file=sys.stderr)
+        report["comparison"] = compare_reports(report, baseline)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+    breaches = _check_thresholds(report, args)
+    for breach in breaches:
+        print(f"❌ {breach}", file=sys.stderr)
+    return 1 if breaches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
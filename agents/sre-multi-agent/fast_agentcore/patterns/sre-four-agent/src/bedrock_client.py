@@ -332,3 +332,137 @@ def converse_claude_stream(
 
         logger.error(f"Bedrock streaming error: {e}")
         raise
+
+
+# Model families that accept toolConfig in the Converse API
+_TOOL_USE_MODEL_PREFIXES = (
+    "anthropic.claude-3",
+    "anthropic.claude-sonnet",
+    "anthropic.claude-opus",
+    "anthropic.claude-haiku",
+    "meta.llama3-1",
+    "meta.llama3-2-11b",
+    "meta.llama3-2-90b",
+    "meta.llama3-3",
+    "meta.llama4",
+    "mistral.mistral-large",
+    "cohere.command-r",
+    "amazon.nova",
+)
+
+
+def _base_model_id(model_id: str) -> str:
+    """Strip cross-region inference profile prefixes (e.g. ``us.``) from a model id."""
+    parts = model_id.split(".", 1)
+    if len(parts) == 2 and parts[0] in ("us", "eu", "apac", "us-gov", "global"):
+        return parts[1]
+    return model_id
+
+
+def supports_tool_use(model_id: str) -> bool:
+    """Return True if the model supports Converse tool use."""
+    return _base_model_id(model_id).startswith(_TOOL_USE_MODEL_PREFIXES)
+
+
+def converse_structured(
+    messages: List[Dict[str, Any]],
+    system: str,
+    model_id: str,
+    max_tokens: int,
+    temperature: float,
+    tool_name: str,
+    input_schema: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Call the Bedrock Converse API with the response schema as a tool spec.
+
+    The model is asked to call ``tool_name`` and the tool input is returned
+    as already-structured arguments, so no JSON text parsing is needed.
+
+    Raises:
+        ValueError: If the model answers without calling the tool
+    """
+
+    client = bedrock_client()
+
+    converse_messages = [
+        {
+            "role": str(message.get("role", "user")),
+            "content": [{"text": str(message.get("content", ""))}],
+        }
+        for message in messages
+    ]
+
+    tool_config: Dict[str, Any] = {
+        "tools": [
+            {
+                "toolSpec": {
+                    "name": tool_name,
+                    "description": "Submit the final response using the required schema.",
+                    "inputSchema": {"json": input_schema},
+                }
+            }
+        ]
+    }
+    # Forcing a specific tool is only supported by Anthropic models; other
+    # families are steered by the system prompt instead
+    if _base_model_id(model_id).startswith("anthropic."):
+        tool_config["toolChoice"] = {"tool": {"name": tool_name}}
+
+    emit_event(
+        "bedrock_client",
+        "llm_request",
+        wrap_payload(
+            model=model_id,
+            region=_REGION,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=False,
+            structured=True,
+        ),
+    )
+
+    try:
+        response = client.converse(
+            modelId=model_id,
+            messages=converse_messages,
+            system=[
+                {
+                    "text": f"{system}\n\nRespond only by calling the {tool_name} tool."
+                }
+            ],
+            inferenceConfig={"maxTokens": max(1, max_tokens), "temperature": temperature},
+            toolConfig=tool_config,
+        )
+    except ClientError as e:
+        error_code = e.response.get("Error", {}).get("Code", "Unknown")
+        error_message = e.response.get("Error", {}).get("Message", str(e))
+
+        emit_event(
+            "bedrock_client",
+            "llm_error",
+            wrap_payload(
+                model=model_id, error_code=error_code, error_message=error_message
+            ),
+        )
+
+        logger.error(f"Bedrock Converse API error ({error_code}): {error_message}")
+        raise
+
+    for block in response.get("output", {}).get("message", {}).get("content", []):
+        tool_use = block.get("toolUse")
+        if tool_use and tool_use.get("name") == tool_name:
+            emit_event(
+                "bedrock_client",
+                "llm_success",
+                wrap_payload(
+                    model=model_id,
+                    stop_reason=response.get("stopReason"),
+                    usage=response.get("usage"),
+                    structured=True,
+                ),
+            )
+            return tool_use.get("input") or {}
+
+    raise ValueError(
+        f"Model {model_id} did not call {tool_name} (stopReason={response.get('stopReason')})"
+    )
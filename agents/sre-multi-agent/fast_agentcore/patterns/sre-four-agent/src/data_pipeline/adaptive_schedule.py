@@ -0,0 +1,434 @@
+"""Activity-driven window scheduling for streaming analysis sessions.
+
+A streaming session normally analyses a fixed window every five minutes, so a
+quiet hour costs as many analyst calls as an incident. The scheduler computes
+cheap statistics for each window (volume, error rate, log templates not seen
+before) and compares them with a running baseline:
+
+- stable windows widen the stride (up to the window length) and skip the
+  analyst, except for a periodic heartbeat analysis and while an incident
+  detected earlier is still open
+- windows that moved past the thresholds are analysed at the base stride
+- sharp changes the analyst did not yet call an incident shrink the stride and
+  the window so the onset is pinned down
+
+Window starts are picked from a ``generate_window_schedule`` grid, and the
+report puts the analyst calls saved against the longest stretch of data no
+analysed window covered, which bounds the detection delay skipping can add.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from ..orchestration.real_time.incident_fingerprint import normalize_log_template
+from .log_window_processor import LogEntry, generate_window_schedule, get_window_metadata
+
+# Levels whose templates count towards "new templates"
+_SIGNAL_LEVELS = {"ERROR", "CRITICAL", "FATAL", "WARN", "WARNING"}
+
+# Cap on the templates remembered for the novelty check; past it the set stops growing
+_MAX_KNOWN_TEMPLATES = 2000
+
+STABLE = "stable"
+CHANGED = "changed"
+SHARP = "sharp"
+
+
+@dataclass(frozen=True)
+class AdaptiveScheduleConfig:
+    """Strides, window sizes and change thresholds of the scheduler."""
+
+    enabled: bool = True
+    base_stride_minutes: int = 5
+    min_stride_minutes: int = 1
+    max_stride_minutes: int = 10
+    min_window_minutes: int = 5
+    # A window is "changed" once any signal reaches its threshold and "sharp"
+    # at ``sharp_factor`` times the threshold
+    error_rate_delta: float = 5.0  # percentage points
+    volume_change_ratio: float = 0.5
+    new_templates: int = 1
+    sharp_factor: float = 2.0
+    # Stable windows in a row before the stride starts doubling
+    stable_windows_to_widen: int = 2
+    # Skipped windows in a row before a heartbeat analysis is forced
+    max_skipped_windows: int = 3
+    # Weight of the newest window in the baseline averages
+    baseline_alpha: float = 0.5
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.min_stride_minutes <= self.base_stride_minutes <= self.max_stride_minutes:
+            raise ValueError("Strides must satisfy 1 <= min <= base <= max")
+        if self.min_window_minutes < 1:
+            raise ValueError("min_window_minutes must be at least 1")
+        if not 0.0 < self.baseline_alpha <= 1.0:
+            raise ValueError("baseline_alpha must be in (0, 1]")
+
+
+@dataclass(frozen=True)
+class WindowStats:
+    """Statistics of one window that cost no model call."""
+
+    total_logs: int
+    logs_per_minute: float
+    error_rate: float
+    warn_rate: float
+    templates: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def from_logs(cls, logs: List[LogEntry], window_minutes: int) -> "WindowStats":
+        """
+        Compute statistics for a window.
+
+        Args:
+            logs: Log entries of the window
+            window_minutes: Length of the window in minutes
+
+        Returns:
+            WindowStats with rates in percent and the WARN+ message templates
+        """
+        metadata = get_window_metadata(logs)
+        templates = frozenset(
+            normalize_log_template(log.message)
+            for log in logs
+            if str(log.level).upper() in _SIGNAL_LEVELS
+        )
+        return cls(
+            total_logs=metadata["total_logs"],
+            logs_per_minute=metadata["total_logs"] / max(window_minutes, 1),
+            error_rate=metadata.get("error_rate", 0.0),
+            warn_rate=metadata.get("warn_rate", 0.0),
+            templates=templates,
+        )
+
+
+@dataclass(frozen=True)
+class ScheduledWindow:
+    """A window the session should look at next."""
+
+    number: int
+    start: datetime
+    minutes: int
+    stride_minutes: int
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(minutes=self.minutes)
+
+
+@dataclass(frozen=True)
+class WindowDecision:
+    """Whether to spend an analyst call on a window, and why."""
+
+    analyze: bool
+    activity: str
+    reason: str
+    change_score: float
+    new_templates: int
+    next_stride_minutes: int
+    next_window_minutes: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "analyze": self.analyze,
+            "activity": self.activity,
+            "reason": self.reason,
+            "change_score": round(self.change_score, 3),
+            "new_templates": self.new_templates,
+            "next_stride_minutes": self.next_stride_minutes,
+            "next_window_minutes": self.next_window_minutes,
+        }
+
+
+@dataclass
+class _Baseline:
+    error_rate: Optional[float] = None
+    logs_per_minute: Optional[float] = None
+    templates: Set[str] = field(default_factory=set)
+
+    def update(self, stats: WindowStats, alpha: float) -> None:
+        if self.error_rate is None or self.logs_per_minute is None:
+            self.error_rate = stats.error_rate
+            self.logs_per_minute = stats.logs_per_minute
+        else:
+            self.error_rate += alpha * (stats.error_rate - self.error_rate)
+            self.logs_per_minute += alpha * (stats.logs_per_minute - self.logs_per_minute)
+        for template in stats.templates:
+            if len(self.templates) >= _MAX_KNOWN_TEMPLATES:
+                break
+            self.templates.add(template)
+
+
+class AdaptiveWindowScheduler:
+    """Pick the next window and decide which windows are worth an analyst call."""
+
+    def __init__(
+        self,
+        start: datetime,
+        end: datetime,
+        window_minutes: int = 15,
+        config: Optional[AdaptiveScheduleConfig] = None,
+    ):
+        """
+        Initialize a schedule over ``[start, end]``.
+
+        Args:
+            start: Start of the first window
+            end: Latest window start the session covers
+            window_minutes: Window size used at the base stride
+            config: Scheduler settings; ``enabled=False`` reproduces the fixed
+                schedule (base stride, every non-empty window analysed)
+        """
+        self.config = config or AdaptiveScheduleConfig()
+        self.start = start
+        self.end = end
+        self.base_window_minutes = window_minutes
+
+        cfg = self.config
+        self._grid_minutes = math.gcd(
+            math.gcd(cfg.min_stride_minutes, cfg.base_stride_minutes), cfg.max_stride_minutes
+        )
+        span_minutes = max((end - start).total_seconds() / 60, 0.0)
+        # generate_window_schedule stops short of its end, so cover one grid step past ``end``
+        hours = max(1, math.ceil((span_minutes + self._grid_minutes) / 60))
+        self._grid = [t for t in generate_window_schedule(start, hours, self._grid_minutes) if t <= end]
+
+        self._index = 0
+        self._observed: Optional[ScheduledWindow] = None
+        self._stride = cfg.base_stride_minutes
+        self._window = window_minutes
+        self._baseline = _Baseline()
+        self._stable_streak = 0
+        self._skipped_streak = 0
+        self._incident_open = False
+        self._pending: Optional[ScheduledWindow] = None
+        self._last_analysed_end: Optional[datetime] = None
+        self._last_window_end: Optional[datetime] = None
+
+        # Accounting
+        self.windows = 0
+        self.analysed_windows = 0
+        self.llm_calls = 0
+        self.cached_analyses = 0
+        self.skipped = 0
+        self.empty_windows = 0
+        self.stride_counts: Dict[int, int] = {}
+        self.activity_counts: Dict[str, int] = {STABLE: 0, CHANGED: 0, SHARP: 0}
+        self.max_unanalysed_gap_minutes = 0.0
+        self.detections: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def next_window(self) -> Optional[ScheduledWindow]:
+        """The window to process next, or None once the span is covered."""
+        if self._pending is not None:
+            return self._pending
+        if self._observed is not None:
+            # Step from the last window only now, after the analyst's verdict on it
+            self._index += max(1, self._stride // self._grid_minutes)
+            self._observed = None
+        if self._index >= len(self._grid):
+            return None
+        self._pending = ScheduledWindow(
+            number=self.windows + 1,
+            start=self._grid[self._index],
+            minutes=self._window,
+            stride_minutes=self._stride,
+        )
+        return self._pending
+
+    def observe(self, window: ScheduledWindow, stats: WindowStats) -> WindowDecision:
+        """
+        Classify a window from its statistics and plan the next one.
+
+        Args:
+            window: The window returned by ``next_window``
+            stats: Statistics of that window's logs
+
+        Returns:
+            WindowDecision saying whether to run the analyst on it
+        """
+        if window is not self._pending:
+            raise RuntimeError("observe() must be called with the window from next_window()")
+        cfg = self.config
+        score, new_templates = self._change_score(stats)
+        first = self._baseline.error_rate is None
+
+        if first:
+            activity = CHANGED
+        elif score >= cfg.sharp_factor:
+            activity = SHARP
+        elif score >= 1.0:
+            activity = CHANGED
+        else:
+            activity = STABLE
+
+        if stats.total_logs == 0:
+            analyze, reason = False, "empty"
+        elif not cfg.enabled:
+            analyze, reason = True, "fixed"
+        elif first:
+            analyze, reason = True, "baseline"
+        elif activity != STABLE:
+            analyze, reason = True, activity
+        elif self._incident_open:
+            analyze, reason = True, "incident_open"
+        elif self._skipped_streak >= cfg.max_skipped_windows:
+            analyze, reason = True, "heartbeat"
+        else:
+            analyze, reason = False, "stable"
+
+        if cfg.enabled:
+            self._adapt(activity)
+        self._baseline.update(stats, cfg.baseline_alpha)
+
+        # Accounting
+        self.windows += 1
+        self.activity_counts[activity] += 1
+        self.stride_counts[window.stride_minutes] = self.stride_counts.get(window.stride_minutes, 0) + 1
+        if stats.total_logs == 0:
+            self.empty_windows += 1
+        elif not analyze:
+            self.skipped += 1
+        self._skipped_streak = 0 if analyze else self._skipped_streak + (stats.total_logs > 0)
+        self._last_window_end = window.end
+        if analyze:
+            self._note_coverage(window)
+
+        self._pending = None
+        self._observed = window
+        return WindowDecision(
+            analyze=analyze,
+            activity=activity,
+            reason=reason,
+            change_score=score,
+            new_templates=new_templates,
+            next_stride_minutes=self._stride,
+            next_window_minutes=self._window,
+        )
+
+    def record_analysis(self, window: ScheduledWindow, anomalous: bool, cache_hit: bool = False) -> None:
+        """
+        Record the outcome of an analyst call on a window.
+
+        Open incidents keep the session at the base stride with every window
+        analysed until the analyst stops reporting an anomaly.
+
+        Args:
+            window: Window that was analysed
+            anomalous: Whether the analyst reported an anomaly
+            cache_hit: The result came from the window analysis cache, so
+                the model was not called
+        """
+        self.analysed_windows += 1
+        if cache_hit:
+            self.cached_analyses += 1
+        else:
+            self.llm_calls += 1
+        if anomalous and not self._incident_open:
+            self.detections.append({
+                "window_number": window.number,
+                "window_start": window.start.isoformat(),
+                "window_minutes": window.minutes,
+                "stride_minutes": window.stride_minutes,
+            })
+        self._incident_open = anomalous
+        if anomalous and self.config.enabled:
+            # The onset is found; follow the incident at the base stride
+            self._stride = self.config.base_stride_minutes
+            self._window = self.base_window_minutes
+
+    def _change_score(self, stats: WindowStats) -> Tuple[float, int]:
+        cfg = self.config
+        baseline = self._baseline
+        new_templates = len(stats.templates - baseline.templates)
+        if baseline.error_rate is None or baseline.logs_per_minute is None:
+            return 0.0, new_templates
+        error_score = abs(stats.error_rate - baseline.error_rate) / cfg.error_rate_delta
+        volume_score = (
+            abs(stats.logs_per_minute - baseline.logs_per_minute)
+            / max(baseline.logs_per_minute, 1.0)
+            / cfg.volume_change_ratio
+        )
+        template_score = new_templates / cfg.new_templates if cfg.new_templates else 0.0
+        return max(error_score, volume_score, template_score), new_templates
+
+    def _adapt(self, activity: str) -> None:
+        cfg = self.config
+        if activity == SHARP and not self._incident_open:
+            self._stable_streak = 0
+            self._stride = cfg.min_stride_minutes
+            self._window = min(cfg.min_window_minutes, self.base_window_minutes)
+        elif activity != STABLE or self._incident_open:
+            self._stable_streak = 0
+            self._stride = cfg.base_stride_minutes
+            self._window = self.base_window_minutes
+        else:
+            self._stable_streak += 1
+            self._stride = max(self._stride, cfg.base_stride_minutes)
+            if self._stable_streak >= cfg.stable_windows_to_widen:
+                # Never past the window length, so the statistics still see every log
+                widest = max(min(cfg.max_stride_minutes, self.base_window_minutes), cfg.base_stride_minutes)
+                self._stride = min(self._stride * 2, widest)
+            self._window = self.base_window_minutes
+
+    def _note_coverage(self, window: ScheduledWindow) -> None:
+        covered_from = self._last_analysed_end or self.start
+        gap = (window.start - covered_from).total_seconds() / 60
+        self.max_unanalysed_gap_minutes = max(self.max_unanalysed_gap_minutes, gap)
+        self._last_analysed_end = max(self._last_analysed_end or window.end, window.end)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    @property
+    def fixed_schedule_calls(self) -> int:
+        """Analyst calls the fixed schedule makes over the same span."""
+        span = (self.end - self.start).total_seconds() / 60
+        return int(span // self.config.base_stride_minutes) + 1
+
+    def report(self) -> Dict[str, Any]:
+        """Analyst calls made and saved, and the coverage cost of skipping.
+
+        ``llm_calls`` counts model calls only; analyses served from the window
+        analysis cache are ``cached_analyses``, and ``llm_calls_saved``
+        includes them.
+        """
+        fixed = self.fixed_schedule_calls
+        trailing_gap = 0.0
+        if self._last_window_end is not None:
+            covered = self._last_analysed_end or self.start
+            trailing_gap = max((self._last_window_end - covered).total_seconds() / 60, 0.0)
+        return {
+            "mode": "adaptive" if self.config.enabled else "fixed",
+            "windows": self.windows,
+            "analysed_windows": self.analysed_windows,
+            "llm_calls": self.llm_calls,
+            "cached_analyses": self.cached_analyses,
+            "skipped_windows": self.skipped,
+            "empty_windows": self.empty_windows,
+            "fixed_schedule_calls": fixed,
+            "llm_calls_saved": fixed - self.llm_calls,
+            "llm_calls_saved_pct": round((fixed - self.llm_calls) / fixed * 100, 1) if fixed else 0.0,
+            "activity": dict(self.activity_counts),
+            "strides": {str(stride): count for stride, count in sorted(self.stride_counts.items())},
+            # Data no analysed window looked at: an incident starting there is
+            # detected at most this much later than under the fixed schedule
+            "max_unanalysed_gap_minutes": round(self.max_unanalysed_gap_minutes, 1),
+            "trailing_unanalysed_minutes": round(trailing_gap, 1),
+            "detections": list(self.detections),
+        }
+
+
+__all__ = [
+    "AdaptiveScheduleConfig",
+    "AdaptiveWindowScheduler",
+    "ScheduledWindow",
+    "WindowDecision",
+    "WindowStats",
+]
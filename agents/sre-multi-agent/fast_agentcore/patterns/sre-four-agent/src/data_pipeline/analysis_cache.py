@@ -0,0 +1,322 @@
+"""Two-tier store of analyst results per log window.
+
+A window's analyst result only depends on the dataset, the window bounds, the
+model and the analyst prompt. Replays and concurrent dashboard sessions over
+the same data therefore reuse stored results instead of calling the LLM again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..orchestration.four_agent.schema import AgentMessage
+from ..orchestration.four_agent.settings import ANALYSIS_CACHE_MAX_AGE_SECONDS, ANALYSIS_CACHE_MAX_FILES
+
+# Scores the analyst's response schema requires; a result without them was
+# not parsed from a complete response
+_REQUIRED_DETAILS = ("severity_score", "anomaly_confidence")
+
+
+@dataclass(frozen=True)
+class WindowAnalysisKey:
+    """Identity of a window analysis."""
+    dataset_hash: str
+    window_start: datetime
+    window_minutes: int
+    model_id: str
+    prompt_version: str
+
+    @property
+    def digest(self) -> str:
+        """Stable hex digest used as the cache file name."""
+        raw = "|".join([
+            self.dataset_hash,
+            self.window_start.astimezone(timezone.utc).isoformat(),
+            str(self.window_minutes),
+            self.model_id,
+            self.prompt_version,
+        ])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class WindowAnalysisCache:
+    """
+    In-memory LRU backed by a directory of JSON files.
+
+    Lookups check the LRU first, then the disk tier (promoting hits into the
+    LRU). Writes go to both tiers. Stored messages are returned as copies with
+    the caller's incident id so cached results never leak ids between sessions.
+
+    The disk tier is bounded too: ``sweep`` deletes files past the maximum age
+    and then the oldest beyond ``max_disk_entries``. It runs when the cache is
+    opened and after every tenth of ``max_disk_entries`` writes, so the
+    directory overshoots the limit by at most that much.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        cache_dir: Path | str | None = None,
+        persist: bool = True,
+        max_disk_entries: int = ANALYSIS_CACHE_MAX_FILES,
+        max_age_seconds: float = ANALYSIS_CACHE_MAX_AGE_SECONDS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            cache_dir: Directory for the disk tier. If None, uses .analysis_cache
+                in the project root.
+            persist: Set False to disable the disk tier
+            max_disk_entries: Maximum number of result files kept on disk
+            max_age_seconds: Age after which a result file is deleted; 0
+                keeps files regardless of age
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_disk_entries < 1:
+            raise ValueError("max_disk_entries must be at least 1")
+
+        if cache_dir is None:
+            cache_dir = Path(__file__).resolve().parents[2] / ".analysis_cache"
+
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_age_seconds = max_age_seconds
+        self.cache_dir = Path(cache_dir) if persist else None
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_sweep = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.sweep()
+
+    def _path(self, key: WindowAnalysisKey) -> Path:
+        return self.cache_dir / f"{key.digest}.json"
+
+    def _remember(self, digest: str, record: Dict[str, Any]) -> None:
+        """Insert into the LRU, evicting the least recently used entry."""
+        self._entries[digest] = record
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: WindowAnalysisKey, incident_id: Optional[str] = None) -> Optional[AgentMessage]:
+        """
+        Look up a stored analyst result.
+
+        Args:
+            key: Window analysis key
+            incident_id: Incident id to stamp on the returned message
+
+        Returns:
+            AgentMessage if stored, otherwise None
+        """
+        digest = key.digest
+        with self._lock:
+            record = self._entries.get(digest)
+            if record is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+
+        if record is None and self.cache_dir is not None:
+            path = self._path(key)
+            if path.exists():
+                try:
+                    with open(path, "r") as f:
+                        record = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"⚠️  Ignoring unreadable analysis cache entry {path.name}: {e}")
+                    record = None
+                if record is not None:
+                    with self._lock:
+                        self._remember(digest, record)
+                        self.hits += 1
+                        self.disk_hits += 1
+
+        if record is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        message = AgentMessage.model_validate(record["message"])
+        if incident_id is not None:
+            message = message.model_copy(update={"incident_id": incident_id})
+        return message
+
+    def put(self, key: WindowAnalysisKey, message: AgentMessage) -> None:
+        """
+        Store an analyst result in both tiers.
+
+        Args:
+            key: Window analysis key
+            message: AgentMessage returned by the analyst
+        """
+        record = {
+            "key": {
+                "dataset_hash": key.dataset_hash,
+                "window_start": key.window_start.isoformat(),
+                "window_minutes": key.window_minutes,
+                "model_id": key.model_id,
+                "prompt_version": key.prompt_version,
+            },
+            "message": message.model_dump(mode="json", by_alias=True),
+            "stored_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        with self._lock:
+            self._remember(key.digest, record)
+
+        if self.cache_dir is not None:
+            path = self._path(key)
+            tmp_path = path.with_suffix(".json.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                self._writes_since_sweep += 1
+                due = self._writes_since_sweep >= max(1, self.max_disk_entries // 10)
+                if due:
+                    self._writes_since_sweep = 0
+            if due:
+                self.sweep()
+
+    def sweep(self) -> int:
+        """
+        Delete expired result files, then the oldest beyond the file limit.
+
+        Returns:
+            Number of files deleted
+        """
+        if self.cache_dir is None:
+            return 0
+
+        files = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue  # Deleted by another process sweeping the same directory
+        files.sort()
+
+        cutoff = time.time() - self.max_age_seconds if self.max_age_seconds > 0 else None
+        excess = len(files) - self.max_disk_entries
+        removed = 0
+        for i, (mtime, path) in enumerate(files):
+            # Oldest first: stop at the first file that is young enough and within the limit
+            if i >= excess and (cutoff is None or mtime >= cutoff):
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            removed += 1
+
+        if removed:
+            with self._lock:
+                self.disk_evictions += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "memory_entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_enabled": self.cache_dir is not None,
+                "max_disk_entries": self.max_disk_entries,
+                "max_age_seconds": self.max_age_seconds,
+                "disk_evictions": self.disk_evictions,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+def is_cacheable_result(message: AgentMessage) -> bool:
+    """
+    Whether an analyst result is a complete analysis worth replaying.
+
+    Results of a failed or degraded call (no summary, an error or fallback
+    marker, missing scores) are used once and analysed again next time.
+    """
+    payload = message.payload if message else None
+    if payload is None or not payload.summary:
+        return False
+    details = payload.details or {}
+    if details.get("error") or details.get("fallback") or details.get("used_fallback"):
+        return False
+    return all(isinstance(details.get(name), (int, float)) for name in _REQUIRED_DETAILS)
+
+
+async def analyze_window_cached(
+    cache: Optional[WindowAnalysisCache],
+    key: WindowAnalysisKey,
+    analyst: Any,
+    request: AgentMessage,
+    state: Any,
+) -> tuple[AgentMessage, bool]:
+    """
+    Return the analyst result for a window, calling the analyst only on a miss.
+
+    Only results passing ``is_cacheable_result`` are stored, so a transient
+    model failure is not replayed for the window.
+
+    Args:
+        cache: Cache to consult, or None to always call the analyst
+        key: Window analysis key
+        analyst: AnalystAgent used on a cache miss
+        request: Window request built by ``build_window_request``
+        state: IncidentState passed to the analyst
+
+    Returns:
+        Tuple of (analyst result, cache_hit)
+    """
+    if cache is not None:
+        cached = cache.get(key, incident_id=request.incident_id)
+        if cached is not None:
+            return cached, True
+
+    result = await analyst.handle(request, state)
+    if cache is not None and is_cacheable_result(result):
+        cache.put(key, result)
+    return result, False
+
+
+_window_analysis_cache: Optional[WindowAnalysisCache] = None
+
+
+def get_window_analysis_cache() -> WindowAnalysisCache:
+    """Get the process-wide window analysis cache."""
+    global _window_analysis_cache
+    if _window_analysis_cache is None:
+        _window_analysis_cache = WindowAnalysisCache()
+    return _window_analysis_cache
+
+
+__all__ = [
+    "WindowAnalysisCache",
+    "WindowAnalysisKey",
+    "analyze_window_cached",
+    "get_window_analysis_cache",
+    "is_cacheable_result",
+]
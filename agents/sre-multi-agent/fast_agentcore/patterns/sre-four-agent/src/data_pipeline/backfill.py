@@ -0,0 +1,489 @@
+"""
+Offline backfill: analyse a whole log history in parallel and persist the results.
+
+Unlike the streaming session in ``demo_app`` (one window at a time with a delay
+between windows and results only broadcast over WebSockets), the backfill runner
+dispatches window analyses concurrently up to a limit and writes every window's
+analyst result, plus any incident pipeline outputs, to a local results store.
+Runs are resumable: windows that already have a stored result are skipped.
+
+Usage:
+    python -m src.data_pipeline.backfill --start 2024-01-15T09:00 --end 2024-01-15T18:00
+    python -m src.data_pipeline.backfill --start 09:00 --end 12:00 --concurrency 8 --run-incidents
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from ..orchestration.four_agent.schema import AgentMessage, Severity
+from ..orchestration.four_agent.state import IncidentState
+from ..orchestration.real_time.incident_fingerprint import (
+    IncidentFingerprint,
+    IncidentFingerprintRegistry,
+    build_incident_fingerprint,
+)
+from .analysis_cache import WindowAnalysisCache, WindowAnalysisKey, analyze_window_cached
+from .log_window_processor import LogEntry, get_window_metadata
+from .pipeline_orchestrator import LogDataPipeline
+from .window_analysis import assess_anomaly, build_window_request
+
+# Signature of the callable that runs the RCA/Impact/Mitigation chain for a new incident
+IncidentRunner = Callable[[str, datetime, List[LogEntry], AgentMessage], Awaitable[Dict[str, Any]]]
+
+
+def _atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON via a temporary file so an interrupted run never leaves a partial record."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+class BackfillResultStore:
+    """
+    Local directory store for backfill results.
+
+    Layout::
+
+        <root>/windows/<YYYYmmddTHHMM>.json   one record per analysed window
+        <root>/incidents/<incident_id>.json   one record per opened incident
+        <root>/run.json                      parameters and report of the last run
+    """
+
+    def __init__(self, root: Path | str):
+        """
+        Initialize the store, creating its directories if needed.
+
+        Args:
+            root: Directory that holds the store
+        """
+        self.root = Path(root)
+        self.windows_dir = self.root / "windows"
+        self.incidents_dir = self.root / "incidents"
+        self.windows_dir.mkdir(parents=True, exist_ok=True)
+        self.incidents_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def window_key(window_start: datetime) -> str:
+        """Stable file key for a window start time."""
+        return window_start.astimezone(timezone.utc).strftime("%Y%m%dT%H%M")
+
+    def _window_path(self, window_start: datetime) -> Path:
+        return self.windows_dir / f"{self.window_key(window_start)}.json"
+
+    def has_window(self, window_start: datetime) -> bool:
+        """Return True if a completed result exists for the window."""
+        return self._window_path(window_start).exists()
+
+    def save_window(self, window_start: datetime, record: Dict[str, Any]) -> None:
+        """Persist the result record for a window."""
+        _atomic_write_json(self._window_path(window_start), record)
+
+    def load_window(self, window_start: datetime) -> Optional[Dict[str, Any]]:
+        """Load the result record for a window, or None if not stored."""
+        path = self._window_path(window_start)
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def iter_windows(self) -> Iterator[Dict[str, Any]]:
+        """Yield every stored window record in chronological order."""
+        for path in sorted(self.windows_dir.glob("*.json")):
+            with open(path, "r") as f:
+                yield json.load(f)
+
+    def has_incident(self, incident_id: str) -> bool:
+        """Return True if a record exists for the incident."""
+        return (self.incidents_dir / f"{incident_id}.json").exists()
+
+    def load_incident(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        """Load an incident record, or None if not stored."""
+        path = self.incidents_dir / f"{incident_id}.json"
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def save_incident(self, incident_id: str, record: Dict[str, Any]) -> None:
+        """Persist an incident record."""
+        _atomic_write_json(self.incidents_dir / f"{incident_id}.json", record)
+
+    def save_run(self, record: Dict[str, Any]) -> None:
+        """Persist the parameters and report of a run."""
+        _atomic_write_json(self.root / "run.json", record)
+
+
+@dataclass
+class BackfillReport:
+    """Summary of a backfill run."""
+    windows_total: int = 0
+    windows_skipped: int = 0
+    windows_analyzed: int = 0
+    windows_failed: int = 0
+    anomalous_windows: int = 0
+    incidents_opened: int = 0
+    incidents_run: int = 0
+    elapsed_seconds: float = 0.0
+    failures: Dict[str, str] = field(default_factory=dict)
+
+
+class BackfillRunner:
+    """
+    Run analyst window analyses over a time range concurrently and store the results.
+
+    Window analysis is parallel; incident de-duplication is then replayed in
+    chronological order over all stored windows (including those from earlier
+    runs) so the opened incidents are identical to a sequential streaming pass.
+    """
+
+    def __init__(
+        self,
+        pipeline: LogDataPipeline,
+        store: BackfillResultStore,
+        analyst_factory: Callable[[], Any],
+        *,
+        concurrency: int = 4,
+        max_logs_per_request: int = 10,
+        incident_runner: Optional[IncidentRunner] = None,
+        analysis_cache: Optional[WindowAnalysisCache] = None,
+        model_id: str = "",
+    ):
+        """
+        Initialize the backfill runner.
+
+        Args:
+            pipeline: Log data pipeline providing windows
+            store: Results store to read from and write to
+            analyst_factory: Zero-argument callable returning an AnalystAgent;
+                one agent is created per concurrency slot
+            concurrency: Maximum number of windows analysed at the same time
+            max_logs_per_request: Log entries forwarded to the analyst per window
+            incident_runner: Optional coroutine function that runs the full
+                incident pipeline for a newly opened incident
+            analysis_cache: Optional window analysis cache shared with the
+                streaming session; requires ``model_id`` to key entries
+            model_id: Model used by the analysts, part of the cache key
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.pipeline = pipeline
+        self.store = store
+        self.analyst_factory = analyst_factory
+        self.concurrency = concurrency
+        self.max_logs_per_request = max_logs_per_request
+        self.incident_runner = incident_runner
+        self.analysis_cache = analysis_cache
+        self.model_id = model_id
+
+    def window_starts(self, start: datetime, end: datetime) -> List[datetime]:
+        """
+        List window start times in ``[start, end)`` stepping by the stream interval.
+
+        Args:
+            start: First window start
+            end: Exclusive upper bound for window starts
+
+        Returns:
+            Chronological list of window start times
+        """
+        step = timedelta(minutes=self.pipeline.stream_interval_minutes)
+        starts = []
+        current = start
+        while current < end:
+            starts.append(current)
+            current += step
+        return starts
+
+    async def _analyze_window(
+        self,
+        window_start: datetime,
+        analysts: "asyncio.Queue[Any]",
+        report: BackfillReport,
+    ) -> None:
+        """Analyse one window with a pooled analyst and persist its record."""
+        window_logs = self.pipeline.get_window_logs(window_start)
+        record: Dict[str, Any] = {
+            "window_key": self.store.window_key(window_start),
+            "window_start": window_start.isoformat(),
+            "window_minutes": self.pipeline.window_minutes,
+            "log_count": len(window_logs),
+            "metadata": get_window_metadata(window_logs) if window_logs else {},
+            "analyst_result": None,
+            "assessment": None,
+            "fingerprint": None,
+            "analyzed_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        if window_logs:
+            analyst = await analysts.get()
+            try:
+                incident_id = f"backfill-{record['window_key']}"
+                state = IncidentState(incident_id=incident_id, severity=Severity.SEV_2)
+                request = build_window_request(
+                    window_logs,
+                    window_start,
+                    self.pipeline.window_minutes,
+                    incident_id,
+                    max_logs=self.max_logs_per_request,
+                )
+                cache_key = WindowAnalysisKey(
+                    dataset_hash=self.pipeline.dataset_hash,
+                    window_start=window_start,
+                    window_minutes=self.pipeline.window_minutes,
+                    model_id=self.model_id,
+                    prompt_version=getattr(analyst, "prompt_version", ""),
+                )
+                analyst_result, cache_hit = await analyze_window_cached(
+                    self.analysis_cache, cache_key, analyst, request, state
+                )
+                record["analysis_cached"] = cache_hit
+            finally:
+                analysts.put_nowait(analyst)
+
+            assessment = assess_anomaly(analyst_result)
+            record["analyst_result"] = analyst_result.model_dump(mode="json", by_alias=True)
+            record["assessment"] = assessment
+            if assessment["should_trigger"]:
+                fingerprint = build_incident_fingerprint(window_logs, analyst_result)
+                record["fingerprint"] = asdict(fingerprint)
+                report.anomalous_windows += 1
+
+        self.store.save_window(window_start, record)
+        report.windows_analyzed += 1
+        print(f"✅ Window {record['window_key']}: {record['log_count']} logs, "
+              f"anomaly={bool(record['fingerprint'])}")
+
+    async def _open_incidents(self, report: BackfillReport) -> None:
+        """Replay stored anomalous windows through the fingerprint registry."""
+        registry = IncidentFingerprintRegistry()
+        pending: Dict[str, Dict[str, Any]] = {}
+
+        for record in self.store.iter_windows():
+            if not record.get("fingerprint"):
+                continue
+            window_start = datetime.fromisoformat(record["window_start"])
+            fp = record["fingerprint"]
+            fingerprint = IncidentFingerprint(
+                services=tuple(fp["services"]),
+                error_codes=tuple(fp["error_codes"]),
+                templates=tuple(fp["templates"]),
+                severity=fp["severity"],
+            )
+            incident, is_new = registry.observe(
+                fingerprint,
+                now=window_start,
+                new_incident_id=lambda: f"INC-{record['window_key']}",
+            )
+            if is_new:
+                pending[incident.incident_id] = {
+                    "incident_id": incident.incident_id,
+                    "opened_window": record["window_start"],
+                    "fingerprint": fingerprint.to_dict(),
+                    "detections": [],
+                }
+            pending[incident.incident_id]["detections"].append(record["window_start"])
+
+        report.incidents_opened = len(pending)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _persist(incident_record: Dict[str, Any]) -> None:
+            incident_id = incident_record["incident_id"]
+            existing = self.store.load_incident(incident_id) or {}
+            incident_record["pipeline_output"] = existing.get("pipeline_output")
+
+            if self.incident_runner is not None and incident_record["pipeline_output"] is None:
+                window_start = datetime.fromisoformat(incident_record["opened_window"])
+                window_record = self.store.load_window(window_start) or {}
+                analyst_result = AgentMessage.model_validate(window_record["analyst_result"])
+                async with semaphore:
+                    print(f"🚀 Running incident pipeline for {incident_id}")
+                    incident_record["pipeline_output"] = await self.incident_runner(
+                        incident_id,
+                        window_start,
+                        self.pipeline.get_window_logs(window_start),
+                        analyst_result,
+                    )
+                report.incidents_run += 1
+
+            self.store.save_incident(incident_id, incident_record)
+
+        results = await asyncio.gather(
+            *(_persist(record) for record in pending.values()), return_exceptions=True
+        )
+        for record, result in zip(pending.values(), results):
+            if isinstance(result, Exception):
+                report.failures[record["incident_id"]] = f"{type(result).__name__}: {result}"
+
+    async def run(self, start: datetime, end: datetime) -> BackfillReport:
+        """
+        Analyse every window in ``[start, end)`` and persist the results.
+
+        Args:
+            start: First window start
+            end: Exclusive upper bound for window starts
+
+        Returns:
+            BackfillReport describing the run
+        """
+        started = time.perf_counter()
+        report = BackfillReport()
+        starts = self.window_starts(start, end)
+        report.windows_total = len(starts)
+
+        todo = [ws for ws in starts if not self.store.has_window(ws)]
+        report.windows_skipped = len(starts) - len(todo)
+        print(f"📋 Backfill: {len(starts)} windows, {report.windows_skipped} already done, "
+              f"{len(todo)} to analyse (concurrency={self.concurrency})")
+
+        analysts: "asyncio.Queue[Any]" = asyncio.Queue()
+        for _ in range(min(self.concurrency, len(todo))):
+            analysts.put_nowait(self.analyst_factory())
+
+        results = await asyncio.gather(
+            *(self._analyze_window(ws, analysts, report) for ws in todo),
+            return_exceptions=True,
+        )
+        for window_start, result in zip(todo, results):
+            if isinstance(result, Exception):
+                report.windows_failed += 1
+                report.failures[self.store.window_key(window_start)] = f"{type(result).__name__}: {result}"
+                print(f"❌ Window {self.store.window_key(window_start)} failed: {result}")
+
+        await self._open_incidents(report)
+
+        report.elapsed_seconds = round(time.perf_counter() - started, 3)
+        self.store.save_run({
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "window_minutes": self.pipeline.window_minutes,
+            "stream_interval_minutes": self.pipeline.stream_interval_minutes,
+            "concurrency": self.concurrency,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "report": asdict(report),
+        })
+        return report
+
+
+def make_incident_runner(model_id: str, window_minutes: int = 15) -> IncidentRunner:
+    """
+    Build an incident runner that executes the four-agent orchestrator.
+
+    Args:
+        model_id: Bedrock model identifier used by every agent
+        window_minutes: Duration of the window that opened the incident
+
+    Returns:
+        Coroutine function suitable for ``BackfillRunner(incident_runner=...)``
+    """
+    from ..orchestration.four_agent.analyst_agent import AnalystAgent, AnalystAgentConfig
+    from ..orchestration.four_agent.impact_agent import ImpactAgent, ImpactAgentConfig
+    from ..orchestration.four_agent.mitigation_agent import MitigationAgentConfig, MitigationCommsAgent
+    from ..orchestration.four_agent.orchestrator import PhaseTwoOrchestrator
+    from ..orchestration.four_agent.rca_agent import RCAAgent
+    from ..orchestration.four_agent.scenario_loader import ScenarioMetadata, ScenarioSnapshot, TimeWindow
+
+    async def _run(
+        incident_id: str,
+        window_start: datetime,
+        window_logs: List[LogEntry],
+        analyst_result: AgentMessage,
+    ) -> Dict[str, Any]:
+        orchestrator = PhaseTwoOrchestrator(
+            analyst_agent=AnalystAgent(config=AnalystAgentConfig(), model=model_id),
+            rca_agent=RCAAgent(model=model_id),
+            impact_agent=ImpactAgent(config=ImpactAgentConfig(), model=model_id),
+            mitigation_agent=MitigationCommsAgent(config=MitigationAgentConfig(), model=model_id),
+            demo_mode=False,
+            incident_id=incident_id,
+        )
+        snapshot = ScenarioSnapshot(
+            metadata=ScenarioMetadata(
+                key="backfill_incident",
+                severity=Severity.SEV_2,
+                description=(analyst_result.payload.summary or "")[:200],
+            ),
+            window=TimeWindow(start=window_start, end=window_start + timedelta(minutes=window_minutes)),
+            monitoring={"metrics": get_window_metadata(window_logs) if window_logs else {}},
+            additional_sources={},
+            _incident_id=incident_id,
+        )
+        result = await orchestrator.run(snapshot)
+        return {
+            "responses": [m.model_dump(mode="json", by_alias=True) for m in result.responses],
+            "plans": [m.model_dump(mode="json", by_alias=True) for m in result.plans],
+            "summary": result.summary.to_markdown() if result.summary else None,
+        }
+
+    return _run
+
+
+def _parse_time(value: str, dataset_start: datetime) -> datetime:
+    """Parse an ISO timestamp or an HH:MM time relative to the dataset day."""
+    if len(value) <= 5 and ":" in value:
+        hour, minute = map(int, value.split(":"))
+        return dataset_start.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dataset_start.tzinfo)
+    return parsed
+
+
+def main() -> None:
+    """Command-line entry point for offline backfills."""
+    parser = argparse.ArgumentParser(description="Analyse a log history window by window and store the results")
+    parser.add_argument("--start", required=True, help="ISO timestamp or HH:MM on the dataset day")
+    parser.add_argument("--end", required=True, help="ISO timestamp or HH:MM (exclusive)")
+    parser.add_argument("--store", default="backfill_results", help="Results store directory")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent window analyses")
+    parser.add_argument("--model-id", default="us.meta.llama3-3-70b-instruct-v1:0", help="Bedrock model id")
+    parser.add_argument("--run-incidents", action="store_true",
+                        help="Run the RCA/Impact/Mitigation pipeline for each opened incident")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always call the analyst instead of reusing cached window analyses")
+    parser.add_argument("--config", default="configs/data_pipeline.json", help="Pipeline config file")
+    args = parser.parse_args()
+
+    from ..orchestration.four_agent.analyst_agent import AnalystAgent, AnalystAgentConfig
+
+    pipeline = LogDataPipeline(config_file=args.config)
+    start = _parse_time(args.start, pipeline.dataset_start_time)
+    end = _parse_time(args.end, pipeline.dataset_start_time)
+
+    runner = BackfillRunner(
+        pipeline,
+        BackfillResultStore(args.store),
+        analyst_factory=lambda: AnalystAgent(config=AnalystAgentConfig(), model=args.model_id),
+        concurrency=args.concurrency,
+        analysis_cache=None if args.no_cache else WindowAnalysisCache(),
+        model_id=args.model_id,
+        incident_runner=(
+            make_incident_runner(args.model_id, pipeline.window_minutes) if args.run_incidents else None
+        ),
+    )
+    report = asyncio.run(runner.run(start, end))
+
+    print("\n🏁 BACKFILL COMPLETE")
+    print(json.dumps(asdict(report), indent=2))
+
+
+__all__ = [
+    "BackfillReport",
+    "BackfillResultStore",
+    "BackfillRunner",
+    "make_incident_runner",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -51,6 +52,7 @@ class LogDataPipeline:
         # Pipeline state
         self._logs_cache: Optional[List[LogEntry]] = None
         self._dataset_start_time: Optional[datetime] = None
+        self._dataset_hash: Optional[str] = None
 
         # Validate configuration
         self._validate_configuration()
@@ -136,6 +138,21 @@ class LogDataPipeline:
 
         return self._dataset_start_time
 
+    @property
+    def dataset_hash(self) -> str:
+        """Content hash of the log file, used to key cached window analyses."""
+        if self._dataset_hash is None:
+            digest = hashlib.sha256()
+            if self.log_file_path.exists():
+                with open(self.log_file_path, 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(block)
+            else:
+                digest.update(str(self.log_file_path).encode("utf-8"))
+            self._dataset_hash = digest.hexdigest()[:16]
+
+        return self._dataset_hash
+
     def get_available_windows(self) -> List[datetime]:
         """Get all available time windows in the dataset."""
         logs = self.load_logs()
@@ -148,18 +165,19 @@ class LogDataPipeline:
 
         return generate_window_schedule(start_time, int(total_hours) + 1, self.window_minutes)
 
-    def get_window_logs(self, window_start: datetime) -> List[LogEntry]:
+    def get_window_logs(self, window_start: datetime, window_minutes: Optional[int] = None) -> List[LogEntry]:
         """
         Get logs for a specific time window.
 
         Args:
             window_start: Start time of the window to process
+            window_minutes: Window length (defaults to the pipeline's window size)
 
         Returns:
             List of LogEntry objects for the specified window
         """
         logs = self.load_logs()
-        return extract_time_window(logs, window_start, self.window_minutes)
+        return extract_time_window(logs, window_start, window_minutes or self.window_minutes)
 
     def get_window_summary(self, window_start: datetime) -> str:
         """
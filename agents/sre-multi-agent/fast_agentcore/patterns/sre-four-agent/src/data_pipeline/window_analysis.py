@@ -0,0 +1,121 @@
+"""Shared helpers for running the analyst agent over a single log window."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from ..orchestration.four_agent.schema import (
+    AgentMessage,
+    AgentRole,
+    MessageType,
+    PayloadModel,
+    Severity,
+)
+from ..orchestration.real_time.incident_fingerprint import severity_from_summary
+from .log_window_processor import LogEntry
+
+
+def build_window_request(
+    window_logs: List[LogEntry],
+    window_start: datetime,
+    window_size: int,
+    incident_id: str,
+    max_logs: int = 10,
+) -> AgentMessage:
+    """
+    Build the orchestrator request asking the analyst to assess one window.
+
+    Args:
+        window_logs: Logs that fall inside the window
+        window_start: Start time of the window
+        window_size: Window duration in minutes
+        incident_id: Incident identifier used for the analysis state
+        max_logs: Maximum number of log entries forwarded to the analyst
+
+    Returns:
+        AgentMessage ready to pass to ``AnalystAgent.handle``
+    """
+    window_end = window_start + timedelta(minutes=window_size)
+
+    log_entries = [
+        {
+            "timestamp": log_entry.timestamp.isoformat(),
+            "level": log_entry.level,
+            "message": log_entry.message,
+            "service": log_entry.service,
+        }
+        for log_entry in window_logs[:max_logs]
+    ]
+
+    return AgentMessage(
+        incident_id=incident_id,
+        sender=AgentRole.ORCHESTRATOR,
+        type=MessageType.REQUEST,
+        severity=Severity.SEV_2,
+        payload=PayloadModel(
+            summary=f"Streaming window analysis: {window_start.strftime('%H:%M')} - {window_end.strftime('%H:%M')}",
+            details={
+                "logs": log_entries,
+                "monitoring": {"window_size": window_size, "log_count": len(window_logs)},
+            },
+        ),
+    )
+
+
+def assess_anomaly(analyst_result: AgentMessage) -> Dict[str, Any]:
+    """
+    Decide whether an analyst result should open an incident.
+
+    Trigger rules:
+    1. High confidence (>70%) AND severity is HIGH/CRITICAL
+    2. OR multiple anomalies detected (>=2)
+    3. OR low confidence (<50%) but CRITICAL severity (emergency override)
+
+    Args:
+        analyst_result: AgentMessage returned by the analyst agent
+
+    Returns:
+        Dictionary with confidence, severity, anomalies_count, the individual
+        trigger flags and the overall ``should_trigger`` decision
+    """
+    payload = analyst_result.payload if analyst_result and analyst_result.payload else None
+    if not payload:
+        return {
+            "confidence": 0.0,
+            "severity": "LOW",
+            "anomalies_count": 0,
+            "high_confidence_trigger": False,
+            "multiple_anomalies_trigger": False,
+            "emergency_override": False,
+            "should_trigger": False,
+        }
+
+    details = payload.details if payload.details else {}
+
+    # Extract confidence (default to 0.8 if not found)
+    confidence = details.get("confidence", 0.8)
+
+    # Extract severity from the summary text, as the incident fingerprint does
+    severity = severity_from_summary(payload.summary or "") or "MEDIUM"
+
+    # Count evidence items as anomalies
+    anomalies_count = 0
+    if payload.evidence:
+        anomalies_count = len(payload.evidence)
+    elif "anomalies" in details:
+        anomalies_count = len(details["anomalies"]) if isinstance(details["anomalies"], list) else 1
+
+    high_confidence_trigger = confidence > 0.7 and severity in ["HIGH", "CRITICAL"]
+    multiple_anomalies_trigger = anomalies_count >= 2
+    emergency_override = confidence < 0.5 and severity == "CRITICAL"
+
+    return {
+        "confidence": confidence,
+        "severity": severity,
+        "anomalies_count": anomalies_count,
+        "high_confidence_trigger": high_confidence_trigger,
+        "multiple_anomalies_trigger": multiple_anomalies_trigger,
+        "emergency_override": emergency_override,
+        "should_trigger": high_confidence_trigger or multiple_anomalies_trigger or emergency_override,
+    }
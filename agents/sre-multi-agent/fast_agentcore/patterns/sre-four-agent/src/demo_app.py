@@ -25,10 +25,26 @@ from src.orchestration.four_agent.schema import (
 )
 from src.orchestration.four_agent.state import IncidentState
 from src.data_pipeline.pipeline_orchestrator import LogDataPipeline
+from src.data_pipeline.window_analysis import assess_anomaly, build_window_request
+from src.data_pipeline.adaptive_schedule import (
+    AdaptiveScheduleConfig,
+    AdaptiveWindowScheduler,
+    WindowStats
+)
+from src.data_pipeline.analysis_cache import (
+    WindowAnalysisKey,
+    analyze_window_cached,
+    get_window_analysis_cache
+)
 
 # Real-time WebSocket integration
 from src.orchestration.real_time.pipeline_state_manager import get_pipeline_state_manager
 from src.orchestration.real_time.websocket_orchestrator import WebSocketOrchestrator
+from src.orchestration.real_time.incident_fingerprint import (
+    IncidentFingerprintRegistry,
+    build_incident_fingerprint
+)
+from src.orchestration.real_time.subscriptions import topics_from_query
 
 
 # Request/Response Models
@@ -73,6 +89,12 @@ class StreamingStartRequest(BaseModel):
     start_time: str = Field(..., description="Start time in HH:MM format (e.g., '09:30')")
     window_size_minutes: int = Field(default=15, description="Window size in minutes")
     model_id: str = Field(default="us.meta.llama3-3-70b-instruct-v1:0", description="AWS Bedrock model to use")
+    max_windows: int = Field(default=20, ge=1, description="Number of windows to process")
+    window_interval_seconds: float = Field(default=2.0, ge=0, description="Pause between windows")
+    adaptive_windows: bool = Field(
+        default=False,
+        description="Widen the stride and skip analysis while window statistics are stable"
+    )
 
 
 class PipelineStartResponse(BaseModel):
@@ -172,6 +194,12 @@ manager = ConnectionManager()
 # Initialize real-time pipeline state manager
 pipeline_manager = get_pipeline_state_manager()
 
+
+@app.on_event("shutdown")
+async def close_pipeline_manager():
+    """Leave the state bus, stop the retention sweep and flush archived pipeline state."""
+    await pipeline_manager.close()
+
 # Initialize real data pipeline
 data_pipeline = LogDataPipeline()
 
@@ -492,14 +520,38 @@ async def analyze_incident(request: IncidentAnalysisRequest):
         )
 
 
+async def _query_topics(websocket: WebSocket):
+    """
+    Subscription topics from the WebSocket URL, e.g. ``?pipeline=p1&severity=SEV-1``.
+
+    Returns:
+        (topics, error): topics is None when the client did not filter; error
+        is set when the query is invalid and the socket has been closed
+    """
+    try:
+        return topics_from_query(websocket.query_params), None
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e)[:120])
+        return None, str(e)
+
+
 @app.websocket("/ws/demo")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time demo updates."""
+    """WebSocket endpoint for real-time demo updates.
+
+    Optional query parameters ``pipeline``, ``agent``, ``type`` and
+    ``severity`` (comma-separated values) subscribe to a subset of the
+    updates; clients can also send {"type": "subscribe", ...} at any time.
+    """
     await websocket.accept()
+    topics, error = await _query_topics(websocket)
+    if error:
+        print(f"❌ Rejected /ws/demo subscription: {error}")
+        return
     print(f"✅ WebSocket client connected to /ws/demo")
 
     # Register with pipeline_manager (not the old manager)
-    await pipeline_manager.add_websocket_connection(websocket)
+    await pipeline_manager.add_websocket_connection(websocket, topics)
     print(f"📊 Total WebSocket connections: {len(pipeline_manager.websocket_connections)}")
     print(f"🔍 DEBUG: Global pipeline_manager ID: {id(pipeline_manager)}")
     print(f"🔍 DEBUG: WebSocket connections set ID: {id(pipeline_manager.websocket_connections)}")
@@ -521,6 +573,8 @@ async def websocket_endpoint(websocket: WebSocket):
             # Echo back any received data (for ping/pong)
             if data == "ping":
                 await websocket.send_text("pong")
+            else:
+                await pipeline_manager.handle_client_message(websocket, data)
     except WebSocketDisconnect:
         print(f"❌ WebSocket client disconnected from /ws/demo")
         await pipeline_manager.remove_websocket_connection(websocket)
@@ -531,11 +585,14 @@ async def websocket_endpoint(websocket: WebSocket):
 
 @app.websocket("/ws/pipeline")
 async def pipeline_websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time pipeline updates."""
+    """WebSocket endpoint for real-time pipeline updates (same subscription options as /ws/demo)."""
     await websocket.accept()
+    topics, error = await _query_topics(websocket)
+    if error:
+        return
 
     # Add to pipeline state manager
-    await pipeline_manager.add_websocket_connection(websocket)
+    await pipeline_manager.add_websocket_connection(websocket, topics)
 
     try:
         while True:
@@ -544,7 +601,10 @@ async def pipeline_websocket_endpoint(websocket: WebSocket):
             # Handle ping/pong and potential control messages
             if data == "ping":
                 await websocket.send_text("pong")
-            # Could add other control messages here in the future
+            else:
+                # Clients send {"type": "resync"} after detecting a version gap,
+                # and {"type": "subscribe"/"unsubscribe"} to change their topics
+                await pipeline_manager.handle_client_message(websocket, data)
     except WebSocketDisconnect:
         await pipeline_manager.remove_websocket_connection(websocket)
 
@@ -683,6 +743,10 @@ async def get_pipeline_status(pipeline_id: str):
     """Get current pipeline status - Enhanced for Phase 2."""
     pipeline_state = pipeline_manager.get_pipeline_state(pipeline_id)
     if not pipeline_state:
+        # Finished pipelines past their retention period only keep a summary
+        summary = pipeline_manager.get_pipeline_summary(pipeline_id)
+        if summary:
+            return summary
         raise HTTPException(status_code=404, detail=f"Pipeline {pipeline_id} not found")
 
     return {
@@ -700,15 +764,15 @@ async def get_pipeline_status(pipeline_id: str):
                 "findings_count": len(agent.findings),
                 # Phase 2 enhancements
                 "processing_stage": agent.processing_stage,
-                "output_chunks_count": len(agent.output_chunks),
-                "communications_sent": len(agent.communications_sent),
-                "communications_received": len(agent.communications_received),
+                "output_chunks_count": agent.output_chunks.total,
+                "communications_sent": agent.communications_sent.total,
+                "communications_received": agent.communications_received.total,
                 "estimated_completion": agent.estimated_completion.isoformat() if agent.estimated_completion else None
             }
             for name, agent in pipeline_state.agents.items()
         },
         # Phase 2 enhancements
-        "communications_count": len(pipeline_state.communications),
+        "communications_count": pipeline_state.communications.total,
         "pipeline_priority": pipeline_state.pipeline_priority,
         "pause_time": pipeline_state.pause_time.isoformat() if pipeline_state.pause_time else None,
         "resume_time": pipeline_state.resume_time.isoformat() if pipeline_state.resume_time else None,
@@ -820,7 +884,7 @@ async def get_pipeline_communications(pipeline_id: str, limit: int = 20):
             }
             for comm in communications
         ],
-        "total_communications": len(pipeline_state.communications)
+        "total_communications": pipeline_state.communications.total
     }
 
 
@@ -841,6 +905,8 @@ async def get_agent_output_stream(pipeline_id: str, agent_name: str, chunk_limit
         "pipeline_id": pipeline_id,
         "agent_name": agent_name,
         "full_output": agent.full_output,
+        # Characters cut from the start of full_output to bound memory
+        "full_output_dropped_chars": agent.full_output_dropped,
         "output_chunks": [
             {
                 "chunk_id": chunk.chunk_id,
@@ -853,7 +919,9 @@ async def get_agent_output_stream(pipeline_id: str, agent_name: str, chunk_limit
             }
             for chunk in chunks
         ],
-        "total_chunks": len(agent.output_chunks),
+        "total_chunks": agent.output_chunks.total,
+        # Chunks older than the ring buffer window (archived when an archive dir is set)
+        "archived_chunks": agent.output_chunks.evicted,
         "processing_stage": agent.processing_stage
     }
 
@@ -1405,9 +1473,9 @@ async def run_real_pipeline(scenario: str, pipeline_id: str, incident_id: str, m
             monitoring: Dict[str, Any]
             additional_sources: Dict[str, Any]
 
-        # Get window info
-        scenario_info = REAL_INCIDENT_SCENARIOS[scenario]
-        window_time = scenario_info["window_time"]
+        # Get window info (streaming-triggered incidents have no fixed window)
+        scenario_info = REAL_INCIDENT_SCENARIOS.get(scenario, {})
+        window_time = scenario_info.get("window_time")
 
         # Create window timing based on scenario
         base_time = data_pipeline.dataset_start_time
@@ -1651,7 +1719,10 @@ async def start_streaming_analysis(request: StreamingStartRequest, background_ta
         session_id=session_id,
         start_time=request.start_time,
         window_size=request.window_size_minutes,
-        model_id=request.model_id
+        model_id=request.model_id,
+        max_windows=request.max_windows,
+        window_interval_seconds=request.window_interval_seconds,
+        adaptive=request.adaptive_windows
     )
 
     return {
@@ -1661,14 +1732,29 @@ async def start_streaming_analysis(request: StreamingStartRequest, background_ta
     }
 
 
-async def run_streaming_session(session_id: str, start_time: str, window_size: int, model_id: str):
-    """Process log windows sequentially, only triggering full pipeline on anomaly detection."""
+async def run_streaming_session(
+    session_id: str,
+    start_time: str,
+    window_size: int,
+    model_id: str,
+    max_windows: int = 20,
+    window_interval_seconds: float = 2.0,
+    adaptive: bool = False
+):
+    """Process log windows sequentially, only triggering full pipeline on anomaly detection.
+
+    Windows normally start every 5 minutes. With ``adaptive`` the session
+    covers the same time span but the scheduler widens the stride and skips
+    the analyst while cheap window statistics are stable, and tightens stride
+    and window size when they change sharply.
+    """
 
     print(f"\n🌊 STARTING STREAMING SESSION")
     print(f"Session ID: {session_id}")
     print(f"Start time: {start_time}")
     print(f"Window size: {window_size} minutes")
     print(f"Model: {model_id}")
+    print(f"Schedule: {'adaptive' if adaptive else 'fixed'}")
 
     try:
         # Convert start_time to datetime
@@ -1696,22 +1782,38 @@ async def run_streaming_session(session_id: str, start_time: str, window_size: i
             "timestamp": datetime.now(timezone.utc).isoformat()
         })
 
+        # Same span as max_windows windows at the base stride; the fixed
+        # schedule visits exactly those windows and analyses every non-empty one
+        schedule_config = AdaptiveScheduleConfig(enabled=adaptive)
+        scheduler = AdaptiveWindowScheduler(
+            current_time,
+            current_time + timedelta(minutes=schedule_config.base_stride_minutes * (max_windows - 1)),
+            window_minutes=window_size,
+            config=schedule_config
+        )
         window_count = 0
-        max_windows = 20  # Process up to 20 windows (5 hours worth)
 
-        while window_count < max_windows:
-            window_count += 1
-            window_end = current_time + timedelta(minutes=window_size)
+        # Overlapping windows see the same incident several times; repeat
+        # detections attach to the open incident instead of re-running the pipeline
+        incident_registry = IncidentFingerprintRegistry()
+
+        while (window := scheduler.next_window()) is not None:
+            window_count = window.number
+            current_time = window.start
+            window_end = window.end
 
             print(f"\n📋 PROCESSING WINDOW {window_count}")
             print(f"Time range: {current_time.strftime('%H:%M')} - {window_end.strftime('%H:%M')}")
 
             # Get logs for this window
-            window_logs = data_pipeline.get_window_logs(current_time)
+            window_logs = data_pipeline.get_window_logs(current_time, window.minutes)
             log_count = len(window_logs)
 
             print(f"📊 Log entries: {log_count}")
 
+            # Cheap statistics decide whether this window is worth an analyst call
+            decision = scheduler.observe(window, WindowStats.from_logs(window_logs, window.minutes))
+
             # Broadcast window start
             await pipeline_manager.broadcast_update({
                 "type": "streaming_window_start",
@@ -1719,40 +1821,20 @@ async def run_streaming_session(session_id: str, start_time: str, window_size: i
                 "window_number": window_count,
                 "window_start": current_time.strftime('%H:%M'),
                 "window_end": window_end.strftime('%H:%M'),
+                "window_minutes": window.minutes,
                 "log_count": log_count,
+                "schedule": decision.to_dict(),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             })
 
-            if log_count > 0:
-                # Convert logs for analyst agent
-                log_entries = []
-                for log_entry in window_logs[:10]:  # Limit to 10 most relevant
-                    log_entries.append({
-                        "timestamp": log_entry.timestamp.isoformat(),
-                        "level": log_entry.level,
-                        "message": log_entry.message,
-                        "service": log_entry.service
-                    })
-
+            if decision.analyze:
                 # Run analyst agent for anomaly detection
                 print(f"🔍 Running analyst agent for anomaly detection...")
 
                 incident_id = f"stream-analysis-{window_count}"
                 state = IncidentState(incident_id=incident_id, severity=Severity.SEV_2)
 
-                analyst_message = AgentMessage(
-                    incident_id=incident_id,
-                    sender=AgentRole.ORCHESTRATOR,
-                    type=MessageType.REQUEST,
-                    severity=Severity.SEV_2,
-                    payload=PayloadModel(
-                        summary=f"Streaming window analysis: {current_time.strftime('%H:%M')} - {window_end.strftime('%H:%M')}",
-                        details={
-                            "logs": log_entries,
-                            "monitoring": {"window_size": window_size, "log_count": log_count}
-                        }
-                    )
-                )
+                analyst_message = build_window_request(window_logs, current_time, window.minutes, incident_id)
 
                 # Broadcast analyst analysis start
                 await pipeline_manager.broadcast_update({
@@ -1764,26 +1846,62 @@ async def run_streaming_session(session_id: str, start_time: str, window_size: i
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 })
 
-                # Call analyst agent
-                analyst_result = await analyst_agent.handle(analyst_message, state)
+                # Call analyst agent (replayed windows are served from the analysis cache)
+                cache_key = WindowAnalysisKey(
+                    dataset_hash=data_pipeline.dataset_hash,
+                    window_start=current_time,
+                    window_minutes=window.minutes,
+                    model_id=model_id,
+                    prompt_version=AnalystAgent.prompt_version
+                )
+                analyst_result, cache_hit = await analyze_window_cached(
+                    get_window_analysis_cache(), cache_key, analyst_agent, analyst_message, state
+                )
 
-                print(f"✅ Analyst analysis complete")
+                print(f"✅ Analyst analysis complete{' (cached)' if cache_hit else ''}")
                 print(f"Summary: {analyst_result.payload.summary[:100]}...")
 
                 # Check for anomaly detection in analyst response
                 anomaly_detected = await check_for_anomaly_detection(analyst_result, window_count, current_time)
+                scheduler.record_analysis(window, anomaly_detected, cache_hit=cache_hit)
 
                 if anomaly_detected:
+                    fingerprint = build_incident_fingerprint(window_logs, analyst_result)
+                    open_incident, is_new_incident = incident_registry.observe(
+                        fingerprint,
+                        now=current_time,
+                        new_incident_id=lambda: f"INC-{window_count:03d}",
+                        window_number=window_count
+                    )
+                    incident_id = open_incident.incident_id
+
+                if anomaly_detected and not is_new_incident:
+                    print(f"🔁 ANOMALY MATCHES OPEN INCIDENT {incident_id} "
+                          f"(detection #{open_incident.detections}) - skipping duplicate pipeline")
+
+                    # Broadcast that the detection was attached to the existing incident
+                    await pipeline_manager.broadcast_update({
+                        "type": "incident_updated",
+                        "session_id": session_id,
+                        "incident_id": incident_id,
+                        "window_number": window_count,
+                        "window_time": current_time.strftime('%H:%M'),
+                        "detections": open_incident.detections,
+                        "fingerprint": fingerprint.to_dict(),
+                        "anomaly_summary": analyst_result.payload.summary[:200],
+                        "timestamp": datetime.now(timezone.utc).isoformat()
+                    })
+                elif anomaly_detected:
                     print(f"🚨 ANOMALY DETECTED - Triggering full incident pipeline!")
 
                     # Broadcast incident trigger
-                    incident_id = f"INC-{window_count:03d}"
                     await pipeline_manager.broadcast_update({
                         "type": "incident_triggered",
                         "session_id": session_id,
                         "incident_id": incident_id,
                         "window_number": window_count,
                         "window_time": current_time.strftime('%H:%M'),
+                        "fingerprint": fingerprint.to_dict(),
                         "anomaly_summary": analyst_result.payload.summary[:200],
                         "timestamp": datetime.now(timezone.utc).isoformat()
                     })
@@ -1801,9 +1919,23 @@ async def run_streaming_session(session_id: str, start_time: str, window_size: i
                         "session_id": session_id,
                         "window_number": window_count,
                         "incident_detected": False,
+                        "analysis_cached": cache_hit,
                         "analyst_summary": analyst_result.payload.summary[:100],
                         "timestamp": datetime.now(timezone.utc).isoformat()
                     })
+            elif log_count > 0:
+                print(f"⏭️  Window statistics stable ({decision.reason}) - skipping analyst call")
+
+                # Broadcast window complete (analysis skipped by the scheduler)
+                await pipeline_manager.broadcast_update({
+                    "type": "streaming_window_complete",
+                    "session_id": session_id,
+                    "window_number": window_count,
+                    "incident_detected": False,
+                    "analysis_skipped": True,
+                    "message": f"Analysis skipped: {decision.reason}",
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                })
             else:
                 print(f"⚠️  No logs in this window - skipping")
 
@@ -1817,22 +1949,32 @@ async def run_streaming_session(session_id: str, start_time: str, window_size: i
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 })
 
-            # Move to next window
-            current_time = current_time + timedelta(minutes=5)  # 5-minute step for overlapping windows
-
-            # Wait between windows for realistic streaming simulation
-            await asyncio.sleep(2)
+            # Wait between windows for realistic streaming simulation; a wider
+            # stride stands for more elapsed time
+            await asyncio.sleep(
+                window_interval_seconds * decision.next_stride_minutes / schedule_config.base_stride_minutes
+            )
 
         # Broadcast session complete
+        schedule_report = scheduler.report()
         await pipeline_manager.broadcast_update({
             "type": "streaming_session_complete",
             "session_id": session_id,
             "windows_processed": window_count,
+            "open_incidents": [
+                incident.to_dict() for incident in incident_registry.open_incidents.values()
+            ],
+            "schedule": schedule_report,
             "timestamp": datetime.now(timezone.utc).isoformat()
         })
 
         print(f"\n🏁 STREAMING SESSION COMPLETE")
         print(f"Windows processed: {window_count}")
+        print(f"Analyst calls: {schedule_report['llm_calls']} "
+              f"(+{schedule_report['cached_analyses']} cached, "
+              f"saved {schedule_report['llm_calls_saved']} of {schedule_report['fixed_schedule_calls']}, "
+              f"longest unanalysed stretch {schedule_report['max_unanalysed_gap_minutes']} min)")
+        print(f"Open incidents: {len(incident_registry.open_incidents)}")
 
     except Exception as e:
         print(f"\n❌ STREAMING SESSION FAILED: {e}")
@@ -1852,58 +1994,22 @@ async def check_for_anomaly_detection(analyst_result, window_number: int, window
     """Check if analyst detected an anomaly using existing pipeline logic (from full_pipeline_runner.py)."""
 
     try:
-        # Extract data from AgentMessage response payload
-        payload = analyst_result.payload if analyst_result and analyst_result.payload else None
-        if not payload:
+        if not analyst_result or not analyst_result.payload:
             print("⚠️  No payload in analyst result")
             return False
 
-        # Get details from payload
-        details = payload.details if payload.details else {}
-
-        # Extract confidence (default to 0.8 if not found)
-        confidence = details.get('confidence', 0.8)
-
-        # Extract severity from summary/details or use incident severity
-        severity = "MEDIUM"
-        if payload.summary:
-            summary_lower = payload.summary.lower()
-            if "critical" in summary_lower or "sev-1" in summary_lower:
-                severity = "CRITICAL"
-            elif "high" in summary_lower or "sev-2" in summary_lower:
-                severity = "HIGH"
-            elif "low" in summary_lower or "sev-3" in summary_lower:
-                severity = "LOW"
-
-        # Count evidence items as anomalies
-        anomalies_count = 0
-        if hasattr(payload, 'evidence') and payload.evidence:
-            anomalies_count = len(payload.evidence)
-        elif 'anomalies' in details:
-            anomalies_count = len(details['anomalies']) if isinstance(details['anomalies'], list) else 1
-
-        summary = payload.summary.lower() if payload.summary else ""
+        assessment = assess_anomaly(analyst_result)
 
         print(f"🔍 Anomaly detection using existing logic:")
-        print(f"   Confidence: {confidence:.1%}")
-        print(f"   Severity: {severity}")
-        print(f"   Anomalies detected: {anomalies_count}")
-
-        # Trigger incident if:
-        # 1. High confidence (>70%) AND severity is HIGH/CRITICAL
-        # 2. OR multiple anomalies detected (>=2)
-        # 3. OR low confidence (<50%) but HIGH/CRITICAL severity (emergency override)
-
-        high_confidence_trigger = confidence > 0.7 and severity in ["HIGH", "CRITICAL"]
-        multiple_anomalies_trigger = anomalies_count >= 2
-        emergency_override = confidence < 0.5 and severity == "CRITICAL"
+        print(f"   Confidence: {assessment['confidence']:.1%}")
+        print(f"   Severity: {assessment['severity']}")
+        print(f"   Anomalies detected: {assessment['anomalies_count']}")
+        print(f"   Triggers: high_conf={assessment['high_confidence_trigger']}, "
+              f"multi_anomaly={assessment['multiple_anomalies_trigger']}, "
+              f"emergency={assessment['emergency_override']}")
+        print(f"   → Should trigger incident: {assessment['should_trigger']}")
 
-        should_trigger = high_confidence_trigger or multiple_anomalies_trigger or emergency_override
-
-        print(f"   Triggers: high_conf={high_confidence_trigger}, multi_anomaly={multiple_anomalies_trigger}, emergency={emergency_override}")
-        print(f"   → Should trigger incident: {should_trigger}")
-
-        return should_trigger
+        return assessment["should_trigger"]
 
     except Exception as e:
         print(f"❌ Error in anomaly detection: {e}")
@@ -1944,8 +2050,9 @@ async def trigger_full_pipeline_for_incident(
             }
         }
 
-        # Run the full pipeline using existing infrastructure
-        pipeline_id = f"incident-{incident_id}-{int(time.time())}"
+        # Run the full pipeline using existing infrastructure; incident ids restart
+        # at INC-001 in every session, so the session keeps pipeline ids unique
+        pipeline_id = f"incident-{incident_id}-{session_id}-{int(time.time())}"
 
         # Use the existing run_real_pipeline function
         await run_real_pipeline(
@@ -1982,6 +2089,35 @@ async def trigger_full_pipeline_for_incident(
         })
 
 
+@app.get("/api/analysis-cache/stats")
+async def get_analysis_cache_stats():
+    """Get hit/miss statistics for the per-window analyst result cache."""
+    return get_window_analysis_cache().stats()
+
+
+@app.get("/api/websocket/metrics")
+async def get_websocket_metrics():
+    """Get per-client send queue depth, drop and eviction metrics."""
+    return pipeline_manager.get_broadcast_metrics()
+
+
+@app.get("/api/memory")
+async def get_memory_usage():
+    """Get memory accounting for pipeline state, applying the retention policy first."""
+    await pipeline_manager.evict_expired_pipelines()
+    return pipeline_manager.get_memory_usage()
+
+
+@app.get("/api/pipelines/history")
+async def get_pipeline_history(limit: int = 50):
+    """Get summaries of finished pipelines evicted from memory."""
+    return {
+        "pipelines": pipeline_manager.get_pipeline_history(limit),
+        "total": len(pipeline_manager.pipeline_history),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -2001,6 +2137,10 @@ async def root():
             "start_pipeline": "/api/pipeline/start",
             "start_streaming": "/api/streaming/start",
             "pipeline_status": "/api/pipeline/{pipeline_id}/status",
+            "analysis_cache_stats": "/api/analysis-cache/stats",
+            "websocket_metrics": "/api/websocket/metrics",
+            "memory_usage": "/api/memory",
+            "pipeline_history": "/api/pipelines/history",
             "test_real_agents": "/test/real-agents",
             "real_data_info": "/real-data/info",
             "docs": "/docs"
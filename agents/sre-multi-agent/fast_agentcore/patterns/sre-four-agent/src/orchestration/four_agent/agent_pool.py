@@ -0,0 +1,320 @@
+"""Process-lifetime pool of warm agents, readers and AWS clients.
+
+Building the four agents costs a Bedrock Knowledge Base client per agent, an
+LLM runner each and a read of the policy documents on first lookup. The pool
+does all of that once per process and shares the result between requests:
+
+- one knowledge base reader is given to the RCA, Impact and Mitigation agents
+- LLM runners are created and policy documents read during warmup
+- boto3 clients are cached per service and region (they are thread-safe)
+
+Agents keep no per-request state besides a few per-incident entries, dropped
+through ``forget_incident`` when a lease ends. Each request leases an
+orchestrator, the only object tracking a run, and gets a fresh
+``IncidentState`` from it, so concurrent requests share nothing mutable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .analyst_agent import AnalystAgent
+from .bedrock_kb_reader import BedrockKnowledgeBaseReader
+from .impact_agent import ImpactAgent
+from .mitigation_agent import MitigationCommsAgent
+from .orchestrator import PhaseTwoOrchestrator
+from .rca_agent import RCAAgent
+from .settings import AGENT_POOL_SIZE
+
+try:
+    import boto3
+
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+
+@dataclass
+class PooledAgents:
+    """Agents and readers shared by every request."""
+
+    analyst: AnalystAgent
+    rca: RCAAgent
+    impact: ImpactAgent
+    mitigation: MitigationCommsAgent
+    kb_reader: Optional[BedrockKnowledgeBaseReader] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "analyst": self.analyst,
+            "rca": self.rca,
+            "impact": self.impact,
+            "mitigation": self.mitigation,
+        }
+
+    def readers(self) -> Dict[str, Any]:
+        """Knowledge readers in use, keyed by the agent attribute holding them."""
+        readers = {
+            "rca": getattr(self.rca, "_rca_knowledge_reader", None),
+            "impact": getattr(self.impact, "_business_metrics_reader", None),
+            "mitigation_kb": getattr(self.mitigation, "_kb_reader", None),
+            "mitigation_policy": getattr(self.mitigation, "_policy_reader", None),
+        }
+        return {name: reader for name, reader in readers.items() if reader is not None}
+
+
+def build_agents() -> PooledAgents:
+    """Create the four agents around one shared knowledge base reader."""
+    kb_reader = None
+    try:
+        kb_reader = BedrockKnowledgeBaseReader()
+        print("✅ Agent pool: sharing one Bedrock Knowledge Base reader")
+    except Exception as e:
+        # Each agent falls back to its keyword-based reader
+        print(f"ℹ️  Agent pool: Bedrock KB unavailable ({e}), agents use local readers")
+
+    return PooledAgents(
+        analyst=AnalystAgent(),
+        rca=RCAAgent(kb_reader=kb_reader),
+        impact=ImpactAgent(kb_reader=kb_reader),
+        mitigation=MitigationCommsAgent(kb_reader=kb_reader),
+        kb_reader=kb_reader,
+    )
+
+
+class AgentPool:
+    """Warm agents shared by every request, and a free list of orchestrators."""
+
+    def __init__(
+        self,
+        *,
+        max_idle: int = AGENT_POOL_SIZE,
+        agent_factory: Callable[[], PooledAgents] = build_agents,
+    ):
+        """
+        Initialize an empty pool; nothing is built until warmup.
+
+        Args:
+            max_idle: Idle orchestrators kept for reuse
+            agent_factory: Builds the shared agents (tests pass fakes)
+        """
+        self.max_idle = max_idle
+        self._agent_factory = agent_factory
+        self._agents: Optional[PooledAgents] = None
+        self._idle: List[PhaseTwoOrchestrator] = []
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._build_lock = threading.Lock()
+        self._client_lock = threading.Lock()
+        self._warmup: Optional[asyncio.Future] = None
+        self._warming = False
+
+        # Health and metrics
+        self.warmup_ms: Optional[float] = None
+        self.warmup_error: Optional[str] = None
+        self.warnings: List[str] = []
+        self.leases = 0
+        self.active_leases = 0
+        self.orchestrators_created = 0
+        self.orchestrators_discarded = 0
+
+    @property
+    def ready(self) -> bool:
+        """True once the shared agents are built and warm."""
+        return self._agents is not None
+
+    @property
+    def warming(self) -> bool:
+        """True while warmup is running."""
+        return self._warming
+
+    # ------------------------------------------------------------------
+    # Warmup
+    # ------------------------------------------------------------------
+    def warm(self) -> PooledAgents:
+        """Build and warm the shared agents; blocks, safe to call from any thread."""
+        if self._agents is not None:
+            return self._agents
+        with self._build_lock:
+            if self._agents is not None:
+                return self._agents
+            self._warming = True
+            started = time.perf_counter()
+            try:
+                agents = self._agent_factory()
+                warnings = self._warm_agents(agents)
+            except Exception as e:
+                self.warmup_error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self._warming = False
+            self.warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.warmup_error = None
+            self.warnings = warnings
+            self._agents = agents
+            print(f"🔥 Agent pool warm in {self.warmup_ms}ms")
+        return self._agents
+
+    @staticmethod
+    def _warm_agents(agents: PooledAgents) -> List[str]:
+        """Create LLM runners and read policy documents ahead of the first request."""
+        warnings: List[str] = []
+        for agent in agents.as_dict().values():
+            agent._ensure_runner()
+        for name, reader in agents.readers().items():
+            preload = getattr(reader, "preload", None)
+            if preload is None:
+                continue
+            try:
+                preload()
+            except OSError as e:
+                # The agent reports the missing document when it needs it
+                warnings.append(f"{name} reader: {e}")
+                print(f"⚠️  Agent pool: could not preload {name} reader: {e}")
+        return warnings
+
+    def start_warmup(self) -> asyncio.Future:
+        """Warm the pool in a worker thread without blocking the event loop."""
+        if self._warmup is None:
+            self._warmup = asyncio.ensure_future(asyncio.to_thread(self.warm))
+            self._warmup.add_done_callback(self._warmup_done)
+        return self._warmup
+
+    def _warmup_done(self, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            if not future.cancelled():
+                print(f"⚠️  Agent pool warmup failed: {future.exception()}")
+            # Let the next request try again
+            self._warmup = None
+
+    async def ensure_warm(self) -> PooledAgents:
+        """Wait for the shared agents, warming them if nobody has yet."""
+        if self._agents is not None:
+            return self._agents
+        # Join a warmup already in flight rather than building twice
+        return await asyncio.shield(self.start_warmup())
+
+    # ------------------------------------------------------------------
+    # Leases
+    # ------------------------------------------------------------------
+    @asynccontextmanager
+    async def lease(self, incident_id: str) -> AsyncIterator[PhaseTwoOrchestrator]:
+        """
+        Lease an orchestrator over the shared agents for one request.
+
+        The orchestrator goes back to the free list when the block exits and
+        the agents forget the incident.
+        """
+        agents = await self.ensure_warm()
+        orchestrator = self._checkout(agents, incident_id)
+        self.leases += 1
+        self.active_leases += 1
+        try:
+            yield orchestrator
+        finally:
+            self.active_leases -= 1
+            for agent in agents.as_dict().values():
+                forget = getattr(agent, "forget_incident", None)
+                if forget is not None:
+                    forget(incident_id)
+            self._checkin(orchestrator)
+
+    def _checkout(self, agents: PooledAgents, incident_id: str) -> PhaseTwoOrchestrator:
+        if self._idle:
+            orchestrator = self._idle.pop()
+            orchestrator.reset(incident_id)
+            return orchestrator
+        self.orchestrators_created += 1
+        return PhaseTwoOrchestrator(
+            analyst_agent=agents.analyst,
+            rca_agent=agents.rca,
+            impact_agent=agents.impact,
+            mitigation_agent=agents.mitigation,
+            demo_mode=False,
+            incident_id=incident_id,
+        )
+
+    def _checkin(self, orchestrator: PhaseTwoOrchestrator) -> None:
+        try:
+            orchestrator.reset()
+        except RuntimeError:
+            # Suspended mid-run; not safe to hand to another request
+            self.orchestrators_discarded += 1
+            return
+        if len(self._idle) < self.max_idle:
+            self._idle.append(orchestrator)
+        else:
+            self.orchestrators_discarded += 1
+
+    # ------------------------------------------------------------------
+    # AWS clients
+    # ------------------------------------------------------------------
+    def client(self, service_name: str, region_name: Optional[str] = None) -> Any:
+        """
+        Shared boto3 client for a service and region, created on first use.
+
+        Raises:
+            ImportError: If boto3 is not available
+        """
+        key = (service_name, region_name)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        if not BOTO3_AVAILABLE:
+            raise ImportError("boto3 is required for AWS clients. Install with: pip install boto3")
+        with self._client_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = boto3.client(service_name, region_name=region_name)
+                self._clients[key] = client
+        return client
+
+    # ------------------------------------------------------------------
+    # Health
+    # ------------------------------------------------------------------
+    def health(self) -> Dict[str, Any]:
+        """Warmup state, components in use and lease counters."""
+        if self._agents is not None:
+            status = "degraded" if self.warnings else "ready"
+        elif self._warming:
+            status = "warming"
+        elif self.warmup_error is not None:
+            status = "failed"
+        else:
+            status = "cold"
+
+        agents: Dict[str, Any] = {}
+        readers: Dict[str, str] = {}
+        if self._agents is not None:
+            for name, agent in self._agents.as_dict().items():
+                runner = getattr(agent, "_llm_runner", None)
+                agents[name] = {
+                    "type": type(agent).__name__,
+                    "runner": type(runner).__name__ if runner is not None else None,
+                }
+            readers = {name: type(reader).__name__ for name, reader in self._agents.readers().items()}
+
+        return {
+            "status": status,
+            "warmup_ms": self.warmup_ms,
+            "warmup_error": self.warmup_error,
+            "warnings": list(self.warnings),
+            "agents": agents,
+            "readers": readers,
+            "shared_kb_reader": self._agents is not None and self._agents.kb_reader is not None,
+            "orchestrators": {
+                "idle": len(self._idle),
+                "max_idle": self.max_idle,
+                "created": self.orchestrators_created,
+                "discarded": self.orchestrators_discarded,
+            },
+            "leases": {"total": self.leases, "active": self.active_leases},
+            "clients": sorted(f"{service}@{region or 'default'}" for service, region in self._clients),
+        }
+
+
+__all__ = ["AgentPool", "PooledAgents", "build_agents"]
@@ -16,6 +16,33 @@ from .llm import BaseLLMAgent
 from .schema import AgentRole, EvidenceReference, MessageType, PayloadModel
 from .settings import get_default_model
 from .state import IncidentState
+from .structured_output import agent_response_schema
+
+# Schema for analyze_logs responses, mirroring AnalysisResult/DetectedAnomaly
+ANALYSIS_RESULT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "anomalies": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "pattern": {"type": "string"},
+                    "confidence": {"type": "number"},
+                    "severity": {"type": "string", "enum": ["LOW", "MEDIUM", "HIGH", "CRITICAL"]},
+                    "affected_services": {"type": "array", "items": {"type": "string"}},
+                    "evidence_snippet": {"type": "string"},
+                    "timestamp_range": {"type": "string"},
+                },
+                "required": ["pattern", "confidence", "severity", "affected_services"],
+            },
+        },
+        "overall_confidence": {"type": "number"},
+        "severity_assessment": {"type": "string", "enum": ["LOW", "MEDIUM", "HIGH", "CRITICAL"]},
+        "log_summary": {"type": "string"},
+    },
+    "required": ["anomalies", "overall_confidence", "severity_assessment", "log_summary"],
+}
 
 
 @dataclass(frozen=True)
@@ -67,6 +94,10 @@ class AnalystAgent(BaseLLMAgent):
         AgentRole.ANALYST.value
     )  # Using ANALYST alias (resolves to "Signals" for compatibility)
 
+    # Bump whenever _system_prompt or _build_user_prompt change so cached
+    # window analyses produced by an older prompt are not reused
+    prompt_version = "analyst-v1"
+
     def __init__(
         self,
         config: AnalystAgentConfig | None = None,
@@ -103,8 +134,9 @@ class AnalystAgent(BaseLLMAgent):
                 logger = logging.getLogger(__name__)
                 logger.debug(f"Failed to initialize CloudWatch observability: {e}")
 
-        # Performance tracking
-        self._analysis_start_time: Optional[float] = None
+        # Performance tracking, per incident so a shared agent can serve
+        # several incidents at once
+        self._analysis_start_times: Dict[str, float] = {}
 
         # Initialize real-time scenario loader if in real-time mode
         self.scenario_loader = None
@@ -150,6 +182,10 @@ class AnalystAgent(BaseLLMAgent):
             stream_updates=stream_updates,
         )
 
+    def forget_incident(self, incident_id: str) -> None:
+        """Drop timing state left behind by an incident whose analysis failed."""
+        self._analysis_start_times.pop(incident_id, None)
+
     # ------------------------------------------------------------------
     # Main Analysis Methods
     # ------------------------------------------------------------------
@@ -219,12 +255,19 @@ Identify any anomalies, errors, or concerning patterns. Focus on:
                 temperature=0.25,
                 max_tokens=self._max_tokens,
                 stream=False,
+                response_schema=(
+                    ANALYSIS_RESULT_SCHEMA if self._structured_output else None
+                ),
             )
 
             # Get LLM response
             result = await runner.run(request)
             response = result.text
 
+            # Structured-output mode returns an already validated object
+            if result.structured is not None:
+                return self._analysis_result_from_data(result.structured)
+
             # Parse JSON response - handle markdown code blocks
             if not response or not response.strip():
                 raise ValueError("LLM returned empty response")
@@ -261,52 +304,7 @@ Identify any anomalies, errors, or concerning patterns. Focus on:
 
             result_data = json.loads(clean_response)
 
-            # Convert to AnalysisResult - handle flexible field names
-            anomalies = []
-            for anomaly_data in result_data.get("anomalies", []):
-                try:
-                    # Handle both dictionary and string anomalies
-                    if isinstance(anomaly_data, str):
-                        # LLM returned a plain string instead of structured object
-                        # Create a structured anomaly from the string
-                        anomaly = self._parse_string_anomaly(anomaly_data)
-                    elif isinstance(anomaly_data, dict):
-                        # Expected case: structured dictionary
-                        anomaly = DetectedAnomaly(
-                            pattern=anomaly_data.get(
-                                "pattern",
-                                anomaly_data.get("description", "Unknown pattern"),
-                            ),
-                            confidence=float(anomaly_data.get("confidence", 0.7)),
-                            severity=anomaly_data.get("severity", "MEDIUM"),
-                            affected_services=anomaly_data.get(
-                                "affected_services",
-                                [anomaly_data.get("service", "unknown")],
-                            ),
-                            evidence_snippet=anomaly_data.get(
-                                "evidence_snippet",
-                                anomaly_data.get("example_log", "No evidence"),
-                            ),
-                            timestamp_range=anomaly_data.get(
-                                "timestamp_range", "Unknown time range"
-                            ),
-                        )
-                    else:
-                        # Unexpected type - skip
-                        print(f"⚠️ Unexpected anomaly type: {type(anomaly_data)} - {anomaly_data}")
-                        continue
-                    
-                    anomalies.append(anomaly)
-                except Exception as e:
-                    print(f"⚠️ Could not parse anomaly: {anomaly_data} - {e}")
-                    continue
-
-            return AnalysisResult(
-                anomalies=anomalies,
-                overall_confidence=result_data.get("overall_confidence", 0.0),
-                severity_assessment=result_data.get("severity_assessment", "UNKNOWN"),
-                log_summary=result_data.get("log_summary", "No issues detected"),
-            )
+            return self._analysis_result_from_data(result_data)
 
         except json.JSONDecodeError as e:
             # Fallback if LLM doesn't return valid JSON - treat as plain text analysis
@@ -344,6 +342,55 @@ Identify any anomalies, errors, or concerning patterns. Focus on:
                 log_summary="Unable to analyze logs due to error",
             )
 
+    def _analysis_result_from_data(self, result_data: Mapping[str, Any]) -> AnalysisResult:
+        """Convert a decoded analysis response into an AnalysisResult."""
+        # Convert to AnalysisResult - handle flexible field names
+        anomalies = []
+        for anomaly_data in result_data.get("anomalies", []):
+            try:
+                # Handle both dictionary and string anomalies
+                if isinstance(anomaly_data, str):
+                    # LLM returned a plain string instead of structured object
+                    # Create a structured anomaly from the string
+                    anomaly = self._parse_string_anomaly(anomaly_data)
+                elif isinstance(anomaly_data, dict):
+                    # Expected case: structured dictionary
+                    anomaly = DetectedAnomaly(
+                        pattern=anomaly_data.get(
+                            "pattern",
+                            anomaly_data.get("description", "Unknown pattern"),
+                        ),
+                        confidence=float(anomaly_data.get("confidence", 0.7)),
+                        severity=anomaly_data.get("severity", "MEDIUM"),
+                        affected_services=anomaly_data.get(
+                            "affected_services",
+                            [anomaly_data.get("service", "unknown")],
+                        ),
+                        evidence_snippet=anomaly_data.get(
+                            "evidence_snippet",
+                            anomaly_data.get("example_log", "No evidence"),
+                        ),
+                        timestamp_range=anomaly_data.get(
+                            "timestamp_range", "Unknown time range"
+                        ),
+                    )
+                else:
+                    # Unexpected type - skip
+                    print(f"⚠️ Unexpected anomaly type: {type(anomaly_data)} - {anomaly_data}")
+                    continue
+
+                anomalies.append(anomaly)
+            except Exception as e:
+                print(f"⚠️ Could not parse anomaly: {anomaly_data} - {e}")
+                continue
+
+        return AnalysisResult(
+            anomalies=anomalies,
+            overall_confidence=result_data.get("overall_confidence", 0.0),
+            severity_assessment=result_data.get("severity_assessment", "UNKNOWN"),
+            log_summary=result_data.get("log_summary", "No issues detected"),
+        )
+
     async def detect_anomalies(self, log_text: str) -> List[DetectedAnomaly]:
         """LLM-based anomaly detection in logs."""
         # This would contain the core anomaly detection logic
@@ -505,9 +552,9 @@ Identify any anomalies, errors, or concerning patterns. Focus on:
 
         return base_prompt
 
-    def _build_user_prompt(self, incoming, state) -> str:
+    def _build_user_prompt(self, incoming, state, knowledge=None) -> str:
         # Start timing analysis
-        self._analysis_start_time = time.time()
+        self._analysis_start_times[incoming.incident_id] = time.time()
 
         log_analysis, incident_narrative, context_data = (
             self._analyze_logs_from_incoming(incoming)
@@ -556,6 +603,22 @@ Identify any anomalies, errors, or concerning patterns. Focus on:
     ) -> MessageType:
         return MessageType.OPEN
 
+    def _response_schema(self, incoming, state) -> Dict[str, Any]:
+        return agent_response_schema(
+            {
+                "type": "object",
+                "properties": {
+                    "severity_score": {"type": "number"},
+                    "anomaly_confidence": {"type": "number"},
+                    "detected_patterns": {"type": "object"},
+                    "severity_indicators": {"type": "array"},
+                    "initial_hypothesis": {"type": "string"},
+                    "recommended_action": {"type": "string"},
+                },
+                "required": ["severity_score", "anomaly_confidence"],
+            }
+        )
+
     def _build_payload(
         self, parsed: Mapping[str, object], incoming, state
     ) -> PayloadModel:
@@ -614,9 +677,9 @@ Identify any anomalies, errors, or concerning patterns. Focus on:
 
         # Calculate analysis duration if tracking was started
         analysis_duration_ms = 0.0
-        if self._analysis_start_time:
-            analysis_duration_ms = (time.time() - self._analysis_start_time) * 1000
-            self._analysis_start_time = None  # Reset
+        started_at = self._analysis_start_times.pop(message.incident_id, None)
+        if started_at:
+            analysis_duration_ms = (time.time() - started_at) * 1000
 
         # Emit CloudWatch metrics
         if self._observability:
@@ -9,41 +9,60 @@ Key features:
 - Retry logic with exponential backoff for transient failures
 - Response format conversion to maintain compatibility with existing agents
 - Comprehensive error handling and fallback responses
+- Two-level query result cache (exact and near-duplicate queries), dropped
+  when a new ingestion job shows the KB was synced
 """
 
 from __future__ import annotations
 
+import json
 import logging
 import os
+import threading
 import time
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any
-from threading import local
+
+from .embedding_backends import CircuitBreaker
+from .kb_fanout import retrieve_many
+from .query_cache import CACHE_MISS, QueryResultCache
+from .settings import KB_SYNC_CHECK_SECONDS, QUERY_CACHE_EMBED_MODEL
 
 logger = logging.getLogger(__name__)
 
-# Thread-local storage for KB retrieval tracking
-_kb_tracking = local()
+# Errors that no retry fixes: the embedding model id is wrong or not enabled
+# for this account
+_EMBED_MODEL_ERRORS = {"AccessDeniedException", "ValidationException"}
+
+# Per-request KB retrieval tracking. A context variable rather than
+# thread-local storage: requests sharing pooled agents run concurrently on
+# one event loop thread, and each asyncio task has its own context.
+_kb_tracking: ContextVar[list | None] = ContextVar("kb_retrievals", default=None)
 
 def get_kb_retrievals():
-    """Get list of KB retrievals for current thread."""
-    if not hasattr(_kb_tracking, 'retrievals'):
-        _kb_tracking.retrievals = []
-    return _kb_tracking.retrievals
+    """Get list of KB retrievals for the current request."""
+    retrievals = _kb_tracking.get()
+    if retrievals is None:
+        retrievals = []
+        _kb_tracking.set(retrievals)
+    return retrievals
 
 def clear_kb_retrievals():
-    """Clear KB retrieval tracking for current thread."""
-    if hasattr(_kb_tracking, 'retrievals'):
-        _kb_tracking.retrievals = []
-
-def track_kb_retrieval(query: str, sources: list[str], result_count: int):
-    """Track a KB retrieval for display to user."""
-    if not hasattr(_kb_tracking, 'retrievals'):
-        _kb_tracking.retrievals = []
-    _kb_tracking.retrievals.append({
+    """Start a fresh KB retrieval list for the current request."""
+    _kb_tracking.set([])
+
+def track_kb_retrieval(query: str, sources: list[str], result_count: int, cache: str = CACHE_MISS):
+    """Track a KB retrieval for display to user.
+
+    ``cache`` is how the query cache answered: "miss" (retrieved),
+    "exact" or "semantic".
+    """
+    get_kb_retrievals().append({
         'query': query,
         'sources': sources,
-        'result_count': result_count
+        'result_count': result_count,
+        'cache': cache,
     })
 
 try:
@@ -80,6 +99,7 @@ class BedrockKnowledgeBaseReader:
         region_name: str = "us-west-2",
         inference_model_arn: str | None = None,
         top_k: int = 5,
+        cache: QueryResultCache | None = None,
     ):
         """Initialize Bedrock Knowledge Base reader.
 
@@ -88,6 +108,9 @@ class BedrockKnowledgeBaseReader:
             region_name: AWS region for Bedrock services
             inference_model_arn: Model ARN for inference (Llama 3.3/3.7)
             top_k: Number of results to retrieve from semantic search
+            cache: Query result cache; by default one configured from the
+                SRE_QUERY_CACHE_* settings, embedding queries with
+                SRE_QUERY_CACHE_EMBED_MODEL for near-duplicate lookup
 
         Raises:
             ImportError: If boto3 is not available
@@ -113,10 +136,23 @@ class BedrockKnowledgeBaseReader:
             default="arn:aws:bedrock:us-west-2::foundation-model/meta.llama3-3-70b-instruct-v1:0",
         )
         self.top_k = int(os.getenv("BEDROCK_KB_TOP_K", str(top_k)))
+        # Optional: lets the reader notice KB syncs and drop cached results
+        self.data_source_id = self._load_config_value(
+            "BEDROCK_DATA_SOURCE_ID", None, required=False
+        )
 
         # Validate configuration
         self._validate_configuration()
 
+        self.cache = cache if cache is not None else QueryResultCache(embed=self._embed_query)
+        self._embed_client = None
+        self._embed_breaker = CircuitBreaker(f"query cache ({QUERY_CACHE_EMBED_MODEL})")
+        self._embed_disabled = False
+        self._agent_client = None
+        self._sync_marker: str | None = None
+        self._sync_checked_at = 0.0
+        self._sync_lock = threading.Lock()
+
         # Initialize boto3 client
         try:
             self.client = boto3.client(
@@ -219,10 +255,11 @@ class BedrockKnowledgeBaseReader:
         base_delay: float = 1.0,
         max_delay: float = 10.0,
     ) -> dict[str, Any]:
-        """Core retrieval method that calls bedrock_agent_runtime.retrieve().
+        """Core retrieval method, answered from the query cache when possible.
 
-        Implements retry logic with exponential backoff for timeouts and throttling.
-        Handles various API errors including authentication, not found, and throttling.
+        A cache miss calls ``bedrock_agent_runtime.retrieve()`` with retries
+        (see ``_call_retrieve``). Every lookup, hit or miss, is reported
+        through ``track_kb_retrieval``.
 
         Args:
             query: Natural language query for semantic search
@@ -242,6 +279,136 @@ class BedrockKnowledgeBaseReader:
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
 
+        self._check_kb_sync()
+        response, outcome = self.cache.get_or_compute(
+            f"retrieve:{self.top_k}",
+            query,
+            lambda: self._call_retrieve(query, max_retries, base_delay, max_delay),
+        )
+
+        # Extract sources for tracking
+        sources = []
+        for result in response.get('retrievalResults', [])[:5]:  # Track first 5 sources
+            location = result.get('location', {})
+            if 's3Location' in location:
+                uri = location['s3Location'].get('uri', 'unknown')
+                # Extract filename from S3 URI
+                filename = uri.split('/')[-1] if '/' in uri else uri
+                if filename not in sources:
+                    sources.append(filename)
+
+        # Track this retrieval for display to user
+        track_kb_retrieval(query[:100], sources, len(response.get('retrievalResults', [])), cache=outcome)
+
+        if sources:
+            logger.info(
+                f"KB Query: '{query[:80]}...' | Sources: {', '.join(sources)}"
+                f"{'' if outcome == CACHE_MISS else f' | cache: {outcome}'}"
+            )
+
+        return response
+
+    def _embed_query(self, text: str) -> list[float] | None:
+        """Embed a query for the cache's near-duplicate lookup.
+
+        Returns None (semantic lookup skipped) if the embedding model cannot
+        be used. Throttles and timeouts go through a circuit breaker, so the
+        model is tried again once it recovers; only an access or validation
+        error on the model id stops it for good.
+        """
+        if self._embed_disabled or not self._embed_breaker.allow():
+            return None
+        try:
+            if self._embed_client is None:
+                self._embed_client = boto3.client("bedrock-runtime", region_name=self.region_name)
+            response = self._embed_client.invoke_model(
+                modelId=QUERY_CACHE_EMBED_MODEL,
+                body=json.dumps({"inputText": text}),
+            )
+            embedding = json.loads(response["body"].read()).get("embedding")
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code in _EMBED_MODEL_ERRORS:
+                self._embed_disabled = True
+                logger.warning(
+                    f"Query cache: cannot embed with {QUERY_CACHE_EMBED_MODEL} ({error_code}); "
+                    "only exact repeats will be served from cache"
+                )
+            else:
+                self._embed_breaker.record_failure()
+                logger.debug(f"Query cache: embedding failed ({error_code}), skipping semantic lookup")
+            return None
+        except Exception as e:
+            self._embed_breaker.record_failure()
+            logger.debug(f"Query cache: embedding failed ({e}), skipping semantic lookup")
+            return None
+        self._embed_breaker.record_success()
+        return embedding
+
+    def _check_kb_sync(self) -> None:
+        """Drop cached results if the data source was synced since the last check.
+
+        Looks at the most recent ingestion job of ``BEDROCK_DATA_SOURCE_ID``
+        at most every ``SRE_KB_SYNC_CHECK_SECONDS``; without a data source id
+        cached results simply expire with their TTL.
+        """
+        if not self.data_source_id or KB_SYNC_CHECK_SECONDS <= 0 or not self.cache.enabled:
+            return
+        now = time.monotonic()
+        with self._sync_lock:
+            if now - self._sync_checked_at < KB_SYNC_CHECK_SECONDS:
+                return
+            self._sync_checked_at = now
+        try:
+            if self._agent_client is None:
+                self._agent_client = boto3.client("bedrock-agent", region_name=self.region_name)
+            jobs = self._agent_client.list_ingestion_jobs(
+                knowledgeBaseId=self.knowledge_base_id,
+                dataSourceId=self.data_source_id,
+                sortBy={"attribute": "STARTED_AT", "order": "DESCENDING"},
+                maxResults=1,
+            ).get("ingestionJobSummaries", [])
+        except Exception as e:
+            logger.warning(f"Could not check Knowledge Base sync status: {e}")
+            return
+
+        marker = f"{jobs[0].get('ingestionJobId')}:{jobs[0].get('status')}" if jobs else ""
+        with self._sync_lock:
+            previous, self._sync_marker = self._sync_marker, marker
+        if previous is not None and marker != previous:
+            logger.info(f"Knowledge Base ingestion job changed ({marker}), invalidating query cache")
+            self.cache.invalidate()
+
+    def invalidate_cache(self) -> None:
+        """Drop all cached query results, e.g. right after syncing the KB."""
+        self.cache.invalidate()
+
+    def _call_retrieve(
+        self,
+        query: str,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 10.0,
+    ) -> dict[str, Any]:
+        """Call bedrock_agent_runtime.retrieve(), bypassing the query cache.
+
+        Implements retry logic with exponential backoff for timeouts and throttling.
+        Handles various API errors including authentication, not found, and throttling.
+
+        Args:
+            query: Natural language query for semantic search
+            max_retries: Maximum number of retry attempts (default: 3)
+            base_delay: Initial delay in seconds for exponential backoff (default: 1.0)
+            max_delay: Maximum delay in seconds between retries (default: 10.0)
+
+        Returns:
+            Bedrock KB API response dictionary containing retrievalResults
+
+        Raises:
+            ValueError: If query is empty or invalid
+            ClientError: For non-retryable API errors (auth, not found, validation)
+            ReadTimeoutError: If all retries are exhausted for timeout errors
+        """
         # Prepare retrieval configuration
         retrieval_config = {
             "vectorSearchConfiguration": {"numberOfResults": self.top_k}
@@ -268,24 +435,6 @@ class BedrockKnowledgeBaseReader:
                     f"Successfully retrieved {result_count} results "
                     f"from Knowledge Base (attempt {attempt + 1})"
                 )
-                
-                # Extract sources for tracking
-                sources = []
-                for result in response.get('retrievalResults', [])[:5]:  # Track first 5 sources
-                    location = result.get('location', {})
-                    if 's3Location' in location:
-                        uri = location['s3Location'].get('uri', 'unknown')
-                        # Extract filename from S3 URI
-                        filename = uri.split('/')[-1] if '/' in uri else uri
-                        if filename not in sources:
-                            sources.append(filename)
-                
-                # Track this retrieval for display to user
-                track_kb_retrieval(query[:100], sources, result_count)
-                
-                if sources:
-                    logger.info(f"KB Query: '{query[:80]}...' | Sources: {', '.join(sources)}")
-                
                 return response
 
             except ClientError as e:
@@ -705,6 +854,7 @@ class BedrockKnowledgeBaseReader:
             - content: Text content of the chunk
             - relevance_score: Similarity score (0-1, higher is better)
             - source: Source document filename
+            - metadata: Bedrock result metadata (includes the KB chunk id)
 
         Raises:
             ValueError: If query is empty or invalid
@@ -744,6 +894,7 @@ class BedrockKnowledgeBaseReader:
                     "content": content,
                     "relevance_score": relevance_score,
                     "source": source_file,
+                    "metadata": result.get("metadata", {}),
                 })
             
             logger.info(
@@ -760,5 +911,26 @@ class BedrockKnowledgeBaseReader:
             )
             raise
 
+    async def retrieve_many(self, queries: list[str], source: str = "both") -> list[dict[str, Any]]:
+        """Run several semantic queries concurrently and merge the results.
+
+        Each query is a ``search_by_semantic_query`` call in a worker thread,
+        at most ``SRE_KB_FANOUT_CONCURRENCY`` in flight, so N queries cost
+        about one retrieve round-trip instead of N.
+
+        Args:
+            queries: Natural language queries
+            source: Passed through to ``search_by_semantic_query``
+
+        Returns:
+            Chunks de-duplicated by KB chunk id, best first, with per-query
+            normalised ``relevance_score`` and the ``query_index`` of the
+            query each chunk matched best (see ``kb_fanout.merge_query_results``)
+
+        Raises:
+            ClientError, ReadTimeoutError: If every query failed
+        """
+        return await retrieve_many(lambda query: self.search_by_semantic_query(query, source), queries)
+
 
 __all__ = ["BedrockKnowledgeBaseReader"]
@@ -5,6 +5,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from .schema import Severity
+from .section_index import SectionIndex
 
 
 class BusinessMetricsReader:
@@ -26,19 +27,27 @@ class BusinessMetricsReader:
             policy_path = root / "docs" / "policies" / "business-impact-baselines.md"
 
         self._policy_path = Path(policy_path)
-        self._policy_content: str | None = None
+        self._index = SectionIndex(self._policy_path, "Business impact baselines policy")
 
-    def _load_policy_content(self) -> str:
-        """Load the full policy document content."""
-        if self._policy_content is None:
-            if not self._policy_path.exists():
-                raise FileNotFoundError(
-                    f"Business impact baselines policy not found at {self._policy_path}"
-                )
+    def preload(self) -> None:
+        """Index the policy document now rather than on the first lookup."""
+        self._index.refresh()
 
-            self._policy_content = self._policy_path.read_text()
+    def search_sections(
+        self, query: str, limit: int = 3, max_tokens: int | None = None
+    ) -> str:
+        """Policy subsections that best match the query's keywords.
 
-        return self._policy_content
+        Args:
+            query: Keywords, e.g. "checkout revenue per transaction"
+            limit: Maximum number of subsections
+            max_tokens: Token budget for the returned text
+
+        Returns:
+            The matching subsections, best first
+        """
+        sections = self._index.search(query, limit=limit, max_tokens=max_tokens)
+        return "\n\n".join(section.body for section in sections)
 
     def get_baseline_metrics(self, severity: Severity) -> dict[str, float]:
         """Extract baseline metrics for the given severity level.
@@ -55,8 +64,6 @@ class BusinessMetricsReader:
             >>> print(metrics['baseline_tps'])
             1200.0
         """
-        content = self._load_policy_content()
-
         # Map severity to section numbers in the policy document
         section_map = {
             Severity.SEV_1: "3.1",  # SEV-1 (Critical) - Complete Service Outage
@@ -69,7 +76,7 @@ class BusinessMetricsReader:
             return self._get_fallback_baselines(severity)
 
         # Extract the specific section
-        section_content = self._extract_section(content, section_num)
+        section_content = self._extract_section(section_num)
 
         # Parse metrics from the section
         metrics = self._parse_baseline_metrics(section_content, severity)
@@ -82,10 +89,8 @@ class BusinessMetricsReader:
         Returns:
             Dictionary containing revenue calculation formulas and methodology
         """
-        content = self._load_policy_content()
-
-        # Extract Section 4: Revenue Calculation Methodology
-        formulas_section = self._extract_section(content, "4")
+        # Section 4.1 of the Revenue Calculation Methodology holds the formulas
+        formulas_section = self._extract_section("4.1")
 
         return {
             "transaction_revenue_loss": "(Baseline TPS - Current TPS) × Revenue per Transaction",
@@ -109,11 +114,7 @@ class BusinessMetricsReader:
         Returns:
             Dictionary containing SLA thresholds and breach criteria
         """
-        # Parse from Section 5: Success Rate and SLA Impact
-        content = self._load_policy_content()
-        sla_section = self._extract_section(content, "5")
-
-        # Default thresholds from policy
+        # Default thresholds from policy Section 5: Success Rate and SLA Impact
         thresholds = {
             Severity.SEV_1: {
                 "success_rate_threshold": 95.0,
@@ -173,55 +174,16 @@ class BusinessMetricsReader:
 
         return user_thresholds.get(severity, user_thresholds[Severity.SEV_2])
 
-    def _extract_section(self, content: str, section_num: str) -> str:
+    def _extract_section(self, section_num: str) -> str:
         """Extract a specific numbered section from the policy document.
 
         Args:
-            content: Full policy document content
             section_num: Section number to extract (e.g., "3.1", "4")
 
         Returns:
             Extracted section content as string
         """
-        lines = content.split("\n")
-        section_lines = []
-        in_section = False
-        section_level = len(section_num.split("."))
-
-        for line in lines:
-            # Check if this is the start of our target section
-            if line.startswith(f"### {section_num} ") or line.startswith(
-                f"## {section_num} "
-            ):
-                in_section = True
-                section_lines.append(line)
-                continue
-
-            # Check if we've hit the next section at the same level
-            if in_section and line.startswith("#"):
-                # Count the heading level
-                heading_level = len(line) - len(line.lstrip("#"))
-                if heading_level <= section_level + 1:
-                    # Check if this is a same-level or higher-level section
-                    if section_level == 1 and heading_level <= 2:
-                        break
-                    elif section_level == 2 and heading_level <= 3:
-                        # For subsections, only break on same level or higher
-                        if line.startswith("### ") and not line.startswith(
-                            f"### {section_num}."
-                        ):
-                            break
-                        elif line.startswith("## "):
-                            break
-
-            if in_section:
-                section_lines.append(line)
-
-        return (
-            "\n".join(section_lines)
-            if section_lines
-            else f"Section {section_num} not found"
-        )
+        return self._index.section_text(section_num)
 
     def _parse_baseline_metrics(
         self, section_content: str, severity: Severity
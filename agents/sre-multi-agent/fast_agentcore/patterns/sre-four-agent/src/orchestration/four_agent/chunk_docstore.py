@@ -0,0 +1,176 @@
+"""Chunk texts of a vector index in a JSON lines file, read lazily by id.
+
+LangChain's ``FAISS.save_local`` pickles the whole docstore, and
+``load_local`` has to unpickle it (with ``allow_dangerous_deserialization``)
+before the first search, so a cold start grew with the corpus and executed
+whatever the pickle contained. ``ChunkDocstore`` keeps one JSON object per
+chunk in ``<index name>.docs.jsonl`` instead:
+
+- each chunk's byte offset and length in the file are kept with its record
+  (in the metadata sidecar), so a lookup is one slice of a memory-mapped
+  file and nothing is read at load
+- new chunks are held in memory until ``flush`` appends them; removed chunks
+  stay in the file as garbage until ``rewrite`` copies the live ones out
+- source and position come from the chunk's record, so moving a chunk does
+  not touch the file
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from langchain_community.docstore.base import AddableMixin, Docstore
+from langchain_core.documents import Document
+
+if TYPE_CHECKING:
+    from .vector_index import ChunkRecord
+
+logger = logging.getLogger(__name__)
+
+
+class ChunkDocstore(Docstore, AddableMixin):
+    """LangChain docstore over a JSON lines file, addressed through chunk records."""
+
+    def __init__(self, path: Path, locate: Callable[[str], ChunkRecord | None]):
+        """Open the docstore; the file is mapped on the first lookup.
+
+        Args:
+            path: JSON lines file, usually ``<index name>.docs.jsonl``
+            locate: Record of a live chunk, holding its offset, or None
+        """
+        self.path = path
+        self.locate = locate
+        self._pending: dict[str, Document] = {}
+        self._mapped: mmap.mmap | None = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Docstore interface
+    # ------------------------------------------------------------------
+    def add(self, texts: dict[str, Document]) -> None:
+        """Hold new chunks until the next ``flush``."""
+        self._pending.update(texts)
+
+    def delete(self, ids: list) -> None:
+        """Forget unflushed chunks; flushed ones become garbage once their records are dropped."""
+        for chunk_id in ids:
+            self._pending.pop(chunk_id, None)
+
+    def search(self, search: str) -> Document | str:
+        """The chunk with this id, or a "not found" message as LangChain's docstores return."""
+        record = self.locate(search)
+        if record is None:
+            return f"ID {search} not found."
+        if search in self._pending:
+            text = self._pending[search].page_content
+        else:
+            text = self._read(search, record)
+            if text is None:
+                return f"ID {search} not found."
+        return Document(
+            page_content=text,
+            metadata={"source": record.source, "chunk_id": search, "position": record.position},
+        )
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def size(self) -> int:
+        """Bytes in the file, to check against the manifest on load."""
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def flush(self) -> dict[str, tuple[int, int]]:
+        """Append unflushed chunks to the file and set their records' offsets.
+
+        Returns:
+            (offset, length) of each chunk written
+        """
+        written: dict[str, tuple[int, int]] = {}
+        with self._lock:
+            pending = [
+                (chunk_id, doc, record)
+                for chunk_id, doc in self._pending.items()
+                if (record := self.locate(chunk_id)) is not None
+            ]
+            if pending:
+                with open(self.path, "ab") as f:
+                    for chunk_id, doc, record in pending:
+                        line = _encode(chunk_id, doc.page_content)
+                        record.doc_offset = f.tell()
+                        record.doc_length = len(line)
+                        f.write(line)
+                        written[chunk_id] = (record.doc_offset, record.doc_length)
+                self._unmap()
+            self._pending.clear()
+        return written
+
+    def rewrite(self, records: dict[str, ChunkRecord]) -> dict[str, tuple[int, int]]:
+        """Replace the file with these (the live) chunks only, in their order.
+
+        Lines are copied as they are, without decoding them.
+
+        Returns:
+            (offset, length) of every chunk
+        """
+        self.flush()
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with self._lock:
+            mapped = self._map()
+            with open(tmp_path, "wb") as f:
+                for record in records.values():
+                    line = mapped[record.doc_offset:record.doc_offset + record.doc_length]
+                    record.doc_offset = f.tell()
+                    f.write(line)
+            os.replace(tmp_path, self.path)
+            self._unmap()
+        return {chunk_id: (record.doc_offset, record.doc_length) for chunk_id, record in records.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            self._unmap()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _read(self, chunk_id: str, record: ChunkRecord) -> str | None:
+        if record.doc_offset < 0:
+            return None
+        with self._lock:
+            line = self._map()[record.doc_offset:record.doc_offset + record.doc_length]
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = {}
+        if data.get("id") != chunk_id:
+            logger.warning(f"Docstore {self.path.name} has no chunk {chunk_id} at offset {record.doc_offset}")
+            return None
+        return data["text"]
+
+    def _map(self) -> mmap.mmap | bytes:
+        if self._mapped is None:
+            if self.size() == 0:
+                return b""
+            with open(self.path, "rb") as f:
+                self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mapped
+
+    def _unmap(self) -> None:
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+
+def _encode(chunk_id: str, text: str) -> bytes:
+    return (json.dumps({"id": chunk_id, "text": text}, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+__all__ = ["ChunkDocstore"]
@@ -0,0 +1,216 @@
+"""SQLite sidecar holding the chunks of a vector index and their filterable metadata.
+
+A filtered vector search needs the ids of the chunks a ``MetadataFilter``
+allows before FAISS runs. Scanning every chunk's metadata in Python for that
+is fine for a few documents but not for years of post-mortems, so each
+vector index keeps its chunks' metadata in a SQLite file next to it:
+
+- ``chunks``: chunk id, FAISS vector id, source, position, where its text is
+  in the docstore file, section heading and how many incident ids, dates and
+  severities the chunk mentions
+- ``chunk_tags``: one row per incident id, incident date and severity a chunk
+  mentions
+
+``vector_ids`` turns a filter into one indexed query and returns the vector
+ids to search among. The ``chunks`` table is also the index's chunk list on
+disk: searches resolve vector ids through it, and the index reads it whole
+only when it is updated.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from .hybrid_search import MetadataFilter
+    from .vector_index import ChunkRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    chunk_id TEXT PRIMARY KEY,
+    vector_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    doc_offset INTEGER NOT NULL DEFAULT -1,
+    doc_length INTEGER NOT NULL DEFAULT 0,
+    section TEXT NOT NULL DEFAULT '',
+    incidents INTEGER NOT NULL DEFAULT 0,
+    dates INTEGER NOT NULL DEFAULT 0,
+    severities INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS chunks_source ON chunks (source);
+CREATE INDEX IF NOT EXISTS chunks_vector ON chunks (vector_id);
+CREATE TABLE IF NOT EXISTS chunk_tags (
+    chunk_id TEXT NOT NULL REFERENCES chunks (chunk_id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunk_tags_chunk ON chunk_tags (chunk_id, kind);
+CREATE INDEX IF NOT EXISTS chunk_tags_value ON chunk_tags (kind, value);
+"""
+
+_RECORD_COLUMNS = "chunk_id, vector_id, source, position, doc_offset, doc_length"
+
+# chunk_tags.kind for each list in a chunk's metadata
+_TAG_FIELDS = {"incident": "incident_ids", "date": "incident_dates", "severity": "severities"}
+
+
+def _has_tag(kind: str, condition: str) -> str:
+    """SQL test that chunk ``c`` has a tag of this kind whose ``value`` matches ``condition``.
+
+    Uncorrelated, so SQLite evaluates the subquery once through the
+    (kind, value) index instead of once per chunk.
+    """
+    return f"c.chunk_id IN (SELECT chunk_id FROM chunk_tags WHERE kind = '{kind}' AND {condition})"
+
+
+class ChunkMetadataStore:
+    """Chunk metadata of one vector index, queried to pre-filter searches."""
+
+    def __init__(self, path: Path | str):
+        """Open (creating if needed) the sidecar database.
+
+        Args:
+            path: SQLite file, usually ``<index name>.meta.sqlite``
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Searches run in worker threads; the lock serialises access
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def fingerprint(self) -> tuple[int, int]:
+        """Chunk count and sum of vector ids, to check against the manifest on load."""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), TOTAL(vector_id) FROM chunks").fetchone()
+        return count, int(total)
+
+    def records(self) -> list[tuple[str, int, str, int, int, int]]:
+        """(chunk id, vector id, source, position, doc offset, doc length) of every chunk."""
+        with self._lock:
+            return self._conn.execute(f"SELECT {_RECORD_COLUMNS} FROM chunks").fetchall()
+
+    def record(self, chunk_id: str) -> tuple[str, int, str, int, int, int] | None:
+        """One chunk's row as in ``records``, or None."""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {_RECORD_COLUMNS} FROM chunks WHERE chunk_id = ?", (chunk_id,)
+            ).fetchone()
+
+    def chunk_id(self, vector_id: int) -> str | None:
+        """Chunk held under a FAISS vector id, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT chunk_id FROM chunks WHERE vector_id = ?", (vector_id,)).fetchone()
+        return row[0] if row else None
+
+    def replace_source(
+        self,
+        source: str,
+        chunks: Iterable[tuple[str, ChunkRecord, dict[str, Any] | None]],
+    ) -> None:
+        """Make the store hold exactly these chunks for a source.
+
+        Args:
+            source: Source document name
+            chunks: (chunk id, manifest record, metadata) per chunk;
+                metadata as from ``describe_chunks``, or None if unknown
+        """
+        rows = []
+        tags = []
+        for chunk_id, record, metadata in chunks:
+            metadata = metadata or {}
+            for kind, field in _TAG_FIELDS.items():
+                tags.extend((chunk_id, kind, value) for value in metadata.get(field, ()))
+            rows.append((
+                chunk_id,
+                record.vector_id,
+                source,
+                record.position,
+                record.doc_offset,
+                record.doc_length,
+                metadata.get("section", ""),
+                len(metadata.get("incident_ids", ())),
+                len(metadata.get("incident_dates", ())),
+                len(metadata.get("severities", ())),
+            ))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks WHERE source = ?", (source,))
+            self._conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany("INSERT INTO chunk_tags VALUES (?, ?, ?)", tags)
+
+    def renumber(self, vector_ids: dict[str, int]) -> None:
+        """Record new vector ids after the index was compacted."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE chunks SET vector_id = ? WHERE chunk_id = ?",
+                [(vector_id, chunk_id) for chunk_id, vector_id in vector_ids.items()],
+            )
+
+    def set_offsets(self, offsets: dict[str, tuple[int, int]]) -> None:
+        """Record where chunks' texts were written in the docstore file."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE chunks SET doc_offset = ?, doc_length = ? WHERE chunk_id = ?",
+                [(offset, length, chunk_id) for chunk_id, (offset, length) in offsets.items()],
+            )
+
+    def clear(self) -> None:
+        """Drop every chunk, e.g. before the index is rebuilt from scratch."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks")
+
+    def vector_ids(
+        self,
+        filters: MetadataFilter | None,
+        sources: set[str] | None = None,
+    ) -> list[int] | None:
+        """Vector ids of the chunks a filter and source restriction allow.
+
+        Same semantics as ``MetadataFilter.matches``: a chunk is excluded
+        only by a field it has a value for, except ``service`` (matched
+        against the section heading) and ``incidents_only``.
+
+        Returns:
+            The allowed vector ids, or None when nothing is restricted
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if sources is not None:
+            clauses.append(f"c.source IN ({', '.join('?' * len(sources))})")
+            params.extend(sorted(sources))
+        if filters is not None:
+            if filters.incidents_only:
+                clauses.append("c.incidents > 0")
+            if filters.service:
+                clauses.append("instr(lower(c.section), lower(?)) > 0")
+                params.append(filters.service)
+            if filters.severity:
+                clauses.append(f"c.severities = 0 OR {_has_tag('severity', 'value = ?')}")
+                params.append(filters.severity)
+            if filters.since or filters.until:
+                since = filters.since.isoformat() if filters.since else "0000-00-00"
+                until = filters.until.isoformat() if filters.until else "9999-99-99"
+                clauses.append(f"c.dates = 0 OR {_has_tag('date', 'value BETWEEN ? AND ?')}")
+                params.extend((since, until))
+        if not clauses:
+            return None
+        query = "SELECT c.vector_id FROM chunks c WHERE " + " AND ".join(f"({clause})" for clause in clauses)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query, params)]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["ChunkMetadataStore"]
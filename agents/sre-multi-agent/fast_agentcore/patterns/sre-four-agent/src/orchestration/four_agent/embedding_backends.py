@@ -0,0 +1,356 @@
+"""Embedding backends to fall back on when Bedrock is unavailable or throttled.
+
+Query embeddings used to fall back to a zero vector when Titan could not be
+reached, which ranks chunks arbitrarily: a Bedrock brownout showed up as a
+wrong root cause rather than a slow one. The vector RAG reader now walks a
+chain of backends instead, primary first, each behind a ``CircuitBreaker``:
+
+- ``LocalEmbeddings``: a small sentence-transformers model on CPU, used when
+  the optional ``sentence-transformers`` package is installed
+- ``HashingEmbeddings``: hashed word and character trigram counts; no model
+  and no network, so it always answers, and the whole retrieval path can run
+  offline
+
+Vectors of different models are not comparable, so each backend searches its
+own vector indexes, kept in a directory named by ``backend_namespace``.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.util
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .embedding_cache import EmbeddingCache
+from .settings import (
+    EMBEDDING_BREAKER_FAILURES,
+    EMBEDDING_BREAKER_RESET_SECONDS,
+    EMBEDDING_FALLBACKS,
+    EMBEDDING_HASHING_DIMENSION,
+    EMBEDDING_LOCAL_MODEL,
+)
+
+logger = logging.getLogger(__name__)
+
+# sentence-transformers pulls in torch, so it is only imported when a local
+# model is first used
+LOCAL_EMBEDDINGS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class EmbeddingError(RuntimeError):
+    """Raised when texts could not be embedded after retries."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one embedding backend.
+
+    Closed, calls go through. ``failure_threshold`` failures in a row open it:
+    calls are refused, so a throttled backend costs nothing per query. Once
+    ``reset_seconds`` have passed it is half-open and lets one trial call
+    through, which closes it on success or opens it again on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = EMBEDDING_BREAKER_FAILURES,
+        reset_seconds: float = EMBEDDING_BREAKER_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+        # Metrics
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; a True in half-open state is the trial.
+
+        Every allowed call must be followed by ``record_success`` or
+        ``record_failure``.
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Embedding backend {self.name} recovered, circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+            if self._opened_at is not None:
+                # A failed trial: wait another reset interval
+                self._opened_at = self._clock()
+            elif self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                self.trips += 1
+                logger.warning(
+                    f"Embedding backend {self.name} failed {self._failures} times in a row, "
+                    f"circuit open for {self.reset_seconds:g}s"
+                )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state(),
+                "consecutive_failures": self._failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+class HashingEmbeddings(Embeddings):
+    """Hashed word and character trigram counts (the "hashing trick").
+
+    Each word and each trigram of the padded word adds +-1 (trigrams +-0.5)
+    to a bucket picked by its hash, and the vector is L2-normalised. It knows
+    no synonyms, but matches the identifiers, error codes and service names
+    incident queries are made of, in well under a millisecond and the same
+    way on every machine.
+    """
+
+    def __init__(self, dimension: int = EMBEDDING_HASHING_DIMENSION):
+        self.dimension = dimension
+        self.model_id = f"hashing-{dimension}"
+        self._feature = functools.lru_cache(maxsize=65536)(self._hash_feature)
+        self._metrics_lock = threading.Lock()
+        self.texts_requested = 0
+
+    def _hash_feature(self, feature: str) -> tuple[int, float]:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest[:4], "little") % self.dimension, 1.0 if digest[4] & 1 else -1.0
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for word in _WORD.findall(text.lower()):
+            bucket, sign = self._feature(word)
+            vector[bucket] += sign
+            padded = f" {word} "
+            for i in range(len(padded) - 2):
+                bucket, sign = self._feature(padded[i:i + 3])
+                vector[bucket] += 0.5 * sign
+        norm = float(np.linalg.norm(vector))
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        with self._metrics_lock:
+            self.texts_requested += len(texts)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    def stats(self) -> dict[str, Any]:
+        with self._metrics_lock:
+            return {"model_id": self.model_id, "texts": self.texts_requested}
+
+
+class LocalEmbeddings(Embeddings):
+    """A sentence-transformers model run on CPU.
+
+    The model is loaded (and downloaded, the first time) on the first call,
+    so an unused fallback costs nothing at startup. Vectors are normalised
+    and go through the embedding cache like Bedrock's.
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_LOCAL_MODEL,
+        cache: EmbeddingCache | None = None,
+        batch_size: int = 32,
+        device: str = "cpu",
+    ):
+        """Initialize local embeddings.
+
+        Args:
+            model_name: sentence-transformers model name or path
+            cache: Embedding cache; None disables caching
+            batch_size: Texts encoded per forward pass
+            device: Torch device
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        if not LOCAL_EMBEDDINGS_AVAILABLE:
+            raise ImportError(
+                "Local embeddings require sentence-transformers. Install with: pip install sentence-transformers"
+            )
+        self.model_name = model_name
+        self.model_id = f"local:{model_name}"
+        self.cache = cache
+        self.batch_size = batch_size
+        self.device = device
+        self._model: Any = None
+        self._load_lock = threading.Lock()
+
+        # Metrics
+        self._metrics_lock = threading.Lock()
+        self.texts_requested = 0
+        self.cache_hits = 0
+        self.failures = 0
+        self.encode_seconds = 0.0
+
+    def _load(self) -> Any:
+        with self._load_lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+
+                started = time.perf_counter()
+                self._model = SentenceTransformer(self.model_name, device=self.device)
+                logger.info(f"Loaded local embedding model {self.model_name} in {time.perf_counter() - started:.1f}s")
+        return self._model
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, encoding only those not in the cache.
+
+        Raises:
+            EmbeddingError: If the model could not be loaded or run
+        """
+        return self._embed(texts, persist=True)
+
+    def _embed(self, texts: list[str], persist: bool) -> list[list[float]]:
+        vectors: list[list[float] | None] = [None] * len(texts)
+        pending: dict[str, list[int]] = {}
+        for i, text in enumerate(texts):
+            cached = self.cache.get(self.model_id, text) if self.cache is not None else None
+            if cached is not None:
+                vectors[i] = cached
+            else:
+                pending.setdefault(text, []).append(i)
+
+        with self._metrics_lock:
+            self.texts_requested += len(texts)
+            self.cache_hits += len(texts) - sum(len(positions) for positions in pending.values())
+
+        if pending:
+            started = time.perf_counter()
+            try:
+                encoded = self._load().encode(
+                    list(pending),
+                    batch_size=self.batch_size,
+                    normalize_embeddings=True,
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                )
+            except Exception as e:
+                with self._metrics_lock:
+                    self.failures += 1
+                raise EmbeddingError(f"{self.model_id} failed to embed {len(pending)} texts: {e}") from e
+            with self._metrics_lock:
+                self.encode_seconds += time.perf_counter() - started
+            for (text, positions), row in zip(pending.items(), encoded):
+                vector = row.tolist()
+                if self.cache is not None:
+                    self.cache.put(self.model_id, text, vector, persist=persist)
+                for i in positions:
+                    vectors[i] = vector
+
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        # Like Bedrock's, query vectors stay out of the disk tier
+        return self._embed([text], persist=False)[0]
+
+    def stats(self) -> dict[str, Any]:
+        with self._metrics_lock:
+            return {
+                "model_id": self.model_id,
+                "loaded": self._model is not None,
+                "texts": self.texts_requested,
+                "cache_hits": self.cache_hits,
+                "failures": self.failures,
+                "encode_seconds": round(self.encode_seconds, 3),
+            }
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_local_unavailable() -> None:
+    logger.warning("Local embedding fallback skipped: sentence-transformers is not installed")
+
+
+def backend_namespace(embeddings: Embeddings) -> str:
+    """Directory name for the vector indexes built with these embeddings."""
+    model_id = getattr(embeddings, "model_id", None) or type(embeddings).__name__
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", model_id).strip("-")
+
+
+def fallback_embeddings(
+    names: list[str] = EMBEDDING_FALLBACKS, cache: EmbeddingCache | None = None
+) -> list[Embeddings]:
+    """The fallback backends named in ``SRE_EMBEDDING_FALLBACKS``, in order.
+
+    "local" is skipped with a warning when sentence-transformers is not
+    installed.
+
+    Args:
+        names: Backend names, "local" or "hashing"
+        cache: Embedding cache for the local model
+    """
+    backends: list[Embeddings] = []
+    for name in names:
+        if name == "hashing":
+            backends.append(HashingEmbeddings())
+        elif name == "local":
+            if not LOCAL_EMBEDDINGS_AVAILABLE:
+                _warn_local_unavailable()
+                continue
+            backends.append(LocalEmbeddings(cache=cache))
+        else:
+            raise ValueError(f"Unknown embedding backend: {name}")
+    return backends
+
+
+__all__ = [
+    "CircuitBreaker",
+    "EmbeddingError",
+    "HashingEmbeddings",
+    "LocalEmbeddings",
+    "backend_namespace",
+    "fallback_embeddings",
+]
@@ -0,0 +1,171 @@
+"""Content-addressed store of text embeddings.
+
+An embedding only depends on the model and the exact text, so vectors are
+stored under a hash of both. Rebuilding a vector index over a corpus where
+most chunks are unchanged then only calls the embedding model for the chunks
+that are new, whichever document they came from.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_key(model_id: str, text: str) -> str:
+    """Stable hex digest of a (model id, text) pair."""
+    digest = hashlib.sha256()
+    digest.update(model_id.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """In-memory LRU backed by a directory of float32 vector files.
+
+    Files live under ``<cache_dir>/<model>/<key[:2]>/<key>.f32`` and hold the
+    raw little-endian float32 components, so a lookup is one small read with
+    no parsing. Writes go through a temporary file and an atomic rename, which
+    makes the directory safe to share between processes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str | None = None,
+        max_entries: int = 10000,
+        persist: bool = True,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the disk tier. If None, uses
+                .vector_cache/embeddings in the project root.
+            max_entries: Maximum number of vectors kept in memory
+            persist: Set False to keep vectors in memory only
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        if cache_dir is None:
+            cache_dir = Path(__file__).resolve().parents[3] / ".vector_cache" / "embeddings"
+
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if persist else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _path(self, model_id: str, key: str) -> Path:
+        model_dir = re.sub(r"[^A-Za-z0-9._-]+", "_", model_id)
+        return self.cache_dir / model_dir / key[:2] / f"{key}.f32"
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        """Insert into the LRU, evicting the least recently used entry."""
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, model_id: str, text: str) -> list[float] | None:
+        """Look up the stored embedding of a text.
+
+        Args:
+            model_id: Embedding model the vector was produced by
+            text: Exact text that was embedded
+
+        Returns:
+            Embedding vector if stored, otherwise None
+        """
+        key = embedding_key(model_id, text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+
+        if self.cache_dir is not None:
+            path = self._path(model_id, key)
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                data = None
+            except OSError as e:
+                logger.warning(f"Ignoring unreadable embedding cache entry {path.name}: {e}")
+                data = None
+            if data and len(data) % 4 == 0:
+                values = array("f")
+                values.frombytes(data)
+                vector = values.tolist()
+                with self._lock:
+                    self._remember(key, vector)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return vector
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model_id: str, text: str, vector: list[float], persist: bool = True) -> None:
+        """Store an embedding in both tiers.
+
+        Args:
+            model_id: Embedding model that produced the vector
+            text: Exact text that was embedded
+            vector: Embedding vector
+            persist: Set False to keep it in memory only, for texts unlikely
+                to come back after a restart such as queries; the disk tier
+                has no eviction
+        """
+        key = embedding_key(model_id, text)
+        vector = [float(value) for value in vector]
+        with self._lock:
+            self._remember(key, vector)
+            self.writes += 1
+
+        if self.cache_dir is not None and persist:
+            path = self._path(model_id, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp_path, "wb") as f:
+                    array("f", vector).tofile(f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                # The vector is still served from memory for this process
+                logger.warning(f"Failed to persist embedding {key[:12]}: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "memory_entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_enabled": self.cache_dir is not None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+__all__ = ["EmbeddingCache", "embedding_key"]
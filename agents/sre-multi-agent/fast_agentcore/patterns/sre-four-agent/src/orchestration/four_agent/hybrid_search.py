@@ -0,0 +1,397 @@
+"""Lexical retrieval and rank fusion for the vector RAG reader.
+
+Titan embeddings capture what a chunk is about but blur exact identifiers:
+``SQLSTATE[08006]``, ``INC-2024-06-15``, ``us-east-1`` or a service name come
+back as "something about connections". This module adds what the vector
+index lacks:
+
+- ``BM25Index``: an in-memory Okapi BM25 inverted index. The tokenizer keeps
+  compound identifiers whole *and* indexes their parts, so both
+  ``sqlstate[08006]`` and ``08006`` match.
+- ``LexicalChunkIndex``: a BM25 index over the same chunks as an
+  ``IncrementalVectorIndex`` (same chunk ids), plus per-chunk metadata
+  (section, incident ids and dates, severities) for pre-filtering.
+- ``reciprocal_rank_fusion``: merges rankings by rank alone, so BM25 scores
+  and L2 distances never have to be calibrated against each other.
+- ``MetadataFilter``: service/severity/date restrictions applied *before*
+  ranking, to both the BM25 index and the FAISS id selector.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable
+
+from .settings import RRF_K
+from .vector_index import chunk_ids
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+(?:[-.:/\[\]@]+[a-z0-9_]+)*\]?")
+_PART_RE = re.compile(r"[a-z0-9_]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was were "
+    "will with after before not no into".split()
+)
+
+_SECTION_RE = re.compile(r"^## +(?:[\dA-Z]+[.:] +)?(.+?)\s*$", re.MULTILINE)
+_INCIDENT_RE = re.compile(r"INC-(\d{4})-(\d{2})-(\d{2})")
+_SEVERITY_RE = re.compile(r"\bSEV-?([0-5])\b", re.IGNORECASE)
+
+
+def _stem(word: str) -> str:
+    """Fold simple English plurals so "connections" matches "connection"."""
+    if len(word) > 4 and word.isalpha() and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into BM25 terms.
+
+    Compound identifiers (``INC-2024-01-15``, ``SQLSTATE[08006]``,
+    ``db-endpoint.rds.amazonaws.com``) are kept as one term and their
+    alphanumeric parts are added as terms of their own.
+    """
+    terms = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        token = match.group(0)
+        parts = _PART_RE.findall(token)
+        if len(parts) > 1:
+            terms.append(token)
+        terms.extend(_stem(part) for part in parts if part not in _STOPWORDS)
+    return terms
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index, updated document by document."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._doc_terms: dict[str, Counter[str]] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a document, replacing any previous text under the same id."""
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self._doc_terms[doc_id] = terms
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_length += self._lengths[doc_id]
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a document; unknown ids are ignored."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        allowed: set[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Top documents for a query.
+
+        Args:
+            query: Query text
+            k: Number of documents to return
+            allowed: Only score these documents; None for all. Collection
+                statistics (idf, average length) still cover every document.
+
+        Returns:
+            (doc id, score) pairs, best first; documents sharing no term with
+            the query are not returned
+        """
+        n_docs = len(self._doc_terms)
+        if not n_docs or k < 1:
+            return []
+        avg_length = self._total_length / n_docs
+
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, freq in postings.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = freq + self.k1 * (1.0 - self.b + self.b * self._lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * freq * (self.k1 + 1.0) / norm
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    def score_texts(self, query: str, texts: list[str]) -> list[float]:
+        """BM25 scores of arbitrary texts against the indexed collection.
+
+        Used to rank passages inside a retrieved chunk (e.g. one incident of
+        several) with the same term weights as the chunks themselves.
+        """
+        n_docs = len(self._doc_terms)
+        if not n_docs:
+            return [0.0] * len(texts)
+        avg_length = self._total_length / n_docs
+        weights = {}
+        for term in set(tokenize(query)):
+            df = len(self._postings.get(term, ()))
+            weights[term] = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+
+        scores = []
+        for text in texts:
+            terms = Counter(tokenize(text))
+            length = sum(terms.values())
+            total = 0.0
+            for term, idf in weights.items():
+                freq = terms.get(term, 0)
+                if freq:
+                    norm = freq + self.k1 * (1.0 - self.b + self.b * length / avg_length)
+                    total += idf * freq * (self.k1 + 1.0) / norm
+            scores.append(total)
+        return scores
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[list[str]],
+    k: int = RRF_K,
+) -> list[tuple[str, float]]:
+    """Fuse rankings with RRF: ``score(d) = sum(1 / (k + rank(d)))``.
+
+    Args:
+        rankings: Document ids per ranking, best first (ranks start at 1)
+        k: Damping constant; larger values flatten the head of each ranking
+
+    Returns:
+        (doc id, fused score) pairs, best first
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _normalize_severity(value: str) -> str:
+    match = _SEVERITY_RE.search(value) or re.fullmatch(r"\s*([0-5])\s*", value)
+    if match is None:
+        raise ValueError(f"Unrecognised severity {value!r}, expected e.g. 'SEV-2'")
+    return f"SEV-{match.group(1)}"
+
+
+def _as_date(value: date | str | None) -> date | None:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+@dataclass(frozen=True)
+class MetadataFilter:
+    """Restrictions applied to chunks before they are ranked.
+
+    A chunk is excluded only by a field it has a value for: chunks that name
+    no severity pass a severity filter, chunks that reference no incident
+    pass a date filter. ``service`` is matched against the chunk's section
+    heading, since the knowledge base has one section per service or failure
+    domain ("Payment Gateway Failures", "Database Connection Issues").
+    ``incidents_only`` keeps just the chunks that reference an incident id.
+    """
+
+    service: str | None = None
+    severity: str | None = None
+    since: date | None = None
+    until: date | None = None
+    incidents_only: bool = False
+
+    def __post_init__(self):
+        if self.severity is not None:
+            object.__setattr__(self, "severity", _normalize_severity(self.severity))
+        object.__setattr__(self, "since", _as_date(self.since))
+        object.__setattr__(self, "until", _as_date(self.until))
+
+    @classmethod
+    def coerce(cls, value: MetadataFilter | dict[str, Any] | None) -> MetadataFilter | None:
+        """Accept a filter, a dict of its fields (dates as ISO strings) or None."""
+        if value is None or isinstance(value, MetadataFilter):
+            return value
+        return cls(**value)
+
+    def date_in_range(self, value: date) -> bool:
+        return (self.since is None or value >= self.since) and (self.until is None or value <= self.until)
+
+    def matches(self, metadata: dict[str, Any]) -> bool:
+        if self.incidents_only and not metadata.get("incident_ids"):
+            return False
+        if self.service and self.service.lower() not in metadata.get("section", "").lower():
+            return False
+        severities = metadata.get("severities")
+        if self.severity and severities and self.severity not in severities:
+            return False
+        dates = metadata.get("incident_dates")
+        if (self.since or self.until) and dates:
+            if not any(self.date_in_range(date.fromisoformat(value)) for value in dates):
+                return False
+        return True
+
+
+def incident_date(incident_id: str) -> date | None:
+    """Date encoded in an ``INC-YYYY-MM-DD`` id, if valid."""
+    match = _INCIDENT_RE.fullmatch(incident_id)
+    if match is None:
+        return None
+    try:
+        return date(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+def describe_chunks(document: str, chunks: list[str]) -> list[dict[str, Any]]:
+    """Filterable metadata of each chunk of a markdown document.
+
+    Args:
+        document: Full document text the chunks were split from
+        chunks: The document's chunks, in order
+
+    Returns:
+        Per chunk: ``section`` (enclosing second-level heading),
+        ``incident_ids``, ``incident_dates`` (ISO) and ``severities``
+    """
+    headings = [(match.start(), match.group(1)) for match in _SECTION_RE.finditer(document)]
+    heading_starts = [start for start, _ in headings]
+
+    described = []
+    cursor = 0
+    for text in chunks:
+        # Chunks overlap, so search from the previous chunk's start
+        offset = document.find(text, cursor)
+        if offset == -1:
+            offset = max(document.find(text), 0)
+        cursor = offset + 1
+        index = bisect.bisect_right(heading_starts, offset) - 1
+        incident_ids = sorted(set(match.group(0) for match in _INCIDENT_RE.finditer(text)))
+        dates = [incident_date(incident_id) for incident_id in incident_ids]
+        described.append(
+            {
+                "section": headings[index][1] if index >= 0 else "",
+                "incident_ids": incident_ids,
+                "incident_dates": sorted(set(value.isoformat() for value in dates if value)),
+                "severities": sorted(set(f"SEV-{match.group(1)}" for match in _SEVERITY_RE.finditer(text))),
+            }
+        )
+    return described
+
+
+class LexicalChunkIndex:
+    """BM25 index and chunk metadata kept in step with the vector indexes.
+
+    Chunk ids come from ``vector_index.chunk_ids``, so a BM25 hit and a
+    vector hit on the same chunk fuse into one result. One index can hold
+    several sources (chunk ids are prefixed with the source), which keeps
+    BM25 scores comparable across them. The index lives in memory only;
+    building it is a matter of milliseconds per document.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.bm25 = BM25Index(k1=k1, b=b)
+        self.metadata: dict[str, dict[str, Any]] = {}
+        self._sources: dict[str, set[str]] = {}
+        self._source_hashes: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.metadata)
+
+    def source_hash(self, source: str) -> str | None:
+        """Content hash the index last synced a source at."""
+        return self._source_hashes.get(source)
+
+    def sync(
+        self,
+        source: str,
+        chunks: list[str],
+        metadata: list[dict[str, Any]],
+        source_hash: str | None = None,
+    ) -> None:
+        """Make the index hold exactly ``chunks`` for ``source``.
+
+        Args:
+            source: Source document name
+            chunks: The source's chunks, in document order
+            metadata: Per-chunk metadata from ``describe_chunks``
+            source_hash: Content hash of the source
+        """
+        wanted = dict(zip(chunk_ids(source, chunks), zip(chunks, metadata)))
+        current = self._sources.get(source, set())
+        for chunk_id in current - wanted.keys():
+            self.bm25.remove(chunk_id)
+            del self.metadata[chunk_id]
+        for chunk_id, (text, chunk_metadata) in wanted.items():
+            if chunk_id not in current:
+                self.bm25.add(chunk_id, text)
+            self.metadata[chunk_id] = {"source": source, **chunk_metadata}
+        self._sources[source] = set(wanted)
+        if source_hash is not None:
+            self._source_hashes[source] = source_hash
+
+    def allowed(
+        self,
+        filters: MetadataFilter | None,
+        sources: set[str] | None = None,
+    ) -> set[str] | None:
+        """Chunk ids passing a filter and source restriction.
+
+        Returns:
+            The matching chunk ids, or None when nothing is restricted
+        """
+        if sources is not None and sources >= self._sources.keys():
+            sources = None
+        if (filters is None or filters == MetadataFilter()) and sources is None:
+            return None
+        return {
+            chunk_id
+            for chunk_id, metadata in self.metadata.items()
+            if (sources is None or metadata["source"] in sources)
+            and (filters is None or filters.matches(metadata))
+        }
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        allowed: set[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Top chunks by BM25 score; see ``BM25Index.search``."""
+        return self.bm25.search(query, k, allowed=allowed)
+
+
+__all__ = [
+    "BM25Index",
+    "LexicalChunkIndex",
+    "MetadataFilter",
+    "describe_chunks",
+    "incident_date",
+    "reciprocal_rank_fusion",
+    "tokenize",
+]
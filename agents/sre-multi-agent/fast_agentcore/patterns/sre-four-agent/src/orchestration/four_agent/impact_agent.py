@@ -9,6 +9,7 @@ from datetime import datetime
 
 from ..observability import emit_event, wrap_payload
 from .business_metrics_reader import BusinessMetricsReader
+from .kb_fanout import merge_query_results
 from .llm import BaseLLMAgent
 from .schema import (AgentRole, EvidenceReference, MessageType, PayloadModel,
                      Severity)
@@ -61,11 +62,14 @@ class ImpactAgent(BaseLLMAgent):
         temperature: float = 0.2,
         max_output_tokens: int = 900,
         stream_updates: bool = True,
+        kb_reader=None,
     ) -> None:
         self._config = config or ImpactAgentConfig()
         
-        # Use Bedrock Knowledge Base for semantic search
-        if BEDROCK_KB_AVAILABLE:
+        # Use the shared reader when given, else Bedrock Knowledge Base for semantic search
+        if kb_reader is not None:
+            self._business_metrics_reader = kb_reader
+        elif BEDROCK_KB_AVAILABLE:
             try:
                 self._business_metrics_reader = BedrockKnowledgeBaseReader()
                 print("✅ Impact Agent: Using Bedrock Knowledge Base (semantic search)")
@@ -98,59 +102,96 @@ class ImpactAgent(BaseLLMAgent):
             "Quantify customer approvals, TPS, and revenue deltas from telemetry."
         )
 
-    def _build_user_prompt(self, incoming, state) -> str:
+    def _uses_semantic_search(self) -> bool:
+        # Check if we're using Bedrock KB by checking for the specific method
+        reader = self._business_metrics_reader
+        return (
+            BEDROCK_KB_AVAILABLE
+            and hasattr(reader, 'search_by_semantic_query')
+            and not hasattr(reader, 'get_baseline_metrics')
+        )
+
+    def _kb_queries(self, state) -> list[str]:
+        """Semantic queries for business metrics: baselines, revenue formulas, SLAs."""
+        severity_str = getattr(state.severity, "value", str(state.severity))
+        return [
+            f"business impact baselines for {severity_str} severity incidents",
+            "revenue calculation formulas and methodology",
+            f"SLA thresholds and breach criteria for {severity_str}",
+        ]
+
+    @staticmethod
+    def _kb_knowledge(chunks: list[dict]) -> dict[str, dict]:
+        """Prompt context from merged KB chunks; each chunk counts for the query it matched best."""
+
+        def content(query_index: int) -> str:
+            return "\n".join(
+                [chunk["content"] for chunk in chunks if chunk["query_index"] == query_index][:2]
+            )
+
+        return {
+            "business_baselines": {
+                "retrieved_content": content(0),
+                "policy_reference": "POL-SRE-002 Business Impact Baselines (via Bedrock KB)"
+            },
+            "revenue_formulas": {
+                "retrieved_content": content(1),
+                "policy_reference": "POL-SRE-002 Revenue Methodology (via Bedrock KB)"
+            },
+            "sla_thresholds": {
+                "retrieved_content": content(2),
+                "policy_reference": "POL-SRE-002 SLA Thresholds (via Bedrock KB)"
+            },
+        }
+
+    def _fallback_knowledge(self, state, error: Exception | None = None) -> dict[str, dict]:
+        if error is not None:
+            print(f"⚠️  Impact Agent: RAG retrieval failed ({error}), using fallback")
+        # Fallback to BusinessMetricsReader if available
+        if hasattr(self._business_metrics_reader, 'get_baseline_metrics'):
+            return {
+                "business_baselines": self._business_metrics_reader.get_baseline_metrics(state.severity),
+                "revenue_formulas": self._business_metrics_reader.get_revenue_formulas(),
+                "sla_thresholds": self._business_metrics_reader.get_sla_thresholds(state.severity),
+            }
+        # Ultimate fallback with empty data
+        return {
+            "business_baselines": {"policy_reference": "RAG unavailable"},
+            "revenue_formulas": {"policy_reference": "RAG unavailable"},
+            "sla_thresholds": {"policy_reference": "RAG unavailable"},
+        }
+
+    def _lookup_business_knowledge(self, state) -> dict[str, dict]:
+        """Business metrics context retrieved synchronously, one query after another."""
+        try:
+            if not self._uses_semantic_search():
+                return self._fallback_knowledge(state)
+            reader = self._business_metrics_reader
+            return self._kb_knowledge(
+                merge_query_results([reader.search_by_semantic_query(query) for query in self._kb_queries(state)])
+            )
+        except Exception as e:
+            return self._fallback_knowledge(state, e)
+
+    async def _retrieve_knowledge(self, incoming, state) -> dict[str, dict] | None:
+        if not self._uses_semantic_search() or not hasattr(self._business_metrics_reader, "retrieve_many"):
+            return None
+        # Baselines, revenue formulas and SLAs in one concurrent round-trip
+        try:
+            return self._kb_knowledge(
+                await self._business_metrics_reader.retrieve_many(self._kb_queries(state))
+            )
+        except Exception as e:
+            return self._fallback_knowledge(state, e)
+
+    def _build_user_prompt(self, incoming, state, knowledge=None) -> str:
         monitoring = incoming.payload.details.get("monitoring", {})
         additional = incoming.payload.details.get("additional_sources", {})
         rca_context = incoming.payload.details.get("rca", {})
 
-        # RAG: Retrieve baseline metrics from policy document using semantic search
-        # For Bedrock KB, we use semantic search instead of specialized methods
         severity_str = getattr(state.severity, "value", str(state.severity))
-        
-        # Construct semantic queries for business metrics
-        baseline_query = f"business impact baselines for {severity_str} severity incidents"
-        revenue_query = "revenue calculation formulas and methodology"
-        sla_query = f"SLA thresholds and breach criteria for {severity_str}"
-        
-        # Retrieve using semantic search
-        try:
-            # Check if we're using Bedrock KB by checking for the specific method
-            if BEDROCK_KB_AVAILABLE and hasattr(self._business_metrics_reader, 'search_by_semantic_query') and not hasattr(self._business_metrics_reader, 'get_baseline_metrics'):
-                # Use Bedrock KB semantic search
-                baseline_results = self._business_metrics_reader.search_by_semantic_query(baseline_query)
-                revenue_results = self._business_metrics_reader.search_by_semantic_query(revenue_query)
-                sla_results = self._business_metrics_reader.search_by_semantic_query(sla_query)
-                
-                # Extract content from search results
-                baseline_metrics = {
-                    "retrieved_content": "\n".join([chunk["content"] for chunk in baseline_results[:2]]),
-                    "policy_reference": "POL-SRE-002 Business Impact Baselines (via Bedrock KB)"
-                }
-                revenue_formulas = {
-                    "retrieved_content": "\n".join([chunk["content"] for chunk in revenue_results[:2]]),
-                    "policy_reference": "POL-SRE-002 Revenue Methodology (via Bedrock KB)"
-                }
-                sla_thresholds = {
-                    "retrieved_content": "\n".join([chunk["content"] for chunk in sla_results[:2]]),
-                    "policy_reference": "POL-SRE-002 SLA Thresholds (via Bedrock KB)"
-                }
-            else:
-                # Fallback to BusinessMetricsReader methods
-                baseline_metrics = self._business_metrics_reader.get_baseline_metrics(state.severity)
-                revenue_formulas = self._business_metrics_reader.get_revenue_formulas()
-                sla_thresholds = self._business_metrics_reader.get_sla_thresholds(state.severity)
-        except Exception as e:
-            print(f"⚠️  Impact Agent: RAG retrieval failed ({e}), using fallback")
-            # Fallback to BusinessMetricsReader if available
-            if hasattr(self._business_metrics_reader, 'get_baseline_metrics'):
-                baseline_metrics = self._business_metrics_reader.get_baseline_metrics(state.severity)
-                revenue_formulas = self._business_metrics_reader.get_revenue_formulas()
-                sla_thresholds = self._business_metrics_reader.get_sla_thresholds(state.severity)
-            else:
-                # Ultimate fallback with empty data
-                baseline_metrics = {"policy_reference": "RAG unavailable"}
-                revenue_formulas = {"policy_reference": "RAG unavailable"}
-                sla_thresholds = {"policy_reference": "RAG unavailable"}
+        if knowledge is None:
+            knowledge = self._lookup_business_knowledge(state)
 
         context = {
             "incident_id": incoming.incident_id,
@@ -161,9 +202,9 @@ class ImpactAgent(BaseLLMAgent):
             "signals": incoming.payload.details.get("signals", {}),
             "rca": rca_context,
             # RAG: Inject baseline metrics from policy document (POL-SRE-002)
-            "business_baselines": baseline_metrics,
-            "revenue_formulas": revenue_formulas,
-            "sla_thresholds": sla_thresholds,
+            "business_baselines": knowledge["business_baselines"],
+            "revenue_formulas": knowledge["revenue_formulas"],
+            "sla_thresholds": knowledge["sla_thresholds"],
         }
         schema = {
             "summary": "Narrative describing approvals/TPS/revenue deltas.",
@@ -0,0 +1,167 @@
+"""Concurrent knowledge-base lookups for agents that need several at once.
+
+The readers' retrieval methods are synchronous and each costs a network
+round-trip (Bedrock KB retrieve, or a query embedding). An agent that looks
+up several things for one prompt used to pay those round-trips one after
+another, on the event loop. The helpers here run them in worker threads,
+at most ``KB_FANOUT_CONCURRENCY`` at a time, so the prompt waits for the
+slowest lookup instead of their sum:
+
+- ``retrieve_many``: several semantic queries against one search method,
+  merged into a single ranking
+- ``gather_lookups``: several different reader calls, results by name
+
+Worker threads get a copy of the caller's context, so retrievals are still
+reported through ``track_kb_retrieval`` to the calling request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from typing import Any, Callable, Mapping, Sequence
+
+from .query_cache import normalize_query
+from .settings import KB_FANOUT_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+# Bedrock KB puts its chunk id in the result metadata under this key
+_BEDROCK_CHUNK_ID_KEY = "x-amz-bedrock-kb-chunk-id"
+
+
+def chunk_key(chunk: Mapping[str, Any]) -> str:
+    """Identity of a retrieved chunk, for de-duplication across queries.
+
+    The store's chunk id when the result carries one, else a hash of the
+    source document and content.
+    """
+    metadata = chunk.get("metadata") or {}
+    chunk_id = metadata.get("chunk_id") or metadata.get(_BEDROCK_CHUNK_ID_KEY)
+    if chunk_id:
+        return str(chunk_id)
+    digest = hashlib.sha256(f"{chunk.get('source', '')}\0{chunk.get('content', '')}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def merge_query_results(per_query: Sequence[Sequence[Mapping[str, Any]]]) -> list[dict[str, Any]]:
+    """Merge the chunk lists of several queries into one ranking.
+
+    Scores are only comparable within one query (Bedrock confidences and
+    distance-derived similarities drift with query length), so each query's
+    scores are divided by its best score first. A chunk returned by several
+    queries appears once, with its best normalised score.
+
+    Args:
+        per_query: ``search_by_semantic_query`` results, one list per query
+
+    Returns:
+        Chunks best first, each a copy with ``relevance_score`` normalised
+        to 0-1, ``raw_score`` (the reader's score), ``query_index`` (the
+        query it scored best for) and ``matched_queries`` (indices of every
+        query that returned it)
+    """
+    merged: dict[str, dict[str, Any]] = {}
+    for query_index, chunks in enumerate(per_query):
+        best = max((float(chunk.get("relevance_score", 0.0)) for chunk in chunks), default=0.0)
+        for chunk in chunks:
+            raw = float(chunk.get("relevance_score", 0.0))
+            score = raw / best if best > 0 else 0.0
+            key = chunk_key(chunk)
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = {
+                    **chunk,
+                    "relevance_score": score,
+                    "raw_score": raw,
+                    "query_index": query_index,
+                    "matched_queries": [query_index],
+                }
+                continue
+            if query_index not in entry["matched_queries"]:
+                entry["matched_queries"].append(query_index)
+            if score > entry["relevance_score"]:
+                entry.update(relevance_score=score, raw_score=raw, query_index=query_index)
+    # Ties go to chunks more of the queries agreed on
+    return sorted(
+        merged.values(),
+        key=lambda chunk: (chunk["relevance_score"], len(chunk["matched_queries"])),
+        reverse=True,
+    )
+
+
+async def retrieve_many(
+    search: Callable[[str], list[dict[str, Any]]],
+    queries: Sequence[str],
+    max_concurrency: int = KB_FANOUT_CONCURRENCY,
+) -> list[dict[str, Any]]:
+    """Run several semantic queries concurrently and merge their results.
+
+    Repeated queries (after case and whitespace folding) are issued once.
+    A query that fails is logged and contributes nothing; if every query
+    fails, the first error is raised so callers can fall back.
+
+    Args:
+        search: Synchronous search, e.g. a reader's ``search_by_semantic_query``
+        queries: Query texts; ``query_index`` in the results refers to them
+        max_concurrency: Lookups in flight at once
+
+    Returns:
+        Merged chunks, see ``merge_query_results``
+    """
+    texts: list[str] = []
+    slots: dict[str, int] = {}
+    first_of = []
+    for query in queries:
+        key = normalize_query(query)
+        if key not in slots:
+            slots[key] = len(texts)
+            texts.append(query)
+        first_of.append(slots[key])
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(text: str) -> list[dict[str, Any]]:
+        async with semaphore:
+            return await asyncio.to_thread(search, text)
+
+    outcomes = await asyncio.gather(*(run(text) for text in texts), return_exceptions=True)
+    errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if errors and len(errors) == len(outcomes):
+        raise errors[0]
+    for text, outcome in zip(texts, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning(f"KB query '{text[:50]}' failed, merging the others: {outcome}")
+
+    per_query = [
+        [] if isinstance(outcomes[slot], BaseException) else outcomes[slot]
+        for slot in first_of
+    ]
+    return merge_query_results(per_query)
+
+
+async def gather_lookups(
+    lookups: Mapping[str, Callable[[], Any]],
+    max_concurrency: int = KB_FANOUT_CONCURRENCY,
+) -> dict[str, Any]:
+    """Run several synchronous reader calls concurrently.
+
+    Args:
+        lookups: Result name -> zero-argument call
+        max_concurrency: Calls in flight at once
+
+    Returns:
+        Result name -> call result; the first exception is re-raised
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(call: Callable[[], Any]) -> Any:
+        async with semaphore:
+            return await asyncio.to_thread(call)
+
+    results = await asyncio.gather(*(run(call) for call in lookups.values()))
+    return dict(zip(lookups, results))
+
+
+__all__ = ["chunk_key", "gather_lookups", "merge_query_results", "retrieve_many"]
@@ -7,10 +7,13 @@ import json
 import logging
 import random
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from typing import (
     Any,
     Callable,
+    Iterator,
     List,
     Mapping,
     MutableMapping,
@@ -27,6 +30,14 @@ from .settings import (
     get_default_model,
     get_default_temperature,
     MAX_JSON_RESPONSE_SIZE,
+    STRUCTURED_OUTPUT_MODE,
+)
+from .structured_output import (
+    RESPONSE_TOOL_NAME,
+    IncrementalJSONValidator,
+    StructuredOutputError,
+    agent_response_schema,
+    validate_against_schema,
 )
 
 if TYPE_CHECKING:
@@ -35,6 +46,26 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Receives (agent role, text delta) for every chunk an agent streams in the
+# current context. asyncio.to_thread copies the context, so deltas produced in
+# a runner's worker thread reach the sink installed by the calling task.
+_TOKEN_SINK: ContextVar[Optional[Callable[[str, str], None]]] = ContextVar(
+    "llm_token_sink", default=None
+)
+
+
+@contextmanager
+def token_sink(sink: Callable[[str, str], None]) -> Iterator[None]:
+    """Forward streamed LLM deltas of agents run inside the block to *sink*.
+
+    The sink may be called from a worker thread and must be thread-safe.
+    """
+    token = _TOKEN_SINK.set(sink)
+    try:
+        yield
+    finally:
+        _TOKEN_SINK.reset(token)
+
 
 def _is_retryable_error(exception: Exception) -> bool:
     """Determine if an error should be retried based on its type and properties.
@@ -45,6 +76,10 @@ def _is_retryable_error(exception: Exception) -> bool:
     Returns:
         True if the error is retryable, False otherwise
     """
+    # Schema violations are deterministic for a given prompt; fail fast
+    if isinstance(exception, StructuredOutputError):
+        return False
+
     # Import here to avoid circular dependencies
     try:
         import httpx
@@ -137,6 +172,8 @@ class LLMRequest:
     temperature: Optional[float] = None
     stream: bool = False
     metadata: MutableMapping[str, Any] = field(default_factory=dict)
+    # JSON Schema the response must satisfy; enables structured-output mode
+    response_schema: Optional[Mapping[str, Any]] = None
 
 
 @dataclass
@@ -146,6 +183,8 @@ class LLMResult:
     text: str
     raw: Optional[Any] = None
     usage: Optional[Mapping[str, Any]] = None
+    # Already-validated object when the request carried a response_schema
+    structured: Optional[Mapping[str, Any]] = None
 
 
 class LLMRunner(Protocol):
@@ -166,6 +205,8 @@ class LLMProviderConfig:
     event_prefix: str  # e.g., "bedrock_runner"
     stream_function: Callable  # e.g., converse_claude_stream
     chat_function: Callable  # e.g., converse_claude
+    structured_function: Optional[Callable] = None  # e.g., converse_structured
+    supports_tool_use: Optional[Callable[[str], bool]] = None
 
 
 class BaseChatRunner(LLMRunner):
@@ -178,11 +219,13 @@ class BaseChatRunner(LLMRunner):
         temperature: float,
         max_tokens: int,
         provider_config: LLMProviderConfig,
+        structured_mode: str = STRUCTURED_OUTPUT_MODE,
     ) -> None:
         self._model = model
         self._temperature = temperature
         self._max_tokens = max_tokens
         self._provider = provider_config
+        self._structured_mode = structured_mode
 
     async def run(
         self,
@@ -212,6 +255,18 @@ class BaseChatRunner(LLMRunner):
                 ),
             )
 
+            # Schema-constrained requests bypass free-text JSON parsing
+            if request.response_schema is not None:
+                return self._handle_structured_request(
+                    messages,
+                    system_prompt,
+                    model,
+                    max_tokens,
+                    temperature,
+                    request.response_schema,
+                    stream,
+                )
+
             # Handle streaming requests
             if request.stream and stream is not None:
                 return self._handle_streaming_request(
@@ -260,6 +315,90 @@ class BaseChatRunner(LLMRunner):
         )
         return LLMResult(text=text)
 
+    def _use_tool_calls(self, model: str) -> bool:
+        """Decide whether structured output goes through Converse tool use."""
+        if self._provider.structured_function is None or self._structured_mode == "stream":
+            return False
+        if self._structured_mode == "tool":
+            return True
+        supports = self._provider.supports_tool_use
+        return bool(supports and supports(model))
+
+    def _handle_structured_request(
+        self,
+        messages: List[Mapping[str, str]],
+        system_prompt: str,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        schema: Mapping[str, Any],
+        stream: Optional[Callable[[str], None]],
+    ) -> LLMResult:
+        """Handle a request whose response must satisfy *schema*.
+
+        Models with tool use receive the schema as a tool spec and return the
+        tool arguments. Other models stream plain text that is validated
+        incrementally, abandoning the stream on the first violation.
+        """
+        if self._use_tool_calls(model):
+            try:
+                data = self._provider.structured_function(
+                    messages=list(messages),
+                    system=system_prompt,
+                    model_id=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    tool_name=RESPONSE_TOOL_NAME,
+                    input_schema=dict(schema),
+                )
+            except ValueError as exc:
+                raise StructuredOutputError(str(exc)) from exc
+            validate_against_schema(data, schema)
+            text = json.dumps(data)
+            if stream is not None:
+                try:
+                    stream(text)
+                except Exception:  # pragma: no cover - defensive logging only
+                    logger.exception("Stream handler raised while processing chunk")
+            emit_event(
+                self._provider.event_prefix,
+                "llm_completed",
+                wrap_payload(model=model, stream=False, structured="tool"),
+            )
+            return LLMResult(text=text, structured=data, usage={"mode": "tool"})
+
+        validator = IncrementalJSONValidator(schema)
+        tokens: List[str] = []
+        for chunk in self._provider.stream_function(
+            messages=list(messages),
+            system=system_prompt,
+            model_id=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        ):
+            if not chunk:
+                continue
+            # Raises StructuredOutputError on the first invalid chunk
+            validator.feed(chunk)
+            tokens.append(chunk)
+            if stream is not None:
+                try:
+                    stream(chunk)
+                except Exception:  # pragma: no cover - defensive logging only
+                    logger.exception("Stream handler raised while processing chunk")
+            if validator.done:
+                break
+
+        data = validator.finish()
+        emit_event(
+            self._provider.event_prefix,
+            "llm_stream_completed",
+            wrap_payload(model=model, tokens=len(tokens), structured="stream"),
+        )
+        return LLMResult(
+            text="".join(tokens), structured=data, usage={"mode": "validated_stream"}
+        )
+
     def _handle_chat_request(
         self,
         messages: List[Mapping[str, str]],
@@ -299,7 +438,12 @@ class BedrockChatRunner(BaseChatRunner):
         from dotenv import load_dotenv
 
         # Use bedrock_client.py with proper environment loading
-        from bedrock_client import converse_claude, converse_claude_stream
+        from bedrock_client import (
+            converse_claude,
+            converse_claude_stream,
+            converse_structured,
+            supports_tool_use,
+        )
 
         # Ensure environment is loaded
         load_dotenv()
@@ -323,10 +467,25 @@ class BedrockChatRunner(BaseChatRunner):
                 temperature=temperature,
             )
 
+        def structured_function(
+            messages, system, model_id, max_tokens, temperature, tool_name, input_schema
+        ):
+            return converse_structured(
+                messages=messages,
+                system=system,
+                model_id=model_id,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                tool_name=tool_name,
+                input_schema=input_schema,
+            )
+
         provider_config = LLMProviderConfig(
             event_prefix="bedrock_runner",
             stream_function=stream_function,
             chat_function=chat_function,
+            structured_function=structured_function,
+            supports_tool_use=supports_tool_use,
         )
 
         super().__init__(
@@ -350,10 +509,16 @@ class DeterministicLLMRunner(LLMRunner):
         stream: Optional[Callable[[str], None]] = None,
     ) -> LLMResult:
         data = self._builder(request)
+        if request.response_schema is not None:
+            validate_against_schema(data, request.response_schema)
         text = json.dumps(data)
         if stream is not None:
             stream(text)
-        return LLMResult(text=text, usage={"mode": "deterministic"})
+        return LLMResult(
+            text=text,
+            usage={"mode": "deterministic"},
+            structured=data if request.response_schema is not None else None,
+        )
 
 
 class BaseLLMAgent:
@@ -371,6 +536,7 @@ class BaseLLMAgent:
         max_output_tokens: int = 1024,
         stream_updates: bool = True,
         max_validation_attempts: int = 2,
+        structured_output: Optional[bool] = None,
     ) -> None:
         self.name = role
         self._role = role
@@ -384,6 +550,11 @@ class BaseLLMAgent:
         )
         self._stream_updates = stream_updates
         self._max_validation_attempts = max(1, int(max_validation_attempts))
+        self._structured_output = (
+            structured_output
+            if structured_output is not None
+            else STRUCTURED_OUTPUT_MODE != "off"
+        )
 
     # ------------------------------------------------------------------
     # Public helpers
@@ -402,15 +573,20 @@ class BaseLLMAgent:
         state: "IncidentState",
     ) -> "AgentMessage":
         system_prompt = self._system_prompt(incoming, state)
-        user_prompt = self._build_user_prompt(incoming, state)
+        knowledge = await self._retrieve_knowledge(incoming, state)
+        user_prompt = self._build_user_prompt(incoming, state, knowledge)
         messages: Sequence[Mapping[str, str]] = [
             {"role": "user", "content": user_prompt}
         ]
 
         runner = self._ensure_runner()
+        response_schema = (
+            self._response_schema(incoming, state) if self._structured_output else None
+        )
         last_error: Optional[Exception] = None
         raw_text: Optional[str] = None
         parsed: Optional[Mapping[str, Any]] = None
+        parse_ms = 0.0
 
         for attempt in range(1, self._max_validation_attempts + 1):
             request = LLMRequest(
@@ -421,11 +597,17 @@ class BaseLLMAgent:
                 temperature=self._temperature,
                 stream=self._stream_updates,
                 metadata={"incoming": incoming, "state": state, "attempt": attempt},
+                response_schema=response_schema,
             )
             try:
                 result = await runner.run(request, stream=self._handle_stream_chunk)
                 raw_text = result.text
-                parsed = self._parse_response_text(result.text)
+                parse_started = time.perf_counter()
+                if result.structured is not None:
+                    parsed = result.structured
+                else:
+                    parsed = self._parse_response_text(result.text)
+                parse_ms = (time.perf_counter() - parse_started) * 1000
                 break
             except Exception as exc:  # pragma: no cover - defensive path
                 last_error = exc
@@ -480,6 +662,8 @@ class BaseLLMAgent:
                 "raw_response": raw_text or "",
                 "model": self._model,
                 "attempt": request.metadata.get("attempt", 1),
+                "structured_output": response_schema is not None,
+                "parse_ms": round(parse_ms, 3),
             }
             # Dynamic attribute for runtime access in UIs/exporters; bypass
             # pydantic setattr restrictions intentionally.
@@ -503,12 +687,26 @@ class BaseLLMAgent:
     def _system_prompt(self, incoming, state) -> str:
         raise NotImplementedError
 
-    def _build_user_prompt(self, incoming, state) -> str:
+    async def _retrieve_knowledge(self, incoming, state) -> Optional[Mapping[str, Any]]:
+        """Fetch knowledge-base context for the prompt without blocking the loop.
+
+        Called before ``_build_user_prompt``, which receives the result as
+        ``knowledge``; None means the prompt looks up what it needs itself.
+        """
+        del incoming, state
+        return None
+
+    def _build_user_prompt(self, incoming, state, knowledge: Optional[Mapping[str, Any]] = None) -> str:
         raise NotImplementedError
 
     def _message_type(self, parsed: Mapping[str, Any], incoming, state):
         raise NotImplementedError
 
+    def _response_schema(self, incoming, state) -> Optional[Mapping[str, Any]]:
+        """JSON Schema for the agent's response in structured-output mode."""
+        del incoming, state
+        return agent_response_schema()
+
     def _build_payload(self, parsed: Mapping[str, Any], incoming, state):
         raise NotImplementedError
 
@@ -744,13 +942,15 @@ class BaseLLMAgent:
 
         return candidate
 
-    def _handle_stream_chunk(
-        self, chunk: str
-    ) -> None:  # pragma: no cover - hook for subclasses
-        del chunk
+    def _handle_stream_chunk(self, chunk: str) -> None:
+        """Hook called for every streamed chunk; forwards it to the token sink."""
+        sink = _TOKEN_SINK.get()
+        if sink is not None:
+            sink(getattr(self._role, "value", self._role), chunk)
 
 
 __all__ = [
+    "token_sink",
     "DeterministicLLMRunner",
     "BedrockChatRunner",
     "BaseLLMAgent",
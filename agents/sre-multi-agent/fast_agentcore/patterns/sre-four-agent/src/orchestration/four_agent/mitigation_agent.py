@@ -10,6 +10,7 @@ from typing import Dict, Mapping
 
 from ..observability import emit_event, wrap_payload
 # Business calculator removed for simplified demo
+from .kb_fanout import merge_query_results
 from .llm import BaseLLMAgent
 from .policy_reader import PolicyReader
 from .schema import AgentRole, EvidenceReference, MessageType, PayloadModel, Severity
@@ -44,14 +45,17 @@ class MitigationCommsAgent(BaseLLMAgent):
         temperature: float = 0.25,
         max_output_tokens: int = 1400,
         stream_updates: bool = True,
+        kb_reader=None,
     ) -> None:
         self._config = config or MitigationAgentConfig()
         self._plan_revisions: Dict[str, int] = defaultdict(int)
         self._cached_plan_details: Dict[str, Dict[str, object]] = {}
         # Business calculator removed for simplified demo
         
-        # Use Bedrock Knowledge Base for semantic search, fallback to PolicyReader
-        if BEDROCK_KB_AVAILABLE:
+        # Use the shared reader when given, else Bedrock Knowledge Base, fallback to PolicyReader
+        if kb_reader is not None:
+            self._kb_reader = kb_reader
+        elif BEDROCK_KB_AVAILABLE:
             try:
                 self._kb_reader = BedrockKnowledgeBaseReader()
                 print("✅ Mitigation Agent: Using Bedrock Knowledge Base (semantic search)")
@@ -78,6 +82,11 @@ class MitigationCommsAgent(BaseLLMAgent):
             stream_updates=stream_updates,
         )
 
+    def forget_incident(self, incident_id: str) -> None:
+        """Drop the plan revision and cached plan kept for an incident."""
+        self._plan_revisions.pop(incident_id, None)
+        self._cached_plan_details.pop(incident_id, None)
+
     # ------------------------------------------------------------------
     # BaseLLMAgent hooks
     # ------------------------------------------------------------------
@@ -103,7 +112,72 @@ class MitigationCommsAgent(BaseLLMAgent):
             "Always provide actionable, specific guidance with real data from the incident analysis."
         )
 
-    def _build_user_prompt(self, incoming, state) -> str:
+    def _kb_queries(self, state) -> list[str]:
+        """Semantic queries for mitigation playbooks, communication templates and approvals."""
+        severity_str = getattr(state.severity, "value", str(state.severity))
+        return [
+            f"mitigation playbooks and procedures for {severity_str} severity incidents",
+            f"incident communication templates and stakeholder notification procedures for {severity_str}",
+            f"approval requirements and authorization procedures for {severity_str} incidents",
+        ]
+
+    @staticmethod
+    def _kb_knowledge(chunks: list[dict]) -> Dict[str, object]:
+        """Prompt context from merged KB chunks; each chunk counts for the query it matched best."""
+
+        def content(query_index: int, limit: int) -> str:
+            return "\n".join(
+                [chunk["content"] for chunk in chunks if chunk["query_index"] == query_index][:limit]
+            )
+
+        return {
+            "policy_procedures": content(0, 2),
+            "communication_templates": content(1, 2),
+            "approval_requirements": content(2, 1),
+            "policy_reference": "POL-SRE-004 Mitigation Playbooks (via Bedrock KB)",
+        }
+
+    def _policy_reader_knowledge(self, state, reference: str) -> Dict[str, object]:
+        return {
+            "policy_procedures": self._policy_reader.get_severity_procedures(state.severity),
+            "approval_requirements": self._policy_reader.get_approval_requirements(state.severity),
+            "communication_templates": "",
+            "policy_reference": reference,
+        }
+
+    def _lookup_policy_knowledge(self, state) -> Dict[str, object]:
+        """Policy context retrieved synchronously, one query after another."""
+        # Try to use Bedrock KB for semantic search, fallback to PolicyReader
+        if self._kb_reader is None:
+            # Use PolicyReader when Bedrock KB is not available
+            return self._policy_reader_knowledge(
+                state, "POL-SRE-001 Incident Response Procedures (PolicyReader)"
+            )
+        try:
+            return self._kb_knowledge(
+                merge_query_results(
+                    [self._kb_reader.search_by_semantic_query(query) for query in self._kb_queries(state)]
+                )
+            )
+        except Exception as e:
+            print(f"⚠️  Mitigation Agent: Bedrock KB retrieval failed ({e}), using PolicyReader fallback")
+            return self._policy_reader_knowledge(
+                state, "POL-SRE-001 Incident Response Procedures (PolicyReader fallback)"
+            )
+
+    async def _retrieve_knowledge(self, incoming, state) -> Dict[str, object] | None:
+        if self._kb_reader is None or not hasattr(self._kb_reader, "retrieve_many"):
+            return None
+        # Playbooks, templates and approvals in one concurrent round-trip
+        try:
+            return self._kb_knowledge(await self._kb_reader.retrieve_many(self._kb_queries(state)))
+        except Exception as e:
+            print(f"⚠️  Mitigation Agent: Bedrock KB retrieval failed ({e}), using PolicyReader fallback")
+            return self._policy_reader_knowledge(
+                state, "POL-SRE-001 Incident Response Procedures (PolicyReader fallback)"
+            )
+
+    def _build_user_prompt(self, incoming, state, knowledge=None) -> str:
         details = incoming.payload.details
         intent = details.get("intent", "plan")
         incident_id = incoming.incident_id
@@ -113,42 +187,9 @@ class MitigationCommsAgent(BaseLLMAgent):
 
         # Retrieve relevant policy procedures and mitigation playbooks
         severity_str = getattr(state.severity, "value", str(state.severity))
-        
-        # Try to use Bedrock KB for semantic search, fallback to PolicyReader
-        if self._kb_reader is not None:
-            try:
-                # Use semantic search for mitigation playbooks and communication templates
-                playbook_query = f"mitigation playbooks and procedures for {severity_str} severity incidents"
-                communication_query = f"incident communication templates and stakeholder notification procedures for {severity_str}"
-                approval_query = f"approval requirements and authorization procedures for {severity_str} incidents"
-                
-                # Retrieve using Bedrock KB semantic search
-                playbook_results = self._kb_reader.search_by_semantic_query(playbook_query)
-                communication_results = self._kb_reader.search_by_semantic_query(communication_query)
-                approval_results = self._kb_reader.search_by_semantic_query(approval_query)
-                
-                # Extract content from search results
-                policy_procedures = "\n".join([chunk["content"] for chunk in playbook_results[:2]])
-                communication_templates = "\n".join([chunk["content"] for chunk in communication_results[:2]])
-                approval_requirements = "\n".join([chunk["content"] for chunk in approval_results[:1]])
-                
-                # Add policy reference
-                policy_reference = "POL-SRE-004 Mitigation Playbooks (via Bedrock KB)"
-                
-            except Exception as e:
-                print(f"⚠️  Mitigation Agent: Bedrock KB retrieval failed ({e}), using PolicyReader fallback")
-                # Fallback to PolicyReader
-                policy_procedures = self._policy_reader.get_severity_procedures(state.severity)
-                approval_requirements = self._policy_reader.get_approval_requirements(state.severity)
-                communication_templates = ""
-                policy_reference = "POL-SRE-001 Incident Response Procedures (PolicyReader fallback)"
-        else:
-            # Use PolicyReader when Bedrock KB is not available
-            policy_procedures = self._policy_reader.get_severity_procedures(state.severity)
-            approval_requirements = self._policy_reader.get_approval_requirements(state.severity)
-            communication_templates = ""
-            policy_reference = "POL-SRE-001 Incident Response Procedures (PolicyReader)"
-        
+        if knowledge is None:
+            knowledge = self._lookup_policy_knowledge(state)
+
         base_context = {
             "incident_id": incident_id,
             "severity": severity_str,
@@ -158,10 +199,10 @@ class MitigationCommsAgent(BaseLLMAgent):
             "impact": details.get("impact"),
             "feedback": details.get("feedback"),
             "prior_messages": details.get("prior_messages", []),
-            "policy_procedures": policy_procedures,
-            "approval_requirements": approval_requirements,
-            "communication_templates": communication_templates,
-            "policy_reference": policy_reference,
+            "policy_procedures": knowledge["policy_procedures"],
+            "approval_requirements": knowledge["approval_requirements"],
+            "communication_templates": knowledge["communication_templates"],
+            "policy_reference": knowledge["policy_reference"],
         }
 
         if intent == "status":
@@ -157,6 +157,15 @@ class PhaseTwoOrchestrator:
             "The streamlined system operates autonomously without approval interrupts."
         )
 
+    def reset(self, incident_id: Optional[str] = None) -> None:
+        """Clear per-run tracking so the instance can serve another incident."""
+
+        if self._pending_state is not None:
+            raise RuntimeError("Cannot reset an orchestrator with a suspended run")
+        self.incident_id = incident_id
+        self._current_stage = None
+        self._execution_timeline = []
+
     def visualize(self) -> str:
         """Return an ASCII representation of the LangGraph workflow."""
 
@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import os
 from pathlib import Path
 from typing import Dict, Optional
 
 from .schema import Severity
+from .section_index import SectionIndex
 
 
 class PolicyReader:
@@ -19,22 +19,14 @@ class PolicyReader:
             policy_path = root / "docs" / "policies" / "incident-response-procedures.md"
         
         self._policy_path = Path(policy_path)
-        self._policy_content: Optional[str] = None
+        self._index = SectionIndex(self._policy_path, "Policy document")
     
-    def _load_policy_content(self) -> str:
-        """Load the full policy document content."""
-        if self._policy_content is None:
-            if not self._policy_path.exists():
-                raise FileNotFoundError(f"Policy document not found at {self._policy_path}")
-            
-            self._policy_content = self._policy_path.read_text()
-        
-        return self._policy_content
+    def preload(self) -> None:
+        """Index the policy document now rather than on the first lookup."""
+        self._index.refresh()
     
     def get_severity_procedures(self, severity: Severity) -> str:
         """Extract relevant policy procedures for the given severity level."""
-        content = self._load_policy_content()
-        
         # Map severity to policy section numbers
         section_map = {
             Severity.SEV_1: "3.1",
@@ -47,10 +39,10 @@ class PolicyReader:
             return self._get_general_procedures()
         
         # Extract the specific section
-        section_content = self._extract_section(content, section_num)
+        section_content = self._extract_section(section_num)
         
         # Also include general coordination procedures
-        coordination_section = self._extract_section(content, "4")
+        coordination_section = self._extract_section("4")
         
         return f"""
 MANDATORY PROCEDURES FOR {severity.value} INCIDENTS:
@@ -63,39 +55,20 @@ COORDINATION AND HANDOFF PROCEDURES:
 POLICY REFERENCE: POL-SRE-001 Incident Response Procedures and Mitigation Policy
 """
     
-    def _extract_section(self, content: str, section_num: str) -> str:
+    def _extract_section(self, section_num: str) -> str:
         """Extract a specific numbered section from the policy document."""
-        lines = content.split('\n')
-        section_lines = []
-        in_section = False
-        section_level = len(section_num.split('.'))
-        
-        for line in lines:
-            # Check if this is the start of our target section
-            if line.startswith(f"### {section_num} ") or line.startswith(f"## {section_num} "):
-                in_section = True
-                section_lines.append(line)
-                continue
-            
-            # Check if we've hit the next section at the same level
-            if in_section and line.startswith('#'):
-                # Count the heading level
-                heading_level = len(line) - len(line.lstrip('#'))
-                if heading_level <= section_level + 1:
-                    # Check if this is a same-level or higher-level section
-                    if section_level == 1 and heading_level <= 2:
-                        break
-                    elif section_level == 2 and heading_level <= 3:
-                        # For subsections, only break on same level or higher
-                        if line.startswith('### ') and not line.startswith(f'### {section_num}.'):
-                            break
-                        elif line.startswith('## '):
-                            break
-            
-            if in_section:
-                section_lines.append(line)
+        return self._index.section_text(section_num)
+    
+    def search_sections(self, query: str, limit: int = 3, max_tokens: Optional[int] = None) -> str:
+        """Policy subsections that best match the query's keywords.
         
-        return '\n'.join(section_lines) if section_lines else f"Section {section_num} not found"
+        Args:
+            query: Keywords, e.g. "executive escalation"
+            limit: Maximum number of subsections
+            max_tokens: Token budget for the returned text
+        """
+        sections = self._index.search(query, limit=limit, max_tokens=max_tokens)
+        return "\n\n".join(section.body for section in sections)
     
     def _get_general_procedures(self) -> str:
         """Get general incident response procedures when specific severity not found."""
@@ -122,9 +95,7 @@ POLICY REFERENCE: POL-SRE-001 Incident Response Procedures and Mitigation Policy
     
     def get_business_impact_thresholds(self) -> str:
         """Get business impact calculation guidelines from policy."""
-        content = self._load_policy_content()
-        business_section = self._extract_section(content, "5")
-        return business_section
+        return self._extract_section("5")
 
 
 __all__ = ["PolicyReader"]
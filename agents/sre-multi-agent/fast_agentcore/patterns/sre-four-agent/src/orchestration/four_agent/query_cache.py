@@ -0,0 +1,290 @@
+"""Two-level cache of knowledge-base query results.
+
+During a sustained incident every analysis window asks the knowledge base
+nearly the same questions ("connection pool exhausted payment-service",
+then "payment-service connection pool exhausted"), and each one costs a
+Bedrock KB retrieve or an embedding plus vector search. This cache answers
+repeats from memory:
+
+1. exact: the normalised query text (case and whitespace folded) maps to
+   the stored result, until the entry's TTL expires
+2. semantic: on an exact miss, the query embedding is compared with the
+   embeddings of cached queries in the same namespace that name the same
+   identifiers (error codes, incident ids, service names); the closest one
+   at or above the similarity threshold is reused
+
+Entries are grouped by namespace (reader method plus the arguments that
+change its result), so a semantic hit never crosses methods. ``invalidate``
+drops everything and is called when the knowledge base is synced.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+from .settings import (
+    QUERY_CACHE_MAX_ENTRIES,
+    QUERY_CACHE_SIMILARITY,
+    QUERY_CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Lookup outcomes, as reported to track_kb_retrieval
+CACHE_MISS = "miss"
+CACHE_EXACT = "exact"
+CACHE_SEMANTIC = "semantic"
+
+
+def normalize_query(query: str) -> str:
+    """Fold case and whitespace so trivially different queries share a key."""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def query_identifiers(query: str) -> frozenset[str]:
+    """Tokens that name something rather than describe it.
+
+    That is tokens containing a digit (error codes, incident ids, HTTP
+    statuses) and compound names such as ``payment-service`` or
+    ``orders_db`` (words joined by ``-``, ``_`` or ``.``).
+
+    Embeddings barely tell ``SQLSTATE[08006]`` from ``SQLSTATE[08001]``, or
+    ``payment-service`` from ``auth-service``, so a semantic hit additionally
+    requires both queries to name the same ones.
+    """
+    # Sentence punctuation is not part of a name
+    tokens = [token.strip(".:/-") for token in re.findall(r"[\w.\-\[\]:/]+", query.lower())]
+    return frozenset(
+        token for token in tokens
+        if re.search(r"\d", token) or re.search(r"[a-z0-9][\-_.][a-z0-9]", token)
+    )
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    embedding: np.ndarray | None = None
+
+
+class QueryResultCache:
+    """Exact and near-duplicate query lookup with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = QUERY_CACHE_TTL_SECONDS,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        similarity_threshold: float = QUERY_CACHE_SIMILARITY,
+        embed: Callable[[str], list[float] | None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: Lifetime of an entry; 0 disables the cache
+            max_entries: Entries kept across all namespaces (LRU beyond that)
+            similarity_threshold: Minimum cosine similarity for a semantic
+                hit; 0 disables the semantic level
+            embed: Query embedding function for the semantic level; may
+                return None when no embedding is available
+            clock: Time source, in seconds
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed if similarity_threshold > 0 else None
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _embedding(self, query: str) -> np.ndarray | None:
+        if self.embed is None:
+            return None
+        try:
+            vector = self.embed(query)
+        except Exception as e:
+            logger.warning(f"Query cache: embedding failed, semantic lookup skipped: {e}")
+            return None
+        if not vector:
+            return None
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm else None
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _purge_expired(self, now: float) -> None:
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def lookup(self, namespace: str, query: str) -> tuple[Any, str, np.ndarray | None]:
+        """Find a cached result for a query.
+
+        Returns:
+            (value, outcome, embedding): value is None on a miss; outcome is
+            CACHE_EXACT, CACHE_SEMANTIC or CACHE_MISS; embedding is the query
+            embedding if one was computed, for passing on to ``store``
+        """
+        if not self.enabled:
+            return None, CACHE_MISS, None
+        key = (namespace, normalize_query(query))
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return copy.deepcopy(entry.value), CACHE_EXACT, entry.embedding
+            self._purge_expired(now)
+            generation = self.generation
+            identifiers = query_identifiers(key[1])
+            candidates = [
+                (cached_key, cached)
+                for cached_key, cached in self._entries.items()
+                if cached_key[0] == namespace
+                and cached.embedding is not None
+                and query_identifiers(cached_key[1]) == identifiers
+            ]
+
+        embedding = self._embedding(query) if candidates else None
+        if embedding is not None:
+            matrix = np.vstack([cached.embedding for _, cached in candidates])
+            similarities = matrix @ embedding
+            best = int(np.argmax(similarities))
+            if float(similarities[best]) >= self.similarity_threshold:
+                cached_key, cached = candidates[best]
+                with self._lock:
+                    # Entries seen before an invalidation must not be served
+                    hit = generation == self.generation
+                    if hit:
+                        self.semantic_hits += 1
+                        if cached_key in self._entries:
+                            self._entries.move_to_end(cached_key)
+                        # Repeats of this wording become exact hits, expiring with the original
+                        self._entries[key] = _Entry(cached.value, cached.expires_at, embedding)
+                        self._evict()
+                if hit:
+                    logger.debug(
+                        f"Query cache: '{query[:60]}' reused '{cached_key[1][:60]}' "
+                        f"(similarity {float(similarities[best]):.3f})"
+                    )
+                    return copy.deepcopy(cached.value), CACHE_SEMANTIC, embedding
+
+        with self._lock:
+            self.misses += 1
+        return None, CACHE_MISS, embedding
+
+    def store(
+        self,
+        namespace: str,
+        query: str,
+        value: Any,
+        embedding: np.ndarray | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """Cache a result computed after a miss.
+
+        Args:
+            namespace: Namespace the query was looked up in
+            query: Query text
+            value: Result to cache (copied)
+            embedding: Query embedding from ``lookup``; computed if missing
+            generation: ``generation`` read before computing the value; the
+                result is dropped if the cache was invalidated meanwhile
+        """
+        if not self.enabled:
+            return
+        if embedding is None:
+            embedding = self._embedding(query)
+        entry = _Entry(copy.deepcopy(value), self._clock() + self.ttl_seconds, embedding)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            key = (namespace, normalize_query(query))
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        query: str,
+        compute: Callable[[], Any],
+        cacheable: Callable[[Any], bool] | None = None,
+    ) -> tuple[Any, str]:
+        """Return the cached result for a query, computing and caching it on a miss.
+
+        Args:
+            namespace: Namespace to look the query up in
+            query: Query text
+            compute: Computes the result on a miss
+            cacheable: Whether a computed result may be cached; results it
+                rejects (e.g. fallbacks during an outage) are returned only
+
+        Returns:
+            (value, outcome) with outcome CACHE_EXACT, CACHE_SEMANTIC or CACHE_MISS
+        """
+        value, outcome, embedding = self.lookup(namespace, query)
+        if outcome != CACHE_MISS:
+            return value, outcome
+        generation = self.generation
+        value = compute()
+        if cacheable is None or cacheable(value):
+            self.store(namespace, query, value, embedding=embedding, generation=generation)
+        return value, CACHE_MISS
+
+    def invalidate(self) -> None:
+        """Drop every entry, e.g. after the knowledge base was synced."""
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+        if dropped:
+            logger.info(f"Query cache invalidated ({dropped} entries dropped)")
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and size."""
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "ttl_seconds": self.ttl_seconds,
+                "similarity_threshold": self.similarity_threshold,
+            }
+
+
+__all__ = [
+    "CACHE_EXACT",
+    "CACHE_MISS",
+    "CACHE_SEMANTIC",
+    "QueryResultCache",
+    "normalize_query",
+    "query_identifiers",
+]
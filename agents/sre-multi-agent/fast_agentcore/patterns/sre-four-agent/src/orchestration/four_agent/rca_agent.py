@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 
 from ..observability import emit_event, wrap_payload
 
 # Evidence generator removed for simplified demo
+from .kb_fanout import gather_lookups
 from .llm import BaseLLMAgent
 from .rca_knowledge_reader import (
     RCAKnowledgeReader,
@@ -53,9 +54,12 @@ class RCAAgent(BaseLLMAgent):
         temperature: float = 0.2,
         max_output_tokens: int = 1100,
         stream_updates: bool = True,
+        kb_reader=None,
     ) -> None:
-        # Use Bedrock Knowledge Base for semantic search
-        if BEDROCK_KB_AVAILABLE:
+        # Use the shared reader when given, else Bedrock Knowledge Base for semantic search
+        if kb_reader is not None:
+            self._rca_knowledge_reader = kb_reader
+        elif BEDROCK_KB_AVAILABLE:
             try:
                 self._rca_knowledge_reader = BedrockKnowledgeBaseReader()
                 print("✅ RCA Agent: Using Bedrock Knowledge Base (semantic search)")
@@ -123,21 +127,13 @@ class RCAAgent(BaseLLMAgent):
             "Analyse telemetry to produce ranked root-cause hypotheses with evidence references."
         )
 
-    def _build_user_prompt(self, incoming, state) -> str:
-        monitoring = incoming.payload.details.get("monitoring", {})
-        additional = incoming.payload.details.get("additional_sources", {})
-        signals_context = incoming.payload.details.get("signals", {})
+    def _knowledge_lookups(self, signals_context: dict) -> dict[str, Callable[[], object]]:
+        """Reader calls that supply the prompt's RAG context, by context key."""
+        reader = self._rca_knowledge_reader
 
         # RAG: Extract error patterns from signals
         error_patterns = self._extract_error_patterns(signals_context)
 
-        # RAG: Retrieve troubleshooting knowledge for the first error pattern
-        troubleshooting_knowledge = {}
-        if error_patterns:
-            troubleshooting_knowledge = (
-                self._rca_knowledge_reader.get_troubleshooting_steps(error_patterns[0])
-            )
-
         # RAG: Retrieve known failure patterns
         # Try to infer service from error patterns or use a generic lookup
         service_hint = "database"  # Default fallback
@@ -149,21 +145,33 @@ class RCAAgent(BaseLLMAgent):
                 service_hint = "memory"
                 break
 
-        failure_patterns = self._rca_knowledge_reader.get_failure_pattern(service_hint)
-
-        # RAG: Retrieve similar past incidents based on error patterns (not raw anomalies)
-        similar_incidents = []
+        lookups: dict[str, Callable[[], object]] = {
+            "failure_patterns": lambda: reader.get_failure_pattern(service_hint),
+        }
         if error_patterns:
-            similar_incidents = self._rca_knowledge_reader.get_similar_incidents(
-                error_patterns  # Use extracted string patterns, not dict anomalies
-            )
+            # RAG: Troubleshooting knowledge and error code guidance for the
+            # first error pattern, similar past incidents for all of them
+            # (extracted string patterns, not dict anomalies)
+            lookups["troubleshooting_knowledge"] = lambda: reader.get_troubleshooting_steps(error_patterns[0])
+            lookups["similar_incidents"] = lambda: reader.get_similar_incidents(error_patterns)
+            lookups["error_code_guidance"] = lambda: reader.get_error_code_guidance(error_patterns[0])
+        return lookups
+
+    async def _retrieve_knowledge(self, incoming, state) -> dict[str, object]:
+        # The lookups are independent: run them concurrently, off the event loop
+        return await gather_lookups(
+            self._knowledge_lookups(incoming.payload.details.get("signals", {}))
+        )
 
-        # RAG: Get error code guidance for the first error pattern
-        error_code_guidance = {}
-        if error_patterns:
-            error_code_guidance = self._rca_knowledge_reader.get_error_code_guidance(
-                error_patterns[0]
-            )
+    def _build_user_prompt(self, incoming, state, knowledge=None) -> str:
+        monitoring = incoming.payload.details.get("monitoring", {})
+        additional = incoming.payload.details.get("additional_sources", {})
+        signals_context = incoming.payload.details.get("signals", {})
+
+        if knowledge is None:
+            knowledge = {
+                name: lookup() for name, lookup in self._knowledge_lookups(signals_context).items()
+            }
 
         context = {
             "incident_id": incoming.incident_id,
@@ -174,10 +182,10 @@ class RCAAgent(BaseLLMAgent):
             "signals_context": signals_context,
             "business": additional.get("business", {}),
             # RAG-enhanced knowledge
-            "troubleshooting_knowledge": troubleshooting_knowledge,
-            "failure_patterns": failure_patterns,
-            "similar_incidents": similar_incidents,
-            "error_code_guidance": error_code_guidance,
+            "troubleshooting_knowledge": knowledge.get("troubleshooting_knowledge", {}),
+            "failure_patterns": knowledge.get("failure_patterns", {}),
+            "similar_incidents": knowledge.get("similar_incidents", []),
+            "error_code_guidance": knowledge.get("error_code_guidance", {}),
             "policy_reference": "POL-SRE-003 Troubleshooting Runbooks, POL-SRE-004 Known Failure Patterns",
         }
         schema = {
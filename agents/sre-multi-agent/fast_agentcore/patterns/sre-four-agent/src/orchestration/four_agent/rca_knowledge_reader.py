@@ -5,6 +5,8 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
+from .section_index import SectionIndex
+
 
 class RCAKnowledgeReader:
     """Reads and extracts troubleshooting knowledge from policy documents.
@@ -33,28 +35,23 @@ class RCAKnowledgeReader:
 
         self._runbooks_path = Path(runbooks_path)
         self._patterns_path = Path(patterns_path)
-        self._runbooks_content: str | None = None
-        self._patterns_content: str | None = None
+        self._runbooks = SectionIndex(self._runbooks_path, "Troubleshooting runbooks")
+        self._patterns = SectionIndex(self._patterns_path, "Known failure patterns")
+        # Incident references of both documents, keyed by their index versions
+        self._incident_refs: tuple[tuple[int, int], list[tuple[str, str, str]]] | None = None
 
     def _load_runbooks_content(self) -> str:
         """Load the troubleshooting runbooks content."""
-        if self._runbooks_content is None:
-            if not self._runbooks_path.exists():
-                raise FileNotFoundError(
-                    f"Troubleshooting runbooks not found at {self._runbooks_path}"
-                )
-            self._runbooks_content = self._runbooks_path.read_text()
-        return self._runbooks_content
+        return self._runbooks.content
 
     def _load_patterns_content(self) -> str:
         """Load the known failure patterns content."""
-        if self._patterns_content is None:
-            if not self._patterns_path.exists():
-                raise FileNotFoundError(
-                    f"Known failure patterns not found at {self._patterns_path}"
-                )
-            self._patterns_content = self._patterns_path.read_text()
-        return self._patterns_content
+        return self._patterns.content
+
+    def preload(self) -> None:
+        """Index both documents now rather than on the first lookup."""
+        self._runbooks.refresh()
+        self._patterns.refresh()
 
     def get_troubleshooting_steps(self, error_pattern: str) -> dict[str, any]:
         """Retrieve diagnostic steps for specific error patterns.
@@ -65,8 +62,6 @@ class RCAKnowledgeReader:
         Returns:
             Dictionary containing troubleshooting information
         """
-        content = self._load_runbooks_content()
-
         # Map common error patterns to runbook sections
         pattern_map = {
             "SQLSTATE[08006]": "1",  # Database Connection Issues
@@ -91,15 +86,18 @@ class RCAKnowledgeReader:
                 section_num = num
                 break
 
+        if not section_num:
+            # No known pattern: the runbook chapter whose text best matches the error
+            matches = self._runbooks.search(error_pattern, limit=1)
+            if matches and matches[0].number:
+                section_num = matches[0].number.split(".")[0]
+
         if not section_num:
             # Fallback: return general guidance
             return self._get_fallback_troubleshooting()
 
-        # Extract the section
-        section_content = self._extract_section(content, section_num)
-
         # Parse the section into structured data
-        return self._parse_troubleshooting_section(section_content, section_num)
+        return self._parse_troubleshooting_section(section_num)
 
     def get_failure_pattern(self, service_or_symptom: str) -> dict[str, any]:
         """Retrieve known failure patterns for a service or symptom.
@@ -110,8 +108,6 @@ class RCAKnowledgeReader:
         Returns:
             Dictionary containing failure pattern information
         """
-        content = self._load_patterns_content()
-
         # Map keywords to pattern sections
         keyword_map = {
             "payment": "2",
@@ -135,8 +131,7 @@ class RCAKnowledgeReader:
             section_num = "2"
 
         # Extract and parse section
-        section_content = self._extract_section(content, section_num)
-        return self._parse_failure_pattern_section(section_content, section_num)
+        return self._parse_failure_pattern_section(section_num)
 
     def get_similar_incidents(self, symptoms: list[str]) -> list[dict[str, any]]:
         """Retrieve similar past incidents based on symptoms.
@@ -147,45 +142,38 @@ class RCAKnowledgeReader:
         Returns:
             List of similar incidents with root causes
         """
-        content = self._load_runbooks_content()
-
         incidents = []
-
-        # Search for incident references (INC-YYYY-MM-DD pattern)
-        incident_pattern = r"INC-\d{4}-\d{2}-\d{2}:[^*\n]+"
-        matches = re.findall(incident_pattern, content, re.MULTILINE)
-
-        for match in matches:
+        for incident_id, description, reference in self._incident_references():
             # Check if any symptom keyword appears in the incident description
-            if any(symptom.lower() in match.lower() for symptom in symptoms):
-                # Parse incident details
-                parts = match.split(":")
-                if len(parts) >= 2:
-                    incident_id = parts[0].strip()
-                    description = parts[1].strip()
+            if not any(symptom.lower() in reference for symptom in symptoms):
+                continue
+            # Runbook references come first; skip their repeats in the patterns
+            if not any(inc["incident_id"] == incident_id for inc in incidents):
+                incidents.append({"incident_id": incident_id, "description": description})
 
-                    incidents.append(
-                        {"incident_id": incident_id, "description": description}
-                    )
+        return incidents[:5]  # Return top 5 most relevant
 
-        # Also search in known-failure-patterns for historical references
-        patterns_content = self._load_patterns_content()
-        pattern_matches = re.findall(incident_pattern, patterns_content, re.MULTILINE)
+    def _incident_references(self) -> list[tuple[str, str, str]]:
+        """(incident id, description, lowercased reference) of both documents.
 
-        for match in pattern_matches:
-            if any(symptom.lower() in match.lower() for symptom in symptoms):
-                parts = match.split(":")
-                if len(parts) >= 2:
-                    incident_id = parts[0].strip()
-                    description = parts[1].strip()
+        Parsed once per version of the documents rather than on every lookup.
+        """
+        runbooks = self._load_runbooks_content()
+        patterns = self._load_patterns_content()
+        versions = (self._runbooks.version, self._patterns.version)
+        if self._incident_refs is not None and self._incident_refs[0] == versions:
+            return self._incident_refs[1]
 
-                    # Avoid duplicates
-                    if not any(inc["incident_id"] == incident_id for inc in incidents):
-                        incidents.append(
-                            {"incident_id": incident_id, "description": description}
-                        )
+        # Search for incident references (INC-YYYY-MM-DD pattern)
+        incident_pattern = r"INC-\d{4}-\d{2}-\d{2}:[^*\n]+"
+        references = []
+        for content in (runbooks, patterns):
+            for match in re.findall(incident_pattern, content, re.MULTILINE):
+                parts = match.split(":")
+                references.append((parts[0].strip(), parts[1].strip(), match.lower()))
 
-        return incidents[:5]  # Return top 5 most relevant
+        self._incident_refs = (versions, references)
+        return references
 
     def get_error_code_guidance(self, error_code: str) -> dict[str, str]:
         """Retrieve guidance for specific error codes.
@@ -270,13 +258,14 @@ class RCAKnowledgeReader:
         Returns:
             List of error pattern strings
         """
-        content = self._load_runbooks_content()
-
         patterns = []
 
         # Extract error patterns from section 1.1, 2.1, etc.
-        error_section_pattern = r"### \d+\.\d+ Error Patterns.*?(?=###|\Z)"
-        matches = re.findall(error_section_pattern, content, re.DOTALL)
+        matches = [
+            section.body
+            for section in self._runbooks.sections()
+            if section.number and "." in section.number and section.title.startswith("Error Patterns")
+        ]
 
         for match in matches:
             # Extract bullet points and code patterns
@@ -323,66 +312,57 @@ class RCAKnowledgeReader:
 
         return results
 
-    def _extract_section(self, content: str, section_num: str) -> str:
-        """Extract a specific numbered section from markdown content.
+    def search_sections(
+        self, query: str, limit: int = 3, max_tokens: int | None = None
+    ) -> list[dict[str, str]]:
+        """Runbook and failure-pattern subsections that best match a query.
+
+        Lets a caller put only the relevant subsections into a prompt
+        instead of whole runbook chapters.
 
         Args:
-            content: Full markdown content
-            section_num: Section number (e.g., "1", "2.1")
+            query: Error message, symptom or keywords
+            limit: Maximum number of subsections
+            max_tokens: Token budget for the returned content
 
         Returns:
-            Extracted section content
+            Matching subsections, best first, alternating between the runbooks
+            and the failure patterns
         """
-        lines = content.split("\n")
-        section_lines = []
-        in_section = False
-        section_level = len(section_num.split("."))
-
-        for line in lines:
-            # Check if this is the start of our target section
-            if line.startswith(f"## {section_num} ") or line.startswith(
-                f"### {section_num} "
-            ):
-                in_section = True
-                section_lines.append(line)
-                continue
+        ranked = []
+        for document, index in (("POL-SRE-003", self._runbooks), ("POL-SRE-004", self._patterns)):
+            for rank, section in enumerate(index.search(query, limit=limit)):
+                ranked.append((rank, document, section))
+        ranked.sort(key=lambda item: item[0])
 
-            # Check if we've hit the next section
-            if in_section and (line.startswith("## ") or line.startswith("### ")):
-                # Extract section number from new heading
-                heading_match = re.match(r"^#{2,3} (\d+(?:\.\d+)?)", line)
-                if heading_match:
-                    new_section_num = heading_match.group(1)
-                    new_section_level = len(new_section_num.split("."))
-
-                    # Stop if we hit a same-level or higher-level section
-                    if new_section_level <= section_level:
-                        break
-
-            if in_section:
-                section_lines.append(line)
-
-        return (
-            "\n".join(section_lines)
-            if section_lines
-            else f"Section {section_num} not found"
-        )
+        results = []
+        spent = 0
+        for _, document, section in ranked[:limit]:
+            if max_tokens is not None and spent + section.body_tokens > max_tokens:
+                break
+            spent += section.body_tokens
+            results.append(
+                {
+                    "title": section.title,
+                    "content": section.body,
+                    "policy_reference": f"{document} Section {section.number or section.title}",
+                }
+            )
+        return results
 
-    def _parse_troubleshooting_section(
-        self, section_content: str, section_num: str
-    ) -> dict[str, any]:
+    def _parse_troubleshooting_section(self, section_num: str) -> dict[str, any]:
         """Parse troubleshooting section into structured data."""
         # Extract subsections
-        error_patterns = self._extract_subsection(section_content, "Error Patterns")
-        root_causes = self._extract_subsection(section_content, "Root Causes")
-        diagnostic_steps = self._extract_subsection(section_content, "Diagnostic Steps")
+        index = self._runbooks
+        error_patterns = self._extract_subsection(index, section_num, "Error Patterns")
+        root_causes = self._extract_subsection(index, section_num, "Root Causes")
+        diagnostic_steps = self._extract_subsection(index, section_num, "Diagnostic Steps")
         similar_incidents = self._extract_subsection(
-            section_content, "Similar Past Incidents"
+            index, section_num, "Similar Past Incidents"
         )
 
-        # Extract section title
-        title_match = re.match(r"^#{2,3} \d+(?:\.\d+)? (.+)", section_content)
-        section_name = title_match.group(1) if title_match else f"Section {section_num}"
+        section = index.section(section_num)
+        section_name = section.title if section else f"Section {section_num}"
 
         return {
             "section_name": section_name,
@@ -394,19 +374,17 @@ class RCAKnowledgeReader:
             "policy_reference": f"POL-SRE-003 Section {section_num}",
         }
 
-    def _parse_failure_pattern_section(
-        self, section_content: str, section_num: str
-    ) -> dict[str, any]:
+    def _parse_failure_pattern_section(self, section_num: str) -> dict[str, any]:
         """Parse failure pattern section into structured data."""
-        symptom_pattern = self._extract_subsection(section_content, "Symptom Pattern")
+        index = self._patterns
+        symptom_pattern = self._extract_subsection(index, section_num, "Symptom Pattern")
         root_cause_dist = self._extract_subsection(
-            section_content, "Root Cause Distribution"
+            index, section_num, "Root Cause Distribution"
         )
-        diagnostic_q = self._extract_subsection(section_content, "Diagnostic Questions")
+        diagnostic_q = self._extract_subsection(index, section_num, "Diagnostic Questions")
 
-        # Extract section title
-        title_match = re.match(r"^#{2,3} \d+(?:\.\d+)? (.+)", section_content)
-        section_name = title_match.group(1) if title_match else f"Section {section_num}"
+        section = index.section(section_num)
+        section_name = section.title if section else f"Section {section_num}"
 
         return {
             "section_name": section_name,
@@ -417,16 +395,14 @@ class RCAKnowledgeReader:
             "policy_reference": f"POL-SRE-004 Section {section_num}",
         }
 
-    def _extract_subsection(self, content: str, subsection_name: str) -> str:
-        """Extract a subsection by name (e.g., 'Error Patterns')."""
-        # Match subsection heading
-        pattern = rf"###+ [\d\.]* ?{re.escape(subsection_name)}.*?\n(.*?)(?=\n###|\Z)"
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
-
-        if match:
-            return match.group(1).strip()
-
-        return f"{subsection_name} not found"
+    def _extract_subsection(
+        self, index: SectionIndex, section_num: str, subsection_name: str
+    ) -> str:
+        """Extract a subsection by name (e.g., 'Error Patterns'), without its heading."""
+        subsection = index.subsection(section_num, subsection_name)
+        if subsection is None:
+            return f"{subsection_name} not found"
+        return subsection.body.partition("\n")[2].strip()
 
     def _get_fallback_troubleshooting(self) -> dict[str, any]:
         """Provide fallback troubleshooting guidance for unknown patterns."""
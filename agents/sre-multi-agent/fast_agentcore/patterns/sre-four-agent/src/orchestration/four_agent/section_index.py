@@ -0,0 +1,241 @@
+"""Heading-tree index over a markdown policy document.
+
+The keyword readers (``RCAKnowledgeReader``, ``BusinessMetricsReader``,
+``PolicyReader``) answer every lookup with a numbered section of a policy
+document, and agents ask for the same sections for every incident. A
+``SectionIndex`` parses its document once into a tree of headings, then
+serves sections by number in a dict lookup:
+
+- the document is re-parsed only when its mtime or size changes
+- ``#`` lines inside fenced code blocks are comments, not headings
+- "## 4. Title" and "### 4.1 Title" are both numbered; the trailing dot
+  does not count
+- every section carries its text (with subsections), its own body (up to
+  the first subsection) and their estimated token counts
+- ``search`` ranks sections by keyword (BM25 over an inverted index built
+  on first use), optionally within a token budget, so a prompt can carry
+  just the subsections that match
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from .hybrid_search import BM25Index
+
+logger = logging.getLogger(__name__)
+
+_HEADING_RE = re.compile(r"^(#{1,6}) +(.+?)\s*$")
+_NUMBERED_RE = re.compile(r"^(\d+(?:\.\d+)*)\.? +(.+)$")
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})(.*)$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count: one token per 4 characters."""
+    return (len(text) + 3) // 4
+
+
+@dataclass(frozen=True)
+class Section:
+    """One heading of the document and everything under it."""
+
+    key: str
+    number: str | None
+    title: str
+    level: int
+    text: str
+    body: str
+    tokens: int
+    body_tokens: int
+    parent: str | None
+    children: tuple[str, ...]
+
+
+class SectionIndex:
+    """Sections of one markdown document by number, refreshed on change."""
+
+    def __init__(self, path: str | Path, description: str = "Document"):
+        """Initialize the index; the document is read on first use.
+
+        Args:
+            path: Markdown document
+            description: Name used in the FileNotFoundError message
+        """
+        self.path = Path(path)
+        self.description = description
+        self.version = 0
+        self._signature: tuple[int, int] | None = None
+        self._content = ""
+        self._sections: dict[str, Section] = {}
+        self._keyword_index: BM25Index | None = None
+        self._lock = threading.Lock()
+
+    def _current_signature(self) -> tuple[int, int]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{self.description} not found at {self.path}") from None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self) -> None:
+        """Re-parse the document if it changed since the last parse."""
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            content = self.path.read_text()
+            self._sections = self._parse(content)
+            self._content = content
+            self._keyword_index = None
+            self._signature = signature
+            self.version += 1
+        logger.debug(f"Indexed {len(self._sections)} sections of {self.path.name}")
+
+    @staticmethod
+    def _parse(content: str) -> dict[str, Section]:
+        lines = content.split("\n")
+        # (line number, level, heading text) of every real heading
+        headings: list[tuple[int, int, str]] = []
+        fence = ""
+        for i, line in enumerate(lines):
+            fence_match = _FENCE_RE.match(line)
+            if fence_match:
+                marker, info = fence_match.groups()
+                if not fence:
+                    fence = marker
+                elif marker[0] == fence[0] and len(marker) >= len(fence) and not info.strip():
+                    # Only a bare fence at least as long as the opening one closes it
+                    fence = ""
+                continue
+            match = None if fence else _HEADING_RE.match(line)
+            if match:
+                headings.append((i, len(match.group(1)), match.group(2)))
+
+        drafts: list[dict] = []
+        open_sections: list[int] = []
+        used_keys: set[str] = set()
+        for position, (start, level, heading) in enumerate(headings):
+            while open_sections and drafts[open_sections[-1]]["level"] >= level:
+                open_sections.pop()
+            numbered = _NUMBERED_RE.match(heading)
+            number, title = (numbered.group(1), numbered.group(2)) if numbered else (None, heading)
+            key = number if number and number not in used_keys else f"{title.lower()}@{start}"
+            used_keys.add(key)
+            end = next((line for line, other, _ in headings[position + 1:] if other <= level), len(lines))
+            body_end = headings[position + 1][0] if position + 1 < len(headings) else len(lines)
+            parent = open_sections[-1] if open_sections else None
+            drafts.append({
+                "key": key, "number": number, "title": title, "level": level,
+                "start": start, "end": end, "body_end": min(body_end, end),
+                "parent": parent, "children": [],
+            })
+            if parent is not None:
+                drafts[parent]["children"].append(key)
+            open_sections.append(len(drafts) - 1)
+
+        sections = {}
+        for draft in drafts:
+            text = "\n".join(lines[draft["start"]:draft["end"]])
+            body = "\n".join(lines[draft["start"]:draft["body_end"]])
+            sections[draft["key"]] = Section(
+                key=draft["key"],
+                number=draft["number"],
+                title=draft["title"],
+                level=draft["level"],
+                text=text,
+                body=body,
+                tokens=estimate_tokens(text),
+                body_tokens=estimate_tokens(body),
+                parent=drafts[draft["parent"]]["key"] if draft["parent"] is not None else None,
+                children=tuple(draft["children"]),
+            )
+        return sections
+
+    @property
+    def content(self) -> str:
+        """Full document text."""
+        self.refresh()
+        return self._content
+
+    def section(self, number: str) -> Section | None:
+        """Section by number ("4", "3.1"), including its subsections."""
+        self.refresh()
+        return self._sections.get(number.rstrip("."))
+
+    def section_text(self, number: str) -> str:
+        """Text of a numbered section, or "Section N not found"."""
+        section = self.section(number)
+        return section.text if section else f"Section {number} not found"
+
+    def subsection(self, number: str, name: str) -> Section | None:
+        """First direct subsection of a section whose title contains *name*."""
+        section = self.section(number)
+        if section is None:
+            return None
+        name = name.lower()
+        for key in section.children:
+            child = self._sections[key]
+            if name in child.title.lower():
+                return child
+        return None
+
+    def sections(self) -> list[Section]:
+        """All sections in document order."""
+        self.refresh()
+        return list(self._sections.values())
+
+    def search(
+        self,
+        query: str,
+        limit: int = 3,
+        max_tokens: int | None = None,
+    ) -> list[Section]:
+        """Sections whose own text best matches the query's keywords.
+
+        Each section is indexed by its body only, so a match points at the
+        most specific subsection rather than its whole chapter.
+
+        Args:
+            query: Keywords, error codes or a symptom description
+            limit: Maximum number of sections
+            max_tokens: Stop before the returned bodies exceed this budget
+
+        Returns:
+            Matching sections, best first
+        """
+        self.refresh()
+        with self._lock:
+            if self._keyword_index is None:
+                index = BM25Index()
+                for key, section in self._sections.items():
+                    index.add(key, section.body)
+                self._keyword_index = index
+            index = self._keyword_index
+        results: list[Section] = []
+        spent = 0
+        for key, _ in index.search(query, limit):
+            section = self._sections[key]
+            if max_tokens is not None and spent + section.body_tokens > max_tokens:
+                break
+            spent += section.body_tokens
+            results.append(section)
+        return results
+
+    def stats(self) -> dict[str, int]:
+        """Section count, document tokens and parse count."""
+        self.refresh()
+        return {
+            "sections": len(self._sections),
+            "tokens": estimate_tokens(self._content),
+            "parses": self.version,
+        }
+
+
+__all__ = ["Section", "SectionIndex", "estimate_tokens"]
@@ -124,9 +124,62 @@ def _validate_provider(env_var: str, default: str) -> LLMProvider:
         ) from e
 
 
+def _validate_choice(env_var: str, default: str, choices: tuple[str, ...]) -> str:
+    """Validate an enumerated string environment variable.
+
+    Args:
+        env_var: Environment variable name
+        default: Default value if env var not set
+        choices: Allowed values
+
+    Returns:
+        Validated lower-cased value
+
+    Raises:
+        ConfigurationError: If value is not one of the allowed choices
+    """
+    raw_value = os.getenv(env_var, default).lower().strip()
+    if raw_value not in choices:
+        raise ConfigurationError(
+            f"Invalid value '{raw_value}' for {env_var}. Valid options: {list(choices)}"
+        )
+    return raw_value
+
+
+def _validate_choice_list(env_var: str, default: str, choices: tuple[str, ...]) -> list[str]:
+    """Validate a comma-separated list of enumerated values.
+
+    Args:
+        env_var: Environment variable name
+        default: Default value if env var not set
+        choices: Allowed values
+
+    Returns:
+        Validated lower-cased values in the given order; empty if the
+        variable is set to an empty string
+
+    Raises:
+        ConfigurationError: If a value is not one of the allowed choices
+    """
+    values = [value.strip() for value in os.getenv(env_var, default).lower().split(",") if value.strip()]
+    for value in values:
+        if value not in choices:
+            raise ConfigurationError(
+                f"Invalid value '{value}' in {env_var}. Valid options: {list(choices)}"
+            )
+    return values
+
+
 # LLM Provider Configuration - Bedrock only
 DEFAULT_LLM_PROVIDER = LLMProvider.BEDROCK
 
+# Structured output: "off" keeps free-text JSON with repair, "auto" uses Converse
+# tool use when the model supports it and a validated stream otherwise, "tool"
+# and "stream" force one strategy
+STRUCTURED_OUTPUT_MODE = _validate_choice(
+    "SRE_STRUCTURED_OUTPUT", "off", ("off", "auto", "tool", "stream")
+)
+
 # AWS Bedrock Configuration (validated)
 BEDROCK_DEFAULT_MODEL = os.getenv(
     "BEDROCK_DEFAULT_MODEL", "us.meta.llama3-3-70b-instruct-v1:0"
@@ -143,6 +196,130 @@ MAX_JSON_RESPONSE_SIZE = _validate_int(
     "MAX_JSON_RESPONSE_SIZE", 100000, min_val=1024, max_val=10_000_000
 )  # 1KB-10MB
 
+# WebSocket fan-out: per-client outbound queue size, the policy applied when a
+# client's queue is full, and how long a single send may block before the
+# client is treated as a slow consumer and disconnected
+WS_SEND_QUEUE_SIZE = _validate_int("SRE_WS_SEND_QUEUE_SIZE", 256, min_val=1, max_val=100000)
+WS_QUEUE_POLICY = _validate_choice(
+    "SRE_WS_QUEUE_POLICY", "coalesce", ("drop_oldest", "coalesce", "disconnect")
+)
+WS_SEND_TIMEOUT_SECONDS = _validate_float(
+    "SRE_WS_SEND_TIMEOUT", 5.0, min_val=0.1, max_val=120.0
+)
+
+# State bus shared by server workers: "memory" keeps everything in this
+# process, "unix" relays updates between workers on one host through a
+# broker on the given Unix socket
+STATE_BUS_BACKEND = _validate_choice("SRE_STATE_BUS", "memory", ("memory", "unix"))
+STATE_BUS_SOCKET = os.getenv("SRE_STATE_BUS_SOCKET", "/tmp/sre-state-bus.sock")
+
+# Token streaming: LLM deltas are forwarded to WebSocket clients in
+# micro-batches flushed after this many milliseconds or once this many bytes
+# are pending, whichever comes first (the first delta is sent immediately)
+TOKEN_STREAM_FLUSH_MS = _validate_int("SRE_TOKEN_STREAM_FLUSH_MS", 50, min_val=1, max_val=5000)
+TOKEN_STREAM_MAX_BYTES = _validate_int("SRE_TOKEN_STREAM_MAX_BYTES", 512, min_val=1, max_val=1_000_000)
+
+# Pipeline state retention: ring-buffer capacity of each per-pipeline list,
+# the newest characters of each agent's full output kept in memory, how long
+# finished pipelines stay in full detail before being summarised, how often
+# the retention policy is applied in the background (0 disables the sweep),
+# how many finished pipelines and summaries are kept, and an optional
+# directory that output chunks and evicted pipelines are archived to
+PIPELINE_MAX_OUTPUT_CHUNKS = _validate_int("SRE_PIPELINE_MAX_OUTPUT_CHUNKS", 200, min_val=3, max_val=100000)
+PIPELINE_MAX_ACTIVITIES = _validate_int("SRE_PIPELINE_MAX_ACTIVITIES", 100, min_val=5, max_val=100000)
+PIPELINE_MAX_COMMUNICATIONS = _validate_int("SRE_PIPELINE_MAX_COMMUNICATIONS", 100, min_val=10, max_val=100000)
+PIPELINE_MAX_FINDINGS = _validate_int("SRE_PIPELINE_MAX_FINDINGS", 200, min_val=1, max_val=100000)
+PIPELINE_MAX_PROCESSED_LOGS = _validate_int("SRE_PIPELINE_MAX_PROCESSED_LOGS", 500, min_val=10, max_val=1_000_000)
+PIPELINE_MAX_OUTPUT_CHARS = _validate_int(
+    "SRE_PIPELINE_MAX_OUTPUT_CHARS", 200_000, min_val=1000, max_val=100_000_000
+)
+PIPELINE_RETENTION_SECONDS = _validate_float(
+    "SRE_PIPELINE_RETENTION_SECONDS", 900.0, min_val=0.0, max_val=604800.0
+)
+PIPELINE_SWEEP_SECONDS = _validate_float("SRE_PIPELINE_SWEEP_SECONDS", 60.0, min_val=0.0, max_val=86400.0)
+PIPELINE_MAX_RETAINED = _validate_int("SRE_PIPELINE_MAX_RETAINED", 50, min_val=0, max_val=100000)
+PIPELINE_MAX_SUMMARIES = _validate_int("SRE_PIPELINE_MAX_SUMMARIES", 1000, min_val=0, max_val=1_000_000)
+PIPELINE_ARCHIVE_DIR = os.getenv("SRE_PIPELINE_ARCHIVE_DIR") or None
+
+# Agent pool of the AgentCore entrypoint: how many idle orchestrators are kept
+# for reuse, and whether agents and readers are warmed in the background at
+# startup ("background") or on the first request ("lazy")
+AGENT_POOL_SIZE = _validate_int("SRE_AGENT_POOL_SIZE", 4, min_val=1, max_val=1000)
+AGENT_POOL_WARMUP = _validate_choice("SRE_AGENT_POOL_WARMUP", "background", ("background", "lazy"))
+
+# Document embeddings for the vector RAG reader: Bedrock requests in flight at
+# once, retries per request on throttling or transient errors, and how many
+# vectors the embedding cache keeps in memory (all are kept on disk)
+EMBEDDING_MAX_CONCURRENCY = _validate_int("SRE_EMBEDDING_CONCURRENCY", 8, min_val=1, max_val=64)
+EMBEDDING_MAX_RETRIES = _validate_int("SRE_EMBEDDING_MAX_RETRIES", 4, min_val=0, max_val=10)
+EMBEDDING_CACHE_MAX_ENTRIES = _validate_int("SRE_EMBEDDING_CACHE_ENTRIES", 10000, min_val=1, max_val=10_000_000)
+
+# Embedding backends tried in order when Bedrock is unavailable or throttled:
+# "local" (a sentence-transformers model on CPU, if installed) and "hashing"
+# (hashed word and trigram counts, no model). Each backend has a circuit
+# breaker that opens after this many consecutive failures and lets a trial
+# request through once the reset interval has passed.
+EMBEDDING_FALLBACKS = _validate_choice_list("SRE_EMBEDDING_FALLBACKS", "local,hashing", ("local", "hashing"))
+EMBEDDING_LOCAL_MODEL = os.getenv("SRE_EMBEDDING_LOCAL_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_HASHING_DIMENSION = _validate_int("SRE_EMBEDDING_HASHING_DIM", 512, min_val=16, max_val=65536)
+EMBEDDING_BREAKER_FAILURES = _validate_int("SRE_EMBEDDING_BREAKER_FAILURES", 3, min_val=1, max_val=1000)
+EMBEDDING_BREAKER_RESET_SECONDS = _validate_float(
+    "SRE_EMBEDDING_BREAKER_RESET_SECONDS", 30.0, min_val=0.0, max_val=3600.0
+)
+
+# Vector indexes are updated chunk by chunk; once the vectors removed since
+# the last compaction exceed this fraction of the live ones, ids are renumbered
+VECTOR_COMPACTION_RATIO = _validate_float("SRE_VECTOR_COMPACTION_RATIO", 0.25, min_val=0.0, max_val=10.0)
+
+# FAISS index type of the vector stores: "flat" (exact), "hnsw" or "ivfpq".
+# HNSW: graph degree, build and search breadth. IVF-PQ: inverted lists (0
+# picks the square root of the vector count at build time), lists probed per
+# query, sub-quantizers and bits per code. An IVF-PQ index needs at least
+# max(nlist, 2^bits) vectors to train and stays flat until it has them.
+# Filtered searches allowing at most VECTOR_EXACT_FILTER_LIMIT chunks rank
+# them exactly instead of through the approximate index.
+VECTOR_INDEX_TYPE = _validate_choice("SRE_VECTOR_INDEX_TYPE", "flat", ("flat", "hnsw", "ivfpq"))
+VECTOR_HNSW_M = _validate_int("SRE_VECTOR_HNSW_M", 32, min_val=4, max_val=256)
+VECTOR_HNSW_EF_CONSTRUCTION = _validate_int("SRE_VECTOR_HNSW_EF_CONSTRUCTION", 200, min_val=8, max_val=4096)
+VECTOR_HNSW_EF_SEARCH = _validate_int("SRE_VECTOR_HNSW_EF_SEARCH", 64, min_val=1, max_val=4096)
+VECTOR_IVF_NLIST = _validate_int("SRE_VECTOR_IVF_NLIST", 0, min_val=0, max_val=1_000_000)
+VECTOR_IVF_NPROBE = _validate_int("SRE_VECTOR_IVF_NPROBE", 16, min_val=1, max_val=100_000)
+VECTOR_PQ_M = _validate_int("SRE_VECTOR_PQ_M", 16, min_val=1, max_val=1024)
+VECTOR_PQ_BITS = _validate_int("SRE_VECTOR_PQ_BITS", 8, min_val=4, max_val=12)
+VECTOR_EXACT_FILTER_LIMIT = _validate_int("SRE_VECTOR_EXACT_FILTER_LIMIT", 2048, min_val=0, max_val=10_000_000)
+
+# Knowledge-base retrieval: "hybrid" fuses BM25 and vector rankings with
+# reciprocal-rank fusion, "vector" and "lexical" use one ranking only.
+# Each ranking contributes its top RETRIEVAL_FETCH_K chunks to the fusion.
+RETRIEVAL_MODE = _validate_choice("SRE_RETRIEVAL_MODE", "hybrid", ("hybrid", "vector", "lexical"))
+RETRIEVAL_FETCH_K = _validate_int("SRE_RETRIEVAL_FETCH_K", 20, min_val=1, max_val=1000)
+RRF_K = _validate_int("SRE_RRF_K", 60, min_val=1, max_val=1000)
+
+# Knowledge-base query result cache: exact (normalised query) hits live for
+# the TTL; on a miss, a cached query whose embedding has at least this cosine
+# similarity is reused (0 disables the semantic level, a TTL of 0 the cache).
+# The Bedrock KB reader embeds queries for the semantic level with
+# QUERY_CACHE_EMBED_MODEL (the vector reader, whose searches are local and
+# cheap, only uses the exact level) and checks for KB syncs (new ingestion
+# jobs on BEDROCK_DATA_SOURCE_ID) at most every KB_SYNC_CHECK_SECONDS.
+QUERY_CACHE_TTL_SECONDS = _validate_float("SRE_QUERY_CACHE_TTL_SECONDS", 300.0, min_val=0.0, max_val=86400.0)
+QUERY_CACHE_SIMILARITY = _validate_float("SRE_QUERY_CACHE_SIMILARITY", 0.95, min_val=0.0, max_val=1.0)
+QUERY_CACHE_MAX_ENTRIES = _validate_int("SRE_QUERY_CACHE_ENTRIES", 512, min_val=1, max_val=1_000_000)
+QUERY_CACHE_EMBED_MODEL = os.getenv("SRE_QUERY_CACHE_EMBED_MODEL", "amazon.titan-embed-text-v2:0")
+KB_SYNC_CHECK_SECONDS = _validate_float("SRE_KB_SYNC_CHECK_SECONDS", 60.0, min_val=0.0, max_val=86400.0)
+
+# Knowledge-base lookups an agent issues together (retrieve_many) run
+# concurrently, at most this many at a time per call
+KB_FANOUT_CONCURRENCY = _validate_int("SRE_KB_FANOUT_CONCURRENCY", 4, min_val=1, max_val=32)
+
+# Analyst results per log window kept on disk (.analysis_cache): files older
+# than the max age (0 keeps them regardless of age) are deleted, then the
+# oldest beyond the file limit
+ANALYSIS_CACHE_MAX_FILES = _validate_int("SRE_ANALYSIS_CACHE_FILES", 5000, min_val=1, max_val=10_000_000)
+ANALYSIS_CACHE_MAX_AGE_SECONDS = _validate_float(
+    "SRE_ANALYSIS_CACHE_MAX_AGE_SECONDS", 604800.0, min_val=0.0, max_val=31_536_000.0
+)
+
 # Business calculation defaults (validated)
 BASELINE_TPS_MULTIPLIER = _validate_float(
     "BASELINE_TPS_MULTIPLIER", 1.0, min_val=0.1, max_val=10.0
@@ -199,6 +376,63 @@ def validate_all_settings() -> None:
 
         # Validate size limits
         logger.debug(f"Max JSON Response Size: {MAX_JSON_RESPONSE_SIZE}")
+        logger.debug(f"Structured Output Mode: {STRUCTURED_OUTPUT_MODE}")
+
+        # Validate WebSocket fan-out
+        logger.debug(f"WebSocket Send Queue Size: {WS_SEND_QUEUE_SIZE}")
+        logger.debug(f"WebSocket Queue Policy: {WS_QUEUE_POLICY}")
+        logger.debug(f"WebSocket Send Timeout: {WS_SEND_TIMEOUT_SECONDS}s")
+
+        logger.debug(f"State Bus: {STATE_BUS_BACKEND} ({STATE_BUS_SOCKET})")
+
+        # Validate token streaming
+        logger.debug(
+            f"Token Stream Batching: {TOKEN_STREAM_FLUSH_MS}ms / {TOKEN_STREAM_MAX_BYTES} bytes"
+        )
+
+        # Validate pipeline state retention
+        logger.debug(
+            f"Pipeline Ring Buffers: chunks={PIPELINE_MAX_OUTPUT_CHUNKS}, "
+            f"activities={PIPELINE_MAX_ACTIVITIES}, communications={PIPELINE_MAX_COMMUNICATIONS}, "
+            f"findings={PIPELINE_MAX_FINDINGS}, logs={PIPELINE_MAX_PROCESSED_LOGS}, "
+            f"output chars={PIPELINE_MAX_OUTPUT_CHARS}"
+        )
+        logger.debug(
+            f"Pipeline Retention: {PIPELINE_RETENTION_SECONDS}s, sweep every {PIPELINE_SWEEP_SECONDS}s, "
+            f"max retained={PIPELINE_MAX_RETAINED}, max summaries={PIPELINE_MAX_SUMMARIES}"
+        )
+        logger.debug(f"Pipeline Archive Dir: {PIPELINE_ARCHIVE_DIR or 'disabled'}")
+
+        # Validate agent pool
+        logger.debug(f"Agent Pool: size={AGENT_POOL_SIZE}, warmup={AGENT_POOL_WARMUP}")
+
+        # Validate embeddings
+        logger.debug(
+            f"Embeddings: concurrency={EMBEDDING_MAX_CONCURRENCY}, retries={EMBEDDING_MAX_RETRIES}, "
+            f"cache entries={EMBEDDING_CACHE_MAX_ENTRIES}"
+        )
+        logger.debug(
+            f"Embedding Fallbacks: {','.join(EMBEDDING_FALLBACKS) or 'none'}, local model={EMBEDDING_LOCAL_MODEL}, "
+            f"hashing dim={EMBEDDING_HASHING_DIMENSION}, breaker failures={EMBEDDING_BREAKER_FAILURES} "
+            f"reset={EMBEDDING_BREAKER_RESET_SECONDS}s"
+        )
+        logger.debug(f"Vector Index Compaction Ratio: {VECTOR_COMPACTION_RATIO}")
+        logger.debug(
+            f"Vector Index: type={VECTOR_INDEX_TYPE}, hnsw m={VECTOR_HNSW_M} "
+            f"ef_construction={VECTOR_HNSW_EF_CONSTRUCTION} ef_search={VECTOR_HNSW_EF_SEARCH}, "
+            f"ivf nlist={VECTOR_IVF_NLIST or 'auto'} nprobe={VECTOR_IVF_NPROBE}, "
+            f"pq m={VECTOR_PQ_M} bits={VECTOR_PQ_BITS}, exact filter limit={VECTOR_EXACT_FILTER_LIMIT}"
+        )
+        logger.debug(f"Retrieval: mode={RETRIEVAL_MODE}, fetch_k={RETRIEVAL_FETCH_K}, rrf_k={RRF_K}")
+        logger.debug(
+            f"Query Cache: ttl={QUERY_CACHE_TTL_SECONDS}s, similarity={QUERY_CACHE_SIMILARITY}, "
+            f"entries={QUERY_CACHE_MAX_ENTRIES}, embed model={QUERY_CACHE_EMBED_MODEL}, "
+            f"KB sync check={KB_SYNC_CHECK_SECONDS}s"
+        )
+        logger.debug(f"KB Fan-out Concurrency: {KB_FANOUT_CONCURRENCY}")
+        logger.debug(
+            f"Analysis Cache: files={ANALYSIS_CACHE_MAX_FILES}, max age={ANALYSIS_CACHE_MAX_AGE_SECONDS}s"
+        )
 
         # Validate business calculations
         logger.debug(f"TPS Multiplier: {BASELINE_TPS_MULTIPLIER}")
@@ -0,0 +1,302 @@
+"""Schema-enforced LLM output: JSON Schema checks and an incremental stream validator."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, List, Mapping, Optional
+
+from .settings import MAX_JSON_RESPONSE_SIZE
+
+# Name of the tool the model is asked to call with its structured response
+RESPONSE_TOOL_NAME = "submit_response"
+
+# Characters allowed before the opening brace when a model wraps JSON in a fence
+_FENCE_PREFIX = "```json"
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+class StructuredOutputError(ValueError):
+    """Raised when model output violates the requested response schema.
+
+    Subclasses ValueError so the retry logic treats it as non-retryable: a
+    schema violation fails fast instead of triggering another LLM invocation.
+    """
+
+
+def agent_response_schema(
+    details_schema: Optional[Mapping[str, Any]] = None,
+) -> dict:
+    """Build the JSON Schema shared by all agents' responses.
+
+    Args:
+        details_schema: Optional schema for the ``details`` object
+
+    Returns:
+        JSON Schema with ``summary``, ``details`` and optional ``evidence``
+    """
+    return {
+        "type": "object",
+        "properties": {
+            "summary": {"type": "string"},
+            "details": dict(details_schema) if details_schema else {"type": "object"},
+            "evidence": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "href": {"type": ["string", "null"]},
+                        "summary": {"type": ["string", "null"]},
+                    },
+                    "required": ["title"],
+                },
+            },
+        },
+        "required": ["summary", "details"],
+    }
+
+
+def _matches_type(value: Any, expected: str) -> bool:
+    if expected == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if expected == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    python_type = _JSON_TYPES.get(expected)
+    return python_type is None or isinstance(value, python_type)
+
+
+def validate_against_schema(
+    value: Any, schema: Mapping[str, Any], path: str = "$"
+) -> None:
+    """Validate *value* against the subset of JSON Schema used by the agents.
+
+    Supports ``type`` (single or list), ``enum``, ``required``, ``properties``,
+    ``additionalProperties: false`` and ``items``.
+
+    Args:
+        value: Decoded JSON value
+        schema: JSON Schema
+        path: JSON path of *value* used in error messages
+
+    Raises:
+        StructuredOutputError: If the value does not conform
+    """
+    expected = schema.get("type")
+    if expected is not None:
+        options = expected if isinstance(expected, list) else [expected]
+        if not any(_matches_type(value, option) for option in options):
+            raise StructuredOutputError(
+                f"{path}: expected {'/'.join(options)}, got {type(value).__name__}"
+            )
+
+    if "enum" in schema and value not in schema["enum"]:
+        raise StructuredOutputError(f"{path}: {value!r} is not one of {schema['enum']}")
+
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                raise StructuredOutputError(f"{path}: missing required field '{key}'")
+        properties = schema.get("properties", {})
+        for key, item in value.items():
+            if key in properties:
+                validate_against_schema(item, properties[key], f"{path}.{key}")
+            elif schema.get("additionalProperties") is False:
+                raise StructuredOutputError(f"{path}: unexpected field '{key}'")
+
+    if isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            validate_against_schema(item, schema["items"], f"{path}[{index}]")
+
+
+def _value_type_from_first_char(char: str) -> Optional[str]:
+    """Infer the JSON type of a value from its first character."""
+    if char == "{":
+        return "object"
+    if char == "[":
+        return "array"
+    if char == '"':
+        return "string"
+    if char == "-" or char.isdigit():
+        return "number"
+    if char in "tf":
+        return "boolean"
+    if char == "n":
+        return "null"
+    return None
+
+
+class IncrementalJSONValidator:
+    """Validate a streamed JSON object against a schema as chunks arrive.
+
+    The validator rejects output as soon as it can tell it is wrong: prose
+    before the opening brace, an unexpected top-level key, or a top-level value
+    of the wrong type all raise on the chunk that reveals them, so the stream
+    can be abandoned instead of consuming the remaining tokens. Text after the
+    closing brace (fences, end-of-turn tokens) is ignored.
+    """
+
+    def __init__(
+        self,
+        schema: Mapping[str, Any],
+        *,
+        max_size: int = MAX_JSON_RESPONSE_SIZE,
+    ) -> None:
+        if schema.get("type", "object") != "object":
+            raise ValueError("IncrementalJSONValidator only supports object schemas")
+        self._schema = schema
+        self._properties: Mapping[str, Any] = schema.get("properties", {})
+        self._closed_schema = schema.get("additionalProperties") is False
+        self._max_size = max_size
+
+        self._prefix = ""
+        self._body: List[str] = []
+        self._size = 0
+        self._started = False
+        self._done = False
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._expect_value = False
+        self._key_chars: Optional[List[str]] = None
+        self._current_key: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level object has been closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> None:
+        """Consume a streamed chunk.
+
+        Raises:
+            StructuredOutputError: As soon as the output cannot satisfy the schema
+        """
+        for char in chunk:
+            if self._done:
+                return
+            if not self._started:
+                self._consume_prefix(char)
+                continue
+
+            self._size += 1
+            if self._size > self._max_size:
+                raise StructuredOutputError(
+                    f"Structured output exceeds {self._max_size} bytes"
+                )
+            self._body.append(char)
+            self._consume_body(char)
+
+    def _consume_prefix(self, char: str) -> None:
+        if char == "{":
+            self._started = True
+            self._body.append(char)
+            self._size = 1
+            self._depth = 1
+            self._expect_key = True
+            return
+        self._prefix += char
+        stripped = self._prefix.strip()
+        if stripped and not (
+            _FENCE_PREFIX.startswith(stripped) or stripped in (_FENCE_PREFIX, "```")
+        ):
+            raise StructuredOutputError(
+                f"Expected a JSON object but output began with {stripped[:40]!r}"
+            )
+
+    def _consume_body(self, char: str) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._key_chars is not None:
+                    self._check_key("".join(self._key_chars))
+                    self._key_chars = None
+                return
+            if self._key_chars is not None:
+                self._key_chars.append(char)
+            return
+
+        if char.isspace():
+            return
+
+        if self._depth == 1 and self._expect_value:
+            self._check_value_start(char)
+            self._expect_value = False
+
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and self._expect_key:
+                self._key_chars = []
+                self._expect_key = False
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._done = True
+        elif self._depth == 1 and char == ":":
+            self._expect_value = True
+        elif self._depth == 1 and char == ",":
+            self._expect_key = True
+
+    def _check_key(self, key: str) -> None:
+        self._current_key = key
+        if self._closed_schema and key not in self._properties:
+            raise StructuredOutputError(f"$: unexpected field '{key}'")
+
+    def _check_value_start(self, char: str) -> None:
+        key_schema = self._properties.get(self._current_key or "")
+        if not key_schema or "type" not in key_schema:
+            return
+        actual = _value_type_from_first_char(char)
+        expected = key_schema["type"]
+        options = expected if isinstance(expected, list) else [expected]
+        if "integer" in options:
+            options = options + ["number"]
+        if actual is not None and actual not in options:
+            raise StructuredOutputError(
+                f"$.{self._current_key}: expected {'/'.join(options)}, got {actual}"
+            )
+
+    def finish(self) -> dict:
+        """Parse and fully validate the accumulated object.
+
+        Returns:
+            The decoded JSON object
+
+        Raises:
+            StructuredOutputError: If the object is incomplete or invalid
+        """
+        if not self._started:
+            raise StructuredOutputError("Model produced no JSON object")
+        if not self._done:
+            raise StructuredOutputError(
+                "Output ended before the JSON object was closed"
+            )
+        try:
+            data = json.loads("".join(self._body))
+        except json.JSONDecodeError as exc:
+            raise StructuredOutputError(f"Output is not valid JSON: {exc}") from exc
+        validate_against_schema(data, self._schema)
+        return data
+
+
+__all__ = [
+    "IncrementalJSONValidator",
+    "RESPONSE_TOOL_NAME",
+    "StructuredOutputError",
+    "agent_response_schema",
+    "validate_against_schema",
+]
@@ -0,0 +1,843 @@
+"""Chunk-level maintenance of a FAISS vector index.
+
+The vector RAG reader used to key its cached index on a hash of the whole
+document, so editing one section discarded the index and embedded every chunk
+again. This module keeps a manifest of the chunks in an index instead:
+
+- a chunk id is ``<source>:<content hash>:<occurrence>``, so it survives
+  chunks moving around when text is inserted above them
+- the manifest maps each chunk id to its content hash, FAISS vector id and
+  current position in its source
+- ``sync`` diffs the wanted chunks against the manifest and applies only the
+  difference through ``IndexIDMap2.add_with_ids``/``remove_ids``
+- removals leave gaps in the vector id space; ``compact`` renumbers the
+  vectors densely once enough of them were removed
+
+The FAISS index type is configurable (``IndexConfig``): exact "flat", "hnsw"
+or "ivfpq". HNSW graphs cannot delete vectors, so removed ones stay in the
+graph as tombstones, excluded from every search, until compaction rebuilds
+the index. IVF-PQ is trained on the vectors it is first built from and stays
+flat until there are enough of them; compaction retrains it.
+
+Each chunk's filterable metadata is kept in a SQLite sidecar
+(``ChunkMetadataStore``), so a metadata filter selects the vector ids to
+search among before FAISS runs. Filters that leave few chunks are ranked
+exactly rather than through the approximate index.
+
+The FAISS store is the LangChain wrapper the reader already used; its
+``index_to_docstore_id`` is keyed by vector id rather than by row. Searches
+go through ``IncrementalVectorIndex.search`` so they see the search
+parameters and tombstones.
+
+Nothing is pickled: the index is written with ``faiss.write_index`` and
+loaded memory-mapped, chunk texts live in a JSON lines ``ChunkDocstore``
+read by offset on demand, and the manifest file leaves the chunk records to
+the sidecar. A cold start reads a small manifest and maps two files,
+whatever the corpus size; searches resolve vector ids through the sidecar.
+The first update reads the records into the manifest and the index into
+memory, since FAISS cannot modify a mapped index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, Mapping
+
+from .chunk_metadata import ChunkMetadataStore
+from .settings import (
+    VECTOR_COMPACTION_RATIO,
+    VECTOR_EXACT_FILTER_LIMIT,
+    VECTOR_HNSW_EF_CONSTRUCTION,
+    VECTOR_HNSW_EF_SEARCH,
+    VECTOR_HNSW_M,
+    VECTOR_INDEX_TYPE,
+    VECTOR_IVF_NLIST,
+    VECTOR_IVF_NPROBE,
+    VECTOR_PQ_BITS,
+    VECTOR_PQ_M,
+)
+
+if TYPE_CHECKING:
+    from .hybrid_search import MetadataFilter
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss
+    import numpy as np
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
+    from langchain_core.embeddings import Embeddings
+
+    from .chunk_docstore import ChunkDocstore
+
+    VECTOR_INDEX_DEPS_AVAILABLE = True
+except ImportError:
+    VECTOR_INDEX_DEPS_AVAILABLE = False
+
+MANIFEST_VERSION = 2
+INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+# Upper bound on how much a filtered search widens efSearch/nprobe
+MAX_FILTER_WIDENING = 16
+
+
+def chunk_hash(text: str) -> str:
+    """Short content hash identifying a chunk's text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def chunk_ids(source: str, chunks: list[str]) -> list[str]:
+    """Stable ids of a source's chunks, in document order.
+
+    Repeated chunk texts are told apart by their occurrence number.
+    """
+    ids = []
+    occurrences: dict[str, int] = {}
+    for text in chunks:
+        content_hash = chunk_hash(text)
+        occurrence = occurrences.get(content_hash, 0)
+        occurrences[content_hash] = occurrence + 1
+        ids.append(f"{source}:{content_hash}:{occurrence}")
+    return ids
+
+
+@dataclass
+class ChunkRecord:
+    """Manifest entry of one chunk in the index."""
+
+    content_hash: str
+    vector_id: int
+    source: str
+    position: int
+    # Where the chunk's text is in the docstore file; -1 until flushed
+    doc_offset: int = -1
+    doc_length: int = 0
+
+
+@dataclass
+class ChunkManifest:
+    """Chunks held by an index, and what they were built from."""
+
+    dimension: int | None = None
+    next_vector_id: int = 0
+    chunks: dict[str, ChunkRecord] = field(default_factory=dict)
+    source_hashes: dict[str, str] = field(default_factory=dict)
+    removed_since_compaction: int = 0
+    index_type: str = "flat"
+    # Vector ids removed from the manifest but still in an HNSW graph
+    tombstones: list[int] = field(default_factory=list)
+    # Size of the docstore file the offsets refer to
+    docstore_size: int = 0
+    # Count and vector id sum of the chunks, to check the sidecar against
+    chunk_count: int = 0
+    vector_id_sum: int = 0
+    version: int = MANIFEST_VERSION
+
+    @classmethod
+    def load(cls, path: Path) -> ChunkManifest | None:
+        """Read a manifest, or None if it is missing, unreadable or outdated.
+
+        The chunk records are not part of the file; they are read from the
+        metadata sidecar when the index is updated.
+        """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable chunk manifest {path.name}: {e}")
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            return None
+        return cls(**data)
+
+    def save(self, path: Path) -> None:
+        """Write the manifest, without its chunk records, atomically."""
+        data = {item.name: getattr(self, item.name) for item in fields(self) if item.name != "chunks"}
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+
+@dataclass(frozen=True)
+class IndexConfig:
+    """FAISS index type and its build and search parameters."""
+
+    kind: str = VECTOR_INDEX_TYPE
+    hnsw_m: int = VECTOR_HNSW_M
+    ef_construction: int = VECTOR_HNSW_EF_CONSTRUCTION
+    ef_search: int = VECTOR_HNSW_EF_SEARCH
+    ivf_nlist: int = VECTOR_IVF_NLIST
+    ivf_nprobe: int = VECTOR_IVF_NPROBE
+    pq_m: int = VECTOR_PQ_M
+    pq_bits: int = VECTOR_PQ_BITS
+    exact_filter_limit: int = VECTOR_EXACT_FILTER_LIMIT
+
+    def __post_init__(self):
+        if self.kind not in INDEX_TYPES:
+            raise ValueError(f"Unknown vector index type {self.kind!r}, expected one of {INDEX_TYPES}")
+
+    def nlist(self, n_vectors: int) -> int:
+        """Inverted lists for an IVF index over this many vectors."""
+        return self.ivf_nlist or max(1, int(math.sqrt(n_vectors)))
+
+    def resolve_kind(self, n_vectors: int) -> str:
+        """Index type to build for this many vectors.
+
+        IVF-PQ needs at least one training vector per list and per PQ
+        centroid; below that the index is flat.
+        """
+        if self.kind == "ivfpq" and n_vectors < max(self.nlist(n_vectors), 2 ** self.pq_bits):
+            return "flat"
+        return self.kind
+
+    def pq_subquantizers(self, dimension: int) -> int:
+        """Largest sub-quantizer count up to ``pq_m`` that divides the dimension."""
+        return next(m for m in range(min(self.pq_m, dimension), 0, -1) if dimension % m == 0)
+
+
+def build_faiss_index(config: IndexConfig, vectors: np.ndarray) -> tuple[Any, str]:
+    """Empty FAISS index taking external ids, trained on ``vectors`` if it needs it.
+
+    Args:
+        config: Index type and parameters
+        vectors: The vectors about to be added, (n, dimension) float32
+
+    Returns:
+        (index, index type actually built); add vectors with ``add_with_ids``
+    """
+    n_vectors, dimension = vectors.shape
+    kind = config.resolve_kind(n_vectors)
+    if kind == "hnsw":
+        inner = faiss.IndexHNSWFlat(dimension, config.hnsw_m)
+        inner.hnsw.efConstruction = config.ef_construction
+        inner.hnsw.efSearch = config.ef_search
+        return faiss.IndexIDMap2(inner), kind
+    if kind == "ivfpq":
+        index = faiss.IndexIVFPQ(
+            faiss.IndexFlatL2(dimension),
+            dimension,
+            config.nlist(n_vectors),
+            config.pq_subquantizers(dimension),
+            config.pq_bits,
+        )
+        index.train(vectors)
+        index.nprobe = config.ivf_nprobe
+        # IVF keeps the ids in its lists; the hash map makes them reconstructable and removable
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return index, kind
+    return faiss.IndexIDMap2(faiss.IndexFlatL2(dimension)), "flat"
+
+
+def search_faiss_index(
+    index: Any,
+    kind: str,
+    config: IndexConfig,
+    queries: np.ndarray,
+    k: int,
+    ids: list[int] | None = None,
+    excluded: list[int] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Nearest vectors to each query, as ``faiss.Index.search``.
+
+    Args:
+        index: Index from ``build_faiss_index``
+        kind: Its index type
+        config: Search parameters
+        queries: (n, dimension) float32
+        k: Neighbours per query
+        ids: Only consider these vector ids; None for all. An approximate
+            index ranks a subset of at most ``exact_filter_limit`` ids
+            exactly, since a selective filter starves its candidate lists;
+            a larger subset widens the approximate search instead.
+        excluded: Never return these ids (HNSW tombstones)
+
+    Returns:
+        (squared L2 distances, vector ids), padded with -1 ids
+    """
+    if ids is not None and kind != "flat" and len(ids) <= config.exact_filter_limit:
+        return _exact_search(index, queries, k, ids)
+
+    selector = None
+    if ids is not None:
+        selector = faiss.IDSelectorBatch(np.asarray(ids, dtype=np.int64))
+    elif excluded:
+        removed = faiss.IDSelectorBatch(np.asarray(excluded, dtype=np.int64))
+        selector = faiss.IDSelectorNot(removed)
+
+    # A filter passing a fraction of the vectors also passes about that
+    # fraction of the candidates, so widen the search to match
+    widen = min(index.ntotal / max(len(ids), 1), MAX_FILTER_WIDENING) if ids is not None else 1.0
+    if kind == "hnsw":
+        params = faiss.SearchParametersHNSW()
+        params.efSearch = int(max(config.ef_search, k) * widen)
+    elif kind == "ivfpq":
+        params = faiss.SearchParametersIVF()
+        params.nprobe = min(int(config.ivf_nprobe * widen), index.nlist)
+    else:
+        params = faiss.SearchParameters() if selector is not None else None
+    if selector is not None:
+        params.sel = selector
+    return index.search(queries, k, params=params)
+
+
+def _exact_search(index: Any, queries: np.ndarray, k: int, ids: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    """Brute-force search among a few vector ids, reconstructed from the index."""
+    distances = np.full((len(queries), k), np.finfo(np.float32).max, dtype=np.float32)
+    labels = np.full((len(queries), k), -1, dtype=np.int64)
+    if not ids:
+        return distances, labels
+    candidates = np.asarray(ids, dtype=np.int64)
+    vectors = np.vstack([index.reconstruct(int(vector_id)) for vector_id in candidates])
+    scores = (
+        (queries ** 2).sum(axis=1)[:, None]
+        - 2.0 * queries @ vectors.T
+        + (vectors ** 2).sum(axis=1)[None, :]
+    )
+    top = min(k, len(candidates))
+    for row, row_scores in enumerate(scores):
+        nearest = np.argpartition(row_scores, top - 1)[:top]
+        nearest = nearest[np.argsort(row_scores[nearest])]
+        distances[row, :top] = np.maximum(row_scores[nearest], 0.0)
+        labels[row, :top] = candidates[nearest]
+    return distances, labels
+
+
+@dataclass
+class IndexSyncReport:
+    """What one ``sync`` changed."""
+
+    added: int = 0
+    removed: int = 0
+    moved: int = 0
+    unchanged: int = 0
+    compacted: bool = False
+    seconds: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.moved or self.compacted)
+
+
+def _record(row: tuple[str, int, str, int, int, int]) -> ChunkRecord:
+    """ChunkRecord from a sidecar row (chunk id, vector id, source, position, doc offset, doc length)."""
+    chunk_id, vector_id, source, position, doc_offset, doc_length = row
+    return ChunkRecord(
+        content_hash=chunk_id.rsplit(":", 2)[1],
+        vector_id=vector_id,
+        source=source,
+        position=position,
+        doc_offset=doc_offset,
+        doc_length=doc_length,
+    )
+
+
+class _SidecarIdMap(Mapping):
+    """Vector id -> chunk id looked up in the sidecar, for a loaded index not yet updated."""
+
+    def __init__(self, metadata: ChunkMetadataStore):
+        self._metadata = metadata
+
+    def __getitem__(self, vector_id: int) -> str:
+        chunk_id = self._metadata.chunk_id(int(vector_id))
+        if chunk_id is None:
+            raise KeyError(vector_id)
+        return chunk_id
+
+    def __iter__(self) -> Iterator[int]:
+        return (row[1] for row in self._metadata.records())
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+
+class IncrementalVectorIndex:
+    """FAISS index over document chunks, updated chunk by chunk."""
+
+    def __init__(
+        self,
+        name: str,
+        cache_dir: Path | str,
+        embeddings: Embeddings,
+        compaction_ratio: float = VECTOR_COMPACTION_RATIO,
+        config: IndexConfig | None = None,
+    ):
+        """Initialize an index; call ``load`` or ``sync`` to fill it.
+
+        Args:
+            name: Index file name (without extension) inside ``cache_dir``
+            cache_dir: Directory holding the index, docstore, manifest and
+                metadata sidecar
+            embeddings: Embeddings for new chunks and for queries
+            compaction_ratio: Compact once removed vectors exceed this
+                fraction of the live ones
+            config: Index type and parameters; by default from the
+                SRE_VECTOR_* settings
+        """
+        if not VECTOR_INDEX_DEPS_AVAILABLE:
+            raise ImportError(
+                "Vector search dependencies required. "
+                "Install with: pip install langchain langchain-community faiss-cpu"
+            )
+
+        self.name = name
+        self.cache_dir = Path(cache_dir)
+        self.embeddings = embeddings
+        self.compaction_ratio = compaction_ratio
+        self.config = config or IndexConfig()
+        self.manifest = ChunkManifest()
+        self.store: FAISS | None = None
+        # Whether store.index is the read-only mapping of the index file
+        self._mapped = False
+        # Whether manifest.chunks holds the records, or they are still only in the sidecar
+        self._chunks_loaded = True
+        self.metadata = ChunkMetadataStore(self.cache_dir / f"{name}.meta.sqlite")
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.cache_dir / f"{self.name}.manifest.json"
+
+    @property
+    def index_path(self) -> Path:
+        return self.cache_dir / f"{self.name}.faiss"
+
+    @property
+    def docstore_path(self) -> Path:
+        return self.cache_dir / f"{self.name}.docs.jsonl"
+
+    def __len__(self) -> int:
+        return len(self.manifest.chunks) if self._chunks_loaded else self.manifest.chunk_count
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def load(self) -> bool:
+        """Load the index, its manifest and metadata from the cache directory.
+
+        An index of another type than configured is rebuilt from its own
+        vectors, without embedding anything.
+
+        Returns:
+            True if a consistent index was loaded, False if the caller has to
+            sync from scratch
+        """
+        if not self._load():
+            self.metadata.clear()
+            return False
+        if self._needs_rebuild():
+            logger.info(
+                f"Rebuilding vector index {self.name} as {self.config.resolve_kind(len(self))} "
+                f"(was {self.manifest.index_type})"
+            )
+            self.compact()
+            self.save()
+        return True
+
+    def _load(self) -> bool:
+        manifest = ChunkManifest.load(self.manifest_path)
+        if manifest is None or not self.index_path.exists():
+            return False
+        try:
+            # Mapped read-only: the vectors are paged in as searches touch them
+            index = faiss.read_index(str(self.index_path), faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError as e:
+            logger.warning(f"Failed to load vector index {self.name}, rebuilding: {e}")
+            return False
+
+        # Counts and id sums stand in for comparing every chunk, which would
+        # make loading as slow as the corpus is large
+        expected = (manifest.chunk_count, manifest.vector_id_sum)
+        if self.metadata.fingerprint() != expected:
+            logger.warning(f"Metadata of vector index {self.name} does not match its manifest, rebuilding")
+            return False
+        stored = faiss.vector_to_array(index.id_map) if isinstance(index, faiss.IndexIDMap) else None
+        tombstones = manifest.tombstones
+        if index.ntotal != manifest.chunk_count + len(tombstones) or (
+            stored is not None and int(stored.sum()) != manifest.vector_id_sum + sum(tombstones)
+        ):
+            logger.warning(f"Vector index {self.name} does not match its manifest, rebuilding")
+            return False
+        docstore = ChunkDocstore(self.docstore_path, self._locate)
+        if docstore.size() != manifest.docstore_size:
+            logger.warning(f"Docstore of vector index {self.name} does not match its manifest, rebuilding")
+            return False
+
+        self.manifest = manifest
+        self._chunks_loaded = False
+        self.store = FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=_SidecarIdMap(self.metadata),
+        )
+        self._mapped = True
+        return True
+
+    def _load_chunks(self) -> None:
+        """Read the chunk records from the sidecar before the index is changed."""
+        if self._chunks_loaded:
+            return
+        manifest = self.manifest
+        manifest.chunks = {row[0]: _record(row) for row in self.metadata.records()}
+        self.store.index_to_docstore_id = {
+            record.vector_id: chunk_id for chunk_id, record in manifest.chunks.items()
+        }
+        self._chunks_loaded = True
+
+    def _locate(self, chunk_id: str) -> ChunkRecord | None:
+        """Record of a live chunk, from the sidecar until the records are loaded."""
+        if self._chunks_loaded:
+            return self.manifest.chunks.get(chunk_id)
+        row = self.metadata.record(chunk_id)
+        return _record(row) if row else None
+
+    def save(self) -> None:
+        """Persist the index and the docstore, then the manifest that describes them.
+
+        Each file is replaced atomically (the docstore is appended to), and a
+        crash between them leaves files that ``load`` finds inconsistent.
+        Docstore garbage is dropped once it exceeds the compaction ratio.
+        """
+        if self.store is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if not self._mapped:
+            # A mapped index is the file as it was loaded
+            tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            faiss.write_index(self.store.index, str(tmp_path))
+            os.replace(tmp_path, self.index_path)
+
+        manifest = self.manifest
+        if self._chunks_loaded:
+            docstore = self.store.docstore
+            self.metadata.set_offsets(docstore.flush())
+            live = sum(record.doc_length for record in manifest.chunks.values())
+            if docstore.size() - live > self.compaction_ratio * max(live, 1):
+                self.metadata.set_offsets(docstore.rewrite(manifest.chunks))
+            manifest.docstore_size = docstore.size()
+            manifest.chunk_count = len(manifest.chunks)
+            manifest.vector_id_sum = sum(record.vector_id for record in manifest.chunks.values())
+        manifest.save(self.manifest_path)
+        # Left behind by the pickled format this replaced
+        (self.cache_dir / f"{self.name}.pkl").unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def source_hash(self, source: str) -> str | None:
+        """Content hash the index last synced a source at."""
+        return self.manifest.source_hashes.get(source)
+
+    def sync(
+        self,
+        source: str,
+        chunks: list[str],
+        source_hash: str | None = None,
+        metadata: list[dict[str, Any]] | None = None,
+    ) -> IndexSyncReport:
+        """Make the index hold exactly ``chunks`` for ``source``.
+
+        Only chunks whose text is new are embedded and added; chunks that
+        disappeared are removed and chunks that moved get their position
+        updated in place. Other sources in the index are left alone. The
+        metadata sidecar is rewritten for the source, since a heading edit
+        changes the metadata of chunks whose text did not change.
+
+        Args:
+            source: Source document name
+            chunks: The source's chunks, in document order
+            source_hash: Content hash of the source, recorded in the manifest
+            metadata: Per-chunk metadata from ``describe_chunks``, for
+                filtered searches
+
+        Returns:
+            IndexSyncReport with the number of chunks added, removed and moved
+        """
+        started = time.perf_counter()
+        report = IndexSyncReport()
+        self._load_chunks()
+        manifest = self.manifest
+
+        wanted = {
+            chunk_id: (position, text)
+            for position, (chunk_id, text) in enumerate(zip(chunk_ids(source, chunks), chunks))
+        }
+
+        current = {
+            chunk_id for chunk_id, record in manifest.chunks.items() if record.source == source
+        }
+        to_remove = sorted(current - wanted.keys())
+        to_add = [chunk_id for chunk_id in wanted if chunk_id not in current]
+
+        if to_remove:
+            self._remove(to_remove)
+            report.removed = len(to_remove)
+
+        for chunk_id in current & wanted.keys():
+            position = wanted[chunk_id][0]
+            record = manifest.chunks[chunk_id]
+            if record.position != position:
+                record.position = position
+                report.moved += 1
+            else:
+                report.unchanged += 1
+
+        if to_add:
+            self._add(source, [(chunk_id, *wanted[chunk_id]) for chunk_id in to_add])
+            report.added = len(to_add)
+
+        if self.store is None:
+            # Nothing to index yet; keep an empty store so searches return []
+            self.store = self._empty_store(manifest.dimension or 1)
+
+        if source_hash is not None:
+            manifest.source_hashes[source] = source_hash
+
+        if (
+            manifest.removed_since_compaction > self.compaction_ratio * max(len(manifest.chunks), 1)
+            or self._needs_rebuild()
+        ):
+            self.compact()
+            report.compacted = True
+
+        self.metadata.replace_source(
+            source,
+            [
+                (chunk_id, manifest.chunks[chunk_id], chunk_metadata)
+                for chunk_id, chunk_metadata in zip(
+                    wanted, metadata if metadata is not None else [None] * len(wanted)
+                )
+            ],
+        )
+
+        report.seconds = round(time.perf_counter() - started, 3)
+        if report.changed or source_hash is not None:
+            self.save()
+        logger.info(
+            f"Synced {source} into {self.name}: +{report.added} -{report.removed} "
+            f"~{report.moved} ={report.unchanged} in {report.seconds}s"
+            f"{' (compacted)' if report.compacted else ''}"
+        )
+        return report
+
+    def _needs_rebuild(self) -> bool:
+        """Whether the index type differs from the one configured for its size."""
+        return self.store is not None and self.manifest.index_type != self.config.resolve_kind(len(self))
+
+    def _empty_store(self, dimension: int, index: Any = None) -> FAISS:
+        # Chunks of a previous store are garbage in the file; start it afresh
+        self.docstore_path.unlink(missing_ok=True)
+        self._mapped = False
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index if index is not None else faiss.IndexIDMap2(faiss.IndexFlatL2(dimension)),
+            docstore=ChunkDocstore(self.docstore_path, self._locate),
+            index_to_docstore_id={},
+        )
+
+    def _make_writable(self) -> None:
+        """Read a mapped index into memory before changing it."""
+        if self._mapped:
+            self.store.index = faiss.read_index(str(self.index_path))
+            self._mapped = False
+
+    def _add(self, source: str, entries: list[tuple[str, int, str]]) -> None:
+        """Embed and add (chunk id, position, text) entries."""
+        vectors = np.asarray(
+            self.embeddings.embed_documents([text for _, _, text in entries]), dtype=np.float32
+        )
+        manifest = self.manifest
+        dimension = int(vectors.shape[1])
+        if self.store is None or self.store.index.ntotal == 0:
+            # Size (and train) the index from the first real vectors
+            manifest.dimension = dimension
+            index, manifest.index_type = build_faiss_index(self.config, vectors)
+            if manifest.index_type != self.config.kind:
+                logger.info(
+                    f"Vector index {self.name}: {len(vectors)} vectors are too few to train "
+                    f"{self.config.kind}, using {manifest.index_type} until compaction"
+                )
+            self.store = self._empty_store(dimension, index)
+        elif self.store.index.d != dimension:
+            raise ValueError(
+                f"Embedding dimension {dimension} does not match index {self.name} ({self.store.index.d})"
+            )
+
+        ids = np.arange(manifest.next_vector_id, manifest.next_vector_id + len(entries), dtype=np.int64)
+        manifest.next_vector_id += len(entries)
+        self._make_writable()
+        self.store.index.add_with_ids(vectors, ids)
+
+        documents = {}
+        for vector_id, (chunk_id, position, text) in zip(ids.tolist(), entries):
+            documents[chunk_id] = Document(
+                page_content=text,
+                metadata={"source": source, "chunk_id": chunk_id, "position": position},
+            )
+            self.store.index_to_docstore_id[vector_id] = chunk_id
+            manifest.chunks[chunk_id] = ChunkRecord(
+                content_hash=chunk_id.rsplit(":", 2)[1],
+                vector_id=vector_id,
+                source=source,
+                position=position,
+            )
+        self.store.docstore.add(documents)
+
+    def _remove(self, chunk_ids: list[str]) -> None:
+        manifest = self.manifest
+        ids = np.asarray([manifest.chunks[chunk_id].vector_id for chunk_id in chunk_ids], dtype=np.int64)
+        if manifest.index_type == "hnsw":
+            # HNSW cannot delete; searches skip tombstones until compaction
+            manifest.tombstones.extend(ids.tolist())
+        else:
+            self._make_writable()
+            self.store.index.remove_ids(faiss.IDSelectorArray(ids))
+        self.store.docstore.delete(chunk_ids)
+        for vector_id, chunk_id in zip(ids.tolist(), chunk_ids):
+            del self.store.index_to_docstore_id[vector_id]
+            del manifest.chunks[chunk_id]
+        manifest.removed_since_compaction += len(chunk_ids)
+
+    def compact(self) -> None:
+        """Rebuild the index from its live vectors, renumbered densely.
+
+        Vectors are copied out of the current index, so nothing is embedded
+        again; the docstore is kept as is. The new index is of the configured
+        type (an IVF-PQ index is retrained), and HNSW tombstones are dropped.
+        Vectors read back from an IVF-PQ index are its lossy reconstructions.
+        """
+        if self.store is None:
+            return
+        self._load_chunks()
+        manifest = self.manifest
+        ordered = sorted(manifest.chunks.items(), key=lambda item: (item[1].source, item[1].position))
+        mapping: dict[int, str] = {}
+        if ordered:
+            old_ids = [record.vector_id for _, record in ordered]
+            vectors = np.vstack([self.store.index.reconstruct(vector_id) for vector_id in old_ids])
+            index, manifest.index_type = build_faiss_index(self.config, vectors)
+            index.add_with_ids(vectors, np.arange(len(ordered), dtype=np.int64))
+        else:
+            index, manifest.index_type = faiss.IndexIDMap2(faiss.IndexFlatL2(self.store.index.d)), "flat"
+        for new_id, (chunk_id, record) in enumerate(ordered):
+            record.vector_id = new_id
+            mapping[new_id] = chunk_id
+
+        self.store.index = index
+        self._mapped = False
+        self.store.index_to_docstore_id = mapping
+        manifest.next_vector_id = len(ordered)
+        manifest.removed_since_compaction = 0
+        manifest.tombstones = []
+        self.metadata.renumber({chunk_id: vector_id for vector_id, chunk_id in mapping.items()})
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search(
+        self,
+        embedding: list[float],
+        k: int,
+        allowed_chunk_ids: set[str] | None = None,
+        filters: MetadataFilter | None = None,
+    ) -> list[tuple[Document, float]]:
+        """Nearest chunks to a query embedding, optionally among a subset of chunks.
+
+        The subset is applied inside FAISS through an id selector (or ranked
+        exactly when small), so a filter never leaves fewer than ``k``
+        results while matching chunks remain (unlike filtering the top ``k``
+        afterwards).
+
+        Args:
+            embedding: Query embedding, from the index's embeddings
+            k: Number of chunks to return
+            allowed_chunk_ids: Only consider these chunks; None for all
+            filters: Only consider chunks whose metadata passes; resolved
+                in the SQLite sidecar before the vector search
+
+        Returns:
+            (document, L2 distance) pairs, nearest first
+        """
+        if self.store is None or self.store.index.ntotal == 0 or k < 1:
+            return []
+        ids = self.metadata.vector_ids(filters) if filters is not None else None
+        if allowed_chunk_ids is not None:
+            self._load_chunks()
+            chunks = self.manifest.chunks
+            allowed = {chunks[chunk_id].vector_id for chunk_id in allowed_chunk_ids if chunk_id in chunks}
+            ids = sorted(allowed if ids is None else allowed.intersection(ids))
+        if ids is not None and not ids:
+            return []
+
+        vector = np.asarray([embedding], dtype=np.float32)
+        if vector.shape[1] != self.store.index.d:
+            logger.warning(f"Query embedding dimension {vector.shape[1]} does not match index {self.name}")
+            return []
+        distances, labels = search_faiss_index(
+            self.store.index,
+            self.manifest.index_type,
+            self.config,
+            vector,
+            k,
+            ids=ids,
+            excluded=self.manifest.tombstones,
+        )
+
+        results = []
+        for distance, vector_id in zip(distances[0].tolist(), labels[0].tolist()):
+            chunk_id = self.store.index_to_docstore_id.get(vector_id)
+            if chunk_id is None:
+                continue
+            results.append((self.store.docstore.search(chunk_id), float(distance)))
+        return results
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int,
+        filters: MetadataFilter | None = None,
+    ) -> list[tuple[Document, float]]:
+        """Nearest chunks to a query text; see ``search``."""
+        if self.store is None:
+            return []
+        return self.search(self.embeddings.embed_query(query), k, filters=filters)
+
+    def stats(self) -> dict[str, Any]:
+        """Chunk counts and id-space usage of the index."""
+        manifest = self.manifest
+        return {
+            "name": self.name,
+            "chunks": len(self),
+            "vectors": self.store.index.ntotal if self.store is not None else 0,
+            "dimension": manifest.dimension,
+            "index_type": manifest.index_type,
+            "tombstones": len(manifest.tombstones),
+            "mapped": self._mapped,
+            "docstore_bytes": manifest.docstore_size,
+            "next_vector_id": manifest.next_vector_id,
+            "removed_since_compaction": manifest.removed_since_compaction,
+            "sources": dict(manifest.source_hashes),
+        }
+
+
+__all__ = [
+    "INDEX_TYPES",
+    "ChunkManifest",
+    "ChunkRecord",
+    "IncrementalVectorIndex",
+    "IndexConfig",
+    "IndexSyncReport",
+    "build_faiss_index",
+    "chunk_hash",
+    "chunk_ids",
+    "search_faiss_index",
+]
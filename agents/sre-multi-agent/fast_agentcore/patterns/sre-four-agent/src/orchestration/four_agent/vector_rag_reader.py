@@ -1,29 +1,67 @@
 """Vector-based RAG knowledge retrieval for RCA agent.
 
 This module implements true Retrieval-Augmented Generation using:
-1. Vector embeddings (AWS Bedrock Titan Embeddings)
+1. Vector embeddings (AWS Bedrock Titan Embeddings), falling back to local
+   embeddings with their own indexes when Bedrock fails or throttles
 2. FAISS vector store for semantic search
 3. Document chunking strategies
 4. Top-K retrieval with relevance scoring
+5. BM25 lexical search fused with vector results (reciprocal-rank fusion)
+   for exact identifiers, with metadata pre-filters
 
 Replaces the previous keyword-based pattern matching approach.
 """
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import logging
+import random
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Any
 
+from .bedrock_kb_reader import track_kb_retrieval
+from .embedding_backends import CircuitBreaker, EmbeddingError, backend_namespace, fallback_embeddings
+from .embedding_cache import EmbeddingCache
+from .hybrid_search import (
+    LexicalChunkIndex,
+    MetadataFilter,
+    describe_chunks,
+    incident_date,
+    reciprocal_rank_fusion,
+)
+from .kb_fanout import retrieve_many
+from .settings import (
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_MAX_CONCURRENCY,
+    EMBEDDING_MAX_RETRIES,
+    RETRIEVAL_FETCH_K,
+    RETRIEVAL_MODE,
+    RRF_K,
+)
+from .query_cache import QueryResultCache
+from .vector_index import IncrementalVectorIndex, IndexConfig, IndexSyncReport
+
 logger = logging.getLogger(__name__)
 
+# Backoff between embedding retries: doubles per attempt up to the cap, with jitter
+_BACKOFF_BASE_SECONDS = 0.25
+_BACKOFF_MAX_SECONDS = 8.0
+
 try:
     import boto3
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import BotoCoreError, ClientError
     import faiss  # Check FAISS library itself
     from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
     from langchain_core.embeddings import Embeddings
     from langchain_text_splitters import RecursiveCharacterTextSplitter
 
@@ -36,19 +74,45 @@ except ImportError as e:
     )
 
 
+# Bedrock error codes worth retrying with backoff; anything else (validation,
+# access denied, unknown model) fails immediately
+_RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "ModelTimeoutException",
+    "ModelNotReadyException",
+}
+
 class BedrockEmbeddings(Embeddings):
-    """AWS Bedrock embeddings using Titan Embed Text model."""
+    """AWS Bedrock embeddings using Titan Embed Text model.
+
+    Titan takes one text per ``invoke_model`` request, so a batch is embedded
+    as up to ``max_concurrency`` requests in flight, each retried with
+    exponential backoff on throttling. Vectors are looked up in and written to
+    an :class:`EmbeddingCache` keyed by model id and text hash, and duplicate
+    texts within a batch are embedded once.
+    """
 
     def __init__(
         self,
         model_id: str = "amazon.titan-embed-text-v1",
         region_name: str = "us-east-1",
+        max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+        max_retries: int = EMBEDDING_MAX_RETRIES,
+        cache: EmbeddingCache | None = None,
+        client: Any = None,
     ):
         """Initialize Bedrock embeddings client.
 
         Args:
             model_id: Bedrock model ID for embeddings
             region_name: AWS region
+            max_concurrency: Embedding requests in flight at once
+            max_retries: Retries per request on throttling or transient errors
+            cache: Embedding cache; None disables caching
+            client: bedrock-runtime client to use instead of creating one
         """
         if not VECTOR_DEPS_AVAILABLE:
             raise ImportError(
@@ -58,7 +122,31 @@ class BedrockEmbeddings(Embeddings):
 
         self.model_id = model_id
         self.region_name = region_name
-        self.client = boto3.client("bedrock-runtime", region_name=region_name)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.cache = cache
+        if client is None:
+            # Enough pooled connections for every request in flight; retries
+            # are handled here so throttling is visible in the metrics
+            client = boto3.client(
+                "bedrock-runtime",
+                region_name=region_name,
+                config=BotoConfig(
+                    max_pool_connections=max(10, self.max_concurrency),
+                    retries={"total_max_attempts": 1, "mode": "standard"},
+                ),
+            )
+        self.client = client
+        self.dimension: int | None = None
+
+        # Metrics
+        self._metrics_lock = threading.Lock()
+        self.texts_requested = 0
+        self.cache_hits = 0
+        self.api_requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.api_seconds = 0.0
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for a list of documents.
@@ -68,12 +156,56 @@ class BedrockEmbeddings(Embeddings):
 
         Returns:
             List of embedding vectors
+
+        Raises:
+            EmbeddingError: If any text could not be embedded after retries.
+                Vectors embedded before the failure are cached, so a retry
+                only requests the rest.
         """
-        embeddings = []
-        for text in texts:
-            embedding = self._embed_single(text)
-            embeddings.append(embedding)
-        return embeddings
+        return self._embed(texts, persist=True)
+
+    def _embed(self, texts: list[str], persist: bool) -> list[list[float]]:
+        """Embed texts not in the cache; ``persist`` also writes new vectors to its disk tier."""
+        vectors: list[list[float] | None] = [None] * len(texts)
+        pending: dict[str, list[int]] = {}
+        for i, text in enumerate(texts):
+            cached = self.cache.get(self.model_id, text) if self.cache is not None else None
+            if cached is not None:
+                vectors[i] = cached
+            else:
+                pending.setdefault(text, []).append(i)
+
+        with self._metrics_lock:
+            self.texts_requested += len(texts)
+            self.cache_hits += len(texts) - sum(len(positions) for positions in pending.values())
+
+        if pending:
+            failed: list[BaseException] = []
+            started = time.perf_counter()
+            workers = min(self.max_concurrency, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as pool:
+                futures = {pool.submit(self._embed_with_retry, text): text for text in pending}
+                for future in as_completed(futures):
+                    text = futures[future]
+                    try:
+                        vector = future.result()
+                    except Exception as e:
+                        failed.append(e)
+                        continue
+                    if self.cache is not None:
+                        self.cache.put(self.model_id, text, vector, persist=persist)
+                    for i in pending[text]:
+                        vectors[i] = vector
+            with self._metrics_lock:
+                self.api_seconds += time.perf_counter() - started
+
+            if failed:
+                raise EmbeddingError(
+                    f"{len(failed)} of {len(pending)} texts failed to embed with "
+                    f"{self.model_id}: {failed[0]}"
+                ) from failed[0]
+
+        return vectors
 
     def embed_query(self, text: str) -> list[float]:
         """Generate embedding for a single query.
@@ -83,30 +215,143 @@ class BedrockEmbeddings(Embeddings):
 
         Returns:
             Embedding vector
+
+        Raises:
+            EmbeddingError: If the model could not be reached after retries;
+                the reader then falls back to its next embedding backend
         """
-        return self._embed_single(text)
+        # Queries are cached in memory only: one file per distinct incident
+        # query would grow the disk tier with traffic
+        return self._embed([text], persist=False)[0]
+
+    def _embed_with_retry(self, text: str) -> list[float]:
+        """Embed one text, backing off exponentially on retryable errors."""
+        attempt = 0
+        while True:
+            with self._metrics_lock:
+                self.api_requests += 1
+            try:
+                return self._embed_single(text)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    with self._metrics_lock:
+                        self.failures += 1
+                    raise
+                delay = min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * (2 ** attempt))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                attempt += 1
+                with self._metrics_lock:
+                    self.retries += 1
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, ClientError):
+            return error.response.get("Error", {}).get("Code") in _RETRYABLE_ERROR_CODES
+        return isinstance(error, (BotoCoreError, ConnectionError, TimeoutError))
 
     def _embed_single(self, text: str) -> list[float]:
         """Generate embedding for a single text."""
-        try:
-            response = self.client.invoke_model(
-                modelId=self.model_id, body=json.dumps({"inputText": text})
-            )
+        response = self.client.invoke_model(
+            modelId=self.model_id, body=json.dumps({"inputText": text})
+        )
+        response_body = json.loads(response["body"].read())
+        embedding = response_body.get("embedding")
+        if not embedding:
+            raise EmbeddingError(f"No embedding in {self.model_id} response")
+        self.dimension = len(embedding)
+        return embedding
+
+    def stats(self) -> dict[str, Any]:
+        """Embedding requests, retries and cache effectiveness so far."""
+        with self._metrics_lock:
+            texts = self.texts_requested
+            stats = {
+                "model_id": self.model_id,
+                "max_concurrency": self.max_concurrency,
+                "texts": texts,
+                "cache_hits": self.cache_hits,
+                "cache_hit_rate": round(self.cache_hits / texts, 3) if texts else 0.0,
+                "api_requests": self.api_requests,
+                "retries": self.retries,
+                "failures": self.failures,
+                "api_seconds": round(self.api_seconds, 3),
+                "requests_per_second": round(self.api_requests / self.api_seconds, 1)
+                if self.api_seconds else 0.0,
+            }
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+
+@dataclass
+class _EmbeddingBackend:
+    """One link of the reader's embedding chain and the vector stores built with it."""
+
+    name: str
+    embeddings: Embeddings
+    breaker: CircuitBreaker
+    runbooks_index: IncrementalVectorIndex
+    patterns_index: IncrementalVectorIndex
+    # Both indexes follow the current documents; fallbacks are built on first use
+    synced: bool = False
 
-            response_body = json.loads(response["body"].read())
-            return response_body.get("embedding", [])
-        except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            # Return zero vector as fallback (Titan Embed Text v1 = 1024 dimensions)
-            return [0.0] * 1024
+
+def _result_sources(result: Any) -> tuple[list[str], int]:
+    """Source documents and result count of a reader method's result."""
+    if isinstance(result, dict):
+        chunks = result.get("retrieved_chunks", [])
+        if chunks:
+            sources = [chunk.get("source", "unknown") for chunk in chunks]
+            return list(dict.fromkeys(sources)), len(chunks)
+        return [], result.get("sources_found", 0)
+    sources = [item["source"] for item in result if isinstance(item, dict) and "source" in item]
+    return list(dict.fromkeys(sources)), len(result)
+
+
+def _is_cacheable(result: Any) -> bool:
+    """Whether a reader method's result is a real answer worth caching.
+
+    Fallback responses and empty results mean no embedding backend could
+    serve the query; caching them would outlive the outage by a TTL.
+    """
+    if isinstance(result, dict):
+        return result.get("retrieval_method") != "fallback" and "error" not in result
+    return bool(result)
+
+
+def _cached_query(method):
+    """Serve a reader method from the query cache.
+
+    The first positional argument is the query (a list is joined); the
+    method name and remaining arguments form the cache namespace. Lookups
+    are reported through ``track_kb_retrieval``; fallback results are not
+    cached.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, query, *args, **kwargs):
+        text = " ".join(query) if isinstance(query, (list, tuple)) else query
+        if not text or not text.strip() or (self.runbooks_store is None and self.patterns_store is None):
+            # Fallback responses are not worth caching
+            return method(self, query, *args, **kwargs)
+        namespace = f"{method.__name__}:{args!r}:{sorted(kwargs.items())!r}"
+        result, outcome = self.query_cache.get_or_compute(
+            namespace, text, lambda: method(self, query, *args, **kwargs), cacheable=_is_cacheable
+        )
+        sources, result_count = _result_sources(result)
+        track_kb_retrieval(text[:100], sources, result_count, cache=outcome)
+        return result
+
+    return wrapper
 
 
 class VectorRAGKnowledgeReader:
     """Vector-based RAG knowledge retrieval for SRE troubleshooting.
 
     This class replaces keyword-based pattern matching with semantic search using:
-    - Vector embeddings for all policy documents
-    - FAISS for efficient similarity search
+    - Vector embeddings for all policy documents, from a chain of embedding
+      backends (Bedrock first) each behind a circuit breaker
+    - FAISS for efficient similarity search (flat, HNSW or IVF-PQ)
     - Chunking strategy for long documents
     - Top-K retrieval with relevance scoring
     """
@@ -119,16 +364,36 @@ class VectorRAGKnowledgeReader:
         chunk_size: int = 500,
         chunk_overlap: int = 50,
         top_k: int = 5,
+        embeddings: BedrockEmbeddings | None = None,
+        retrieval_mode: str = RETRIEVAL_MODE,
+        query_cache: QueryResultCache | None = None,
+        index_config: IndexConfig | None = None,
+        fallbacks: list[Embeddings] | None = None,
     ):
         """Initialize vector-based RAG reader.
 
         Args:
             runbooks_path: Path to troubleshooting-runbooks.md
             patterns_path: Path to known-failure-patterns.md
-            cache_dir: Directory to cache vector store
+            cache_dir: Directory to cache vector store and chunk embeddings
             chunk_size: Size of text chunks for embedding
             chunk_overlap: Overlap between chunks
             top_k: Number of top results to retrieve
+            embeddings: Embeddings to use; by default Bedrock Titan with an
+                embedding cache under ``cache_dir/embeddings``
+            retrieval_mode: "hybrid" (BM25 and vector fused with RRF),
+                "vector" or "lexical", for ``hybrid_search`` and
+                ``get_similar_incidents``
+            query_cache: Cache for the public retrieval methods; by default
+                one configured from the SRE_QUERY_CACHE_* settings, serving
+                exact repeats only: a local vector search costs about as
+                much as the query embedding a near-duplicate lookup needs
+            index_config: FAISS index type and parameters of both vector
+                stores; by default from the SRE_VECTOR_* settings
+            fallbacks: Embeddings tried in order when ``embeddings``
+                fails or its circuit breaker is open, each with its own
+                vector stores under ``cache_dir/<namespace>``; by default
+                the SRE_EMBEDDING_FALLBACKS backends, [] for none
         """
         if not VECTOR_DEPS_AVAILABLE:
             raise ImportError(
@@ -156,79 +421,245 @@ class VectorRAGKnowledgeReader:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.top_k = top_k
+        if retrieval_mode not in ("hybrid", "vector", "lexical"):
+            raise ValueError(f"Unknown retrieval mode: {retrieval_mode}")
+        self.retrieval_mode = retrieval_mode
 
         # Initialize components
-        self.embeddings = BedrockEmbeddings()
+        embedding_cache = EmbeddingCache(self.cache_dir / "embeddings", max_entries=EMBEDDING_CACHE_MAX_ENTRIES)
+        if embeddings is None:
+            embeddings = BedrockEmbeddings(cache=embedding_cache)
+        self.embeddings = embeddings
+        if fallbacks is None:
+            fallbacks = fallback_embeddings(cache=embedding_cache)
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
             separators=["\n## ", "\n### ", "\n\n", "\n", " ", ""],
         )
 
-        # Initialize or load vector stores
+        # Vector stores per embedding backend, each updated chunk by chunk.
+        # The primary's live in cache_dir itself, each fallback's in a
+        # directory of its own, since their vectors are not comparable.
+        self._backends: list[_EmbeddingBackend] = []
+        for position, backend_embeddings in enumerate([embeddings, *fallbacks]):
+            name = backend_namespace(backend_embeddings)
+            if any(backend.name == name for backend in self._backends):
+                continue
+            index_dir = self.cache_dir if position == 0 else self.cache_dir / name
+            self._backends.append(
+                _EmbeddingBackend(
+                    name=name,
+                    embeddings=backend_embeddings,
+                    breaker=CircuitBreaker(name),
+                    runbooks_index=IncrementalVectorIndex(
+                        "runbooks_vectorstore", index_dir, backend_embeddings, config=index_config
+                    ),
+                    patterns_index=IncrementalVectorIndex(
+                        "patterns_vectorstore", index_dir, backend_embeddings, config=index_config
+                    ),
+                )
+            )
+        primary = self._backends[0]
+        self.runbooks_index = primary.runbooks_index
+        self.patterns_index = primary.patterns_index
         self.runbooks_store: FAISS | None = None
         self.patterns_store: FAISS | None = None
+        # Backend that embedded the last query; cached results are dropped
+        # when it changes
+        self._active = primary
+        self._sync_lock = threading.RLock()
+        # Chunks and chunk metadata of each document at its last seen hash
+        self._chunks: dict[str, tuple[str, list[str], list[dict[str, Any]]]] = {}
+        # BM25 over the chunks of both documents, rebuilt in memory at startup
+        self.lexical = LexicalChunkIndex()
+        # Emptied whenever refresh() finds a changed document
+        self.query_cache = query_cache if query_cache is not None else QueryResultCache(similarity_threshold=0)
         self._initialize_vector_stores()
 
     def _initialize_vector_stores(self):
-        """Initialize vector stores from documents or cache."""
-        # Check if cached vector stores exist
-        runbooks_index_name = "runbooks_vectorstore"
-        patterns_index_name = "patterns_vectorstore"
-
-        # Calculate content hashes to detect changes
-        runbooks_hash = self._calculate_file_hash(self.runbooks_path)
-        patterns_hash = self._calculate_file_hash(self.patterns_path)
-
-        hash_file = self.cache_dir / "content_hashes.json"
-        cached_hashes = {}
-        if hash_file.exists():
-            with open(hash_file) as f:
-                cached_hashes = json.load(f)
-
-        # Check if runbooks cache is valid
-        runbooks_faiss_file = self.cache_dir / f"{runbooks_index_name}.faiss"
-        if (
-            runbooks_faiss_file.exists()
-            and cached_hashes.get("runbooks") == runbooks_hash
-        ):
-            logger.info("Loading runbooks vector store from cache")
+        """Initialize vector stores from cache, syncing documents that changed."""
+        for index in (self.runbooks_index, self.patterns_index):
+            if index.load():
+                logger.info(f"Loaded {index.name} from cache ({len(index)} chunks)")
+        self.refresh()
+
+        stats = self.embeddings.stats() if hasattr(self.embeddings, "stats") else {}
+        if stats.get("texts") and "cache_hit_rate" in stats:
+            logger.info(
+                f"Embedded {stats['texts']} chunks: cache hit rate {stats['cache_hit_rate']:.0%}, "
+                f"{stats['api_requests']} requests at {stats['requests_per_second']}/s, "
+                f"{stats['retries']} retries"
+            )
+
+    def refresh(self) -> dict[str, IndexSyncReport]:
+        """Bring the vector stores up to date with the policy documents.
+
+        Documents whose content hash is unchanged are not even re-chunked;
+        for the others only added, edited or removed chunks touch the index.
+        The BM25 index and the metadata sidecars follow the same chunks, and
+        cached query results are dropped. Cheap enough to call whenever the knowledge base may
+        have changed.
+
+        The primary backend's stores are always synced, unless its circuit
+        breaker is open; a fallback's only once it has been used. A backend
+        that fails to embed the changed chunks is synced again when a query
+        next reaches it.
+
+        Returns:
+            Sync report of the primary backend per document that had changed
+        """
+        reports: dict[str, IndexSyncReport] = {}
+        changed = False
+        for file_path in (self.runbooks_path, self.patterns_path):
+            file_hash = self._calculate_file_hash(file_path)
+            if self.lexical.source_hash(file_path.name) == file_hash:
+                continue
+            changed = True
+            chunks, metadata = self._document_chunks(file_path, file_hash)
+            self.lexical.sync(file_path.name, chunks, metadata, source_hash=file_hash)
+
+        primary = self._backends[0]
+        for backend in self._backends:
+            if backend is primary:
+                if backend.breaker.state == CircuitBreaker.OPEN:
+                    backend.synced = False
+                    continue
+            elif not backend.synced:
+                continue
             try:
-                self.runbooks_store = self._load_vector_store(runbooks_index_name)
-            except Exception as e:
-                logger.warning(f"Failed to load runbooks cache, rebuilding: {e}")
-                self.runbooks_store = self._build_vector_store(self.runbooks_path)
-                self._save_vector_store(self.runbooks_store, runbooks_index_name)
-                cached_hashes["runbooks"] = runbooks_hash
-        else:
-            logger.info("Building runbooks vector store")
-            self.runbooks_store = self._build_vector_store(self.runbooks_path)
-            self._save_vector_store(self.runbooks_store, runbooks_index_name)
-            cached_hashes["runbooks"] = runbooks_hash
-
-        # Check if patterns cache is valid
-        patterns_faiss_file = self.cache_dir / f"{patterns_index_name}.faiss"
-        if (
-            patterns_faiss_file.exists()
-            and cached_hashes.get("patterns") == patterns_hash
-        ):
-            logger.info("Loading patterns vector store from cache")
+                synced = self._sync_backend(backend)
+            except EmbeddingError as e:
+                backend.breaker.record_failure()
+                logger.warning(f"Could not sync the {backend.name} vector stores: {e}")
+                continue
+            if synced:
+                backend.breaker.record_success()
+                changed = True
+            if backend is primary:
+                reports = synced
+
+        self.runbooks_store = self.runbooks_index.store
+        self.patterns_store = self.patterns_index.store
+        if changed:
+            self.query_cache.invalidate()
+        return reports
+
+    def _sync_backend(self, backend: _EmbeddingBackend) -> dict[str, IndexSyncReport]:
+        """Load a backend's vector stores if needed and sync them with the documents.
+
+        Raises:
+            EmbeddingError: If changed chunks could not be embedded
+        """
+        reports = {}
+        with self._sync_lock:
+            backend.synced = False
+            for index, file_path in (
+                (backend.runbooks_index, self.runbooks_path),
+                (backend.patterns_index, self.patterns_path),
+            ):
+                if index.store is None and index.load():
+                    logger.info(f"Loaded {backend.name} {index.name} from cache ({len(index)} chunks)")
+                file_hash = self._calculate_file_hash(file_path)
+                if index.store is not None and index.source_hash(file_path.name) == file_hash:
+                    continue
+                chunks, metadata = self._document_chunks(file_path, file_hash)
+                logger.info(f"Syncing {backend.name} {index.name} with {file_path.name}")
+                reports[file_path.name] = index.sync(
+                    file_path.name, chunks, source_hash=file_hash, metadata=metadata
+                )
+            backend.synced = True
+        return reports
+
+    def _document_chunks(self, file_path: Path, file_hash: str) -> tuple[list[str], list[dict[str, Any]]]:
+        """Chunks of a document and their metadata, split once per content hash."""
+        cached = self._chunks.get(file_path.name)
+        if cached is None or cached[0] != file_hash:
+            chunks = self._split_document(file_path)
+            cached = (file_hash, chunks, describe_chunks(file_path.read_text(), chunks))
+            self._chunks[file_path.name] = cached
+        return cached[1], cached[2]
+
+    def compact(self) -> None:
+        """Renumber the vector stores of every synced backend densely and persist them."""
+        with self._sync_lock:
+            for backend in self._backends:
+                for index in (backend.runbooks_index, backend.patterns_index):
+                    if index.store is not None:
+                        index.compact()
+                        index.save()
+        self.runbooks_store = self.runbooks_index.store
+        self.patterns_store = self.patterns_index.store
+
+    # ------------------------------------------------------------------
+    # Embedding backends
+    # ------------------------------------------------------------------
+    def _embed_query(self, query: str) -> tuple[_EmbeddingBackend, list[float]] | None:
+        """Embed a query with the first backend that is available.
+
+        Backends are tried in order, skipping those whose circuit breaker is
+        open; a fallback's vector stores are built the first time it is
+        reached. Every outcome is recorded on the backend's breaker, so the
+        primary is tried again (once) after its reset interval.
+
+        Returns:
+            (backend, embedding), or None if no backend could embed the query
+        """
+        for backend in self._backends:
+            if not backend.breaker.allow():
+                continue
             try:
-                self.patterns_store = self._load_vector_store(patterns_index_name)
+                if not backend.synced:
+                    self._sync_backend(backend)
+                embedding = backend.embeddings.embed_query(query)
             except Exception as e:
-                logger.warning(f"Failed to load patterns cache, rebuilding: {e}")
-                self.patterns_store = self._build_vector_store(self.patterns_path)
-                self._save_vector_store(self.patterns_store, patterns_index_name)
-                cached_hashes["patterns"] = patterns_hash
-        else:
-            logger.info("Building patterns vector store")
-            self.patterns_store = self._build_vector_store(self.patterns_path)
-            self._save_vector_store(self.patterns_store, patterns_index_name)
-            cached_hashes["patterns"] = patterns_hash
-
-        # Save updated hashes
-        with open(hash_file, "w") as f:
-            json.dump(cached_hashes, f)
+                # Whatever went wrong (a stale index of another dimension, an
+                # unreadable index file), a half-open breaker's trial must end
+                backend.breaker.record_failure()
+                logger.warning(f"Embedding backend {backend.name} failed: {e}")
+                continue
+            backend.breaker.record_success()
+            if backend is not self._active:
+                logger.warning(f"Vector search switched from {self._active.name} to {backend.name} embeddings")
+                self._active = backend
+                # Results ranked in the other embedding space are not comparable
+                self.query_cache.invalidate()
+            return backend, embedding
+        logger.error("No embedding backend available, vector search skipped")
+        return None
+
+    def _similarity_search(self, kind: str, query: str, k: int) -> list[tuple[Document, float]]:
+        """(document, L2 distance) pairs from the runbooks or patterns store of the available backend."""
+        embedded = self._embed_query(query)
+        if embedded is None:
+            return []
+        backend, embedding = embedded
+        index = backend.runbooks_index if kind == "runbooks" else backend.patterns_index
+        return index.search(embedding, k)
+
+    def _indexes(self, backend: _EmbeddingBackend, kinds: list[str]) -> list[tuple[IncrementalVectorIndex, str]]:
+        """(index, document name) of a backend's stores for these kinds that have been built."""
+        indexes = []
+        if "runbooks" in kinds:
+            indexes.append((backend.runbooks_index, self.runbooks_path.name))
+        if "patterns" in kinds:
+            indexes.append((backend.patterns_index, self.patterns_path.name))
+        return [(index, name) for index, name in indexes if index.store is not None]
+
+    def embedding_status(self) -> dict[str, Any]:
+        """Embedding backends in fallback order with their breaker states, and the one in use."""
+        return {
+            "active": self._active.name,
+            "backends": [
+                {
+                    "name": backend.name,
+                    "synced": backend.synced,
+                    "chunks": len(backend.runbooks_index) + len(backend.patterns_index),
+                    **backend.breaker.stats(),
+                }
+                for backend in self._backends
+            ],
+        }
 
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA256 hash of file content."""
@@ -241,68 +672,21 @@ class VectorRAGKnowledgeReader:
                 sha256.update(chunk)
         return sha256.hexdigest()
 
-    def _build_vector_store(self, file_path: Path) -> FAISS:
-        """Build FAISS vector store from markdown file.
+    def _split_document(self, file_path: Path) -> list[str]:
+        """Split a markdown file into chunks for embedding.
 
         Args:
             file_path: Path to markdown file
 
         Returns:
-            FAISS vector store with embedded chunks
+            Chunk texts in document order
         """
         if not file_path.exists():
             raise FileNotFoundError(f"Policy document not found: {file_path}")
 
-        # Load and chunk document
-        content = file_path.read_text()
-        chunks = self.text_splitter.split_text(content)
-
+        chunks = self.text_splitter.split_text(file_path.read_text())
         logger.info(f"Split {file_path.name} into {len(chunks)} chunks")
-
-        # Create vector store with chunks
-        vector_store = FAISS.from_texts(
-            texts=chunks,
-            embedding=self.embeddings,
-            metadatas=[
-                {"source": file_path.name, "chunk_id": i} for i in range(len(chunks))
-            ],
-        )
-
-        return vector_store
-
-    def _save_vector_store(self, vector_store: FAISS, index_name: str):
-        """Save vector store to cache.
-
-        Args:
-            vector_store: FAISS vector store to save
-            index_name: Name for the index files (without extension)
-        """
-        try:
-            vector_store.save_local(str(self.cache_dir), index_name=index_name)
-            logger.info(f"Saved vector store to {self.cache_dir}/{index_name}")
-        except Exception as e:
-            logger.warning(f"Failed to save vector store: {e}")
-
-    def _load_vector_store(self, index_name: str) -> FAISS:
-        """Load vector store from cache.
-
-        Args:
-            index_name: Name of the index files (without extension)
-
-        Returns:
-            Loaded FAISS vector store
-        """
-        try:
-            vector_store = FAISS.load_local(
-                str(self.cache_dir),
-                self.embeddings,
-                index_name=index_name,
-                allow_dangerous_deserialization=True,  # We control the cache
-            )
-            return vector_store
-        except Exception as e:
-            logger.error(f"Failed to load vector store from cache: {e}")
-            raise
+        return chunks
 
     def _distance_to_similarity(self, distance: float) -> float:
         """Convert L2 distance to similarity score (0-1 range, higher is better).
@@ -351,6 +735,7 @@ class VectorRAGKnowledgeReader:
             else:
                 return str(obj)
 
+    @_cached_query
     def get_troubleshooting_steps(self, error_pattern: str) -> dict[str, Any]:
         """Retrieve diagnostic steps using semantic search.
 
@@ -360,13 +745,8 @@ class VectorRAGKnowledgeReader:
         Returns:
             Dictionary with troubleshooting information
         """
-        if self.runbooks_store is None:
-            return self._get_fallback_response()
-
         # Perform semantic search
-        results = self.runbooks_store.similarity_search_with_score(
-            error_pattern, k=self.top_k
-        )
+        results = self._similarity_search("runbooks", error_pattern, self.top_k)
 
         if not results:
             return self._get_fallback_response()
@@ -395,6 +775,7 @@ class VectorRAGKnowledgeReader:
             "policy_reference": "POL-SRE-003 Troubleshooting Runbooks",
         }
 
+    @_cached_query
     def get_failure_pattern(self, service_or_symptom: str) -> dict[str, Any]:
         """Retrieve failure patterns using semantic search.
 
@@ -404,13 +785,8 @@ class VectorRAGKnowledgeReader:
         Returns:
             Dictionary with failure pattern information
         """
-        if self.patterns_store is None:
-            return self._get_fallback_response()
-
         # Perform semantic search
-        results = self.patterns_store.similarity_search_with_score(
-            service_or_symptom, k=self.top_k
-        )
+        results = self._similarity_search("patterns", service_or_symptom, self.top_k)
 
         if not results:
             return self._get_fallback_response()
@@ -438,59 +814,163 @@ class VectorRAGKnowledgeReader:
             "policy_reference": "POL-SRE-004 Known Failure Patterns",
         }
 
-    def get_similar_incidents(self, symptoms: list[str]) -> list[dict[str, Any]]:
-        """Retrieve similar incidents using semantic search.
+    def hybrid_search(
+        self,
+        query: str,
+        source: str = "both",
+        k: int | None = None,
+        filters: MetadataFilter | dict[str, Any] | None = None,
+    ) -> list[tuple[Document, float]]:
+        """Rank chunks with BM25 and vector search fused by RRF.
+
+        The vector ranking merges both stores by distance (they share one
+        embedding space) and the BM25 ranking covers both documents in one
+        index; each contributes its top ``RETRIEVAL_FETCH_K`` chunks to the
+        fusion. Filters restrict the candidate chunks before either ranking
+        runs. The query is embedded by the first embedding backend available
+        and searched in that backend's stores; with none available the BM25
+        ranking is used alone.
+
+        Args:
+            query: Query text, may mix prose and exact identifiers
+            source: "runbooks", "patterns", or "both"
+            k: Number of chunks to return (defaults to top_k)
+            filters: MetadataFilter, or a dict of its fields
+
+        Returns:
+            (document, relevance) pairs, best first. Relevance is in 0-1:
+            the fused score relative to a chunk ranked first by both
+            rankings, or the distance-derived similarity in "vector" mode.
+        """
+        k = self.top_k if k is None else k
+        filters = MetadataFilter.coerce(filters)
+        kinds = [kind for kind in ("runbooks", "patterns") if source in (kind, "both")]
+
+        documents: dict[str, Document] = {}
+        rankings: list[list[str]] = []
+        distances: dict[str, float] = {}
+        # Backend whose stores supply the documents; if no backend can embed
+        # the query, the BM25 ranking alone is used
+        backend = self._active
+        if self.retrieval_mode != "lexical":
+            embedded = self._embed_query(query)
+            if embedded is not None:
+                backend, embedding = embedded
+                for index, _ in self._indexes(backend, kinds):
+                    for doc, distance in index.search(embedding, RETRIEVAL_FETCH_K, filters=filters):
+                        documents[doc.metadata["chunk_id"]] = doc
+                        distances[doc.metadata["chunk_id"]] = distance
+                rankings.append(sorted(distances, key=distances.get)[:RETRIEVAL_FETCH_K])
+
+        if self.retrieval_mode == "vector":
+            return [
+                (documents[chunk_id], self._distance_to_similarity(distances[chunk_id]))
+                for chunk_id in (rankings[0][:k] if rankings else [])
+            ]
+
+        indexes = self._indexes(backend, kinds)
+        if not indexes:
+            # The active backend was never synced: any stores of the same chunks will do
+            indexes = next(
+                (found for other in self._backends if (found := self._indexes(other, kinds))), []
+            )
+        if not indexes:
+            return []
+        stores = {name: index.store for index, name in indexes}
+        allowed = self.lexical.allowed(filters, sources=set(stores))
+        ranking = []
+        for chunk_id, _ in self.lexical.search(query, RETRIEVAL_FETCH_K, allowed=allowed):
+            if chunk_id not in documents:
+                found = stores[self.lexical.metadata[chunk_id]["source"]].docstore.search(chunk_id)
+                if not isinstance(found, Document):
+                    # BM25 follows a document edit even when no backend could
+                    # embed it; its new chunks are not in the vector stores yet
+                    continue
+                documents[chunk_id] = found
+            ranking.append(chunk_id)
+        rankings.append(ranking)
+
+        best_possible = sum(1.0 / (RRF_K + 1) for ranking in rankings if ranking) or 1.0
+        return [
+            (documents[chunk_id], score / best_possible)
+            for chunk_id, score in reciprocal_rank_fusion(rankings, k=RRF_K)[:k]
+        ]
+
+    @_cached_query
+    def get_similar_incidents(
+        self,
+        symptoms: list[str],
+        filters: MetadataFilter | dict[str, Any] | None = None,
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        """Retrieve similar incidents from runbooks and failure patterns.
+
+        Uses ``hybrid_search``, so incident ids, error codes and service
+        names in the symptoms match exactly while the vector ranking covers
+        paraphrases. Incidents from the same chunk are ordered by how well
+        their own entry matches the query.
 
         Args:
             symptoms: List of symptom descriptions
+            filters: Optional service/severity/date restrictions; dates also
+                apply to the incident ids themselves
+            limit: Maximum number of incidents to return
 
         Returns:
             List of similar incidents
         """
-        if not symptoms or self.runbooks_store is None:
+        if not symptoms:
             return []
 
         # Combine symptoms into query
         query = " ".join(symptoms)
+        filters = replace(MetadataFilter.coerce(filters) or MetadataFilter(), incidents_only=True)
 
-        # Search runbooks for incident references
-        results = self.runbooks_store.similarity_search_with_score(query, k=10)
+        # Only chunks that reference an incident are ranked at all
+        results = self.hybrid_search(query, source="both", k=10, filters=filters)
 
-        incidents = []
-        for doc, distance in results:
+        candidates = []
+        for doc, relevance in results:
             content = doc.page_content
 
-            # Extract incident IDs (INC-YYYY-MM-DD pattern)
-            incident_pattern = r"INC-\d{4}-\d{2}-\d{2}"
-            matches = re.findall(incident_pattern, content)
-
-            for incident_id in matches:
-                # Extract context around incident ID
-                idx = content.find(incident_id)
-                if idx != -1:
-                    # Get surrounding context
-                    start = max(0, idx - 50)
-                    end = min(len(content), idx + 150)
-                    context = content[start:end].strip()
-
-                    incidents.append(
-                        {
-                            "incident_id": incident_id,
-                            "description": context,
-                            "relevance_score": self._distance_to_similarity(distance),
-                        }
-                    )
+            # Extract incident IDs (INC-YYYY-MM-DD pattern); each incident's
+            # entry runs up to the next incident id
+            matches = list(re.finditer(r"INC-\d{4}-\d{2}-\d{2}", content))
+            entries = [
+                (match.group(0), content[match.start():(matches[i + 1].start() if i + 1 < len(matches) else None)])
+                for i, match in enumerate(matches)
+            ]
+            if filters.since or filters.until:
+                entries = [
+                    (incident_id, entry) for incident_id, entry in entries
+                    if (occurred := incident_date(incident_id)) and filters.date_in_range(occurred)
+                ]
+
+            # Break ties between incidents of one chunk by their own entry
+            entry_scores = (
+                self.lexical.bm25.score_texts(query, [entry for _, entry in entries])
+                if len(entries) > 1 else [0.0] * len(entries)
+            )
+            for (incident_id, entry), entry_score in zip(entries, entry_scores):
+                candidates.append((relevance, entry_score, incident_id, entry[:200].strip()))
 
         # Deduplicate and sort by relevance
         seen_ids = set()
         unique_incidents = []
-        for inc in sorted(incidents, key=lambda x: x["relevance_score"], reverse=True):
-            if inc["incident_id"] not in seen_ids:
-                seen_ids.add(inc["incident_id"])
-                unique_incidents.append(inc)
+        for relevance, _, incident_id, description in sorted(candidates, key=lambda x: x[:2], reverse=True):
+            if incident_id not in seen_ids:
+                seen_ids.add(incident_id)
+                unique_incidents.append(
+                    {
+                        "incident_id": incident_id,
+                        "description": description,
+                        "relevance_score": relevance,
+                    }
+                )
 
-        return unique_incidents[:5]  # Return top 5
+        return unique_incidents[:limit]
 
+    @_cached_query
     def get_error_code_guidance(self, error_code: str) -> dict[str, Any]:
         """Retrieve error code guidance using semantic search.
 
@@ -502,7 +982,7 @@ class VectorRAGKnowledgeReader:
         Returns:
             Dictionary with error code guidance
         """
-        if not error_code or self.runbooks_store is None:
+        if not error_code:
             return {
                 "error_code": error_code,
                 "guidance": "No guidance available",
@@ -510,9 +990,7 @@ class VectorRAGKnowledgeReader:
             }
 
         # Search for error code in runbooks
-        results = self.runbooks_store.similarity_search_with_score(
-            f"error code {error_code}", k=3
-        )
+        results = self._similarity_search("runbooks", f"error code {error_code}", 3)
 
         if not results:
             return {
@@ -569,6 +1047,7 @@ class VectorRAGKnowledgeReader:
 
         return list(set(patterns))[:50]  # Return unique patterns, max 50
 
+    @_cached_query
     def search_by_semantic_query(
         self, query: str, source: str = "both"
     ) -> list[dict[str, Any]]:
@@ -582,11 +1061,13 @@ class VectorRAGKnowledgeReader:
             List of relevant chunks with scores
         """
         results = []
+        embedded = self._embed_query(query)
+        if embedded is None:
+            return results
+        backend, embedding = embedded
 
-        if source in ("runbooks", "both") and self.runbooks_store:
-            runbooks_results = self.runbooks_store.similarity_search_with_score(
-                query, k=self.top_k
-            )
+        if source in ("runbooks", "both"):
+            runbooks_results = backend.runbooks_index.search(embedding, self.top_k)
             for doc, distance in runbooks_results:
                 results.append(
                     {
@@ -597,10 +1078,8 @@ class VectorRAGKnowledgeReader:
                     }
                 )
 
-        if source in ("patterns", "both") and self.patterns_store:
-            patterns_results = self.patterns_store.similarity_search_with_score(
-                query, k=self.top_k
-            )
+        if source in ("patterns", "both"):
+            patterns_results = backend.patterns_index.search(embedding, self.top_k)
             for doc, distance in patterns_results:
                 results.append(
                     {
@@ -616,6 +1095,20 @@ class VectorRAGKnowledgeReader:
 
         return results[: self.top_k]
 
+    async def retrieve_many(self, queries: list[str], source: str = "both") -> list[dict[str, Any]]:
+        """Run several semantic queries concurrently and merge the results.
+
+        Args:
+            queries: Natural language queries
+            source: "runbooks", "patterns", or "both"
+
+        Returns:
+            Chunks de-duplicated by chunk id, best first, with per-query
+            normalised ``relevance_score`` and the ``query_index`` of the
+            query each chunk matched best (see ``kb_fanout.merge_query_results``)
+        """
+        return await retrieve_many(lambda query: self.search_by_semantic_query(query, source), queries)
+
     def _get_fallback_response(self) -> dict[str, Any]:
         """Provide fallback response when vector search unavailable."""
         return {
@@ -627,4 +1120,4 @@ class VectorRAGKnowledgeReader:
         }
 
 
-__all__ = ["VectorRAGKnowledgeReader", "BedrockEmbeddings"]
+__all__ = ["VectorRAGKnowledgeReader", "BedrockEmbeddings", "EmbeddingError", "MetadataFilter"]
@@ -8,6 +8,18 @@ from .pipeline_state_manager import (
     AgentStatus,
     get_pipeline_state_manager
 )
+from .incident_fingerprint import (
+    IncidentFingerprint,
+    IncidentFingerprintRegistry,
+    OpenIncident,
+    build_incident_fingerprint
+)
+from .json_patch import apply_patch, make_patch
+from .client_channel import ClientConnection, OutboundMessage, QUEUE_POLICIES
+from .retention import PipelineArchive, RetentionPolicy, RingBuffer
+from .token_stream import TokenStreamBatcher
+from .state_bus import InProcessStateBus, StateBus, UnixSocketStateBus, create_state_bus
+from .subscriptions import Subscription, SubscriptionRegistry, parse_topics
 
 __all__ = [
     "PipelineStateManager",
@@ -15,5 +27,25 @@ __all__ = [
     "AgentState",
     "PipelineStatus",
     "AgentStatus",
-    "get_pipeline_state_manager"
+    "get_pipeline_state_manager",
+    "IncidentFingerprint",
+    "IncidentFingerprintRegistry",
+    "OpenIncident",
+    "build_incident_fingerprint",
+    "apply_patch",
+    "make_patch",
+    "ClientConnection",
+    "OutboundMessage",
+    "QUEUE_POLICIES",
+    "PipelineArchive",
+    "RetentionPolicy",
+    "RingBuffer",
+    "TokenStreamBatcher",
+    "StateBus",
+    "InProcessStateBus",
+    "UnixSocketStateBus",
+    "create_state_bus",
+    "Subscription",
+    "SubscriptionRegistry",
+    "parse_topics"
 ]
\ No newline at end of file
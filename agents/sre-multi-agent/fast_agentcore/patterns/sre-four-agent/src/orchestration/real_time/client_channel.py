@@ -0,0 +1,344 @@
+"""
+Per-client outbound channels for WebSocket fan-out.
+
+Every connected client gets a bounded queue drained by its own writer task, so
+producers only enqueue and never await a socket. A slow browser therefore
+delays nothing but its own updates. When a client's queue is full, one of three
+policies applies:
+
+- ``drop_oldest``: discard the oldest queued message
+- ``coalesce``: merge the new message into a queued one with the same
+  coalesce key (consecutive state patches of a pipeline), falling back to
+  ``drop_oldest`` when nothing can be merged
+- ``disconnect``: close the connection; the client reconnects and resyncs
+
+Dropping a state patch is safe: the client sees a ``base_version`` gap and
+asks for a resync.
+
+Messages are encoded once per broadcast, not once per client, using orjson
+when it is installed and the standard library otherwise; both produce the
+same frame.
+"""
+
+import asyncio
+import dataclasses
+import json
+import math
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .json_patch import apply_patch
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+QUEUE_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+def _json_default(value: Any) -> Any:
+    """Encode a value JSON has no type for as orjson does natively, else as str()."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    return str(value)
+
+
+def _json_key(key: Any) -> str:
+    """Dict key as orjson writes it with OPT_NON_STR_KEYS."""
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    value = _json_default(key)
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _plain_json(value: Any) -> Any:
+    """Copy of a value with only str keys and finite floats (NaN and infinities become null)."""
+    if isinstance(value, dict):
+        return {_json_key(key): _plain_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain_json(item) for item in value]
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if value is None or isinstance(value, (str, int)):
+        return value
+    return _plain_json(_json_default(value))
+
+
+# Same output as orjson: compact, UTF-8 rather than \u escapes, and no NaN
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, allow_nan=False, default=_json_default)
+
+_HAS_TIMEOUT_CONTEXT = hasattr(asyncio, "timeout")
+
+# Close code sent to clients evicted as slow consumers ("try again later")
+_SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+def encode_frame(message: Dict[str, Any]) -> str:
+    """
+    Encode a message as a compact JSON text frame.
+
+    Datetimes, enums, UUIDs and dataclasses are encoded as orjson does and
+    other unknown values are stringified rather than failing the broadcast,
+    with or without orjson installed.
+
+    Args:
+        message: JSON-compatible message
+
+    Returns:
+        Encoded frame
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(message, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    try:
+        return _JSON_ENCODER.encode(message)
+    except (TypeError, ValueError):
+        # Keys the encoder rejects, or NaN: convert the way orjson does
+        return _JSON_ENCODER.encode(_plain_json(message))
+
+
+@dataclass
+class OutboundMessage:
+    """A message queued for one or more clients.
+
+    The same instance is shared by every client queue it is fanned out to, so
+    the frame is encoded at most once.
+    """
+    message: Dict[str, Any]
+    coalesce_key: Optional[str] = None
+    _frame: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def frame(self) -> str:
+        """Encoded text frame, serialised on first use."""
+        if self._frame is None:
+            self._frame = encode_frame(self.message)
+        return self._frame
+
+
+def merge_state_messages(older: OutboundMessage, newer: OutboundMessage) -> Optional[OutboundMessage]:
+    """Merge two queued state messages for the same pipeline.
+
+    Args:
+        older: Message already in the queue
+        newer: Message being enqueued
+
+    Returns:
+        A single message equivalent to sending both, or None if they cannot
+        be merged
+    """
+    old, new = older.message, newer.message
+    if new.get("kind") == "snapshot":
+        return newer
+    if new.get("kind") != "patch" or new.get("base_version") != old.get("version"):
+        return None
+
+    if old.get("kind") == "patch":
+        merged = dict(new)
+        merged["base_version"] = old["base_version"]
+        merged["patch"] = list(old["patch"]) + list(new["patch"])
+        return OutboundMessage(merged, newer.coalesce_key)
+
+    if old.get("kind") == "snapshot":
+        merged = dict(old)
+        merged["type"] = new.get("type", old.get("type"))
+        merged["version"] = new["version"]
+        merged["timestamp"] = new.get("timestamp", old.get("timestamp"))
+        merged["state"] = apply_patch(old["state"], new["patch"])
+        return OutboundMessage(merged, newer.coalesce_key)
+
+    return None
+
+
+class ClientConnection:
+    """Bounded outbound queue and writer task for one WebSocket client."""
+
+    def __init__(
+        self,
+        websocket: Any,
+        *,
+        max_queue: int = 256,
+        policy: str = "coalesce",
+        send_timeout: float = 5.0,
+        on_close: Optional[Callable[["ClientConnection"], None]] = None,
+    ):
+        """
+        Initialize the connection and start its writer task.
+
+        Args:
+            websocket: Accepted WebSocket (anything with ``send_text``)
+            max_queue: Maximum number of queued messages
+            policy: Full-queue policy, one of ``QUEUE_POLICIES``
+            send_timeout: Seconds a single send may take before the client is
+                evicted as a slow consumer
+            on_close: Called once when the connection is closed
+        """
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}'. Valid options: {list(QUEUE_POLICIES)}")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self._on_close = on_close
+
+        self._queue: Deque[OutboundMessage] = deque()
+        self._in_flight = False
+        self._wakeup = asyncio.Event()
+        self.closed = False
+        self.close_reason: Optional[str] = None
+
+        # Metrics
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+
+        self._writer = asyncio.create_task(self._run())
+
+    @property
+    def depth(self) -> int:
+        """Number of messages not yet delivered, including one being sent."""
+        return len(self._queue) + int(self._in_flight)
+
+    def enqueue(self, item: OutboundMessage) -> bool:
+        """
+        Queue a message without waiting on the socket.
+
+        Returns:
+            False if the connection is closed or was closed by the
+            ``disconnect`` policy, True otherwise
+        """
+        if self.closed:
+            return False
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy == "disconnect":
+                self.close("send queue full")
+                return False
+            if self.policy == "coalesce" and self._coalesce(item):
+                return True
+            self._queue.popleft()
+            self.dropped += 1
+
+        self._queue.append(item)
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._wakeup.set()
+        return True
+
+    def _coalesce(self, item: OutboundMessage) -> bool:
+        """Merge ``item`` into the newest queued message with the same key."""
+        if item.coalesce_key is None:
+            return False
+        for index in range(len(self._queue) - 1, -1, -1):
+            queued = self._queue[index]
+            if queued.coalesce_key != item.coalesce_key:
+                continue
+            merged = merge_state_messages(queued, item)
+            if merged is None:
+                return False
+            self._queue[index] = merged
+            self.coalesced += 1
+            self._wakeup.set()
+            return True
+        return False
+
+    def close(self, reason: str) -> None:
+        """Stop sending; the writer task closes the socket and exits."""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self._queue.clear()
+        self._wakeup.set()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    async def _run(self) -> None:
+        """Writer task: drain the queue one frame at a time."""
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                item = self._queue.popleft()
+                self._in_flight = True
+                await self._send(item.frame)
+                self._in_flight = False
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self.close(f"send timed out after {self.send_timeout}s")
+        except Exception as e:
+            self.close(f"send failed: {e}")
+
+        if self.close_reason and self.close_reason != "client disconnected":
+            try:
+                await asyncio.wait_for(
+                    self.websocket.close(code=_SLOW_CONSUMER_CLOSE_CODE),
+                    timeout=self.send_timeout,
+                )
+            except Exception:
+                pass
+
+    async def _send(self, frame: str) -> None:
+        """Send one frame, raising TimeoutError if the client stalls."""
+        if _HAS_TIMEOUT_CONTEXT:
+            # Cheaper than wait_for on 3.11, which wraps every send in a new task
+            async with asyncio.timeout(self.send_timeout):
+                await self.websocket.send_text(frame)
+        else:
+            await asyncio.wait_for(self.websocket.send_text(frame), timeout=self.send_timeout)
+
+    async def aclose(self) -> None:
+        """Close the connection and wait for the writer task to finish."""
+        self.close("client disconnected")
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and delivery counters for this client."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "max_queue": self.max_queue,
+            "policy": self.policy,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "closed": self.closed,
+            "close_reason": self.close_reason,
+        }
+
+
+__all__ = [
+    "ClientConnection",
+    "OutboundMessage",
+    "ORJSON_AVAILABLE",
+    "QUEUE_POLICIES",
+    "encode_frame",
+    "merge_state_messages",
+]
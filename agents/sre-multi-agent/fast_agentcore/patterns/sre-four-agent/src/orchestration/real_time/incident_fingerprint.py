@@ -0,0 +1,316 @@
+"""
+Incident fingerprinting for de-duplicating detections across streaming windows.
+
+Overlapping windows (15-minute windows every 5 minutes) mean a single incident
+is detected by several consecutive windows. This module derives a stable
+fingerprint for each detection from the affected services, error codes,
+normalised message templates and severity, and keeps a time-decayed table of
+open incidents so that repeat detections attach to the incident that is
+already being handled instead of spawning a new four-agent pipeline.
+"""
+
+import hashlib
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Log levels that contribute to a fingerprint; INFO/DEBUG noise is ignored
+_SIGNAL_LEVELS = {"ERROR", "CRITICAL", "FATAL", "WARN", "WARNING"}
+
+# Ordered substitutions that turn a log message into a stable template
+_TEMPLATE_SUBSTITUTIONS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"\b[0-9a-fA-F]{12,}\b"), "<hex>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+# Maximum number of templates kept per fingerprint (most frequent first)
+_MAX_TEMPLATES = 5
+
+# Severity keywords in an analyst summary, checked in order; whole words only,
+# hyphenated compounds included, so that "slow", "flow" or "low-latency" do
+# not read as "low" and "highlight" or "high-severity" not as "high"
+_SUMMARY_SEVERITY: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"(?<![\w-])(?:critical|sev-1)(?![\w-])"), "CRITICAL"),
+    (re.compile(r"(?<![\w-])(?:high|sev-2)(?![\w-])"), "HIGH"),
+    (re.compile(r"(?<![\w-])(?:low|sev-3)(?![\w-])"), "LOW"),
+]
+
+
+def normalize_log_template(message: str) -> str:
+    """Reduce a log message to a template by masking variable tokens.
+
+    Args:
+        message: Raw log message
+
+    Returns:
+        Lower-cased template with ids, addresses and numbers replaced by placeholders
+    """
+    template = message.strip()
+    for pattern, replacement in _TEMPLATE_SUBSTITUTIONS:
+        template = pattern.sub(replacement, template)
+    return template.lower()[:160]
+
+
+def severity_from_summary(summary: str) -> Optional[str]:
+    """Severity named in an analyst summary, or None if it names none.
+
+    Args:
+        summary: Analyst summary text
+
+    Returns:
+        "CRITICAL", "HIGH" or "LOW" for the first matching keyword
+    """
+    summary = summary.lower()
+    for pattern, severity in _SUMMARY_SEVERITY:
+        if pattern.search(summary):
+            return severity
+    return None
+
+
+def _severity_from_analyst(analyst_result: Any) -> str:
+    """Derive a coarse severity bucket from an analyst AgentMessage."""
+    payload = getattr(analyst_result, "payload", None)
+    details = (payload.details if payload and payload.details else {}) or {}
+
+    score = details.get("severity_score")
+    if isinstance(score, (int, float)):
+        if score >= 0.8:
+            return "CRITICAL"
+        if score >= 0.6:
+            return "HIGH"
+        if score >= 0.3:
+            return "MEDIUM"
+        return "LOW"
+
+    summary = (payload.summary or "") if payload else ""
+    return severity_from_summary(summary) or "MEDIUM"
+
+
+def _jaccard(left: Iterable[str], right: Iterable[str]) -> float:
+    """Jaccard similarity of two string collections (1.0 when both are empty)."""
+    a, b = set(left), set(right)
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass(frozen=True)
+class IncidentFingerprint:
+    """Stable signature of an anomaly detection."""
+    services: Tuple[str, ...]
+    error_codes: Tuple[str, ...]
+    templates: Tuple[str, ...]
+    severity: str
+
+    @property
+    def key(self) -> str:
+        """Short digest identifying this exact fingerprint."""
+        raw = "|".join([
+            ",".join(self.services),
+            ",".join(self.error_codes),
+            ",".join(self.templates),
+            self.severity,
+        ])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def similarity(self, other: "IncidentFingerprint") -> float:
+        """Weighted similarity in [0, 1] between two fingerprints.
+
+        Services and error codes dominate because they identify the failing
+        component; templates refine the match and severity is only a tie-breaker
+        since it commonly escalates while an incident is ongoing.
+        """
+        return (
+            0.4 * _jaccard(self.services, other.services)
+            + 0.3 * _jaccard(self.error_codes, other.error_codes)
+            + 0.2 * _jaccard(self.templates, other.templates)
+            + 0.1 * (1.0 if self.severity == other.severity else 0.0)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dictionary."""
+        return {
+            "key": self.key,
+            "services": list(self.services),
+            "error_codes": list(self.error_codes),
+            "templates": list(self.templates),
+            "severity": self.severity,
+        }
+
+
+def build_incident_fingerprint(window_logs: List[Any], analyst_result: Any) -> IncidentFingerprint:
+    """Build a fingerprint from a window's logs and the analyst's verdict.
+
+    Args:
+        window_logs: LogEntry objects for the window that triggered the detection
+        analyst_result: AgentMessage returned by the analyst agent
+
+    Returns:
+        IncidentFingerprint for the detection
+    """
+    signal_logs = [log for log in window_logs if str(log.level).upper() in _SIGNAL_LEVELS]
+    # Fall back to the whole window when nothing is logged at WARN or above
+    candidates = signal_logs or list(window_logs)
+
+    services = sorted({log.service for log in candidates})
+
+    error_codes = set()
+    for log in candidates:
+        if getattr(log, "error_code", None):
+            error_codes.add(str(log.error_code))
+        http_status = getattr(log, "http_status", None)
+        if http_status is not None and http_status >= 500:
+            error_codes.add(f"HTTP_{http_status}")
+
+    template_counts: Dict[str, int] = {}
+    for log in candidates:
+        template = normalize_log_template(log.message)
+        template_counts[template] = template_counts.get(template, 0) + 1
+    templates = sorted(
+        sorted(template_counts, key=lambda t: (-template_counts[t], t))[:_MAX_TEMPLATES]
+    )
+
+    return IncidentFingerprint(
+        services=tuple(services),
+        error_codes=tuple(sorted(error_codes)),
+        templates=tuple(templates),
+        severity=_severity_from_analyst(analyst_result),
+    )
+
+
+@dataclass
+class OpenIncident:
+    """An incident that is still considered active by the registry."""
+    incident_id: str
+    fingerprint: IncidentFingerprint
+    first_seen: datetime
+    last_seen: datetime
+    detections: int = 1
+    windows: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dictionary."""
+        return {
+            "incident_id": self.incident_id,
+            "fingerprint": self.fingerprint.to_dict(),
+            "first_seen": self.first_seen.isoformat(),
+            "last_seen": self.last_seen.isoformat(),
+            "detections": self.detections,
+            "windows": list(self.windows),
+        }
+
+
+class IncidentFingerprintRegistry:
+    """Time-decayed table of open incidents keyed by fingerprint.
+
+    Each open incident carries an activity score that decays exponentially with
+    the time since it was last detected. A new detection attaches to the most
+    similar open incident whose decayed similarity clears ``match_threshold``;
+    incidents whose activity falls below ``expiry_threshold`` are closed.
+
+    Time is supplied by the caller (the window timestamp) rather than read from
+    the wall clock so that replays of historical data de-duplicate identically.
+    """
+
+    def __init__(
+        self,
+        half_life_minutes: float = 15.0,
+        match_threshold: float = 0.5,
+        expiry_threshold: float = 0.1,
+    ):
+        if half_life_minutes <= 0:
+            raise ValueError("half_life_minutes must be positive")
+        self.half_life_minutes = half_life_minutes
+        self.match_threshold = match_threshold
+        self.expiry_threshold = expiry_threshold
+        self.open_incidents: Dict[str, OpenIncident] = {}
+
+    def _activity(self, incident: OpenIncident, now: datetime) -> float:
+        """Exponentially decayed activity of an incident at ``now``."""
+        elapsed_minutes = max((now - incident.last_seen).total_seconds() / 60.0, 0.0)
+        return math.pow(0.5, elapsed_minutes / self.half_life_minutes)
+
+    def expire(self, now: datetime) -> List[OpenIncident]:
+        """Close incidents whose activity has decayed below the expiry threshold.
+
+        Args:
+            now: Current (window) time
+
+        Returns:
+            List of incidents that were closed
+        """
+        expired = [
+            incident for incident in self.open_incidents.values()
+            if self._activity(incident, now) < self.expiry_threshold
+        ]
+        for incident in expired:
+            del self.open_incidents[incident.incident_id]
+        return expired
+
+    def find_match(self, fingerprint: IncidentFingerprint, now: datetime) -> Optional[OpenIncident]:
+        """Return the open incident that best matches ``fingerprint``, if any."""
+        best: Optional[OpenIncident] = None
+        best_score = 0.0
+        for incident in self.open_incidents.values():
+            score = fingerprint.similarity(incident.fingerprint) * self._activity(incident, now)
+            if score >= self.match_threshold and score > best_score:
+                best, best_score = incident, score
+        return best
+
+    def observe(
+        self,
+        fingerprint: IncidentFingerprint,
+        now: datetime,
+        new_incident_id: Callable[[], str],
+        window_number: Optional[int] = None,
+    ) -> Tuple[OpenIncident, bool]:
+        """Record a detection, attaching it to an open incident when possible.
+
+        Args:
+            fingerprint: Fingerprint of the detection
+            now: Time of the detection (window start)
+            new_incident_id: Factory called only when a new incident must be opened
+            window_number: Optional streaming window number for bookkeeping
+
+        Returns:
+            Tuple of (incident, is_new) where ``is_new`` is True when the
+            detection opened a new incident and a pipeline should be started
+        """
+        self.expire(now)
+
+        incident = self.find_match(fingerprint, now)
+        if incident is not None:
+            incident.detections += 1
+            incident.last_seen = max(incident.last_seen, now)
+            # Track the latest view so gradual drift (e.g. severity escalation) keeps matching
+            incident.fingerprint = fingerprint
+            if window_number is not None:
+                incident.windows.append(window_number)
+            return incident, False
+
+        incident = OpenIncident(
+            incident_id=new_incident_id(),
+            fingerprint=fingerprint,
+            first_seen=now,
+            last_seen=now,
+            windows=[window_number] if window_number is not None else [],
+        )
+        self.open_incidents[incident.incident_id] = incident
+        return incident, True
+
+
+__all__ = [
+    "IncidentFingerprint",
+    "IncidentFingerprintRegistry",
+    "OpenIncident",
+    "build_incident_fingerprint",
+    "normalize_log_template",
+    "severity_from_summary",
+]
@@ -0,0 +1,167 @@
+"""
+Minimal RFC 6902 JSON Patch support for pipeline state broadcasts.
+
+Only the operations needed to describe changes between two JSON documents are
+generated: ``add``, ``remove`` and ``replace``. List diffs recognise the two
+shapes pipeline state actually takes - append-only lists and fixed-size
+sliding windows ("last N activities") - so that a new entry produces O(1)
+operations instead of rewriting every element.
+"""
+
+import copy
+from typing import Any, Dict, List
+
+# Upper bound on the window shift searched for when diffing lists
+_MAX_SHIFT = 32
+
+
+def _escape(token: Any) -> str:
+    """Escape a reference token as required by RFC 6901."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(old: Any, new: Any) -> bool:
+    """JSON equality: unlike ``==``, ``1``, ``1.0`` and ``True`` differ, at any depth."""
+    if type(old) is not type(new) or old != new:
+        return False
+    if isinstance(old, dict):
+        return all(_same(value, new[key]) for key, value in old.items())
+    if isinstance(old, list):
+        return all(_same(a, b) for a, b in zip(old, new))
+    return True
+
+
+def _diff(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]) -> None:
+    if _same(old, new):
+        return
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                _diff(old[key], value, child, ops)
+        return
+
+    if isinstance(old, list) and isinstance(new, list):
+        list_ops = _diff_list(old, new, path)
+        # Fall back to a single replace when the element-wise diff is larger
+        if len(list_ops) > len(new):
+            ops.append({"op": "replace", "path": path, "value": new})
+        else:
+            ops.extend(list_ops)
+        return
+
+    ops.append({"op": "replace", "path": path, "value": new})
+
+
+def _diff_list(old: List[Any], new: List[Any], path: str) -> List[Dict[str, Any]]:
+    old_len, new_len = len(old), len(new)
+
+    # Append or sliding window: the tail of ``old`` is the head of ``new``
+    for shift in range(min(old_len, _MAX_SHIFT)):
+        kept = old_len - shift
+        if kept > new_len or not _same(old[shift], new[0]):
+            continue
+        if all(_same(a, b) for a, b in zip(old[shift:], new[:kept])):
+            ops = [{"op": "remove", "path": f"{path}/0"} for _ in range(shift)]
+            ops.extend({"op": "add", "path": f"{path}/-", "value": item} for item in new[kept:])
+            return ops
+
+    ops: List[Dict[str, Any]] = []
+    common = min(old_len, new_len)
+    for index in range(common):
+        _diff(old[index], new[index], f"{path}/{index}", ops)
+    for index in range(old_len - 1, common - 1, -1):
+        ops.append({"op": "remove", "path": f"{path}/{index}"})
+    ops.extend({"op": "add", "path": f"{path}/-", "value": item} for item in new[common:])
+    return ops
+
+
+def make_patch(old: Any, new: Any) -> List[Dict[str, Any]]:
+    """Compute a JSON Patch transforming ``old`` into ``new``.
+
+    Args:
+        old: Previously published JSON document
+        new: Current JSON document
+
+    Returns:
+        List of RFC 6902 operations (empty when the documents are equal)
+    """
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def _resolve_parent(doc: Any, path: str):
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {path!r}")
+    tokens = [_unescape(token) for token in path[1:].split("/")]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+
+def apply_patch(doc: Any, patch: List[Dict[str, Any]]) -> Any:
+    """Apply a JSON Patch produced by :func:`make_patch`.
+
+    Args:
+        doc: Document to patch (left unmodified)
+        patch: List of ``add``/``remove``/``replace`` operations
+
+    Returns:
+        Patched copy of the document
+
+    Raises:
+        ValueError: If an operation is unsupported or its path is invalid
+    """
+    result = copy.deepcopy(doc)
+    for operation in patch:
+        op = operation.get("op")
+        path = operation.get("path", "")
+        value = copy.deepcopy(operation.get("value"))
+
+        if path == "":
+            if op in ("add", "replace"):
+                result = value
+                continue
+            raise ValueError(f"Cannot {op} the document root")
+
+        try:
+            parent, token = _resolve_parent(result, path)
+            if isinstance(parent, list):
+                if op == "add":
+                    if token == "-":
+                        parent.append(value)
+                    else:
+                        parent.insert(int(token), value)
+                elif op == "remove":
+                    del parent[int(token)]
+                elif op == "replace":
+                    parent[int(token)] = value
+                else:
+                    raise ValueError(f"Unsupported JSON Patch op: {op!r}")
+            else:
+                if op in ("add", "replace"):
+                    if op == "replace" and token not in parent:
+                        raise ValueError(f"Cannot replace missing member {path!r}")
+                    parent[token] = value
+                elif op == "remove":
+                    del parent[token]
+                else:
+                    raise ValueError(f"Unsupported JSON Patch op: {op!r}")
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Invalid JSON Patch path {path!r}: {e}") from e
+    return result
+
+
+__all__ = ["apply_patch", "make_patch"]
@@ -9,17 +9,47 @@ Phase 2 enhancements:
 - Real-time output streaming with chunked responses
 - Enhanced WebSocket events for detailed agent communication
 - Multi-pipeline support with concurrent execution
+
+State updates are versioned per pipeline. A client receives a full snapshot
+when it subscribes (or asks to resync) and RFC 6902 JSON Patch deltas after
+that; ``base_version`` lets it detect a missed update and request a resync.
+
+Memory is bounded: per-pipeline lists are ring buffers, agents keep only the
+newest part of their full output, and finished pipelines are evicted into
+compact summaries once their retention period has passed, checked by a
+periodic sweep as well as when pipelines start and finish (see ``retention``).
+
+Outbound messages are also published on a state bus (see ``state_bus``) so
+that clients connected to other server workers receive them; each worker
+mirrors the published state of pipelines run elsewhere to serve snapshots.
+
+Clients may narrow what they receive with topic subscriptions (pipeline, agent,
+message type, severity; see ``subscriptions``); clients without subscriptions
+receive every message.
 """
 
 import asyncio
+import contextlib
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Set, Union
+from typing import Dict, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
+import copy
 import json
 import uuid
 
 from ..four_agent.schema import AgentRole, Severity
+from ..four_agent.settings import (
+    WS_QUEUE_POLICY,
+    WS_SEND_QUEUE_SIZE,
+    WS_SEND_TIMEOUT_SECONDS,
+)
+from .client_channel import ClientConnection, OutboundMessage
+from .json_patch import apply_patch, make_patch
+from .retention import PipelineArchive, RetentionPolicy, RingBuffer, deep_sizeof, process_rss_bytes
+from .state_bus import InProcessStateBus, StateBus, create_state_bus
+from .subscriptions import SubscriptionRegistry, Topics, message_topics, parse_topics
 
 
 class PipelineStatus(Enum):
@@ -51,6 +81,22 @@ class AgentCommunication:
     timestamp: datetime
     communication_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     confidence_score: Optional[float] = None
+    _wire: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Wire format, built once since communications are never modified."""
+        if self._wire is None:
+            self._wire = {
+                "communication_id": self.communication_id,
+                "from_agent": self.from_agent,
+                "to_agent": self.to_agent,
+                "data_type": self.data_type,
+                "data_summary": self.data_summary,
+                "data_size": self.data_size,
+                "confidence_score": self.confidence_score,
+                "timestamp": self.timestamp.isoformat()
+            }
+        return self._wire
 
 
 @dataclass
@@ -64,6 +110,20 @@ class OutputChunk:
     is_complete: bool = False
     chunk_type: str = "text"  # "text", "analysis", "finding", "conclusion"
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    _wire: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Wire format, built once since chunks are never modified."""
+        if self._wire is None:
+            self._wire = {
+                "chunk_id": self.chunk_id,
+                "chunk_content": self.chunk_content,
+                "chunk_type": self.chunk_type,
+                "chunk_index": self.chunk_index,
+                "is_complete": self.is_complete,
+                "timestamp": self.timestamp.isoformat()
+            }
+        return self._wire
 
 
 @dataclass
@@ -77,15 +137,17 @@ class AgentState:
     start_time: Optional[datetime] = None
     complete_time: Optional[datetime] = None
     processing_data: Dict[str, Any] = field(default_factory=dict)
-    activities: List[Dict[str, Any]] = field(default_factory=list)
-    findings: List[str] = field(default_factory=list)
+    activities: List[Dict[str, Any]] = field(default_factory=RingBuffer)
+    findings: List[str] = field(default_factory=RingBuffer)
     confidence_score: Optional[float] = None
 
     # Phase 2 enhancements
-    output_chunks: List[OutputChunk] = field(default_factory=list)
+    output_chunks: List[OutputChunk] = field(default_factory=RingBuffer)
     full_output: Optional[str] = None
-    communications_sent: List[AgentCommunication] = field(default_factory=list)
-    communications_received: List[AgentCommunication] = field(default_factory=list)
+    # Characters cut from the start of full_output to keep it within its cap
+    full_output_dropped: int = 0
+    communications_sent: List[AgentCommunication] = field(default_factory=RingBuffer)
+    communications_received: List[AgentCommunication] = field(default_factory=RingBuffer)
     processing_stage: str = "idle"  # "initializing", "analyzing", "generating", "finalizing"
     estimated_completion: Optional[datetime] = None
 
@@ -100,29 +162,65 @@ class PipelineState:
     start_time: Optional[datetime] = None
     current_agent: Optional[str] = None
     overall_progress: float = 0.0
-    processed_logs: List[Dict[str, Any]] = field(default_factory=list)
-    global_findings: List[str] = field(default_factory=list)
+    processed_logs: List[Dict[str, Any]] = field(default_factory=RingBuffer)
+    global_findings: List[str] = field(default_factory=RingBuffer)
     error_message: Optional[str] = None
     agents: Dict[str, AgentState] = field(default_factory=dict)
 
     # Phase 2 enhancements
-    communications: List[AgentCommunication] = field(default_factory=list)
+    communications: List[AgentCommunication] = field(default_factory=RingBuffer)
     pipeline_config: Dict[str, Any] = field(default_factory=dict)
     execution_metadata: Dict[str, Any] = field(default_factory=dict)
     estimated_total_time: Optional[int] = None  # seconds
     pause_time: Optional[datetime] = None
     resume_time: Optional[datetime] = None
     pipeline_priority: int = 1  # 1=high, 2=medium, 3=low (for multi-pipeline support)
+    end_time: Optional[datetime] = None
 
 
 class PipelineStateManager:
     """Manages pipeline state and WebSocket connections."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_queue_size: int = WS_SEND_QUEUE_SIZE,
+        queue_policy: str = WS_QUEUE_POLICY,
+        send_timeout: float = WS_SEND_TIMEOUT_SECONDS,
+        retention: Optional[RetentionPolicy] = None,
+        bus: Optional[StateBus] = None,
+    ):
         self.pipelines: Dict[str, PipelineState] = {}
-        self.websocket_connections: Set[Any] = set()  # WebSocket connections
+        # WebSocket -> its outbound channel (bounded queue + writer task)
+        self.websocket_connections: Dict[Any, ClientConnection] = {}
+        # Topic filters of clients that asked for a subset of the messages
+        self.subscriptions = SubscriptionRegistry()
         self._lock = asyncio.Lock()
 
+        # Fan-out configuration and counters carried over from closed clients
+        self.max_queue_size = max_queue_size
+        self.queue_policy = queue_policy
+        self.send_timeout = send_timeout
+        self._closed_totals = {"sent": 0, "dropped": 0, "coalesced": 0, "evicted": 0}
+
+        # Last state document sent to clients per pipeline: {"version", "state"}.
+        # Pipelines run by other workers are mirrored here from the state bus.
+        self._published: Dict[str, Dict[str, Any]] = {}
+
+        # Pub/sub shared with other server workers
+        self.bus = bus or InProcessStateBus()
+        self.bus.attach(self._on_bus_message, self._on_bus_connected)
+        self._bus_started = False
+        self._sync_requested: Set[str] = set()
+
+        # Memory bounds: ring-buffer sizes, eviction of finished pipelines into
+        # summaries, and the optional archive of spilled chunks
+        self.retention = retention or RetentionPolicy()
+        self.archive = PipelineArchive(self.retention.archive_dir) if self.retention.archive_dir else None
+        self.pipeline_history: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._evicted_pipelines = 0
+        self._spilled_chunks = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
         # Initialize default agents
         self._agent_definitions = [
             ("Initial Analysis", AgentRole.ANALYST),  # Using ANALYST alias (same value as SIGNALS)
@@ -131,23 +229,62 @@ class PipelineStateManager:
             ("Solution Planning", AgentRole.MITIGATION)
         ]
 
+    async def start(self) -> None:
+        """Join the state bus and start the retention sweep; called lazily by the first pipeline or client."""
+        if not self._bus_started:
+            self._bus_started = True
+            await self.bus.start()
+            if self.retention.sweep_seconds > 0:
+                self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def close(self) -> None:
+        """Leave the state bus, stop the retention sweep and finish queued archive writes; called at shutdown."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+        if self.archive is not None:
+            await asyncio.to_thread(self.archive.close)
+        # Releases the bus socket and, on the broker's worker, the broker lock
+        await self.bus.close()
+        self._bus_started = False
+
     async def create_pipeline(self, pipeline_id: str, incident_id: str, severity: Severity) -> PipelineState:
         """Create a new pipeline instance."""
+        await self.start()
         async with self._lock:
+            self._evict_expired()
+
+            policy = self.retention
             pipeline_state = PipelineState(
                 pipeline_id=pipeline_id,
                 incident_id=incident_id,
                 severity=severity,
-                start_time=datetime.now(timezone.utc)
+                start_time=datetime.now(timezone.utc),
+                processed_logs=RingBuffer(policy.max_processed_logs),
+                global_findings=RingBuffer(policy.max_findings),
+                communications=RingBuffer(policy.max_communications),
             )
 
             # Initialize agents
             for agent_name, agent_role in self._agent_definitions:
                 pipeline_state.agents[agent_name] = AgentState(
                     name=agent_name,
-                    role=agent_role
+                    role=agent_role,
+                    activities=RingBuffer(policy.max_activities),
+                    findings=RingBuffer(policy.max_findings),
+                    output_chunks=RingBuffer(
+                        policy.max_output_chunks,
+                        on_evict=lambda chunks, name=agent_name: self._spill_chunks(pipeline_id, name, chunks),
+                    ),
+                    communications_sent=RingBuffer(policy.max_communications),
+                    communications_received=RingBuffer(policy.max_communications),
                 )
 
+            # A re-used id starts a new version line for clients
+            self._published.pop(pipeline_id, None)
+            self.pipeline_history.pop(pipeline_id, None)
             self.pipelines[pipeline_id] = pipeline_state
             await self._broadcast_update(pipeline_id, "pipeline_created")
             return pipeline_state
@@ -288,19 +425,74 @@ class PipelineStateManager:
             pipeline.status = PipelineStatus.COMPLETED if success else PipelineStatus.FAILED
             pipeline.overall_progress = 1.0
             pipeline.current_agent = None
+            pipeline.end_time = datetime.now(timezone.utc)
 
             if error_message:
                 pipeline.error_message = error_message
 
             await self._broadcast_update(pipeline_id, "pipeline_completed")
+            self._evict_expired()
+
+    async def add_websocket_connection(self, websocket: Any, topics: Optional[Topics] = None) -> None:
+        """
+        Add a WebSocket connection and send it a snapshot of every pipeline it receives.
 
-    async def add_websocket_connection(self, websocket: Any) -> None:
-        """Add a WebSocket connection."""
-        self.websocket_connections.add(websocket)
+        Args:
+            websocket: Accepted WebSocket
+            topics: Initial subscription (see ``parse_topics``); None receives everything
+        """
+        await self.start()
+        async with self._lock:
+            if websocket in self.websocket_connections:
+                return
+            self.subscriptions.add_client(websocket)
+            if topics:
+                self.subscriptions.subscribe(websocket, topics)
+            self.websocket_connections[websocket] = ClientConnection(
+                websocket,
+                max_queue=self.max_queue_size,
+                policy=self.queue_policy,
+                send_timeout=self.send_timeout,
+                on_close=self._forget_client,
+            )
+            await self._send_snapshots(websocket)
 
     async def remove_websocket_connection(self, websocket: Any) -> None:
-        """Remove a WebSocket connection."""
-        self.websocket_connections.discard(websocket)
+        """Remove a WebSocket connection and stop its writer task."""
+        client = self.websocket_connections.get(websocket)
+        if client is not None:
+            await client.aclose()
+
+    def _forget_client(self, client: ClientConnection) -> None:
+        """Drop a closed client and keep its counters in the totals."""
+        if self.websocket_connections.get(client.websocket) is client:
+            del self.websocket_connections[client.websocket]
+            self.subscriptions.remove_client(client.websocket)
+        self._closed_totals["sent"] += client.sent
+        self._closed_totals["dropped"] += client.dropped
+        self._closed_totals["coalesced"] += client.coalesced
+        if client.close_reason != "client disconnected":
+            self._closed_totals["evicted"] += 1
+            print(f"🗑️  Evicted WebSocket client: {client.close_reason}")
+
+    def get_broadcast_metrics(self) -> Dict[str, Any]:
+        """Queue depth, drop and eviction metrics for WebSocket fan-out."""
+        clients = [client.metrics() for client in self.websocket_connections.values()]
+        return {
+            "connections": len(clients),
+            "policy": self.queue_policy,
+            "max_queue_size": self.max_queue_size,
+            "send_timeout_seconds": self.send_timeout,
+            "queued": sum(client["depth"] for client in clients),
+            "max_depth": max((client["max_depth"] for client in clients), default=0),
+            "sent": self._closed_totals["sent"] + sum(client["sent"] for client in clients),
+            "dropped": self._closed_totals["dropped"] + sum(client["dropped"] for client in clients),
+            "coalesced": self._closed_totals["coalesced"] + sum(client["coalesced"] for client in clients),
+            "evicted": self._closed_totals["evicted"],
+            "state_bus": self.bus.metrics(),
+            "subscriptions": self.subscriptions.metrics(),
+            "clients": clients,
+        }
 
     async def broadcast_update(self, update: dict) -> None:
         """
@@ -309,25 +501,16 @@ class PipelineStateManager:
         This is a public method for sending custom messages (not tied to pipeline state).
         Used for streaming analysis, custom events, etc.
         """
-        if not self.websocket_connections:
+        if not self._has_audience():
             print("⚠️  No WebSocket connections to broadcast to")
             return
 
         print(f"📡 Broadcasting to {len(self.websocket_connections)} clients: {update.get('type', 'unknown')}")
 
-        disconnected = []
-        for websocket in self.websocket_connections:
-            try:
-                await websocket.send_json(update)
-                print(f"   ✅ Sent to WebSocket client")
-            except Exception as e:
-                print(f"   ❌ Failed to send to WebSocket: {e}")
-                disconnected.append(websocket)
-
-        # Remove disconnected clients
-        for ws in disconnected:
-            self.websocket_connections.discard(ws)
-            print(f"   🗑️  Removed disconnected WebSocket")
+        # Producers only enqueue; each client's writer task does the sending
+        item = OutboundMessage(update)
+        self._fan_out(item)
+        self.bus.publish(item)
 
     def get_pipeline_state(self, pipeline_id: str) -> Optional[PipelineState]:
         """Get current pipeline state."""
@@ -342,20 +525,25 @@ class PipelineStateManager:
         pipeline.overall_progress = total_progress / len(pipeline.agents)
 
     async def _broadcast_update(self, pipeline_id: str, event_type: str) -> None:
-        """Broadcast pipeline update to all connected WebSockets."""
-        if not self.websocket_connections:
+        """Broadcast the change to a pipeline as a versioned JSON Patch."""
+        if not self._has_audience():
             return
 
-        pipeline = self.pipelines.get(pipeline_id)
-        if not pipeline:
-            return
+        message = self._publish_state(pipeline_id, event_type)
+        if message is not None:
+            self._send_to_all(message)
 
-        # Convert pipeline state to WebSocket message format - Enhanced for Phase 2
-        message = {
-            "type": event_type,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "pipeline_id": pipeline_id,
+    def _state_document(self, pipeline: PipelineState) -> Dict[str, Any]:
+        """Build the JSON document clients mirror for a pipeline.
+
+        Lists are bounded views (last N entries) so that snapshots stay small,
+        and agent output is exposed as recent chunks plus its length rather
+        than the ever-growing concatenated text; the full text is served by
+        the agent output REST endpoint.
+        """
+        return {
             "status": pipeline.status.value,
+            "severity": pipeline.severity.value if pipeline.severity else None,
             "overall_progress": pipeline.overall_progress,
             "current_step": self._get_current_step_description(pipeline),
             "agents": [
@@ -366,51 +554,29 @@ class PipelineStateManager:
                     "message": agent.message,
                     "current_activity": agent.activities[-1]["description"] if agent.activities else None,
                     "activities": agent.activities[-5:],  # Last 5 activities
-                    "findings": agent.findings,
+                    "findings": list(agent.findings),
                     "confidence_score": agent.confidence_score,
-                    "processing_data": agent.processing_data,
+                    "processing_data": copy.deepcopy(agent.processing_data),
 
                     # Phase 2 enhancements
                     "processing_stage": agent.processing_stage,
-                    "full_output": agent.full_output,
-                    "output_chunks": [
-                        {
-                            "chunk_id": chunk.chunk_id,
-                            "chunk_content": chunk.chunk_content,
-                            "chunk_type": chunk.chunk_type,
-                            "chunk_index": chunk.chunk_index,
-                            "is_complete": chunk.is_complete,
-                            "timestamp": chunk.timestamp.isoformat()
-                        }
-                        for chunk in agent.output_chunks[-3:]  # Last 3 chunks
-                    ],
-                    "communications_sent": len(agent.communications_sent),
-                    "communications_received": len(agent.communications_received),
+                    "output_length": len(agent.full_output or "") + agent.full_output_dropped,
+                    "output_chunks": [chunk.to_dict() for chunk in agent.output_chunks[-3:]],  # Last 3 chunks
+                    "communications_sent": agent.communications_sent.total,
+                    "communications_received": agent.communications_received.total,
                     "estimated_completion": agent.estimated_completion.isoformat() if agent.estimated_completion else None
                 }
                 for agent in pipeline.agents.values()
             ],
             "recent_activities": self._get_recent_activities(pipeline),
-            "global_findings": pipeline.global_findings,
+            "global_findings": list(pipeline.global_findings),
             "processed_logs": pipeline.processed_logs[-10:],  # Last 10 log entries
             "error_message": pipeline.error_message,
 
             # Phase 2 enhancements
-            "communications": [
-                {
-                    "communication_id": comm.communication_id,
-                    "from_agent": comm.from_agent,
-                    "to_agent": comm.to_agent,
-                    "data_type": comm.data_type,
-                    "data_summary": comm.data_summary,
-                    "data_size": comm.data_size,
-                    "confidence_score": comm.confidence_score,
-                    "timestamp": comm.timestamp.isoformat()
-                }
-                for comm in pipeline.communications[-10:]  # Last 10 communications
-            ],
-            "pipeline_config": pipeline.pipeline_config,
-            "execution_metadata": pipeline.execution_metadata,
+            "communications": [comm.to_dict() for comm in pipeline.communications[-10:]],  # Last 10 communications
+            "pipeline_config": copy.deepcopy(pipeline.pipeline_config),
+            "execution_metadata": copy.deepcopy(pipeline.execution_metadata),
             "estimated_total_time": pipeline.estimated_total_time,
             "pipeline_priority": pipeline.pipeline_priority,
             "pause_time": pipeline.pause_time.isoformat() if pipeline.pause_time else None,
@@ -420,18 +586,270 @@ class PipelineStateManager:
             "active_pipelines": len(self.get_all_active_pipelines()),
         }
 
-        # Send to all connections
-        disconnected = set()
-        for websocket in self.websocket_connections:
+    def _publish_state(self, pipeline_id: str, event_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Advance the published version of a pipeline and describe the change.
+
+        Returns:
+            A snapshot message the first time a pipeline is published, a patch
+            message against the previous version afterwards, or None when the
+            state has not changed
+        """
+        pipeline = self.pipelines.get(pipeline_id)
+        if not pipeline:
+            return None
+
+        state = self._state_document(pipeline)
+        published = self._published.get(pipeline_id)
+
+        if published is None:
+            self._published[pipeline_id] = {"version": 1, "state": state}
+            return self._snapshot_message(pipeline_id, event_type)
+
+        patch = make_patch(published["state"], state)
+        if not patch:
+            return None
+
+        version = published["version"] + 1
+        published["version"] = version
+        published["state"] = state
+        return {
+            "type": event_type,
+            "kind": "patch",
+            "pipeline_id": pipeline_id,
+            "version": version,
+            "base_version": version - 1,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "patch": patch,
+        }
+
+    def _snapshot_message(self, pipeline_id: str, event_type: str = "pipeline_snapshot") -> Dict[str, Any]:
+        """Full-state message for the currently published version of a pipeline."""
+        published = self._published[pipeline_id]
+        return {
+            "type": event_type,
+            "kind": "snapshot",
+            "pipeline_id": pipeline_id,
+            "version": published["version"],
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "state": published["state"],
+        }
+
+    async def send_snapshot(self, websocket: Any, pipeline_id: Optional[str] = None) -> None:
+        """
+        Send full pipeline snapshots to a single client.
+
+        Used when a client subscribes and when it detects a version gap and
+        asks to resync. Any unpublished change is first broadcast as a patch to
+        the other clients so that every client stays on the same version line.
+
+        Args:
+            websocket: Client connection
+            pipeline_id: Pipeline to resync, or None for all pipelines
+        """
+        async with self._lock:
+            await self._send_snapshots(websocket, pipeline_id)
+
+    async def _send_snapshots(self, websocket: Any, pipeline_id: Optional[str] = None) -> None:
+        """Send snapshots to one client; the caller must hold ``self._lock``."""
+        # Pipelines run here, then those mirrored from other workers
+        pipeline_ids = [pipeline_id] if pipeline_id else list(dict.fromkeys([*self.pipelines, *self._published]))
+        for current_id in pipeline_ids:
+            pending = self._publish_state(current_id, "pipeline_state_synced")
+            if pending is not None:
+                self._send_to_all(pending, exclude=websocket)
+            client = self.websocket_connections.get(websocket)
+            if client is None or current_id not in self._published:
+                continue
+            if not self.subscriptions.wants(websocket, *self._pipeline_topics(current_id)):
+                continue
+            client.enqueue(OutboundMessage(self._snapshot_message(current_id), f"state:{current_id}"))
+
+    async def handle_client_message(self, websocket: Any, data: str) -> bool:
+        """
+        Handle a control message received from a WebSocket client.
+
+        Supported messages:
+            {"type": "resync", "pipeline_id": "<id or omitted for all>"}
+            {"type": "subscribe", "topics": {"pipeline": ["<id>"], "severity": ["SEV-1"], ...}}
+            {"type": "subscribe", "topics": ["pipeline:<id>", "agent:rca", ...]}
+            {"type": "unsubscribe", "subscription_id": "<id or omitted for all>"}
+
+        Subscribing is acknowledged with a ``subscribed`` message carrying the
+        subscription id, followed by snapshots of the pipelines the client
+        now receives.
+
+        Returns:
+            True if the message was recognised and handled
+        """
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(message, dict):
+            return False
+
+        if message.get("type") == "resync":
+            await self.send_snapshot(websocket, message.get("pipeline_id"))
+            return True
+        if message.get("type") == "subscribe":
+            await self._subscribe(websocket, message.get("topics"))
+            return True
+        if message.get("type") == "unsubscribe":
+            await self._unsubscribe(websocket, message.get("subscription_id"))
+            return True
+        return False
+
+    async def _subscribe(self, websocket: Any, spec: Any) -> None:
+        """Add a subscription for a client and send it the matching pipelines."""
+        async with self._lock:
+            client = self.websocket_connections.get(websocket)
+            if client is None:
+                return
             try:
-                await websocket.send_text(json.dumps(message))
-            except Exception:
-                # Mark for removal
-                disconnected.add(websocket)
+                topics = parse_topics(spec)
+            except ValueError as e:
+                client.enqueue(OutboundMessage({"type": "subscription_error", "error": str(e)}))
+                return
+            # An unfiltered client already receives every pipeline
+            was_filtered = self.subscriptions.is_filtered(websocket)
+            subscription = self.subscriptions.subscribe(websocket, topics)
+            client.enqueue(OutboundMessage({
+                "type": "subscribed",
+                **subscription.to_dict(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }))
+            if was_filtered:
+                await self._send_snapshots(websocket)
+
+    async def _unsubscribe(self, websocket: Any, subscription_id: Optional[str]) -> None:
+        """Remove one or all subscriptions of a client."""
+        async with self._lock:
+            client = self.websocket_connections.get(websocket)
+            if client is None:
+                return
+            removed = self.subscriptions.unsubscribe(websocket, subscription_id)
+            client.enqueue(OutboundMessage({
+                "type": "unsubscribed",
+                "subscription_id": subscription_id,
+                "removed": removed,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }))
+            if removed:
+                await self._send_snapshots(websocket)
+
+    def _send_to_all(self, message: Dict[str, Any], exclude: Any = None) -> None:
+        """Queue a pipeline state message for every client except ``exclude``."""
+        # Consecutive state messages of one pipeline can be merged in a full queue
+        item = OutboundMessage(message, f"state:{message['pipeline_id']}")
+        self._fan_out(item, exclude)
+        self.bus.publish(item)
+
+    def _fan_out(self, item: OutboundMessage, exclude: Any = None) -> None:
+        """Queue a message for every local client that wants it, except ``exclude``."""
+        if not self.subscriptions.active:
+            for websocket, client in list(self.websocket_connections.items()):
+                if websocket is not exclude:
+                    client.enqueue(item)
+            return
+
+        # Only the clients that want the message are visited
+        topics, is_state = message_topics(item.message, self._pipeline_severity(item.message.get("pipeline_id")))
+        for websocket in self.subscriptions.recipients(topics, is_state):
+            client = self.websocket_connections.get(websocket)
+            if client is not None and websocket is not exclude:
+                client.enqueue(item)
+
+    def _pipeline_severity(self, pipeline_id: Optional[str]) -> Optional[str]:
+        """Severity of a pipeline run here or mirrored from another worker."""
+        if pipeline_id is None:
+            return None
+        pipeline = self.pipelines.get(pipeline_id)
+        if pipeline is not None:
+            return pipeline.severity.value if pipeline.severity else None
+        published = self._published.get(pipeline_id)
+        if published is not None and isinstance(published.get("state"), dict):
+            return published["state"].get("severity")
+        return None
+
+    def _pipeline_topics(self, pipeline_id: str) -> Tuple[Topics, bool]:
+        """Topics and state flag under which a pipeline's state is published."""
+        return message_topics({"kind": "snapshot", "pipeline_id": pipeline_id}, self._pipeline_severity(pipeline_id))
+
+    def _has_audience(self) -> bool:
+        """Whether anyone, here or on another worker, can receive updates."""
+        return bool(self.websocket_connections) or self.bus.has_peers
+
+    # ==================== State Bus ====================
+
+    def _on_bus_connected(self) -> None:
+        """(Re)joined the bus: drop mirrors and ask every worker for snapshots."""
+        for pipeline_id in [pid for pid in self._published if pid not in self.pipelines]:
+            del self._published[pipeline_id]
+        self._sync_requested.clear()
+        self.bus.publish(OutboundMessage({"type": "state_bus_sync"}))
+
+    def _on_bus_message(self, message: Dict[str, Any], frame: str) -> None:
+        """Fan a message published by another worker out to local clients."""
+        if message.get("type") == "state_bus_sync":
+            self._republish(message.get("pipeline_id"))
+            return
+
+        pipeline_id = message.get("pipeline_id")
+        coalesce_key = None
+        if pipeline_id is not None and message.get("kind") in ("snapshot", "patch", "evicted"):
+            if pipeline_id in self.pipelines or not self._mirror(pipeline_id, message):
+                return
+            coalesce_key = f"state:{pipeline_id}"
+
+        # Reuse the sender's encoding instead of serialising again
+        self._fan_out(OutboundMessage(message, coalesce_key, _frame=frame))
+
+    def _mirror(self, pipeline_id: str, message: Dict[str, Any]) -> bool:
+        """
+        Track the published state of a pipeline run by another worker.
+
+        Returns:
+            True if the message should be forwarded to local clients
+        """
+        kind = message["kind"]
+        published = self._published.get(pipeline_id)
+
+        if kind == "evicted":
+            self._published.pop(pipeline_id, None)
+            self._sync_requested.discard(pipeline_id)
+            return True
 
-        # Remove disconnected sockets
-        for websocket in disconnected:
-            self.websocket_connections.discard(websocket)
+        if kind == "snapshot":
+            self._sync_requested.discard(pipeline_id)
+            if published is not None and published["version"] == message.get("version"):
+                return False
+            self._published[pipeline_id] = {"version": message.get("version"), "state": message.get("state")}
+            return True
+
+        if published is not None and published["version"] == message.get("base_version"):
+            try:
+                published["state"] = apply_patch(published["state"], message.get("patch", []))
+                published["version"] = message.get("version")
+                return True
+            except ValueError:
+                pass
+
+        # Missed an update: ask the owner for a snapshot and skip patches until then
+        self._published.pop(pipeline_id, None)
+        if pipeline_id not in self._sync_requested:
+            self._sync_requested.add(pipeline_id)
+            self.bus.publish(OutboundMessage({"type": "state_bus_sync", "pipeline_id": pipeline_id}))
+        return False
+
+    def _republish(self, pipeline_id: Optional[str] = None) -> None:
+        """Publish snapshots of pipelines run here for workers that lost track."""
+        pipeline_ids = [pipeline_id] if pipeline_id else list(self.pipelines)
+        for current_id in pipeline_ids:
+            if current_id in self.pipelines and current_id in self._published:
+                self.bus.publish(OutboundMessage(
+                    self._snapshot_message(current_id, "pipeline_state_synced"), f"state:{current_id}"
+                ))
 
     def _get_current_step_description(self, pipeline: PipelineState) -> str:
         """Get human-readable description of current pipeline step."""
@@ -452,8 +870,9 @@ class PipelineStateManager:
         """Get recent activities across all agents."""
         all_activities = []
 
+        # Activities are appended in time order, so only each agent's tail can be most recent
         for agent in pipeline.agents.values():
-            for activity in agent.activities:
+            for activity in agent.activities[-limit:]:
                 activity_with_agent = dict(activity)
                 activity_with_agent["agent_name"] = agent.name
                 all_activities.append(activity_with_agent)
@@ -527,7 +946,7 @@ class PipelineStateManager:
                 agent_name=agent_name,
                 chunk_id=str(uuid.uuid4()),
                 chunk_content=chunk_content,
-                chunk_index=len(agent.output_chunks),
+                chunk_index=agent.output_chunks.total,
                 total_chunks=total_chunks,
                 is_complete=is_complete,
                 chunk_type=chunk_type
@@ -535,11 +954,14 @@ class PipelineStateManager:
 
             agent.output_chunks.append(chunk)
 
-            # Update full output
-            if agent.full_output is None:
-                agent.full_output = chunk_content
-            else:
-                agent.full_output += chunk_content
+            # Update full output, keeping its newest part like the chunk
+            # window; chunks pushed out of the window are in the archive
+            full_output = (agent.full_output or "") + chunk_content
+            overflow = len(full_output) - self.retention.max_output_chars
+            if overflow > 0:
+                full_output = full_output[overflow:]
+                agent.full_output_dropped += overflow
+            agent.full_output = full_output
 
             await self._broadcast_update(pipeline_id, "agent_output_chunk")
 
@@ -633,10 +1055,13 @@ class PipelineStateManager:
         ]
 
     def get_pipeline_summary(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
-        """Get a summary of pipeline state for multi-pipeline dashboard."""
+        """Get a summary of pipeline state for multi-pipeline dashboard.
+
+        Evicted pipelines are answered from the summary history.
+        """
         pipeline = self.pipelines.get(pipeline_id)
         if not pipeline:
-            return None
+            return self.pipeline_history.get(pipeline_id)
 
         return {
             "pipeline_id": pipeline_id,
@@ -648,7 +1073,7 @@ class PipelineStateManager:
             "current_agent": pipeline.current_agent,
             "priority": pipeline.pipeline_priority,
             "agent_count": len(pipeline.agents),
-            "communications_count": len(pipeline.communications),
+            "communications_count": pipeline.communications.total,
             "error_message": pipeline.error_message
         }
 
@@ -662,6 +1087,179 @@ class PipelineStateManager:
             await self._broadcast_update(pipeline_id, "pipeline_priority_updated")
             return True
 
+    # ==================== Retention and Memory Accounting ====================
+
+    def _spill_chunks(self, pipeline_id: str, agent_name: str, chunks: List[OutputChunk]) -> None:
+        """Archive output chunks pushed out of an agent's ring buffer."""
+        self._spilled_chunks += len(chunks)
+        if self.archive is not None:
+            self.archive.write(pipeline_id, [
+                {"kind": "chunk", "agent_name": agent_name, **chunk.to_dict()}
+                for chunk in chunks
+            ])
+
+    def _summarize_pipeline(self, pipeline: PipelineState) -> Dict[str, Any]:
+        """Compact record of a finished pipeline kept after eviction."""
+        summary = self.get_pipeline_summary(pipeline.pipeline_id)
+        summary.update({
+            "end_time": pipeline.end_time.isoformat() if pipeline.end_time else None,
+            "findings": list(pipeline.global_findings[-10:]),
+            "findings_count": pipeline.global_findings.total,
+            "agents": {
+                name: {
+                    "status": agent.status.value,
+                    "confidence_score": agent.confidence_score,
+                    "output_length": len(agent.full_output or "") + agent.full_output_dropped,
+                    "output_chunks": agent.output_chunks.total,
+                }
+                for name, agent in pipeline.agents.items()
+            },
+            "archived": self.archive is not None,
+            "evicted": True,
+        })
+        return summary
+
+    def _evict_pipeline(self, pipeline_id: str) -> None:
+        """Replace a finished pipeline by its summary; the caller must hold ``self._lock``."""
+        pipeline = self.pipelines[pipeline_id]
+        summary = self._summarize_pipeline(pipeline)
+        del self.pipelines[pipeline_id]
+        self._published.pop(pipeline_id, None)
+
+        if self.archive is not None:
+            # Chunks still in the window, then each agent's full output
+            records = [
+                {"kind": "chunk", "agent_name": name, **chunk.to_dict()}
+                for name, agent in pipeline.agents.items()
+                for chunk in agent.output_chunks
+            ]
+            records.extend(
+                {"kind": "output", "agent_name": name, "full_output": agent.full_output}
+                for name, agent in pipeline.agents.items()
+                if agent.full_output
+            )
+            records.append({"kind": "summary", **summary})
+            self.archive.write(pipeline_id, records)
+
+        self.pipeline_history[pipeline_id] = summary
+        while len(self.pipeline_history) > self.retention.max_summaries:
+            self.pipeline_history.popitem(last=False)
+        self._evicted_pipelines += 1
+
+        if self._has_audience():
+            self._send_to_all({
+                "type": "pipeline_evicted",
+                "kind": "evicted",
+                "pipeline_id": pipeline_id,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "summary": summary,
+            })
+
+    def _evict_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        Evict finished pipelines past their retention period, and the oldest
+        finished pipelines beyond ``max_retained``.
+
+        The caller must hold ``self._lock``.
+
+        Returns:
+            Number of pipelines evicted
+        """
+        now = now or datetime.now(timezone.utc)
+        finished = sorted(
+            (
+                (pipeline.end_time, pipeline_id)
+                for pipeline_id, pipeline in self.pipelines.items()
+                if pipeline.end_time is not None
+                and pipeline.status in (PipelineStatus.COMPLETED, PipelineStatus.FAILED)
+            ),
+            key=lambda item: item[0],
+        )
+        overflow = max(0, len(finished) - self.retention.max_retained)
+        evicted = 0
+        for index, (end_time, pipeline_id) in enumerate(finished):
+            expired = (now - end_time).total_seconds() >= self.retention.retention_seconds
+            if index < overflow or expired:
+                self._evict_pipeline(pipeline_id)
+                evicted += 1
+        return evicted
+
+    async def evict_expired_pipelines(self) -> int:
+        """Apply the retention policy now; returns the number of evicted pipelines."""
+        async with self._lock:
+            return self._evict_expired()
+
+    async def _sweep_periodically(self) -> None:
+        """Apply the retention policy even while no pipeline starts or finishes."""
+        while True:
+            await asyncio.sleep(self.retention.sweep_seconds)
+            try:
+                await self.evict_expired_pipelines()
+            except Exception as e:
+                print(f"⚠️  Pipeline retention sweep failed: {e}")
+
+    def get_pipeline_history(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Summaries of evicted pipelines, most recent first."""
+        summaries = list(self.pipeline_history.values())
+        summaries.reverse()
+        return summaries[:limit] if limit > 0 else summaries
+
+    def get_memory_usage(self) -> Dict[str, Any]:
+        """
+        Memory accounting for pipeline state.
+
+        Byte figures are approximate (``sys.getsizeof`` over the object graph)
+        and meant for spotting growth, not exact attribution.
+        """
+        list_names = ("output_chunks", "activities", "findings", "communications_sent", "communications_received")
+        lists: Dict[str, Dict[str, int]] = {
+            name: {"items": 0, "evicted": 0}
+            for name in list_names + ("processed_logs", "global_findings", "communications")
+        }
+        pipelines = []
+        for pipeline_id, pipeline in self.pipelines.items():
+            buffers = [(name, getattr(pipeline, name)) for name in ("processed_logs", "global_findings", "communications")]
+            for agent in pipeline.agents.values():
+                buffers.extend((name, getattr(agent, name)) for name in list_names)
+            for name, buffer in buffers:
+                lists[name]["items"] += len(buffer)
+                lists[name]["evicted"] += getattr(buffer, "evicted", 0)
+            pipelines.append({
+                "pipeline_id": pipeline_id,
+                "status": pipeline.status.value,
+                "approx_bytes": deep_sizeof(pipeline),
+            })
+
+        return {
+            "process_rss_bytes": process_rss_bytes(),
+            "pipelines": {
+                "live": len(self.pipelines),
+                "active": len(self.get_all_active_pipelines()),
+                "evicted": self._evicted_pipelines,
+                "history": len(self.pipeline_history),
+                "approx_bytes": sum(item["approx_bytes"] for item in pipelines),
+                "largest": sorted(pipelines, key=lambda item: item["approx_bytes"], reverse=True)[:5],
+            },
+            "lists": lists,
+            "published_state_bytes": deep_sizeof(self._published),
+            "history_bytes": deep_sizeof(self.pipeline_history),
+            "queued_messages": sum(client.depth for client in self.websocket_connections.values()),
+            "spilled_chunks": self._spilled_chunks,
+            "archive": self.archive.stats() if self.archive is not None else None,
+            "retention": {
+                "max_output_chunks": self.retention.max_output_chunks,
+                "max_activities": self.retention.max_activities,
+                "max_communications": self.retention.max_communications,
+                "max_findings": self.retention.max_findings,
+                "max_processed_logs": self.retention.max_processed_logs,
+                "max_output_chars": self.retention.max_output_chars,
+                "retention_seconds": self.retention.retention_seconds,
+                "sweep_seconds": self.retention.sweep_seconds,
+                "max_retained": self.retention.max_retained,
+                "max_summaries": self.retention.max_summaries,
+            },
+        }
+
 
 # Global instance
 _pipeline_state_manager: Optional[PipelineStateManager] = None
@@ -671,5 +1269,5 @@ def get_pipeline_state_manager() -> PipelineStateManager:
     """Get global pipeline state manager instance."""
     global _pipeline_state_manager
     if _pipeline_state_manager is None:
-        _pipeline_state_manager = PipelineStateManager()
+        _pipeline_state_manager = PipelineStateManager(bus=create_state_bus())
     return _pipeline_state_manager
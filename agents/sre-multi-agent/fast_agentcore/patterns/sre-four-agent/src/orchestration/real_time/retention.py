@@ -0,0 +1,251 @@
+"""
+Memory bounds for pipeline state.
+
+Pipeline and agent lists are ring buffers that keep their newest entries,
+finished pipelines are evicted into compact summaries after a retention
+period, and output chunks pushed out of an agent's window can be spilled to an
+optional on-disk archive (one JSON Lines file per pipeline), written on a
+background thread.
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..four_agent.settings import (
+    PIPELINE_ARCHIVE_DIR,
+    PIPELINE_MAX_ACTIVITIES,
+    PIPELINE_MAX_COMMUNICATIONS,
+    PIPELINE_MAX_FINDINGS,
+    PIPELINE_MAX_OUTPUT_CHARS,
+    PIPELINE_MAX_OUTPUT_CHUNKS,
+    PIPELINE_MAX_PROCESSED_LOGS,
+    PIPELINE_MAX_RETAINED,
+    PIPELINE_MAX_SUMMARIES,
+    PIPELINE_RETENTION_SECONDS,
+    PIPELINE_SWEEP_SECONDS,
+)
+
+
+class RingBuffer(list):
+    """
+    List that keeps only its newest ``maxlen`` items.
+
+    It stays a ``list`` so existing slicing and iteration keep working.
+    ``total`` counts every item ever appended, including evicted ones, and
+    ``on_evict`` receives items as they are pushed out.
+    """
+
+    def __init__(
+        self,
+        maxlen: Optional[int] = None,
+        items: Iterable[Any] = (),
+        on_evict: Optional[Callable[[List[Any]], None]] = None,
+    ):
+        super().__init__()
+        if maxlen is not None and maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self.maxlen = maxlen
+        self.evicted = 0
+        self.on_evict = on_evict
+        self.extend(items)
+
+    @property
+    def total(self) -> int:
+        """Number of items ever appended."""
+        return len(self) + self.evicted
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self._trim()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        super().extend(items)
+        self._trim()
+
+    def __iadd__(self, items: Iterable[Any]) -> "RingBuffer":
+        self.extend(items)
+        return self
+
+    def _trim(self) -> None:
+        if self.maxlen is None or len(self) <= self.maxlen:
+            return
+        overflow = len(self) - self.maxlen
+        dropped = self[:overflow]
+        del self[:overflow]
+        self.evicted += overflow
+        if self.on_evict is not None:
+            self.on_evict(dropped)
+
+
+@dataclass
+class RetentionPolicy:
+    """Per-list capacities and eviction rules for ``PipelineStateManager``."""
+    max_output_chunks: int = PIPELINE_MAX_OUTPUT_CHUNKS
+    max_activities: int = PIPELINE_MAX_ACTIVITIES
+    max_communications: int = PIPELINE_MAX_COMMUNICATIONS
+    max_findings: int = PIPELINE_MAX_FINDINGS
+    max_processed_logs: int = PIPELINE_MAX_PROCESSED_LOGS
+    # Newest characters of an agent's full output kept in memory
+    max_output_chars: int = PIPELINE_MAX_OUTPUT_CHARS
+    # Seconds a finished pipeline stays in full detail before it is summarised
+    retention_seconds: float = PIPELINE_RETENTION_SECONDS
+    # Seconds between background applications of the policy; 0 applies it
+    # only when pipelines are created or completed
+    sweep_seconds: float = PIPELINE_SWEEP_SECONDS
+    # Finished pipelines kept in full detail regardless of age
+    max_retained: int = PIPELINE_MAX_RETAINED
+    # Summaries of evicted pipelines kept in the history
+    max_summaries: int = PIPELINE_MAX_SUMMARIES
+    archive_dir: Optional[str] = PIPELINE_ARCHIVE_DIR
+
+
+class PipelineArchive:
+    """Append-only JSON Lines archive of spilled chunks and evicted pipelines.
+
+    ``write`` only queues the records: a background thread appends them, so
+    callers holding the pipeline state lock never wait on the disk. Records
+    of one pipeline are written in the order they were queued.
+    """
+
+    def __init__(self, archive_dir: Union[Path, str]):
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.records_written = 0
+        self.bytes_written = 0
+        self._queue: "queue.Queue[Optional[Tuple[str, str, int]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    def path(self, pipeline_id: str) -> Path:
+        """Archive file of a pipeline."""
+        safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in pipeline_id)
+        return self.archive_dir / f"{safe_id}.jsonl"
+
+    def write(self, pipeline_id: str, records: List[Dict[str, Any]]) -> None:
+        """Queue records to be appended to a pipeline's archive file.
+
+        The records are serialised right away, so later changes to them are
+        not archived. Archive failures are reported and swallowed: losing
+        spilled history must never break a running pipeline.
+        """
+        if not records:
+            return
+        text = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._drain, name="pipeline-archive", daemon=True)
+                self._writer.start()
+            self._queue.put((pipeline_id, text, len(records)))
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._append(*item)
+            finally:
+                self._queue.task_done()
+
+    def _append(self, pipeline_id: str, text: str, count: int) -> None:
+        try:
+            with open(self.path(pipeline_id), "a", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as e:
+            print(f"⚠️  Failed to archive {count} records for {pipeline_id}: {e}")
+            return
+        self.records_written += count
+        self.bytes_written += len(text)
+
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the queued records and stop the writer thread."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            if writer is not None and writer.is_alive():
+                self._queue.put(None)
+        if writer is not None:
+            writer.join()
+
+    def read(self, pipeline_id: str) -> List[Dict[str, Any]]:
+        """Read back every archived record of a pipeline, once queued writes are done."""
+        self.flush()
+        path = self.path(pipeline_id)
+        if not path.exists():
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def stats(self) -> Dict[str, Any]:
+        """Archive location and write counters."""
+        return {
+            "archive_dir": str(self.archive_dir),
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+            "queued_writes": self._queue.unfinished_tasks,
+        }
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Approximate memory footprint of an object graph in bytes.
+
+    Follows containers and instance attributes; shared objects are counted a
+    single time and enum members not at all.
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, Enum):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.append(vars(current))
+    return size
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+__all__ = [
+    "PipelineArchive",
+    "RetentionPolicy",
+    "RingBuffer",
+    "deep_sizeof",
+    "process_rss_bytes",
+]
@@ -0,0 +1,375 @@
+"""
+Pub/sub between server workers sharing pipeline state.
+
+Each worker keeps its own ``PipelineStateManager`` and WebSocket clients. The
+worker running a pipeline publishes every outbound message once on the state
+bus; the other workers receive the already-encoded frame and fan it out to
+their own clients, and mirror pipeline state so they can serve snapshots.
+
+Backends:
+
+- ``InProcessStateBus`` (default): no other workers, or several managers in
+  one process sharing a group (useful for tests and benchmarks)
+- ``UnixSocketStateBus``: workers on one host exchange frames through a small
+  broker on a Unix socket. The first worker to start hosts the broker; when it
+  goes away another worker takes over and everyone resyncs.
+
+Wire format (Unix socket): one ``<origin>\\t<frame>\\n`` line per message,
+where ``frame`` is the compact JSON sent to browser clients.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from ..four_agent.settings import STATE_BUS_BACKEND, STATE_BUS_SOCKET
+from .client_channel import OutboundMessage
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows
+    FCNTL_AVAILABLE = False
+
+# Callback receiving a message published by another worker and its frame
+MessageHandler = Callable[[Dict[str, Any], str], None]
+
+# Longest line accepted on the socket (pipeline snapshots included)
+_LINE_LIMIT = 16 * 1024 * 1024
+
+
+class StateBus(ABC):
+    """Interface of a state bus backend."""
+
+    def __init__(self, worker_id: Optional[str] = None):
+        self.worker_id = worker_id or uuid.uuid4().hex[:12]
+        self._on_message: Optional[MessageHandler] = None
+        self._on_connected: Optional[Callable[[], None]] = None
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+
+    def attach(self, on_message: MessageHandler, on_connected: Optional[Callable[[], None]] = None) -> None:
+        """
+        Register the local consumer.
+
+        Args:
+            on_message: Called on the event loop for every message from another worker
+            on_connected: Called whenever the worker (re)joins the bus
+        """
+        self._on_message = on_message
+        self._on_connected = on_connected
+
+    @property
+    def has_peers(self) -> bool:
+        """Whether published messages may reach another worker."""
+        return False
+
+    async def start(self) -> None:
+        """Connect to the bus; safe to call more than once."""
+
+    @abstractmethod
+    def publish(self, item: OutboundMessage) -> None:
+        """Publish a message to every other worker without blocking."""
+
+    async def close(self) -> None:
+        """Leave the bus."""
+
+    def _deliver(self, frame: str) -> None:
+        if self._on_message is None:
+            return
+        try:
+            message = json.loads(frame)
+        except ValueError:
+            self.dropped += 1
+            return
+        self.received += 1
+        self._on_message(message, frame)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Backend name and message counters."""
+        return {
+            "backend": type(self).__name__,
+            "worker_id": self.worker_id,
+            "has_peers": self.has_peers,
+            "published": self.published,
+            "received": self.received,
+            "dropped": self.dropped,
+        }
+
+
+class InProcessStateBus(StateBus):
+    """State bus between managers of the same process.
+
+    A bus created without a group has no peers, so publishing is free; this
+    is the single-worker default.
+    """
+
+    def __init__(self, group: Optional[List["InProcessStateBus"]] = None, worker_id: Optional[str] = None):
+        super().__init__(worker_id)
+        self._group = group if group is not None else []
+        self._group.append(self)
+
+    @property
+    def has_peers(self) -> bool:
+        return len(self._group) > 1
+
+    def publish(self, item: OutboundMessage) -> None:
+        if not self.has_peers:
+            return
+        self.published += 1
+        loop = asyncio.get_running_loop()
+        for peer in self._group:
+            if peer is not self:
+                # Deliver on a later loop iteration, like a network hop
+                loop.call_soon(peer._deliver, item.frame)
+
+    async def close(self) -> None:
+        if self in self._group:
+            self._group.remove(self)
+
+
+class _SocketBroker:
+    """Relays lines from each connected worker to all the others."""
+
+    def __init__(self, path: str, max_buffer_bytes: int):
+        self.path = path
+        self.max_buffer_bytes = max_buffer_bytes
+        self._peers: Set[asyncio.StreamWriter] = set()
+        self._handlers: Set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.evicted = 0
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Stale socket of a broker that went away
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path, limit=_LINE_LIMIT)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._peers.add(writer)
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                for peer in list(self._peers):
+                    if peer is writer:
+                        continue
+                    if peer.transport.get_write_buffer_size() > self.max_buffer_bytes:
+                        # A worker that stopped reading reconnects and resyncs
+                        self._peers.discard(peer)
+                        peer.close()
+                        self.evicted += 1
+                        continue
+                    peer.write(line)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._handlers.discard(handler)
+            self._peers.discard(writer)
+            writer.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for peer in list(self._peers):
+            peer.close()
+        self._peers.clear()
+        # wait_closed() does not wait for connection handlers; with their
+        # connections closed they read EOF and return
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class UnixSocketStateBus(StateBus):
+    """State bus between workers on one host through a Unix-socket broker."""
+
+    def __init__(
+        self,
+        path: str = STATE_BUS_SOCKET,
+        *,
+        worker_id: Optional[str] = None,
+        connect_timeout: float = 5.0,
+        retry_delay: float = 0.5,
+        max_buffer_bytes: int = 8 * 1024 * 1024,
+    ):
+        """
+        Initialize the bus.
+
+        Args:
+            path: Socket path shared by all workers
+            worker_id: Identifier of this worker (random by default)
+            connect_timeout: Seconds ``start`` waits for the first connection
+            retry_delay: Seconds between reconnection attempts
+            max_buffer_bytes: Unsent bytes after which a peer or this worker's
+                outgoing messages are dropped
+        """
+        super().__init__(worker_id)
+        self.path = path
+        self.connect_timeout = connect_timeout
+        self.retry_delay = retry_delay
+        self.max_buffer_bytes = max_buffer_bytes
+
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._broker: Optional[_SocketBroker] = None
+        self._lock_fd: Optional[int] = None
+        self._closed = False
+        self.connections = 0
+
+    @property
+    def has_peers(self) -> bool:
+        # Other workers are not tracked; a connected bus is assumed to have some
+        return self._writer is not None
+
+    @property
+    def is_broker(self) -> bool:
+        """True if this worker hosts the broker."""
+        return self._broker is not None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintain())
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=self.connect_timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️  State bus not connected after {self.connect_timeout}s; retrying in the background")
+
+    def publish(self, item: OutboundMessage) -> None:
+        writer = self._writer
+        if writer is None or writer.transport.get_write_buffer_size() > self.max_buffer_bytes:
+            self.dropped += 1
+            return
+        writer.write(f"{self.worker_id}\t{item.frame}\n".encode("utf-8"))
+        self.published += 1
+
+    async def _maintain(self) -> None:
+        """Keep a connection to the broker, hosting it when nobody else does."""
+        while not self._closed:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path, limit=_LINE_LIMIT)
+            except (FileNotFoundError, ConnectionRefusedError):
+                if not await self._try_host_broker():
+                    await asyncio.sleep(self.retry_delay)
+                continue
+            except OSError as e:
+                print(f"⚠️  State bus connection failed: {e}")
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            self._writer = writer
+            self.connections += 1
+            self._connected.set()
+            if self._on_connected is not None:
+                self._on_connected()
+            try:
+                await self._read(reader)
+            finally:
+                self._writer = None
+                self._connected.clear()
+                writer.close()
+            if not self._closed:
+                print("⚠️  State bus connection lost; reconnecting")
+                await asyncio.sleep(self.retry_delay)
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            try:
+                line = await reader.readline()
+            except (ConnectionError, ValueError):
+                return
+            if not line:
+                return
+            origin, _, frame = line.decode("utf-8").rstrip("\n").partition("\t")
+            if origin != self.worker_id and frame:
+                self._deliver(frame)
+
+    async def _try_host_broker(self) -> bool:
+        """Start the broker unless another worker is already starting one."""
+        if self._broker is not None:
+            return False
+        if FCNTL_AVAILABLE:
+            fd = os.open(f"{self.path}.lock", os.O_CREAT | os.O_RDWR, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._lock_fd = fd
+
+        broker = _SocketBroker(self.path, self.max_buffer_bytes)
+        try:
+            await broker.start()
+        except OSError as e:
+            print(f"⚠️  Could not start state bus broker at {self.path}: {e}")
+            self._release_lock()
+            return False
+        self._broker = broker
+        print(f"📡 Worker {self.worker_id} hosting state bus broker at {self.path}")
+        return True
+
+    def _release_lock(self) -> None:
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._writer is not None:
+            self._writer.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._broker is not None:
+            await self._broker.close()
+            self._broker = None
+        self._release_lock()
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics = super().metrics()
+        metrics.update({
+            "path": self.path,
+            "connected": self._writer is not None,
+            "connections": self.connections,
+            "is_broker": self.is_broker,
+            "evicted_peers": self._broker.evicted if self._broker is not None else 0,
+        })
+        return metrics
+
+
+def create_state_bus(backend: str = STATE_BUS_BACKEND, socket_path: str = STATE_BUS_SOCKET) -> StateBus:
+    """
+    Create the configured state bus backend.
+
+    Args:
+        backend: ``memory`` or ``unix``
+        socket_path: Socket path for the ``unix`` backend
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "memory":
+        return InProcessStateBus()
+    if backend == "unix":
+        return UnixSocketStateBus(socket_path)
+    raise ValueError(f"Unknown state bus backend '{backend}'. Valid options: ['memory', 'unix']")
+
+
+__all__ = [
+    "InProcessStateBus",
+    "StateBus",
+    "UnixSocketStateBus",
+    "create_state_bus",
+]
@@ -0,0 +1,314 @@
+"""
+Topic subscriptions for WebSocket clients.
+
+A client narrows what it receives by subscribing to topics along four
+dimensions: ``pipeline`` (pipeline id), ``agent`` (agent key or display name),
+``type`` (message type) and ``severity``. Within one subscription every
+dimension given must match (AND, any of the listed values); a client holding
+several subscriptions receives the union (OR). A client without subscriptions
+receives everything, as before.
+
+Versioned pipeline state messages (snapshots, patches, evictions) must reach a
+client without gaps, so they are matched on ``pipeline`` and ``severity`` only:
+the agent dimension is ignored and their type is always ``pipeline_state``.
+
+Subscriptions are indexed by one of their topics, so finding the recipients of
+a message costs one dictionary lookup per topic of the message plus a check of
+the candidates, rather than a scan of every client.
+"""
+
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+# Dimensions in the order subscriptions are indexed by (most selective first)
+TOPIC_DIMENSIONS = ("pipeline", "severity", "type", "agent")
+
+# Message kinds carrying versioned pipeline state
+STATE_KINDS = frozenset({"snapshot", "patch", "evicted"})
+
+# Message type under which state messages are matched
+STATE_TYPE = "pipeline_state"
+
+Topics = Dict[str, FrozenSet[str]]
+
+
+def normalize_topic(dimension: str, value: Any) -> str:
+    """
+    Canonical form of a topic value.
+
+    Pipeline ids are kept as given; other values are case-insensitive and
+    severities accept either spelling (``SEV-1`` or ``SEV_1``).
+    """
+    if isinstance(value, Enum):
+        value = value.value
+    text = str(value).strip()
+    if dimension == "pipeline":
+        return text
+    text = text.lower()
+    if dimension == "severity":
+        text = text.replace("_", "-")
+    return text
+
+
+def parse_topics(spec: Union[Mapping[str, Any], Iterable[str], None]) -> Topics:
+    """
+    Parse a subscription request into topic sets.
+
+    Accepts ``{"pipeline": ["p1"], "severity": "SEV-1"}`` or a list of
+    ``"dimension:value"`` strings such as ``["pipeline:p1", "agent:rca"]``.
+
+    Raises:
+        ValueError: If a dimension is unknown, a value is empty, or no topic
+            is given
+    """
+    values: Dict[str, Set[str]] = defaultdict(set)
+
+    if isinstance(spec, Mapping):
+        for dimension, raw in spec.items():
+            items = [raw] if isinstance(raw, (str, Enum)) or not isinstance(raw, Iterable) else raw
+            for item in items:
+                values[dimension].add(item)
+    elif isinstance(spec, Iterable) and not isinstance(spec, str):
+        for entry in spec:
+            dimension, separator, value = str(entry).partition(":")
+            if not separator:
+                raise ValueError(f"Topic '{entry}' must be written as 'dimension:value'")
+            values[dimension.strip()].add(value)
+    else:
+        raise ValueError("Topics must be an object of dimension -> values or a list of 'dimension:value' strings")
+
+    topics: Topics = {}
+    for dimension, raw_values in values.items():
+        if dimension not in TOPIC_DIMENSIONS:
+            raise ValueError(f"Unknown topic dimension '{dimension}'. Valid options: {list(TOPIC_DIMENSIONS)}")
+        normalized = frozenset(normalize_topic(dimension, value) for value in raw_values)
+        if "" in normalized:
+            raise ValueError(f"Empty value for topic dimension '{dimension}'")
+        if normalized:
+            topics[dimension] = normalized
+
+    if not topics:
+        raise ValueError("A subscription needs at least one topic")
+    return topics
+
+
+def topics_from_query(params: Mapping[str, str]) -> Optional[Topics]:
+    """
+    Topics given as WebSocket URL query parameters.
+
+    ``/ws/pipeline?pipeline=p1,p2&severity=SEV-1`` subscribes to two pipelines
+    at severity SEV-1. Returns None when no dimension is present.
+
+    Raises:
+        ValueError: If a value is invalid
+    """
+    spec = {
+        dimension: [value for value in params[dimension].split(",") if value.strip()]
+        for dimension in TOPIC_DIMENSIONS
+        if params.get(dimension)
+    }
+    return parse_topics(spec) if spec else None
+
+
+def message_topics(message: Mapping[str, Any], severity: Any = None) -> Tuple[Topics, bool]:
+    """
+    Topics a message is published under.
+
+    Args:
+        message: Outbound message
+        severity: Severity of the message's pipeline, used when the message
+            does not carry one
+
+    Returns:
+        The topics and whether the message is a versioned state message
+    """
+    is_state = message.get("kind") in STATE_KINDS and message.get("pipeline_id") is not None
+    topics: Topics = {}
+
+    if message.get("pipeline_id") is not None:
+        topics["pipeline"] = frozenset({normalize_topic("pipeline", message["pipeline_id"])})
+
+    severity = message.get("severity", severity)
+    if severity is not None:
+        topics["severity"] = frozenset({normalize_topic("severity", severity)})
+
+    if is_state:
+        topics["type"] = frozenset({STATE_TYPE})
+        return topics, True
+
+    if message.get("type") is not None:
+        topics["type"] = frozenset({normalize_topic("type", message["type"])})
+
+    agents = {normalize_topic("agent", message[key]) for key in ("agent", "agent_name") if message.get(key)}
+    if agents:
+        topics["agent"] = frozenset(agents)
+    return topics, False
+
+
+@dataclass(frozen=True, eq=False)
+class Subscription:
+    """One client's interest: every dimension given must match.
+
+    Compared and hashed by identity so it can live in the topic index.
+    """
+    subscription_id: str
+    client: Any
+    topics: Topics
+
+    @property
+    def anchor(self) -> Tuple[str, FrozenSet[str]]:
+        """Dimension the subscription is indexed by, with its values."""
+        for dimension in TOPIC_DIMENSIONS:
+            if dimension in self.topics:
+                return dimension, self.topics[dimension]
+        raise ValueError("Subscription has no topics")
+
+    def matches(self, topics: Topics, is_state: bool = False) -> bool:
+        """Whether a message published under ``topics`` is wanted."""
+        for dimension, wanted in self.topics.items():
+            if is_state and dimension == "agent":
+                continue
+            values = topics.get(dimension)
+            if not values or wanted.isdisjoint(values):
+                return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "subscription_id": self.subscription_id,
+            "topics": {dimension: sorted(values) for dimension, values in self.topics.items()},
+        }
+
+
+class SubscriptionRegistry:
+    """Clients and their subscriptions, indexed by topic."""
+
+    def __init__(self):
+        self._index: Dict[Tuple[str, str], Set[Subscription]] = defaultdict(set)
+        self._by_client: Dict[Any, Dict[str, Subscription]] = {}
+        # Connected clients without subscriptions; they receive everything
+        self._unfiltered: Set[Any] = set()
+        # Subscriptions constrained by agent only; state messages ignore that
+        # dimension, so these receive the state of every pipeline
+        self._agent_only: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._by_client.values())
+
+    @property
+    def active(self) -> bool:
+        """True if any client holds a subscription."""
+        return bool(self._by_client)
+
+    def add_client(self, client: Any) -> None:
+        """Register a connected client; it receives everything until it subscribes."""
+        if client not in self._by_client:
+            self._unfiltered.add(client)
+
+    def is_filtered(self, client: Any) -> bool:
+        """True if the client holds at least one subscription."""
+        return client in self._by_client
+
+    def subscriptions(self, client: Any) -> List[Subscription]:
+        """Subscriptions held by a client."""
+        return list(self._by_client.get(client, {}).values())
+
+    def subscribe(self, client: Any, topics: Topics) -> Subscription:
+        """Add a subscription for a client."""
+        subscription = Subscription(f"sub-{next(self._ids)}", client, dict(topics))
+        dimension, values = subscription.anchor
+        for value in values:
+            self._index[(dimension, value)].add(subscription)
+        if dimension == "agent":
+            self._agent_only.add(subscription)
+        self._by_client.setdefault(client, {})[subscription.subscription_id] = subscription
+        self._unfiltered.discard(client)
+        return subscription
+
+    def unsubscribe(self, client: Any, subscription_id: Optional[str] = None) -> int:
+        """
+        Remove one subscription of a client, or all of them.
+
+        Returns:
+            Number of subscriptions removed
+        """
+        owned = self._by_client.get(client)
+        if not owned:
+            return 0
+        if subscription_id is None:
+            removed = list(owned.values())
+        elif subscription_id in owned:
+            removed = [owned[subscription_id]]
+        else:
+            return 0
+
+        for subscription in removed:
+            del owned[subscription.subscription_id]
+            dimension, values = subscription.anchor
+            for value in values:
+                bucket = self._index.get((dimension, value))
+                if bucket is not None:
+                    bucket.discard(subscription)
+                    if not bucket:
+                        del self._index[(dimension, value)]
+            self._agent_only.discard(subscription)
+        if not owned:
+            del self._by_client[client]
+            self._unfiltered.add(client)
+        return len(removed)
+
+    def remove_client(self, client: Any) -> None:
+        """Forget a disconnected client and its subscriptions."""
+        self.unsubscribe(client)
+        self._unfiltered.discard(client)
+
+    def wants(self, client: Any, topics: Topics, is_state: bool = False) -> bool:
+        """Whether a client receives a message published under ``topics``."""
+        owned = self._by_client.get(client)
+        if owned is None:
+            return True
+        return any(subscription.matches(topics, is_state) for subscription in owned.values())
+
+    def recipients(self, topics: Topics, is_state: bool = False) -> Set[Any]:
+        """Clients that receive a message: unfiltered ones and matching subscribers."""
+        if not self._by_client:
+            return set(self._unfiltered)
+        candidates: Set[Subscription] = set()
+        for dimension, values in topics.items():
+            for value in values:
+                bucket = self._index.get((dimension, value))
+                if bucket:
+                    candidates.update(bucket)
+        if is_state:
+            candidates.update(self._agent_only)
+        matched = {
+            subscription.client
+            for subscription in candidates
+            if subscription.matches(topics, is_state)
+        }
+        return matched | self._unfiltered
+
+    def metrics(self) -> Dict[str, Any]:
+        """Subscription counts."""
+        return {
+            "filtered_clients": len(self._by_client),
+            "unfiltered_clients": len(self._unfiltered),
+            "subscriptions": len(self),
+            "index_keys": len(self._index),
+        }
+
+
+__all__ = [
+    "STATE_TYPE",
+    "Subscription",
+    "SubscriptionRegistry",
+    "TOPIC_DIMENSIONS",
+    "message_topics",
+    "normalize_topic",
+    "parse_topics",
+    "topics_from_query",
+]
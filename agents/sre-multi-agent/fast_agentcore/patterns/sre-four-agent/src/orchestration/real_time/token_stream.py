@@ -0,0 +1,154 @@
+"""
+Micro-batched forwarding of streamed LLM deltas.
+
+Bedrock streams deltas from the runner's worker thread. ``TokenStreamBatcher``
+hands them to the event loop through an asyncio queue and forwards them to an
+async sink in batches, flushed by time or size, so clients see output as the
+model produces it without one WebSocket message per token. The first delta of
+a stream is flushed immediately, so time-to-first-visible-token tracks the
+model's own time-to-first-token.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..four_agent.settings import TOKEN_STREAM_FLUSH_MS, TOKEN_STREAM_MAX_BYTES
+
+# Queue marker asking the forwarding task to flush and stop
+_CLOSE = object()
+
+
+class TokenStreamBatcher:
+    """Forward text deltas to an async sink in time- and size-bounded batches."""
+
+    def __init__(
+        self,
+        sink: Callable[[str, bool], Awaitable[None]],
+        *,
+        flush_interval_ms: int = TOKEN_STREAM_FLUSH_MS,
+        max_bytes: int = TOKEN_STREAM_MAX_BYTES,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        """
+        Initialize the batcher and start its forwarding task.
+
+        Must be created on the event loop thread.
+
+        Args:
+            sink: Coroutine called with (batched text, is_final)
+            flush_interval_ms: Longest time a delta waits for more deltas
+            max_bytes: Pending UTF-8 size that triggers an immediate flush
+            loop: Event loop the sink runs on (defaults to the running loop)
+        """
+        self._sink = sink
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_bytes = max_bytes
+        self._loop = loop or asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+
+        # Metrics
+        self.deltas = 0
+        self.batches = 0
+        self.bytes = 0
+        self._first_delta_at: Optional[float] = None
+        self._first_flush_at: Optional[float] = None
+
+        self._task = self._loop.create_task(self._run())
+
+    @property
+    def streamed(self) -> bool:
+        """True once at least one delta has been forwarded."""
+        return self.batches > 0
+
+    def feed(self, text: str) -> None:
+        """Queue a delta; safe to call from any thread."""
+        if not text or self._closed:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(text)
+        else:
+            self._loop.call_soon_threadsafe(self._put, text)
+
+    def _put(self, text: str) -> None:
+        if self._first_delta_at is None:
+            self._first_delta_at = time.perf_counter()
+        self.deltas += 1
+        self._queue.put_nowait(text)
+
+    async def aclose(self) -> None:
+        """Flush pending deltas, send the final batch and stop forwarding."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put_nowait(_CLOSE)
+        await self._task
+
+    async def _run(self) -> None:
+        first = True
+        closing = False
+        while not closing:
+            item = await self._queue.get()
+            if item is _CLOSE:
+                await self._flush([], final=True)
+                return
+
+            parts: List[str] = [item]
+            size = len(item.encode("utf-8"))
+
+            # Later deltas wait briefly for company; the first goes out at once
+            if not first:
+                deadline = self._loop.time() + self.flush_interval
+                while size < self.max_bytes:
+                    if self._queue.empty():
+                        remaining = deadline - self._loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(self._queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    else:
+                        item = self._queue.get_nowait()
+                    if item is _CLOSE:
+                        closing = True
+                        break
+                    parts.append(item)
+                    size += len(item.encode("utf-8"))
+
+            first = False
+            await self._flush(parts, final=closing)
+
+    async def _flush(self, parts: List[str], final: bool) -> None:
+        # A final flush with nothing pending only matters if something was sent
+        if not parts and not (final and self.streamed):
+            return
+        text = "".join(parts)
+        self.batches += 1
+        self.bytes += len(text.encode("utf-8"))
+        if self._first_flush_at is None:
+            self._first_flush_at = time.perf_counter()
+        try:
+            await self._sink(text, final)
+        except Exception as e:
+            # A failed broadcast must not stop the stream or the agent
+            print(f"⚠️  Token stream sink failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Delta/batch counters and the batching delay of the first delta."""
+        first_delay_ms = None
+        if self._first_delta_at is not None and self._first_flush_at is not None:
+            first_delay_ms = round((self._first_flush_at - self._first_delta_at) * 1000, 3)
+        return {
+            "deltas": self.deltas,
+            "batches": self.batches,
+            "bytes": self.bytes,
+            "first_delta_delay_ms": first_delay_ms,
+        }
+
+
+__all__ = ["TokenStreamBatcher"]
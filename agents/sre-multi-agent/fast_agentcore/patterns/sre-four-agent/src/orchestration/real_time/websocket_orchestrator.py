@@ -12,6 +12,7 @@ from typing import Any
 
 from ..four_agent.analyst_agent import AnalystAgent
 from ..four_agent.impact_agent import ImpactAgent
+from ..four_agent.llm import token_sink
 from ..four_agent.mitigation_agent import MitigationCommsAgent
 from ..four_agent.orchestrator import PhaseTwoOrchestrator, PhaseTwoResult
 from ..four_agent.rca_agent import RCAAgent
@@ -19,6 +20,7 @@ from ..four_agent.scenario_loader import ScenarioSnapshot
 from ..four_agent.summary import SummaryExporter
 from ..four_agent.transcript import TranscriptLogger
 from .pipeline_state_manager import AgentStatus, get_pipeline_state_manager
+from .token_stream import TokenStreamBatcher
 
 
 class WebSocketOrchestrator:
@@ -80,6 +82,8 @@ class WebSocketOrchestrator:
             "impact": "Impact Assessment",
             "mitigation": "Solution Planning",
         }
+        # Live LLM token streams per agent name, open while the orchestrator runs
+        self._token_streams: dict[str, TokenStreamBatcher] = {}
 
     async def run_with_websocket_updates(
         self, snapshot: ScenarioSnapshot, pipeline_id: str | None = None
@@ -127,7 +131,7 @@ class WebSocketOrchestrator:
 
             try:
                 # Run the base orchestrator (this blocks until complete)
-                result = await self.orchestrator.run(snapshot)
+                result = await self._run_orchestrator(snapshot)
                 print(f"✅ Orchestrator finished for pipeline {pipeline_id}")
             finally:
                 # Stop polling
@@ -150,6 +154,43 @@ class WebSocketOrchestrator:
                 )
             raise
 
+    async def _run_orchestrator(self, snapshot: ScenarioSnapshot) -> PhaseTwoResult:
+        """Run the base orchestrator, streaming agents' LLM deltas to clients as they arrive."""
+        self._token_streams = {
+            agent_name: self._open_token_stream(agent_name)
+            for agent_name in self._agent_name_mapping.values()
+        }
+        try:
+            with token_sink(self._forward_token):
+                return await self.orchestrator.run(snapshot)
+        finally:
+            streams, self._token_streams = self._token_streams, {}
+            for stream in streams.values():
+                await stream.aclose()
+
+    def _open_token_stream(self, agent_name: str) -> TokenStreamBatcher:
+        """Create the batcher forwarding one agent's deltas as output chunks."""
+        pipeline_id = self.pipeline_id
+
+        async def send(text: str, is_final: bool) -> None:
+            if pipeline_id:
+                await self.pipeline_manager.stream_agent_output_chunk(
+                    pipeline_id=pipeline_id,
+                    agent_name=agent_name,
+                    chunk_content=text,
+                    chunk_type="token",
+                    is_complete=is_final,
+                )
+
+        return TokenStreamBatcher(send)
+
+    def _forward_token(self, role: str, text: str) -> None:
+        """Token sink: route an agent's streamed delta to its batcher (any thread)."""
+        agent_name = self._agent_name_mapping.get(str(role).lower())
+        stream = self._token_streams.get(agent_name) if agent_name else None
+        if stream is not None:
+            stream.feed(text)
+
     async def _run_with_monitoring(self, snapshot: ScenarioSnapshot) -> PhaseTwoResult:
         """Run the orchestrator with agent monitoring."""
 
@@ -191,7 +232,7 @@ class WebSocketOrchestrator:
 
         try:
             # Run the orchestrator
-            return await self.orchestrator.run(snapshot)
+            return await self._run_orchestrator(snapshot)
         finally:
             # Restore original methods
             self.orchestrator._analyst_node = original_analyst_node
@@ -367,8 +408,18 @@ class WebSocketOrchestrator:
                         details_str = str(details)
                         full_output += f"## Detailed Analysis\n{details_str}\n\n"
 
-        # Stream the full output in chunks for better UX
-        if full_output:
+        # Close the live token stream; its final batch is the completion
+        # marker when tokens were streamed, otherwise the formatted report
+        # is sent in slices
+        live_stream = self._token_streams.get(agent_name)
+        streamed_live = False
+        if live_stream is not None:
+            await live_stream.aclose()
+            streamed_live = live_stream.streamed
+            # Agents may be invoked again later in the same run
+            self._token_streams[agent_name] = self._open_token_stream(agent_name)
+
+        if full_output and not streamed_live:
             await self._stream_agent_output_in_chunks(agent_name, full_output)
 
         # BROADCAST to WebSocket clients
@@ -420,7 +471,7 @@ class WebSocketOrchestrator:
     async def _stream_agent_output_in_chunks(
         self, agent_name: str, full_output: str
     ) -> None:
-        """Stream agent output in chunks for better UX."""
+        """Send agent output produced without live token streaming in slices."""
         chunk_size = 200  # characters per chunk
         chunks = [
             full_output[i : i + chunk_size]
@@ -436,8 +487,6 @@ class WebSocketOrchestrator:
                 is_complete=(i == len(chunks) - 1),
                 total_chunks=len(chunks),
             )
-            # Small delay for realistic streaming effect
-            await asyncio.sleep(0.1)
 
     async def _track_agent_handoff(
         self, current_agent_key: str, result: Any, findings: list[str]
@@ -565,7 +614,7 @@ class WebSocketOrchestrator:
 
             try:
                 # Run base orchestrator (this blocks until complete)
-                result = await self.orchestrator.run(snapshot)
+                result = await self._run_orchestrator(snapshot)
                 print("🔵 Base orchestrator.run() completed successfully")
                 print(f"🔵 Result type: {type(result)}")
             except Exception as e:
@@ -13,23 +13,23 @@ Version: 1.0.1 - Fixed auth import
 import os
 import sys
 import traceback
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import AsyncIterator, Dict, Any
 
-from bedrock_agentcore.runtime import BedrockAgentCoreApp, RequestContext
+from bedrock_agentcore.runtime import BedrockAgentCoreApp, PingStatus, RequestContext
 from langgraph_checkpoint_aws import AgentCoreMemorySaver
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
 from orchestration.four_agent.orchestrator import PhaseTwoOrchestrator
-from orchestration.four_agent.analyst_agent import AnalystAgent
-from orchestration.four_agent.rca_agent import RCAAgent
-from orchestration.four_agent.impact_agent import ImpactAgent
-from orchestration.four_agent.mitigation_agent import MitigationCommsAgent
+from orchestration.four_agent.agent_pool import AgentPool
 from orchestration.four_agent.scenario_loader import ScenarioSnapshot, ScenarioMetadata, TimeWindow
 from orchestration.four_agent.schema import Severity
 from orchestration.four_agent.bedrock_kb_reader import get_kb_retrievals, clear_kb_retrievals
+from orchestration.four_agent.settings import AGENT_POOL_WARMUP
 
 
 def extract_user_id_from_context(context: RequestContext) -> str:
@@ -50,40 +50,49 @@ def extract_user_id_from_context(context: RequestContext) -> str:
     except Exception:
         return 'anonymous'
 
-app = BedrockAgentCoreApp()
+# Agents, knowledge readers and AWS clients live for the whole process; each
+# request leases an orchestrator and gets its own IncidentState
+agent_pool = AgentPool()
 
 
-async def create_orchestrator(user_id: str, session_id: str) -> PhaseTwoOrchestrator:
+@asynccontextmanager
+async def _lifespan(app):
+    """Start warming the agent pool without holding up startup."""
+    if AGENT_POOL_WARMUP == "background":
+        agent_pool.start_warmup()
+    yield
+
+
+app = BedrockAgentCoreApp(lifespan=_lifespan)
+
+
+@app.ping
+def ping_status():
+    """Report busy while the agent pool warms; otherwise use the default status."""
+    if agent_pool.warming:
+        return PingStatus.HEALTHY_BUSY
+    return None
+
+
+@lru_cache(maxsize=8)
+def _memory_saver(memory_id: str, region_name: str) -> AgentCoreMemorySaver:
+    """Shared AgentCore memory checkpointer per memory and region."""
+    return AgentCoreMemorySaver(memory_id=memory_id, region_name=region_name)
+
+
+def lease_orchestrator(user_id: str, session_id: str):
     """
-    Create the 4-agent orchestrator with all agents initialized.
+    Lease a 4-agent orchestrator over the warm, shared agents.
     
     Args:
         user_id: User identifier from JWT token
-        session_id: Session identifier for conversation memory
+        session_id: Session identifier, used as the incident ID
         
     Returns:
-        Configured PhaseTwoOrchestrator instance
+        Async context manager yielding a PhaseTwoOrchestrator
     """
-    print(f"[SRE] Creating 4-agent orchestrator for user: {user_id}, session: {session_id}")
-    
-    # Initialize all 4 agents
-    analyst = AnalystAgent()
-    rca = RCAAgent()
-    impact = ImpactAgent()
-    mitigation = MitigationCommsAgent()
-    
-    # Create orchestrator
-    orchestrator = PhaseTwoOrchestrator(
-        analyst_agent=analyst,
-        rca_agent=rca,
-        impact_agent=impact,
-        mitigation_agent=mitigation,
-        demo_mode=False,
-        incident_id=session_id
-    )
-    
-    print("[SRE] 4-agent orchestrator created successfully")
-    return orchestrator
+    print(f"[SRE] Leasing 4-agent orchestrator for user: {user_id}, session: {session_id}")
+    return agent_pool.lease(session_id)
 
 
 def create_scenario_from_query(query: str, session_id: str) -> tuple[ScenarioSnapshot, Dict[str, Any]]:
@@ -97,7 +106,6 @@ def create_scenario_from_query(query: str, session_id: str) -> tuple[ScenarioSna
     Returns:
         Tuple of (ScenarioSnapshot, metadata dict with details for user display)
     """
-    import boto3
     import json
     from datetime import timedelta
     from collections import Counter
@@ -121,7 +129,7 @@ def create_scenario_from_query(query: str, session_id: str) -> tuple[ScenarioSna
     # Check if user is asking about CloudWatch logs
     if "/aws/banking/system-logs" in query.lower() or "cloudwatch" in query.lower():
         try:
-            logs_client = boto3.client('logs')
+            logs_client = agent_pool.client('logs')
             
             # Get recent logs from the last hour
             start_time = now - timedelta(hours=1)
@@ -327,6 +335,12 @@ async def stream_orchestrator_results(
         if kb_retrievals:
             kb_summary = ["\n\n📚 **Knowledge Base Queries:**"]
             kb_summary.append(f"\nTotal Retrievals: {len(kb_retrievals)}")
+            cache_hits = [r for r in kb_retrievals if r.get('cache', 'miss') != 'miss']
+            if cache_hits:
+                semantic_hits = sum(1 for r in cache_hits if r['cache'] == 'semantic')
+                kb_summary.append(
+                    f" ({len(cache_hits)} served from cache, {semantic_hits} of them near-duplicates)"
+                )
             
             # Group by unique sources
             all_sources = set()
@@ -374,10 +388,7 @@ async def stream_orchestrator_results(
             try:
                 from langchain_core.messages import HumanMessage, AIMessage
                 
-                checkpointer = AgentCoreMemorySaver(
-                    memory_id=memory_id,
-                    region_name=os.environ.get("AWS_DEFAULT_REGION", "us-west-2")
-                )
+                checkpointer = _memory_saver(memory_id, os.environ.get("AWS_DEFAULT_REGION", "us-west-2"))
                 
                 config = {"configurable": {"thread_id": session_id, "user_id": user_id, "actor_id": user_id}}
                 
@@ -471,6 +482,10 @@ async def agent_stream(payload, context: RequestContext):
     and either runs the full 4-agent workflow or provides conversational responses
     about previous analysis.
     """
+    if payload.get("action") == "health":
+        yield {"type": "health", "content": agent_pool.health()}
+        return
+
     user_query = payload.get("prompt")
     session_id = payload.get("runtimeSessionId")
     
@@ -494,39 +509,37 @@ async def agent_stream(payload, context: RequestContext):
         if is_incident_analysis:
             print("[SRE] Detected incident analysis request - running 4-agent workflow")
             
-            # Create orchestrator
-            orchestrator = await create_orchestrator(user_id, session_id)
-            
             # Create scenario from query and get display metadata
             scenario, display_metadata = create_scenario_from_query(user_query, session_id)
             
             # Stream results with metadata
-            async for chunk in stream_orchestrator_results(orchestrator, scenario, display_metadata, session_id, user_id):
-                # Convert to LangGraph-compatible format for frontend
-                if chunk["type"] == "agent_response":
-                    yield {
-                        "type": "AIMessageChunk",
-                        "content": [{
-                            "type": "text",
-                            "text": chunk['content']
-                        }]
-                    }
-                elif chunk["type"] in ("status", "summary", "complete", "kb_summary"):
-                    yield {
-                        "type": "AIMessageChunk",
-                        "content": [{
-                            "type": "text",
-                            "text": chunk["content"]
-                        }]
-                    }
-                elif chunk["type"] == "error":
-                    yield {
-                        "type": "AIMessageChunk",
-                        "content": [{
-                            "type": "text",
-                            "text": f"❌ {chunk['content']}"
-                        }]
-                    }
+            async with lease_orchestrator(user_id, session_id) as orchestrator:
+                async for chunk in stream_orchestrator_results(orchestrator, scenario, display_metadata, session_id, user_id):
+                    # Convert to LangGraph-compatible format for frontend
+                    if chunk["type"] == "agent_response":
+                        yield {
+                            "type": "AIMessageChunk",
+                            "content": [{
+                                "type": "text",
+                                "text": chunk['content']
+                            }]
+                        }
+                    elif chunk["type"] in ("status", "summary", "complete", "kb_summary"):
+                        yield {
+                            "type": "AIMessageChunk",
+                            "content": [{
+                                "type": "text",
+                                "text": chunk["content"]
+                            }]
+                        }
+                    elif chunk["type"] == "error":
+                        yield {
+                            "type": "AIMessageChunk",
+                            "content": [{
+                                "type": "text",
+                                "text": f"❌ {chunk['content']}"
+                            }]
+                        }
             
             print("[SRE] 4-agent workflow completed successfully")
         else:
@@ -601,7 +614,6 @@ async def _handle_conversational_query(query: str, session_id: str, user_id: str
     Yields:
         Response chunks in LangGraph format
     """
-    import boto3
     import json
     
     # Get memory ID from environment
@@ -615,10 +627,7 @@ async def _handle_conversational_query(query: str, session_id: str, user_id: str
     
     if memory_id:
         try:
-            checkpointer = AgentCoreMemorySaver(
-                memory_id=memory_id,
-                region_name=os.environ.get("AWS_DEFAULT_REGION", "us-west-2")
-            )
+            checkpointer = _memory_saver(memory_id, os.environ.get("AWS_DEFAULT_REGION", "us-west-2"))
             
             # Retrieve conversation history from memory
             config = {"configurable": {"thread_id": session_id, "user_id": user_id, "actor_id": user_id}}
@@ -668,7 +677,7 @@ async def _handle_conversational_query(query: str, session_id: str, user_id: str
         print("[SRE] No conversation history found in memory")
     
     # Use Bedrock with Llama 3.3 70B (same model as the 4-agent system)
-    bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-west-2')
+    bedrock_runtime = agent_pool.client('bedrock-runtime', region_name='us-west-2')
     
     system_prompt = f"""You are an SRE assistant helping users understand the 4-agent incident response system.
 